@@ -4,22 +4,15 @@ from __future__ import annotations
 
 import asyncio
 import logging
-import os
 
-from aiobotocore.session import get_session
+from autopilot.s3 import close_s3_clients, get_s3_manager
+from autopilot.settings import get_settings
 
 LOGGER = logging.getLogger(__name__)
 logging.basicConfig(
     level=logging.INFO, format="%(asctime)s %(levelname)s %(name)s %(message)s"
 )
 
-MINIO_ENDPOINT = os.getenv("MINIO_ENDPOINT", "http://localhost:9000")
-ACCESS_KEY = os.getenv("MINIO_ACCESS_KEY") or os.getenv("MINIO_ROOT_USER", "autopilot")
-SECRET_KEY = os.getenv("MINIO_SECRET_KEY") or os.getenv(
-    "MINIO_ROOT_PASSWORD", "autopilot123"
-)
-REGION = os.getenv("MINIO_REGION", "us-east-1")
-
 BUCKETS = [
     "autopilot-alerts",
     "autopilot-geozarr",
@@ -39,16 +32,12 @@ async def ensure_bucket(s3_client, bucket: str) -> None:
 
 
 async def main() -> None:
-    session = get_session()
-    async with session.create_client(
-        "s3",
-        endpoint_url=MINIO_ENDPOINT,
-        aws_access_key_id=ACCESS_KEY,
-        aws_secret_access_key=SECRET_KEY,
-        region_name=REGION,
-    ) as s3:
+    s3 = await get_s3_manager(get_settings()).async_client()
+    try:
         for bucket in BUCKETS:
             await ensure_bucket(s3, bucket)
+    finally:
+        await close_s3_clients()
 
 
 if __name__ == "__main__":
@@ -0,0 +1,133 @@
+"""Compare per-consumer AOI parsing with the shared AlertGeometry on large multipolygons.
+
+Pass real-world AOIs (alert JSON files or GeoJSON geometries/features/feature
+collections, e.g. Copernicus EMS delineation layers) as arguments. Without
+arguments a synthetic coastline-like multipolygon is generated instead.
+
+No EMS data ships with the repo (the products are large and licensed
+separately). To fetch one:
+
+1. Open an activation on https://rapidmapping.emergency.copernicus.eu/ (for
+   example a flood, whose delineation is a long, fragmented river shoreline) and
+   download the vector package of one AOI's delineation (DEL) product.
+2. List its layers with ``ogrinfo /vsizip/<package>.zip`` and convert the
+   observed-event polygon layer (``observedEventA``) to WGS84 GeoJSON::
+
+       ogr2ogr -f GeoJSON -t_srs EPSG:4326 local/EMSR_delineation.geojson \\
+           /vsizip/<package>.zip/<layer>.shp
+
+3. Run ``python scripts/benchmark_geometry.py local/EMSR_delineation.geojson``.
+   The feature collection is unioned into one multipolygon, as an alert AOI would be.
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import math
+import pathlib
+import random
+import sys
+import time
+from typing import Any
+
+import shapely
+from shapely.geometry import mapping, shape
+
+from autopilot.geometry import GEOD, AlertGeometry
+
+# build_stac_item, reporting, profile selection and the EODC search body each
+# parsed the AOI separately before the shared geometry existed.
+CONSUMERS = 4
+
+
+def _parse_args() -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("paths", nargs="*", type=pathlib.Path, help="Alert or GeoJSON files")
+    parser.add_argument("--repeat", type=int, default=20, help="Timing repetitions per AOI")
+    parser.add_argument("--max-vertices", type=int, default=500, help="Search footprint budget")
+    parser.add_argument(
+        "--tolerance", type=float, default=0.001, help="Initial simplification tolerance (deg)"
+    )
+    return parser.parse_args()
+
+
+def _load_geometry(path: pathlib.Path) -> dict[str, Any]:
+    payload = json.loads(path.read_text(encoding="utf-8"))
+    if "areaOfInterest" in payload:
+        return payload["areaOfInterest"]
+    if payload.get("type") == "FeatureCollection":
+        geometries = [shape(f["geometry"]) for f in payload["features"] if f.get("geometry")]
+        return mapping(shapely.union_all(geometries))
+    if payload.get("type") == "Feature":
+        return payload["geometry"]
+    return payload
+
+
+def _synthetic_coastline(parts: int = 12, vertices: int = 4000, seed: int = 0) -> dict[str, Any]:
+    rng = random.Random(seed)
+    polygons = []
+    for _ in range(parts):
+        cx, cy = 12 + rng.uniform(-0.5, 0.5), 45 + rng.uniform(-0.5, 0.5)
+        base = rng.uniform(0.02, 0.08)
+        phases = [rng.uniform(0, 2 * math.pi) for _ in range(6)]
+        ring = []
+        for index in range(vertices):
+            angle = 2 * math.pi * index / vertices
+            wobble = sum(
+                math.sin((3**octave) * angle + phases[octave]) / (2**octave) for octave in range(6)
+            )
+            radius = base * (1 + 0.25 * wobble)
+            ring.append((cx + radius * math.cos(angle), cy + radius * math.sin(angle)))
+        polygons.append(shapely.Polygon(ring).buffer(0))
+    return mapping(shapely.union_all(polygons))
+
+
+def _baseline(geojson: dict[str, Any]) -> tuple[Any, ...]:
+    results = []
+    for _ in range(CONSUMERS):
+        geom = shape(geojson)
+        results.append((geom.bounds, GEOD.geometry_area_perimeter(geom)))
+    return tuple(results), json.dumps(geojson)
+
+
+def _shared(geojson: dict[str, Any], tolerance: float, max_vertices: int) -> tuple[Any, ...]:
+    aoi = AlertGeometry(geojson, simplify_tolerance=tolerance, max_vertices=max_vertices)
+    return aoi.bounds, aoi.area_km2, json.dumps(aoi.search_geojson)
+
+
+def _time(func, repeat: int, *args: Any) -> float:
+    start = time.perf_counter()
+    for _ in range(repeat):
+        func(*args)
+    return (time.perf_counter() - start) / repeat * 1000
+
+
+def main() -> int:
+    args = _parse_args()
+    if args.paths:
+        samples = [(path.name, _load_geometry(path)) for path in args.paths]
+    else:
+        print("No AOIs given; using a synthetic coastline multipolygon")
+        samples = [("synthetic-coastline", _synthetic_coastline())]
+
+    header = f"{'AOI':<28}{'vertices':>10}{'search':>8}{'body KB':>9}{'search KB':>11}"
+    print(header + f"{'parse ms':>10}{'shared ms':>11}")
+    for name, geojson in samples:
+        aoi = AlertGeometry(
+            geojson, simplify_tolerance=args.tolerance, max_vertices=args.max_vertices
+        )
+        baseline_ms = _time(_baseline, args.repeat, geojson)
+        shared_ms = _time(_shared, args.repeat, geojson, args.tolerance, args.max_vertices)
+        print(
+            f"{name[:27]:<28}{aoi.vertex_count:>10}"
+            f"{shapely.get_num_coordinates(aoi.search_footprint):>8}"
+            f"{len(json.dumps(geojson)) / 1024:>9.1f}"
+            f"{len(json.dumps(aoi.search_geojson)) / 1024:>11.1f}"
+            f"{baseline_ms:>10.2f}{shared_ms:>11.2f}"
+        )
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,112 @@
+"""Benchmark pgstac ingestion throughput against the local Postgres container.
+
+Synthetic items shaped like ``build_stac_item`` output are ingested once per
+batch size; batch size 1 approximates the per-publish hook (one transaction
+per item). Uses ``STAC_PGSTAC_DSN`` (the docker-compose database by default)
+and removes the benchmark rows afterwards in fallback mode.
+
+Reference run (PostgreSQL 16.2 without the pgstac extension, so fallback mode,
+over a Unix socket on one vCPU; 5,000 items, best of two runs):
+
+    batch   items/s
+        1       530
+      100     5,084
+      500     6,095
+     2000     5,581
+"""
+
+from __future__ import annotations
+
+import argparse
+import random
+import sys
+import time
+import uuid
+from datetime import datetime, timedelta, timezone
+from typing import Any
+
+from autopilot.pgstac import FALLBACK_SCHEMA, PgstacIngestor
+from autopilot.settings import get_settings
+
+
+def _parse_args() -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--items", type=int, default=5000, help="Items per batch-size run")
+    parser.add_argument(
+        "--batch-size",
+        dest="batch_sizes",
+        type=int,
+        action="append",
+        help="Batch sizes to compare (default: 1, 100, 500, 2000)",
+    )
+    parser.add_argument("--dsn", default=None, help="Override STAC_PGSTAC_DSN")
+    return parser.parse_args()
+
+
+def _items(count: int, run: str, seed: int = 0) -> list[dict[str, Any]]:
+    rng = random.Random(seed)
+    start = datetime(2024, 1, 1, tzinfo=timezone.utc)
+    items = []
+    for index in range(count):
+        x, y = rng.uniform(-170, 169), rng.uniform(-60, 59)
+        issued = start + timedelta(minutes=rng.randrange(0, 60 * 24 * 365))
+        items.append(
+            {
+                "type": "Feature",
+                "stac_version": "1.0.0",
+                "id": f"bench-{run}-{index:06d}",
+                "collection": "alertzarr-benchmark",
+                "bbox": [x, y, x + 0.5, y + 0.5],
+                "geometry": {
+                    "type": "Polygon",
+                    "coordinates": [
+                        [[x, y], [x + 0.5, y], [x + 0.5, y + 0.5], [x, y + 0.5], [x, y]]
+                    ],
+                },
+                "properties": {
+                    "datetime": issued.isoformat().replace("+00:00", "Z"),
+                    "alert:hazard": "flood",
+                    "alert:severity": "severe",
+                    "source:scene_count": 2,
+                },
+                "assets": {
+                    "geozarr": {
+                        "href": f"s3://autopilot-geozarr/alerts/flood/{index}.zarr",
+                        "type": "application/vnd+zarr",
+                        "roles": ["data", "zarr"],
+                    }
+                },
+                "links": [],
+            }
+        )
+    return items
+
+
+def main() -> int:
+    args = _parse_args()
+    settings = get_settings()
+    dsn = args.dsn or settings.stac_pgstac_dsn
+    batch_sizes = args.batch_sizes or [1, 100, 500, 2000]
+
+    print(f"{'batch':>7}{'items':>8}{'seconds':>10}{'items/s':>10}")
+    for batch_size in batch_sizes:
+        run = uuid.uuid4().hex[:8]
+        items = _items(args.items, run)
+        ingestor = PgstacIngestor(dsn, batch_size=batch_size)
+        try:
+            mode = ingestor.mode  # creates the fallback schema outside the timing
+            start = time.perf_counter()
+            ingestor.ingest(items)
+            elapsed = time.perf_counter() - start
+            if mode == "fallback":
+                ingestor.connection.execute(
+                    f"DELETE FROM {FALLBACK_SCHEMA}.items WHERE id LIKE %s", (f"bench-{run}-%",)
+                )
+        finally:
+            ingestor.close()
+        print(f"{batch_size:>7}{len(items):>8}{elapsed:>10.2f}{len(items) / elapsed:>10.0f}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
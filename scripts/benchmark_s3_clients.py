@@ -0,0 +1,99 @@
+"""Measure S3 client setup per pipeline run: per-call clients versus the shared manager.
+
+A run touches S3 through two async uploads (placeholder/simulated output and
+the STAC item) and a sync listing (store size). By default only client
+construction and teardown are timed, which needs no MinIO; pass ``--put`` to
+also upload a small object per touchpoint to ``GEOZARR_BUCKET``.
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import statistics
+import sys
+import time
+
+import boto3
+from aiobotocore.session import get_session
+
+from autopilot.s3 import S3ClientManager
+from autopilot.settings import get_settings
+
+ASYNC_TOUCHPOINTS = 2
+SYNC_TOUCHPOINTS = 1
+
+
+def _parse_args() -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--runs", type=int, default=10, help="Simulated pipeline runs")
+    parser.add_argument("--put", action="store_true", help="Upload to MinIO at each touchpoint")
+    return parser.parse_args()
+
+
+async def _per_call_run(settings, put: bool) -> None:
+    credentials = {
+        "endpoint_url": settings.minio_endpoint,
+        "aws_access_key_id": settings.minio_access_key,
+        "aws_secret_access_key": settings.minio_secret_key,
+        "region_name": settings.minio_region,
+    }
+    for index in range(ASYNC_TOUCHPOINTS):
+        async with get_session().create_client("s3", **credentials) as s3:
+            if put:
+                await _put(s3, settings.geozarr_bucket, index)
+    for _ in range(SYNC_TOUCHPOINTS):
+        client = boto3.client("s3", **credentials)
+        if put:
+            client.list_objects_v2(Bucket=settings.geozarr_bucket, Prefix="benchmark/", MaxKeys=1)
+        client.close()
+
+
+async def _shared_run(manager: S3ClientManager, bucket: str, put: bool) -> None:
+    for index in range(ASYNC_TOUCHPOINTS):
+        s3 = await manager.async_client()
+        if put:
+            await _put(s3, bucket, index)
+    for _ in range(SYNC_TOUCHPOINTS):
+        client = manager.sync_client()
+        if put:
+            client.list_objects_v2(Bucket=bucket, Prefix="benchmark/", MaxKeys=1)
+
+
+async def _put(s3, bucket: str, index: int) -> None:
+    await s3.put_object(Bucket=bucket, Key=f"benchmark/s3-clients-{index}.json", Body=b"{}")
+
+
+async def _measure(args: argparse.Namespace) -> tuple[list[float], list[float]]:
+    settings = get_settings()
+    per_call: list[float] = []
+    for _ in range(args.runs):
+        start = time.perf_counter()
+        await _per_call_run(settings, args.put)
+        per_call.append((time.perf_counter() - start) * 1000)
+
+    manager = S3ClientManager.from_settings(settings)
+    shared: list[float] = []
+    try:
+        for _ in range(args.runs):
+            start = time.perf_counter()
+            await _shared_run(manager, settings.geozarr_bucket, args.put)
+            shared.append((time.perf_counter() - start) * 1000)
+    finally:
+        await manager.aclose()
+    return per_call, shared
+
+
+def main() -> int:
+    args = _parse_args()
+    per_call, shared = asyncio.run(_measure(args))
+    print(f"{'mode':<10}{'first ms':>10}{'median ms':>11}{'total ms':>10}")
+    for name, values in (("per-call", per_call), ("shared", shared)):
+        print(f"{name:<10}{values[0]:>10.1f}{statistics.median(values):>11.1f}{sum(values):>10.1f}")
+    saving = statistics.median(per_call) - statistics.median(shared)
+    print(f"Median saving per run: {saving:.1f} ms")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,158 @@
+"""Microbenchmark STAC item building, serialisation and content hashing for backfills.
+
+Compares the per-item path (``build_stac_item`` per output, stdlib ``json``)
+with the batch path (``build_stac_items``, ``encode_stac_item`` via orjson and
+the orjson-based ``item_content_hash``). AOI geometries are parsed before the
+timed sections, as a backfill holding ``LoadedAlert`` objects would have.
+
+``--pause-gc`` disables the cyclic GC around the batch path. Collection passes
+rescan the long-lived alert and output objects every few hundred allocations,
+so this shows what a dedicated single-threaded backfill process could gain. The
+switch is process-wide, which is why the library never flips it itself.
+"""
+
+from __future__ import annotations
+
+import argparse
+import gc
+import hashlib
+import json
+import random
+import sys
+import time
+from collections.abc import Callable
+from typing import Any
+
+from autopilot.alerts import parse_alert_payload
+from autopilot.catalog import SceneSummary
+from autopilot.geozarr import ConversionOutput, ViewerLinks
+from autopilot.stac import build_stac_item, build_stac_items, encode_stac_item, item_content_hash
+
+HAZARDS = ("flood", "wildfire", "storm", "earthquake")
+
+
+def _parse_args() -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--items", type=int, default=100_000, help="Items to generate")
+    parser.add_argument("--scenes", type=int, default=2, help="Source scenes per item")
+    parser.add_argument("--base-url", default="http://localhost:7000/stac", help="Public base URL")
+    parser.add_argument(
+        "--pause-gc",
+        action="store_true",
+        help="Disable the cyclic GC while timing the batch path (process-wide)",
+    )
+    return parser.parse_args()
+
+
+def _pairs(count: int, scenes: int, seed: int = 0) -> list[tuple[Any, ConversionOutput]]:
+    rng = random.Random(seed)
+    pairs = []
+    for index in range(count):
+        x, y = rng.uniform(-170, 169), rng.uniform(-60, 59)
+        hazard = rng.choice(HAZARDS)
+        alert = parse_alert_payload(
+            {
+                "id": f"alert-{index:06d}",
+                "description": "Backfill alert",
+                "issued": "2025-01-01T00:00:00Z",
+                "severity": "severe",
+                "hazardType": hazard,
+                "areaOfInterest": {
+                    "type": "Polygon",
+                    "coordinates": [[[x, y], [x + 1, y], [x + 1, y + 1], [x, y + 1], [x, y]]],
+                },
+            }
+        )
+        alert.geometry.repaired_geojson, alert.geometry.bounds  # noqa: B018 - parse up front
+        item_id = f"{alert.id}-S2A"
+        viewer_root = f"http://localhost:8080/collections/{hazard}/items/{item_id}"
+        output = ConversionOutput(
+            alert_id=alert.id,
+            bucket="autopilot-geozarr",
+            key=f"alerts/{hazard}/{item_id}.zarr",
+            s3_uri=f"s3://autopilot-geozarr/alerts/{hazard}/{item_id}.zarr",
+            bytes_written=1024,
+            duration_seconds=1.0,
+            collection_id=hazard,
+            item_id=item_id,
+            viewer=ViewerLinks(
+                collection_id=hazard,
+                item_id=item_id,
+                base_url="http://localhost:8080",
+                tile_matrix_set="WebMercatorQuad",
+                viewer_url=f"{viewer_root}/viewer",
+                tilejson_url=f"{viewer_root}/WebMercatorQuad/tilejson.json",
+                info_url=f"{viewer_root}/info",
+            ),
+            scenes=[
+                SceneSummary(
+                    id=f"S2A_{index}_{scene}",
+                    collection="sentinel-2-l2a",
+                    datetime="2025-01-01T10:00:00Z",
+                    cloud_cover=10.0,
+                    preview_href=None,
+                    data_href=f"https://objects.example/S2A_{index}_{scene}.zarr",
+                    stac_item_href=f"https://stac.example/items/S2A_{index}_{scene}",
+                )
+                for scene in range(scenes)
+            ],
+        )
+        pairs.append((alert, output))
+    return pairs
+
+
+def _json_hash(item: dict[str, Any]) -> str:
+    encoded = json.dumps(item, sort_keys=True, separators=(",", ":")).encode("utf-8")
+    return hashlib.sha256(encoded).hexdigest()
+
+
+def _time(func: Callable[[], Any], pause_gc: bool = False) -> tuple[float, Any]:
+    if pause_gc:
+        gc.disable()
+    try:
+        start = time.perf_counter()
+        result = func()
+        return time.perf_counter() - start, result
+    finally:
+        if pause_gc:
+            gc.enable()
+
+
+def main() -> int:
+    args = _parse_args()
+    print(f"Generating {args.items} alert/output pair(s)...")
+    pairs = _pairs(args.items, args.scenes)
+    bucket = "autopilot-stac"
+
+    per_item_build, items = _time(
+        lambda: [build_stac_item(alert, output, bucket, args.base_url) for alert, output in pairs]
+    )
+    batch_build, _ = _time(
+        lambda: build_stac_items(pairs, bucket, args.base_url), pause_gc=args.pause_gc
+    )
+    json_dump, _ = _time(lambda: [json.dumps(item).encode("utf-8") for item in items])
+    orjson_dump, _ = _time(
+        lambda: [encode_stac_item(item) for item in items], pause_gc=args.pause_gc
+    )
+    json_hash, _ = _time(lambda: [_json_hash(item) for item in items])
+    orjson_hash, _ = _time(
+        lambda: [item_content_hash(item) for item in items], pause_gc=args.pause_gc
+    )
+
+    rows = (
+        ("build", per_item_build, batch_build),
+        ("serialise", json_dump, orjson_dump),
+        ("content hash", json_hash, orjson_hash),
+        ("total", per_item_build + json_dump + json_hash, batch_build + orjson_dump + orjson_hash),
+    )
+    print(f"{'stage':<14}{'per-item s':>12}{'batch s':>10}{'speed-up':>10}{'items/s':>12}")
+    for name, before, after in rows:
+        print(
+            f"{name:<14}{before:>12.2f}{after:>10.2f}{before / after:>9.1f}x"
+            f"{args.items / after:>12.0f}"
+        )
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -7,7 +7,8 @@ import os
 import pathlib
 import sys
 
-import boto3
+from autopilot.s3 import get_s3_manager
+from autopilot.settings import get_settings
 
 
 def _parse_args() -> argparse.Namespace:
@@ -33,23 +34,9 @@ def main() -> int:
     dest: pathlib.Path = args.dest
     dest.mkdir(parents=True, exist_ok=True)
 
-    try:
-        endpoint = os.environ["MINIO_ENDPOINT"]
-        aws_access_key_id = os.environ["MINIO_ACCESS_KEY"]
-        aws_secret_access_key = os.environ["MINIO_SECRET_KEY"]
-        region_name = os.environ["MINIO_REGION"]
-        bucket = os.environ["STAC_BUCKET"]
-    except KeyError as exc:
-        missing = exc.args[0]
-        raise SystemExit(f"Missing required environment variable: {missing}") from exc
-
-    s3 = boto3.client(
-        "s3",
-        endpoint_url=endpoint,
-        aws_access_key_id=aws_access_key_id,
-        aws_secret_access_key=aws_secret_access_key,
-        region_name=region_name,
-    )
+    settings = get_settings()
+    bucket = settings.stac_bucket
+    s3 = get_s3_manager(settings).sync_client()
 
     downloaded = 0
     paginator = s3.get_paginator("list_objects_v2")
@@ -0,0 +1,158 @@
+"""Load-test the read-only STAC API and report requests per second.
+
+Without ``--url`` an in-process server is started over synthetic items, so the
+numbers reflect the index and HTTP layer alone. Point ``--url`` at a running
+``alertzarr-stac-api`` (e.g. http://127.0.0.1:7000/stac) to include the real
+catalog; item ids for ``/items`` requests are then sampled from ``/search``.
+"""
+
+from __future__ import annotations
+
+import argparse
+import random
+import statistics
+import sys
+import threading
+import time
+from datetime import datetime, timedelta, timezone
+from typing import Any
+
+import httpx
+
+from autopilot.stac_api import StacApiIndex, make_server
+
+HAZARDS = ("flood", "wildfire", "storm", "earthquake")
+
+
+def _parse_args() -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--url", default=None, help="Base URL of a running STAC API")
+    parser.add_argument("--items", type=int, default=5000, help="Synthetic items (no --url)")
+    parser.add_argument("--clients", type=int, default=8, help="Concurrent client threads")
+    parser.add_argument("--duration", type=float, default=10.0, help="Seconds per run")
+    parser.add_argument("--limit", type=int, default=10, help="Page size for /search")
+    return parser.parse_args()
+
+
+def _synthetic_items(count: int, seed: int = 0) -> list[dict[str, Any]]:
+    rng = random.Random(seed)
+    start = datetime(2024, 1, 1, tzinfo=timezone.utc)
+    items = []
+    for index in range(count):
+        x, y = rng.uniform(-170, 169), rng.uniform(-60, 59)
+        size = rng.uniform(0.05, 1.0)
+        hazard = rng.choice(HAZARDS)
+        issued = start + timedelta(minutes=rng.randrange(0, 60 * 24 * 600))
+        items.append(
+            {
+                "type": "Feature",
+                "stac_version": "1.0.0",
+                "id": f"synthetic-{index:06d}",
+                "collection": hazard,
+                "bbox": [x, y, x + size, y + size],
+                "geometry": {
+                    "type": "Polygon",
+                    "coordinates": [
+                        [[x, y], [x + size, y], [x + size, y + size], [x, y + size], [x, y]]
+                    ],
+                },
+                "properties": {
+                    "datetime": issued.isoformat().replace("+00:00", "Z"),
+                    "alert:hazard": hazard,
+                    "alert:severity": "severe",
+                },
+                "assets": {"geozarr": {"href": f"s3://bucket/{index}.zarr", "roles": ["data"]}},
+                "links": [],
+            }
+        )
+    return items
+
+
+def _request(rng: random.Random, item_ids: list[str], limit: int) -> tuple[str, dict[str, Any]]:
+    roll = rng.random()
+    if roll < 0.3 and item_ids:
+        return f"/items/{rng.choice(item_ids)}", {}
+    if roll < 0.6:
+        x, y = rng.uniform(-170, 150), rng.uniform(-60, 40)
+        return "/search", {"bbox": f"{x},{y},{x + 20},{y + 20}", "limit": limit}
+    if roll < 0.85:
+        month = rng.randrange(1, 13)
+        interval = f"2024-{month:02d}-01T00:00:00Z/2024-{month:02d}-28T00:00:00Z"
+        return "/search", {"datetime": interval, "hazard": rng.choice(HAZARDS), "limit": limit}
+    return "/search", {"limit": limit}
+
+
+def _worker(
+    base_url: str,
+    item_ids: list[str],
+    args: argparse.Namespace,
+    deadline: float,
+    seed: int,
+    latencies: list[float],
+    errors: list[int],
+) -> None:
+    rng = random.Random(seed)
+    with httpx.Client(base_url=base_url, timeout=10.0) as client:
+        while time.perf_counter() < deadline:
+            path, params = _request(rng, item_ids, args.limit)
+            start = time.perf_counter()
+            try:
+                response = client.get(path, params=params)
+                ok = response.status_code == 200
+            except httpx.HTTPError:
+                ok = False
+            latencies.append((time.perf_counter() - start) * 1000)
+            if not ok:
+                errors.append(1)
+
+
+def _run(base_url: str, item_ids: list[str], args: argparse.Namespace) -> None:
+    latencies: list[float] = []
+    errors: list[int] = []
+    deadline = time.perf_counter() + args.duration
+    threads = [
+        threading.Thread(
+            target=_worker, args=(base_url, item_ids, args, deadline, seed, latencies, errors)
+        )
+        for seed in range(args.clients)
+    ]
+    started = time.perf_counter()
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    elapsed = time.perf_counter() - started
+
+    latencies.sort()
+    quantiles = statistics.quantiles(latencies, n=100) if len(latencies) > 1 else latencies * 99
+    print(f"Requests:   {len(latencies)} in {elapsed:.1f}s with {args.clients} client(s)")
+    print(f"Throughput: {len(latencies) / elapsed:.0f} req/s")
+    print(f"Latency ms: p50 {quantiles[49]:.2f}  p95 {quantiles[94]:.2f}  p99 {quantiles[98]:.2f}")
+    print(f"Errors:     {len(errors)}")
+
+
+def main() -> int:
+    args = _parse_args()
+    if args.url:
+        response = httpx.get(f"{args.url.rstrip('/')}/search", params={"limit": 1000})
+        item_ids = [feature["id"] for feature in response.json()["features"]]
+        _run(args.url.rstrip("/"), item_ids, args)
+        return 0
+
+    items = _synthetic_items(args.items)
+    index = StacApiIndex("synthetic", base_url="http://127.0.0.1/stac")
+    index.load(items)
+    server = make_server(index, "127.0.0.1", 0)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    try:
+        print(f"Serving {len(items)} synthetic item(s) on port {server.server_port}")
+        _run(f"http://127.0.0.1:{server.server_port}/stac", [item["id"] for item in items], args)
+    finally:
+        server.shutdown()
+        server.server_close()
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -5,11 +5,15 @@ from __future__ import annotations
 import json
 from collections.abc import Mapping
 from dataclasses import dataclass
+from functools import cached_property
 from pathlib import Path
 from typing import Any
 
 from pydantic import BaseModel
 
+from .geometry import AlertGeometry
+from .settings import get_settings
+
 
 class Alert(BaseModel):
     id: str
@@ -30,6 +34,17 @@ class LoadedAlert:
     raw: dict[str, Any]
     model: Alert
 
+    @cached_property
+    def geometry(self) -> AlertGeometry:
+        """The AOI parsed once and shared by search, STAC and reporting."""
+
+        settings = get_settings()
+        return AlertGeometry(
+            self.model.area_of_interest,
+            simplify_tolerance=settings.aoi_simplify_tolerance_deg,
+            max_vertices=settings.aoi_search_max_vertices,
+        )
+
 
 def load_alert(path: Path) -> LoadedAlert:
     with path.open("r", encoding="utf-8") as fp:
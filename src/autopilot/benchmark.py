@@ -0,0 +1,237 @@
+"""Converter parameter sweeps over synthetic Sentinel-2 scenes."""
+
+from __future__ import annotations
+
+import itertools
+import logging
+import os
+import random
+import shutil
+import statistics
+import time
+from collections.abc import Iterable, Sequence
+from contextlib import nullcontext
+from dataclasses import asdict, dataclass
+from pathlib import Path
+from typing import Any
+
+import zarr
+from eopf_geozarr.conversion.fs_utils import open_zarr_group
+
+from .geozarr import _aws_env, _delete_prefix, write_geozarr
+from .s3 import get_s3_manager
+from .settings import Settings
+
+LOGGER = logging.getLogger(__name__)
+
+__all__ = [
+    "BenchmarkConfig",
+    "BenchmarkResult",
+    "parameter_grid",
+    "run_benchmark",
+]
+
+
+@dataclass(frozen=True)
+class BenchmarkConfig:
+    """One point in the converter parameter sweep."""
+
+    spatial_chunk: int
+    tile_width: int
+    min_dimension: int
+    enable_sharding: bool
+
+    @property
+    def label(self) -> str:
+        shard = "sharded" if self.enable_sharding else "unsharded"
+        return (
+            f"chunk{self.spatial_chunk}-tile{self.tile_width}"
+            f"-min{self.min_dimension}-{shard}"
+        )
+
+    def apply(self, settings: Settings) -> Settings:
+        return settings.model_copy(
+            update={
+                "converter_spatial_chunk": self.spatial_chunk,
+                "converter_tile_width": self.tile_width,
+                "converter_min_dimension": self.min_dimension,
+                "converter_enable_sharding": self.enable_sharding,
+            }
+        )
+
+
+@dataclass
+class BenchmarkResult:
+    config: BenchmarkConfig
+    output_path: str
+    write_seconds: float
+    source_bytes: int
+    object_count: int
+    total_bytes: int
+    read_latency_p50_ms: float | None
+    read_latency_p95_ms: float | None
+
+    @property
+    def throughput_mb_s(self) -> float:
+        if self.write_seconds <= 0:
+            return 0.0
+        return self.source_bytes / self.write_seconds / 1_000_000
+
+    def as_dict(self) -> dict[str, Any]:
+        payload = asdict(self)
+        payload["config"] = {**asdict(self.config), "label": self.config.label}
+        payload["throughput_mb_s"] = round(self.throughput_mb_s, 2)
+        return payload
+
+
+def parameter_grid(
+    spatial_chunks: Iterable[int],
+    tile_widths: Iterable[int],
+    min_dimensions: Iterable[int],
+    sharding: Iterable[bool],
+) -> list[BenchmarkConfig]:
+    return [
+        BenchmarkConfig(chunk, tile, minimum, shard)
+        for chunk, tile, minimum, shard in itertools.product(
+            spatial_chunks, tile_widths, min_dimensions, sharding
+        )
+    ]
+
+
+def run_benchmark(
+    datatree,
+    config: BenchmarkConfig,
+    output_root: str,
+    settings: Settings,
+    *,
+    read_samples: int = 20,
+    seed: int = 0,
+    keep_output: bool = False,
+) -> BenchmarkResult:
+    """Write ``datatree`` with ``config`` via the conversion write path and measure it.
+
+    ``output_root`` is a local directory or an ``s3://bucket/prefix`` on the
+    configured MinIO endpoint. Compression is fixed by ``create_geozarr_dataset``
+    (Blosc zstd), so it is not part of the sweep.
+    """
+
+    variant = config.apply(settings)
+    groups = [group for group in variant.converter_groups if group in datatree.groups]
+    variant = variant.model_copy(update={"converter_groups": groups})
+    output_path = f"{output_root.rstrip('/')}/{config.label}.zarr"
+    is_s3 = output_path.startswith("s3://")
+    source_bytes = sum(
+        int(variable.nbytes)
+        for group in groups
+        for variable in datatree[group].data_vars.values()
+    )
+
+    with _target_env(variant, is_s3):
+        _remove_output(output_path, variant, is_s3)
+        start = time.perf_counter()
+        write_geozarr(datatree, output_path, variant)
+        write_seconds = time.perf_counter() - start
+        latencies = _random_tile_latencies(
+            output_path, groups, config.tile_width, read_samples, seed
+        )
+
+    object_count, total_bytes = _store_size(output_path, variant, is_s3)
+    if not keep_output:
+        with _target_env(variant, is_s3):
+            _remove_output(output_path, variant, is_s3)
+
+    return BenchmarkResult(
+        config=config,
+        output_path=output_path,
+        write_seconds=round(write_seconds, 3),
+        source_bytes=source_bytes,
+        object_count=object_count,
+        total_bytes=total_bytes,
+        read_latency_p50_ms=_percentile(latencies, 50),
+        read_latency_p95_ms=_percentile(latencies, 95),
+    )
+
+
+def _target_env(settings: Settings, is_s3: bool):
+    if not is_s3:
+        return nullcontext()
+    return _aws_env(
+        access_key=settings.minio_access_key,
+        secret_key=settings.minio_secret_key,
+        region=settings.minio_region,
+        endpoint=settings.minio_endpoint,
+    )
+
+
+def _random_tile_latencies(
+    output_path: str,
+    groups: Sequence[str],
+    tile_width: int,
+    samples: int,
+    seed: int,
+) -> list[float]:
+    """Read ``samples`` random full-resolution tiles from the written store."""
+
+    if samples <= 0 or not groups:
+        return []
+    root = open_zarr_group(output_path, mode="r")
+    arrays: list[zarr.Array] = []
+    for group in groups:
+        level = root[f"{group.strip('/')}/0"]
+        arrays.extend(
+            array
+            for _, array in level.arrays()
+            if array.ndim >= 2 and array.shape[-1] > 1 and array.shape[-2] > 1
+        )
+    if not arrays:
+        return []
+
+    rng = random.Random(seed)
+    latencies: list[float] = []
+    for _ in range(samples):
+        array = rng.choice(arrays)
+        height, width = array.shape[-2], array.shape[-1]
+        y = rng.randrange(0, max(height - tile_width, 0) + 1)
+        x = rng.randrange(0, max(width - tile_width, 0) + 1)
+        window = (..., slice(y, y + tile_width), slice(x, x + tile_width))
+        start = time.perf_counter()
+        array[window]
+        latencies.append((time.perf_counter() - start) * 1000)
+    return latencies
+
+
+def _store_size(output_path: str, settings: Settings, is_s3: bool) -> tuple[int, int]:
+    if is_s3:
+        bucket, _, prefix = output_path.removeprefix("s3://").partition("/")
+        client = get_s3_manager(settings).sync_client()
+        count = total = 0
+        paginator = client.get_paginator("list_objects_v2")
+        for page in paginator.paginate(Bucket=bucket, Prefix=f"{prefix}/"):
+            for item in page.get("Contents", []):
+                count += 1
+                total += int(item.get("Size", 0))
+        return count, total
+
+    count = total = 0
+    for directory, _, files in os.walk(output_path):
+        for name in files:
+            count += 1
+            total += (Path(directory) / name).stat().st_size
+    return count, total
+
+
+def _remove_output(output_path: str, settings: Settings, is_s3: bool) -> None:
+    if not is_s3:
+        shutil.rmtree(output_path, ignore_errors=True)
+        return
+    bucket, _, prefix = output_path.removeprefix("s3://").partition("/")
+    _delete_prefix(bucket, f"{prefix}/", settings)
+
+
+def _percentile(values: list[float], percentile: int) -> float | None:
+    if not values:
+        return None
+    if len(values) == 1:
+        return round(values[0], 3)
+    cuts = statistics.quantiles(values, n=100, method="inclusive")
+    return round(cuts[percentile - 1] if percentile < 100 else max(values), 3)
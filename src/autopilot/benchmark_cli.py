@@ -0,0 +1,138 @@
+"""Command-line entry point for converter parameter sweeps."""
+
+from __future__ import annotations
+
+import json
+from pathlib import Path
+
+import click
+from rich.console import Console
+from rich.table import Table
+
+from .benchmark import parameter_grid, run_benchmark
+from .logging_utils import configure_logging
+from .settings import get_settings
+from .synthetic import SENTINEL2_GROUPS, build_synthetic_datatree
+
+CONSOLE = Console()
+_SHARDING = {"on": (True,), "off": (False,), "both": (False, True)}
+_COLUMNS = ("Config", "Seconds", "MB/s", "Objects", "Stored MB", "Read p50 ms", "Read p95 ms")
+
+
+@click.command()
+@click.option(
+    "--width", type=int, default=2048, show_default=True, help="Scene width in 10 m pixels"
+)
+@click.option(
+    "--height", type=int, default=None, help="Scene height in 10 m pixels (defaults to --width)"
+)
+@click.option(
+    "--group",
+    "groups",
+    multiple=True,
+    type=click.Choice(list(SENTINEL2_GROUPS)),
+    help="Reflectance groups to generate and convert (defaults to CONVERTER_GROUPS)",
+)
+@click.option("--chunk", "chunks", type=int, multiple=True, help="Spatial chunk sizes to sweep")
+@click.option("--tile-width", "tile_widths", type=int, multiple=True, help="Tile widths to sweep")
+@click.option(
+    "--min-dimension",
+    "min_dimensions",
+    type=int,
+    multiple=True,
+    help="Minimum overview sizes to sweep",
+)
+@click.option(
+    "--sharding",
+    type=click.Choice(list(_SHARDING)),
+    default="both",
+    show_default=True,
+    help="Sweep with sharding enabled, disabled or both",
+)
+@click.option(
+    "--output",
+    type=str,
+    default="local/benchmark",
+    show_default=True,
+    help="Local directory or s3://bucket/prefix on the configured MinIO endpoint",
+)
+@click.option(
+    "--read-samples", type=int, default=20, show_default=True, help="Random tile reads per store"
+)
+@click.option("--keep-output", is_flag=True, help="Keep written stores instead of deleting them")
+@click.option(
+    "--json-out",
+    type=click.Path(path_type=Path, dir_okay=False),
+    default=None,
+    help="Write the results as JSON to this file",
+)
+def main(
+    width: int,
+    height: int | None,
+    groups: tuple[str, ...],
+    chunks: tuple[int, ...],
+    tile_widths: tuple[int, ...],
+    min_dimensions: tuple[int, ...],
+    sharding: str,
+    output: str,
+    read_samples: int,
+    keep_output: bool,
+    json_out: Path | None,
+) -> None:
+    """Convert a synthetic Sentinel-2 scene across a grid of converter settings."""
+    configure_logging()
+    settings = get_settings()
+    selected = list(groups) or [g for g in settings.converter_groups if g in SENTINEL2_GROUPS]
+    settings = settings.model_copy(update={"converter_groups": selected})
+    tree = build_synthetic_datatree(width, height, groups=selected)
+
+    configs = parameter_grid(
+        chunks or (settings.converter_spatial_chunk,),
+        tile_widths or (settings.converter_tile_width,),
+        min_dimensions or (settings.converter_min_dimension,),
+        _SHARDING[sharding],
+    )
+    if not output.startswith("s3://"):
+        Path(output).mkdir(parents=True, exist_ok=True)
+
+    results = []
+    for config in configs:
+        CONSOLE.print(f"Converting with [cyan]{config.label}[/cyan]")
+        results.append(
+            run_benchmark(
+                tree,
+                config,
+                output,
+                settings,
+                read_samples=read_samples,
+                keep_output=keep_output,
+            )
+        )
+
+    table = Table(title=f"GeoZarr conversion benchmark ({width}x{height or width} px)")
+    for column in _COLUMNS:
+        table.add_column(column)
+    for result in results:
+        table.add_row(
+            result.config.label,
+            f"{result.write_seconds:.2f}",
+            f"{result.throughput_mb_s:.1f}",
+            str(result.object_count),
+            f"{result.total_bytes / 1_000_000:.1f}",
+            _format_ms(result.read_latency_p50_ms),
+            _format_ms(result.read_latency_p95_ms),
+        )
+    CONSOLE.print(table)
+
+    if json_out is not None:
+        json_out.parent.mkdir(parents=True, exist_ok=True)
+        json_out.write_text(json.dumps([result.as_dict() for result in results], indent=2))
+        CONSOLE.print(f"Saved results to [cyan]{json_out}[/cyan]")
+
+
+def _format_ms(value: float | None) -> str:
+    return "-" if value is None else f"{value:.1f}"
+
+
+if __name__ == "__main__":  # pragma: no cover
+    main()
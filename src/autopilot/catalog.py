@@ -2,18 +2,40 @@
 
 from __future__ import annotations
 
+import asyncio
+import hashlib
+import json
 import logging
+import os
+import sqlite3
+import threading
+import time
+import weakref
+from collections import OrderedDict
+from collections.abc import AsyncIterator, Awaitable, Callable, Sequence
 from dataclasses import dataclass
 from datetime import datetime, timedelta, timezone
+from functools import lru_cache
+from pathlib import Path
 from typing import Any
 
 import httpx
+import shapely
+from shapely.geometry import mapping, shape
 
 from .alerts import LoadedAlert
+from .reporting import span
 from .settings import get_settings
 
 LOGGER = logging.getLogger(__name__)
 
+# (method, url, body) of a search request and the features plus follow-up of its page.
+_Request = tuple[str, str, dict[str, Any] | None]
+_Page = tuple[list[dict[str, Any]], _Request | None]
+_INDEX_SYNC_OVERLAP = timedelta(days=2)
+_BULK_PAGE_SIZE = 100
+_MAX_UNION_VERTICES = 1000
+
 
 @dataclass(slots=True)
 class SceneSummary:
@@ -27,6 +49,9 @@ class SceneSummary:
     data_href: str | None
     stac_item_href: str
     zarr_href: str | None = None
+    bbox: list[float] | None = None
+    epsg: int | None = None
+    tile_id: str | None = None
 
     def as_dict(self) -> dict[str, Any]:
         payload = {
@@ -40,6 +65,12 @@ class SceneSummary:
         }
         if self.zarr_href:
             payload["zarr_href"] = self.zarr_href
+        if self.bbox:
+            payload["bbox"] = list(self.bbox)
+        if self.epsg is not None:
+            payload["epsg"] = self.epsg
+        if self.tile_id:
+            payload["tile_id"] = self.tile_id
         return payload
 
 
@@ -60,25 +91,794 @@ def _format_datetime(value: datetime) -> str:
     )
 
 
-__all__ = ["SceneSummary", "fetch_eodc_scenes"]
+__all__ = [
+    "IndexCoverage",
+    "SceneIndex",
+    "SceneSearchCache",
+    "SceneSearchCacheStats",
+    "SceneSummary",
+    "aclose_shared_client",
+    "aoi_coverage_reached",
+    "fetch_eodc_scenes",
+    "fetch_eodc_scenes_bulk",
+    "get_scene_index",
+    "get_scene_search_cache",
+    "iter_eodc_scenes",
+]
+
+
+@dataclass
+class SceneSearchCacheStats:
+    hits: int = 0
+    disk_hits: int = 0
+    coalesced: int = 0
+    misses: int = 0
+
+    @property
+    def lookups(self) -> int:
+        return self.hits + self.disk_hits + self.coalesced + self.misses
+
+    @property
+    def hit_rate(self) -> float:
+        if not self.lookups:
+            return 0.0
+        return (self.lookups - self.misses) / self.lookups
+
+    def as_dict(self) -> dict[str, Any]:
+        return {
+            "hits": self.hits,
+            "disk_hits": self.disk_hits,
+            "coalesced": self.coalesced,
+            "misses": self.misses,
+            "hit_rate": round(self.hit_rate, 3),
+        }
+
+
+class SceneSearchCache:
+    """TTL + LRU cache of STAC search results with single-flight request coalescing.
+
+    Entries are keyed on the normalised search (collection, AOI rounded to
+    ~10 m, time window and cloud filter) and store the raw features together
+    with the ``limit`` they were fetched with, so a smaller-limit request is
+    served from a larger cached result; a search without a limit is unbounded.
+    When ``disk_dir`` is set, entries are also written as JSON files and survive
+    process restarts.
+    """
+
+    def __init__(
+        self,
+        ttl_seconds: float,
+        max_entries: int,
+        disk_dir: Path | None = None,
+    ) -> None:
+        self.ttl_seconds = ttl_seconds
+        self.max_entries = max_entries
+        self.disk_dir = disk_dir
+        self.stats = SceneSearchCacheStats()
+        self._entries: OrderedDict[str, tuple[float, int | None, list[dict[str, Any]]]] = (
+            OrderedDict()
+        )
+        # Leader futures by key, with the limit the leader is fetching.
+        self._inflight: dict[str, tuple[asyncio.Future[list[dict[str, Any]]], int | None]] = {}
+
+    @staticmethod
+    def key_for(body: dict[str, Any]) -> str:
+        aoi = shapely.set_precision(shape(body["intersects"]), 1e-4).normalize()
+        normalised = {
+            "collections": sorted(body.get("collections", [])),
+            "aoi": aoi.wkt,
+            "datetime": body.get("datetime"),
+            "query": body.get("query"),
+            "sortby": body.get("sortby"),
+        }
+        encoded = json.dumps(normalised, sort_keys=True).encode("utf-8")
+        return hashlib.sha256(encoded).hexdigest()
+
+    async def get_or_fetch(
+        self,
+        body: dict[str, Any],
+        fetch: Callable[[], Awaitable[list[dict[str, Any]]]],
+    ) -> list[dict[str, Any]]:
+        key = self.key_for(body)
+        limit = _limit(body)
+
+        cached = self._lookup(key, limit)
+        if cached is not None:
+            self.stats.hits += 1
+            return _head(cached, limit)
+
+        while (inflight := self._inflight.get(key)) is not None:
+            leader, leader_limit = inflight
+            try:
+                features = await asyncio.shield(leader)
+            except asyncio.CancelledError:
+                current = asyncio.current_task()
+                if leader.cancelled() and not (current and current.cancelling()):
+                    # Only the leader was cancelled: follow the next leader or fetch.
+                    continue
+                raise
+            if _covers(leader_limit, features, limit):
+                self.stats.coalesced += 1
+                return _head(features, limit)
+            break
+
+        future: asyncio.Future[list[dict[str, Any]]] = asyncio.get_running_loop().create_future()
+        self._inflight[key] = (future, limit)
+        try:
+            entry = None
+            if self.disk_dir is not None:
+                entry = await asyncio.to_thread(self._read_disk, key)
+            if entry is not None and _covers(entry[1], entry[2], limit):
+                self._remember(key, *entry)
+                self.stats.disk_hits += 1
+                features = entry[2]
+                future.set_result(features)
+                return _head(features, limit)
+
+            self.stats.misses += 1
+            features = await fetch()
+        except asyncio.CancelledError:
+            future.cancel()
+            raise
+        except Exception as exc:
+            future.set_exception(exc)
+            future.exception()  # mark retrieved when nobody else is waiting
+            raise
+        else:
+            future.set_result(features)
+            expires_at = time.time() + self.ttl_seconds
+            self._remember(key, expires_at, limit, features)
+            if self.disk_dir is not None:
+                await asyncio.to_thread(self._write_disk, key, expires_at, limit, features)
+        finally:
+            if self._inflight.get(key, (None,))[0] is future:
+                del self._inflight[key]
+        return _head(features, limit)
+
+    async def prime(self, body: dict[str, Any], features: list[dict[str, Any]]) -> None:
+        """Store ``features`` as the complete answer to ``body`` (e.g. from a bulk search)."""
+
+        key = self.key_for(body)
+        limit = _limit(body)
+        expires_at = time.time() + self.ttl_seconds
+        self._remember(key, expires_at, limit, features)
+        if self.disk_dir is not None:
+            await asyncio.to_thread(self._write_disk, key, expires_at, limit, features)
+
+    def clear(self) -> None:
+        self._entries.clear()
+
+    def _lookup(self, key: str, limit: int | None) -> list[dict[str, Any]] | None:
+        entry = self._entries.get(key)
+        if entry is None:
+            return None
+        expires_at, stored_limit, features = entry
+        if expires_at <= time.time():
+            del self._entries[key]
+            return None
+        if not _covers(stored_limit, features, limit):
+            return None
+        self._entries.move_to_end(key)
+        return features
+
+    def _remember(
+        self, key: str, expires_at: float, limit: int | None, features: list[dict[str, Any]]
+    ) -> None:
+        self._entries[key] = (expires_at, limit, features)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+
+    def _read_disk(self, key: str) -> tuple[float, int | None, list[dict[str, Any]]] | None:
+        if self.disk_dir is None:
+            return None
+        path = self.disk_dir / f"{key}.json"
+        try:
+            payload = json.loads(path.read_text(encoding="utf-8"))
+        except (OSError, ValueError):
+            return None
+        if float(payload.get("expires_at", 0)) <= time.time():
+            path.unlink(missing_ok=True)
+            return None
+        stored_limit = payload.get("limit")
+        return (
+            float(payload["expires_at"]),
+            int(stored_limit) if stored_limit is not None else None,
+            list(payload["features"]),
+        )
+
+    def _write_disk(
+        self, key: str, expires_at: float, limit: int | None, features: list[dict[str, Any]]
+    ) -> None:
+        if self.disk_dir is None:
+            return
+        self.disk_dir.mkdir(parents=True, exist_ok=True)
+        path = self.disk_dir / f"{key}.json"
+        tmp_path = path.with_suffix(f".{os.getpid()}.tmp")
+        payload = {"expires_at": expires_at, "limit": limit, "features": features}
+        tmp_path.write_text(json.dumps(payload), encoding="utf-8")
+        os.replace(tmp_path, path)
+        self._prune_disk()
+
+    def _prune_disk(self) -> None:
+        assert self.disk_dir is not None
+        now = time.time()
+        files: list[tuple[float, Path]] = []
+        for path in self.disk_dir.glob("*.json"):
+            try:
+                modified = path.stat().st_mtime
+            except OSError:
+                continue
+            if modified + self.ttl_seconds <= now:
+                path.unlink(missing_ok=True)
+            else:
+                files.append((modified, path))
+        files.sort()
+        for _, path in files[: max(len(files) - self.max_entries, 0)]:
+            path.unlink(missing_ok=True)
+
+
+def _limit(body: dict[str, Any]) -> int | None:
+    """The search's page limit, or ``None`` when it asks for every match."""
+
+    limit = body.get("limit")
+    return int(limit) if limit else None
+
+
+def _head(features: list[dict[str, Any]], limit: int | None) -> list[dict[str, Any]]:
+    return features if limit is None else features[:limit]
+
+
+def _covers(
+    stored_limit: int | None, features: list[dict[str, Any]], limit: int | None
+) -> bool:
+    """Whether a result fetched with ``stored_limit`` answers a ``limit`` request."""
+
+    if stored_limit is None or len(features) < stored_limit:
+        return True
+    return limit is not None and stored_limit >= limit
+
+
+@lru_cache(maxsize=1)
+def get_scene_search_cache() -> SceneSearchCache | None:
+    settings = get_settings()
+    if settings.eodc_search_cache_ttl_seconds <= 0:
+        return None
+    disk_dir = settings.eodc_search_cache_dir
+    return SceneSearchCache(
+        ttl_seconds=settings.eodc_search_cache_ttl_seconds,
+        max_entries=settings.eodc_search_cache_max_entries,
+        disk_dir=Path(disk_dir) if disk_dir else None,
+    )
+
+
+@dataclass(frozen=True, slots=True)
+class IndexCoverage:
+    """A region and time window that the local index holds every item for."""
+
+    rowid: int
+    bounds: tuple[float, float, float, float]
+    start: str
+    end: str
+    synced_at: float
+
+
+class SceneIndex:
+    """SQLite index of EODC STAC items with an R*-tree over their bounding boxes.
+
+    Items are stored as raw features so answers match the live API. The
+    ``coverage`` table records which (bbox, time window) extents were synced
+    completely; only searches inside such an extent are answered locally.
+    Methods block on SQLite; async callers run them with ``asyncio.to_thread``,
+    and a lock keeps those threads off the shared connection at the same time.
+    """
+
+    _SCHEMA = """
+        CREATE TABLE IF NOT EXISTS items (
+            rowid INTEGER PRIMARY KEY,
+            id TEXT NOT NULL,
+            collection TEXT NOT NULL,
+            datetime TEXT NOT NULL,
+            cloud_cover REAL,
+            feature TEXT NOT NULL,
+            UNIQUE (collection, id)
+        );
+        CREATE INDEX IF NOT EXISTS items_collection_datetime ON items (collection, datetime);
+        CREATE VIRTUAL TABLE IF NOT EXISTS items_bbox USING rtree(rowid, minx, maxx, miny, maxy);
+        CREATE TABLE IF NOT EXISTS coverage (
+            rowid INTEGER PRIMARY KEY,
+            collection TEXT NOT NULL,
+            minx REAL, miny REAL, maxx REAL, maxy REAL,
+            start TEXT NOT NULL,
+            "end" TEXT NOT NULL,
+            synced_at REAL NOT NULL
+        );
+    """
+
+    def __init__(self, path: Path | str) -> None:
+        self.path = str(path)
+        if self.path != ":memory:":
+            Path(self.path).parent.mkdir(parents=True, exist_ok=True)
+        self._conn = sqlite3.connect(self.path, check_same_thread=False)
+        self._conn.executescript(self._SCHEMA)
+        self._lock = threading.Lock()
+
+    def close(self) -> None:
+        with self._lock:
+            self._conn.close()
+
+    def upsert(self, features: list[dict[str, Any]]) -> int:
+        """Insert or refresh ``features``; returns how many were stored."""
+
+        stored = 0
+        with self._lock, self._conn:
+            for feature in features:
+                bounds = _feature_bounds(feature)
+                datetime_value = feature.get("properties", {}).get("datetime")
+                if bounds is None or not feature.get("id") or not datetime_value:
+                    continue
+                rowid = self._conn.execute(
+                    """
+                    INSERT INTO items (id, collection, datetime, cloud_cover, feature)
+                    VALUES (?, ?, ?, ?, ?)
+                    ON CONFLICT (collection, id) DO UPDATE SET
+                        datetime = excluded.datetime,
+                        cloud_cover = excluded.cloud_cover,
+                        feature = excluded.feature
+                    RETURNING rowid
+                    """,
+                    (
+                        feature["id"],
+                        feature.get("collection", ""),
+                        _format_datetime(_parse_datetime(datetime_value)),
+                        feature.get("properties", {}).get("eo:cloud_cover"),
+                        json.dumps(feature, separators=(",", ":")),
+                    ),
+                ).fetchone()[0]
+                minx, miny, maxx, maxy = bounds
+                self._conn.execute(
+                    "INSERT OR REPLACE INTO items_bbox VALUES (?, ?, ?, ?, ?)",
+                    (rowid, minx, maxx, miny, maxy),
+                )
+                stored += 1
+        return stored
+
+    def search(
+        self,
+        collection: str,
+        area_of_interest: dict[str, Any],
+        start: str,
+        end: str,
+        *,
+        max_cloud_cover: float | None = None,
+        limit: int | None = None,
+    ) -> list[dict[str, Any]]:
+        """Return features intersecting the AOI within ``[start, end]``, newest first."""
+
+        aoi = shape(area_of_interest)
+        minx, miny, maxx, maxy = aoi.bounds
+        sql = """
+            SELECT items.feature FROM items_bbox
+            JOIN items ON items.rowid = items_bbox.rowid
+            WHERE items_bbox.minx <= ? AND items_bbox.maxx >= ?
+              AND items_bbox.miny <= ? AND items_bbox.maxy >= ?
+              AND items.collection = ? AND items.datetime BETWEEN ? AND ?
+        """
+        params: list[Any] = [maxx, minx, maxy, miny, collection, start, end]
+        if max_cloud_cover is not None:
+            sql += " AND items.cloud_cover < ?"
+            params.append(max_cloud_cover)
+        sql += " ORDER BY items.datetime DESC"
+
+        features: list[dict[str, Any]] = []
+        with self._lock:
+            for (raw,) in self._conn.execute(sql, params):
+                feature = json.loads(raw)
+                geometry = feature.get("geometry")
+                if geometry and not shape(geometry).intersects(aoi):
+                    continue
+                features.append(feature)
+                if limit is not None and len(features) >= limit:
+                    break
+        return features
+
+    def coverage(
+        self, collection: str, bounds: tuple[float, float, float, float], start: str
+    ) -> IndexCoverage | None:
+        """Return the most recently extended synced extent containing ``bounds`` from ``start``."""
+
+        minx, miny, maxx, maxy = bounds
+        with self._lock:
+            row = self._conn.execute(
+                """
+                SELECT rowid, minx, miny, maxx, maxy, start, "end", synced_at FROM coverage
+                WHERE collection = ? AND minx <= ? AND miny <= ? AND maxx >= ? AND maxy >= ?
+                  AND start <= ?
+                ORDER BY "end" DESC, synced_at DESC
+                LIMIT 1
+                """,
+                (collection, minx, miny, maxx, maxy, start),
+            ).fetchone()
+        if row is None:
+            return None
+        return IndexCoverage(row[0], tuple(row[1:5]), row[5], row[6], row[7])
+
+    def record_sync(
+        self,
+        collection: str,
+        bounds: tuple[float, float, float, float],
+        start: str,
+        end: str,
+        synced_at: float,
+        *,
+        extends: IndexCoverage | None = None,
+    ) -> None:
+        with self._lock, self._conn:
+            if extends is not None:
+                self._conn.execute(
+                    'UPDATE coverage SET "end" = max("end", ?), synced_at = ? WHERE rowid = ?',
+                    (end, synced_at, extends.rowid),
+                )
+                return
+            self._conn.execute(
+                """
+                INSERT INTO coverage (collection, minx, miny, maxx, maxy, start, "end", synced_at)
+                VALUES (?, ?, ?, ?, ?, ?, ?, ?)
+                """,
+                (collection, *bounds, start, end, synced_at),
+            )
+
+
+@lru_cache
+def get_scene_index() -> SceneIndex | None:
+    settings = get_settings()
+    if not settings.eodc_index_path:
+        return None
+    return SceneIndex(settings.eodc_index_path)
 
 
 async def fetch_eodc_scenes(
     alert: LoadedAlert,
     *,
     limit: int | None = None,
+    days_after: int = 1,
     client: httpx.AsyncClient | None = None,
+    cache: SceneSearchCache | None = None,
+    index: SceneIndex | None = None,
 ) -> list[SceneSummary]:
-    """Query the EODC STAC API for Sentinel scenes with accessible Zarr assets."""
+    """Query the EODC STAC API for Sentinel scenes with accessible Zarr assets.
+
+    The search window spans ``eodc_days_lookback`` days before the alert was
+    issued and ``days_after`` days after it, widened to whole hours so alerts
+    issued minutes apart share cached results (see ``SceneSearchCache``).
+    ``next`` links are followed until ``limit`` features have been collected.
+    When a ``SceneIndex`` is configured it answers instead of the live API,
+    delta-syncing first if its coverage of the search is missing or stale.
+    """
+
+    settings = get_settings()
+    issued = _parse_datetime(alert.model.issued)
+    body = _search_body(alert, limit or settings.eodc_results_limit, days_after)
+
+    index = index or get_scene_index()
+    cache = cache or get_scene_search_cache()
+    try:
+        async with span("scene_search", limit=body.get("limit")):
+            features = None
+            if index is not None:
+                features = await _indexed_features(index, body, client)
+            if features is None and cache is None:
+                features = await _search_features(body, client)
+            elif features is None:
+                features = await cache.get_or_fetch(body, lambda: _search_features(body, client))
+    except Exception as exc:  # pragma: no cover - network issues handled gracefully
+        LOGGER.warning("Unable to fetch EODC scenes: %s", exc)
+        return []
+
+    scenes: list[SceneSummary] = []
+    for feature in features:
+        scene = _scene_from_feature(feature, issued)
+        if scene is not None:
+            scenes.append(scene)
+    return scenes
+
+
+async def iter_eodc_scenes(
+    alert: LoadedAlert,
+    *,
+    page_size: int | None = None,
+    days_after: int = 1,
+    max_pages: int | None = None,
+    stop_when: Callable[[list[SceneSummary]], bool] | None = None,
+    client: httpx.AsyncClient | None = None,
+) -> AsyncIterator[SceneSummary]:
+    """Yield EODC scenes page by page, following STAC ``next`` links.
+
+    The next page is requested while the current one is being consumed, so at
+    most one page is fetched ahead of the caller. ``stop_when`` receives every
+    scene yielded so far after each scene and ends the search once it returns
+    ``True``. Callers that ``break`` instead should wrap the generator in
+    ``contextlib.aclosing`` so the prefetch is cancelled promptly. Results bypass the
+    search cache because they are streamed rather than collected.
+    """
 
     settings = get_settings()
     issued = _parse_datetime(alert.model.issued)
-    start = _format_datetime(issued - timedelta(days=settings.eodc_days_lookback))
-    end = _format_datetime(issued + timedelta(days=1))
-    body: dict[str, Any] = {
+    max_pages = max_pages or settings.eodc_max_pages
+    body = _search_body(alert, page_size or settings.eodc_results_limit, days_after)
+    client = client or _shared_client()
+    url = f"{settings.eodc_stac_api.rstrip('/')}/search"
+
+    pending: asyncio.Task[_Page] | None = asyncio.create_task(
+        _fetch_page(client, "POST", url, body)
+    )
+    seen: list[SceneSummary] = []
+    pages = 0
+    try:
+        while pending is not None:
+            try:
+                features, next_request = await pending
+            except Exception as exc:
+                LOGGER.warning("Unable to fetch EODC scenes page %s: %s", pages + 1, exc)
+                return
+            pages += 1
+            pending = None
+            if next_request is not None and pages < max_pages:
+                pending = asyncio.create_task(_fetch_page(client, *next_request))
+            for feature in features:
+                scene = _scene_from_feature(feature, issued)
+                if scene is None:
+                    continue
+                seen.append(scene)
+                yield scene
+                if stop_when is not None and stop_when(seen):
+                    return
+    finally:
+        if pending is not None:
+            pending.cancel()
+            await asyncio.gather(pending, return_exceptions=True)
+
+
+def aoi_coverage_reached(
+    area_of_interest: dict[str, Any], fraction: float = 1.0
+) -> Callable[[list[SceneSummary]], bool]:
+    """Build a ``stop_when`` predicate for when scene footprints cover the AOI.
+
+    Footprints are approximated by scene bounding boxes; scenes without one
+    do not count towards coverage.
+    """
+
+    aoi = shape(area_of_interest)
+    target = aoi.area * fraction
+    counted = 0
+    covered = shapely.Polygon()
+
+    def reached(scenes: list[SceneSummary]) -> bool:
+        nonlocal counted, covered
+        for scene in scenes[counted:]:
+            if scene.bbox and len(scene.bbox) >= 4:
+                covered = covered.union(shapely.box(*scene.bbox[:4]).intersection(aoi))
+        counted = len(scenes)
+        return covered.area >= target
+
+    return reached
+
+
+async def fetch_eodc_scenes_bulk(
+    alerts: Sequence[LoadedAlert],
+    *,
+    limit: int | None = None,
+    days_after: int = 1,
+    client: httpx.AsyncClient | None = None,
+    cache: SceneSearchCache | None = None,
+) -> dict[str, list[SceneSummary]]:
+    """Search EODC for many alerts with one request chain per group of nearby alerts.
+
+    Alerts whose AOIs lie within ``eodc_bulk_group_distance_deg`` of each other
+    and whose search windows fit in one window widened by
+    ``eodc_bulk_window_slack_days`` share a search over the union of their
+    AOIs. Returned features are assigned back with an STRtree intersection
+    query and each alert's own time window, giving the same result as
+    ``fetch_eodc_scenes``. When ``cache`` is given, each alert's result is
+    stored under its own search so later ``fetch_eodc_scenes`` calls hit it.
+    """
+
+    settings = get_settings()
+    limit = limit or settings.eodc_results_limit
+    bodies = [_search_body(alert, limit, days_after) for alert in alerts]
+    geometries = [alert.geometry.prepared for alert in alerts]
+    groups = _group_searches(bodies, geometries)
+    client = client or _shared_client()
+
+    searches = await asyncio.gather(
+        *(_search_group(bodies, geometries, group, client) for group in groups),
+        return_exceptions=True,
+    )
+    LOGGER.info(
+        "Bulk EODC search for %s alert(s) used %s group search(es)", len(alerts), len(groups)
+    )
+
+    results: dict[str, list[SceneSummary]] = {}
+    for group, search in zip(groups, searches, strict=True):
+        if isinstance(search, BaseException):
+            LOGGER.warning("Bulk EODC search failed for %s alert(s): %s", len(group), search)
+            search = ([], False)
+        features, complete = search
+        assigned = _assign_features(
+            [bodies[i] for i in group], [geometries[i] for i in group], features, limit
+        )
+        for position, alert_features in zip(group, assigned, strict=True):
+            alert = alerts[position]
+            if not complete and len(alert_features) < limit:
+                results[alert.id] = await fetch_eodc_scenes(
+                    alert, limit=limit, days_after=days_after, client=client, cache=cache
+                )
+                continue
+            if cache is not None:
+                await cache.prime(bodies[position], alert_features)
+            issued = _parse_datetime(alert.model.issued)
+            results[alert.id] = [
+                scene
+                for feature in alert_features
+                if (scene := _scene_from_feature(feature, issued)) is not None
+            ]
+    return results
+
+
+def _group_searches(
+    bodies: list[dict[str, Any]], geometries: list[shapely.Geometry]
+) -> list[list[int]]:
+    """Partition alerts into spatially connected groups with compatible time windows."""
+
+    settings = get_settings()
+    parents = list(range(len(geometries)))
+
+    def root(index: int) -> int:
+        while parents[index] != index:
+            parents[index] = parents[parents[index]]
+            index = parents[index]
+        return index
+
+    if geometries:
+        tree = shapely.STRtree(geometries)
+        left, right = tree.query(
+            geometries, predicate="dwithin", distance=settings.eodc_bulk_group_distance_deg
+        )
+        for a, b in zip(left.tolist(), right.tolist(), strict=True):
+            parents[root(a)] = root(b)
+
+    components: dict[int, list[int]] = {}
+    for index in range(len(geometries)):
+        components.setdefault(root(index), []).append(index)
+
+    slack = timedelta(days=settings.eodc_bulk_window_slack_days)
+    groups: list[list[int]] = []
+    for members in components.values():
+        members.sort(key=lambda i: bodies[i]["datetime"])
+        current: list[int] = []
+        group_start: datetime | None = None
+        for index in members:
+            start, end = (_parse_datetime(v) for v in bodies[index]["datetime"].split("/"))
+            if current and group_start is not None and end - group_start > (end - start) + slack:
+                groups.append(current)
+                current = []
+            if not current:
+                group_start = start
+            current.append(index)
+        if current:
+            groups.append(current)
+    return groups
+
+
+async def _search_group(
+    bodies: list[dict[str, Any]],
+    geometries: list[shapely.Geometry],
+    group: list[int],
+    client: httpx.AsyncClient,
+) -> tuple[list[dict[str, Any]], bool]:
+    """Fetch every feature for ``group``; the flag is ``False`` if the page cap was hit."""
+
+    settings = get_settings()
+    union = shapely.union_all([geometries[i] for i in group])
+    if len(shapely.get_coordinates(union)) > _MAX_UNION_VERTICES:
+        union = union.envelope
+    windows = [bodies[i]["datetime"].split("/") for i in group]
+    body = {
+        **bodies[group[0]],
+        "intersects": mapping(union),
+        "datetime": f"{min(w[0] for w in windows)}/{max(w[1] for w in windows)}",
+        "limit": _BULK_PAGE_SIZE,
+    }
+    request: _Request | None = ("POST", f"{settings.eodc_stac_api.rstrip('/')}/search", body)
+    features: list[dict[str, Any]] = []
+    pages = 0
+    while request is not None:
+        if pages >= settings.eodc_max_pages:
+            return features, False
+        page, request = await _fetch_page(client, *request)
+        features.extend(page)
+        pages += 1
+    return features, True
+
+
+def _assign_features(
+    bodies: list[dict[str, Any]],
+    geometries: list[shapely.Geometry],
+    features: list[dict[str, Any]],
+    limit: int,
+) -> list[list[dict[str, Any]]]:
+    """Return, per alert, the newest ``limit`` features intersecting its AOI and window."""
+
+    assigned: list[list[dict[str, Any]]] = [[] for _ in bodies]
+    footprints = [_feature_footprint(feature) for feature in features]
+    indexed = [i for i, footprint in enumerate(footprints) if footprint is not None]
+    if not indexed:
+        return assigned
+
+    tree = shapely.STRtree([footprints[i] for i in indexed])
+    alert_hits, feature_hits = tree.query(geometries, predicate="intersects")
+    when = {
+        i: _format_datetime(_parse_datetime(features[i]["properties"]["datetime"]))
+        for i in set(indexed[j] for j in feature_hits.tolist())
+        if features[i].get("properties", {}).get("datetime")
+    }
+    candidates: list[list[int]] = [[] for _ in bodies]
+    for alert_index, hit in zip(alert_hits.tolist(), feature_hits.tolist(), strict=True):
+        feature_index = indexed[hit]
+        start, end = bodies[alert_index]["datetime"].split("/")
+        if feature_index in when and start <= when[feature_index] <= end:
+            candidates[alert_index].append(feature_index)
+    for alert_index, feature_indices in enumerate(candidates):
+        feature_indices.sort(key=lambda i: when[i], reverse=True)
+        assigned[alert_index] = [features[i] for i in feature_indices[:limit]]
+    return assigned
+
+
+def _feature_footprint(feature: dict[str, Any]) -> shapely.Geometry | None:
+    if feature.get("geometry"):
+        return shape(feature["geometry"])
+    bounds = _feature_bounds(feature)
+    return shapely.box(*bounds) if bounds is not None else None
+
+
+async def aclose_shared_client() -> None:
+    """Close the keep-alive search client bound to the running event loop."""
+
+    client = _SHARED_CLIENTS.pop(asyncio.get_running_loop(), None)
+    if client is not None:
+        await client.aclose()
+
+
+_SHARED_CLIENTS: weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, httpx.AsyncClient] = (
+    weakref.WeakKeyDictionary()
+)
+
+
+def _shared_client() -> httpx.AsyncClient:
+    """Return a keep-alive client for the running loop so pages reuse connections."""
+
+    loop = asyncio.get_running_loop()
+    client = _SHARED_CLIENTS.get(loop)
+    if client is None or client.is_closed:
+        client = httpx.AsyncClient(
+            timeout=30.0,
+            limits=httpx.Limits(
+                max_connections=8, max_keepalive_connections=4, keepalive_expiry=60.0
+            ),
+        )
+        _SHARED_CLIENTS[loop] = client
+    return client
+
+
+def _search_body(alert: LoadedAlert, limit: int, days_after: int) -> dict[str, Any]:
+    settings = get_settings()
+    issued = _parse_datetime(alert.model.issued)
+    start = _format_datetime(_floor_hour(issued - timedelta(days=settings.eodc_days_lookback)))
+    end = _format_datetime(_ceil_hour(issued + timedelta(days=days_after)))
+    return {
         "collections": [settings.eodc_collection],
-        "intersects": alert.model.area_of_interest,
-        "limit": limit or settings.eodc_results_limit,
+        "intersects": alert.geometry.search_geojson,
+        "limit": limit,
         "datetime": f"{start}/{end}",
         "query": {
             "eo:cloud_cover": {"lt": settings.eodc_cloud_cover},
@@ -88,64 +888,230 @@ async def fetch_eodc_scenes(
         ],
     }
 
-    close_client = False
-    if client is None:
-        client = httpx.AsyncClient(timeout=30.0)
-        close_client = True
 
-    try:
-        response = await client.post(
-            f"{settings.eodc_stac_api.rstrip('/')}/search", json=body
-        )
-        response.raise_for_status()
-    except Exception as exc:  # pragma: no cover - network issues handled gracefully
-        LOGGER.warning("Unable to fetch EODC scenes: %s", exc)
-        return []
-    finally:
-        if close_client:
-            await client.aclose()
+async def _search_features(
+    body: dict[str, Any], client: httpx.AsyncClient | None
+) -> list[dict[str, Any]]:
+    settings = get_settings()
+    client = client or _shared_client()
+    request: _Request | None = (
+        "POST",
+        f"{settings.eodc_stac_api.rstrip('/')}/search",
+        body,
+    )
+    features: list[dict[str, Any]] = []
+    pages = 0
+    while request is not None and pages < settings.eodc_max_pages:
+        page, request = await _fetch_page(client, *request)
+        features.extend(page)
+        pages += 1
+        if not page or len(features) >= body["limit"]:
+            break
+    return features[: body["limit"]]
 
-    scenes: list[SceneSummary] = []
-    for feature in response.json().get("features", []):
-        assets: dict[str, Any] = feature.get("assets", {})
-        zarr_href = _select_zarr_asset(assets, settings.eodc_zarr_asset_keys)
-        if not zarr_href:
-            continue
-        preview = (
-            assets.get("thumbnail")
-            or assets.get("overview")
-            or assets.get("preview")
-            or {}
-        ).get("href")
-        data_asset = (
-            assets.get("visual") or assets.get("true_color") or assets.get("B04")
-        )
-        data_href = (data_asset or {}).get("href")
-
-        stac_href = _find_self_href(feature.get("links", []))
-        if not stac_href:
-            stac_href = (
-                f"{settings.eodc_stac_api.rstrip('/')}/collections/"
-                f"{feature.get('collection', settings.eodc_collection)}/items/"
-                f"{feature.get('id', 'unknown')}"
-            )
 
-        scenes.append(
-            SceneSummary(
-                id=feature.get("id", "unknown"),
-                collection=feature.get("collection", settings.eodc_collection),
-                datetime=feature.get("properties", {}).get(
-                    "datetime", issued.isoformat()
-                ),
-                cloud_cover=feature.get("properties", {}).get("eo:cloud_cover"),
-                preview_href=preview,
-                data_href=data_href,
-                stac_item_href=stac_href,
-                zarr_href=zarr_href,
+async def _indexed_features(
+    index: SceneIndex, body: dict[str, Any], client: httpx.AsyncClient | None
+) -> list[dict[str, Any]] | None:
+    """Answer ``body`` from ``index``, syncing it first when needed.
+
+    Returns ``None`` when the index holds no coverage for the search and a
+    sync could not complete, so the caller falls back to the live API.
+    """
+
+    settings = get_settings()
+    collection = body["collections"][0]
+    start, end = body["datetime"].split("/")
+    bounds = shape(body["intersects"]).bounds
+    now = time.time()
+
+    coverage = await asyncio.to_thread(index.coverage, collection, bounds, start)
+    fresh = (
+        coverage is not None
+        and now - coverage.synced_at <= settings.eodc_index_max_age_seconds
+        and coverage.end >= min(end, _format_timestamp(coverage.synced_at))
+    )
+    if not fresh:
+        sync_end = min(end, _format_timestamp(now))
+        if coverage is None:
+            sync_bounds, sync_start = bounds, start
+        else:
+            # Delta sync from just before the covered window ends; late-ingested
+            # items can carry acquisition times slightly older than the last sync.
+            sync_bounds = coverage.bounds
+            sync_start = _format_datetime(_parse_datetime(coverage.end) - _INDEX_SYNC_OVERLAP)
+        try:
+            complete = await _sync_index(
+                index, collection, sync_bounds, sync_start, sync_end, client
+            )
+        except Exception as exc:
+            LOGGER.warning("Unable to sync the EODC scene index: %s", exc)
+            complete = False
+        if complete:
+            await asyncio.to_thread(
+                index.record_sync,
+                collection,
+                sync_bounds,
+                sync_start,
+                sync_end,
+                now,
+                extends=coverage,
             )
+        elif coverage is None:
+            return None
+        else:
+            LOGGER.warning("Answering EODC search from a stale scene index")
+
+    cloud = body.get("query", {}).get("eo:cloud_cover", {}).get("lt")
+    return await asyncio.to_thread(
+        index.search,
+        collection,
+        body["intersects"],
+        start,
+        end,
+        max_cloud_cover=cloud,
+        limit=body["limit"],
+    )
+
+
+async def _sync_index(
+    index: SceneIndex,
+    collection: str,
+    bounds: tuple[float, float, float, float],
+    start: str,
+    end: str,
+    client: httpx.AsyncClient | None,
+) -> bool:
+    """Page every item in the extent into ``index``; ``False`` if the page cap cut it short."""
+
+    settings = get_settings()
+    client = client or _shared_client()
+    request: _Request | None = (
+        "POST",
+        f"{settings.eodc_stac_api.rstrip('/')}/search",
+        {
+            "collections": [collection],
+            "bbox": list(bounds),
+            "datetime": f"{start}/{end}",
+            "limit": settings.eodc_index_sync_page_size,
+        },
+    )
+    pages = stored = 0
+    while request is not None:
+        if pages >= settings.eodc_index_sync_max_pages:
+            LOGGER.info("EODC index sync stopped after %s pages", pages)
+            return False
+        features, request = await _fetch_page(client, *request)
+        stored += await asyncio.to_thread(index.upsert, features)
+        pages += 1
+    LOGGER.info("Synced %s EODC item(s) into the scene index (%s to %s)", stored, start, end)
+    return True
+
+
+def _format_timestamp(value: float) -> str:
+    return _format_datetime(datetime.fromtimestamp(value, timezone.utc))
+
+
+def _feature_bounds(feature: dict[str, Any]) -> tuple[float, float, float, float] | None:
+    bbox = feature.get("bbox")
+    if bbox and len(bbox) >= 4:
+        if len(bbox) == 6:
+            return bbox[0], bbox[1], bbox[3], bbox[4]
+        return tuple(bbox[:4])
+    geometry = feature.get("geometry")
+    if geometry:
+        return shape(geometry).bounds
+    return None
+
+
+async def _fetch_page(
+    client: httpx.AsyncClient, method: str, url: str, body: dict[str, Any] | None
+) -> _Page:
+    if method == "POST":
+        response = await client.post(url, json=body)
+    else:
+        response = await client.get(url)
+    response.raise_for_status()
+    document = response.json()
+    return list(document.get("features", [])), _next_request(document.get("links", []), body)
+
+
+def _next_request(links: list[dict[str, Any]], body: dict[str, Any] | None) -> _Request | None:
+    """Translate a STAC API ``next`` link into the request that fetches it."""
+
+    for link in links:
+        if link.get("rel") != "next" or not link.get("href"):
+            continue
+        if str(link.get("method", "GET")).upper() != "POST":
+            return "GET", link["href"], body
+        next_body = link.get("body")
+        if next_body is None:
+            next_body = body
+        elif link.get("merge") and body is not None:
+            next_body = {**body, **next_body}
+        return "POST", link["href"], next_body
+    return None
+
+
+def _scene_from_feature(feature: dict[str, Any], issued: datetime) -> SceneSummary | None:
+    settings = get_settings()
+    assets: dict[str, Any] = feature.get("assets", {})
+    zarr_href = _select_zarr_asset(assets, settings.eodc_zarr_asset_keys)
+    if not zarr_href:
+        return None
+    preview = (
+        assets.get("thumbnail")
+        or assets.get("overview")
+        or assets.get("preview")
+        or {}
+    ).get("href")
+    data_asset = (
+        assets.get("visual") or assets.get("true_color") or assets.get("B04")
+    )
+    data_href = (data_asset or {}).get("href")
+
+    stac_href = _find_self_href(feature.get("links", []))
+    if not stac_href:
+        stac_href = (
+            f"{settings.eodc_stac_api.rstrip('/')}/collections/"
+            f"{feature.get('collection', settings.eodc_collection)}/items/"
+            f"{feature.get('id', 'unknown')}"
         )
 
-    return scenes
+    properties = feature.get("properties", {})
+    return SceneSummary(
+        id=feature.get("id", "unknown"),
+        collection=feature.get("collection", settings.eodc_collection),
+        datetime=properties.get("datetime", issued.isoformat()),
+        cloud_cover=properties.get("eo:cloud_cover"),
+        preview_href=preview,
+        data_href=data_href,
+        stac_item_href=stac_href,
+        zarr_href=zarr_href,
+        bbox=feature.get("bbox"),
+        epsg=_feature_epsg(properties),
+        tile_id=properties.get("s2:mgrs_tile") or properties.get("grid:code"),
+    )
+
+
+def _feature_epsg(properties: dict[str, Any]) -> int | None:
+    """EPSG code from STAC projection v1 ``proj:epsg`` or v2 ``proj:code``."""
+
+    if properties.get("proj:epsg") is not None:
+        return int(properties["proj:epsg"])
+    code = properties.get("proj:code")
+    if isinstance(code, str) and code.upper().startswith("EPSG:"):
+        return int(code.split(":", 1)[1])
+    return None
+
+
+def _floor_hour(value: datetime) -> datetime:
+    return value.replace(minute=0, second=0, microsecond=0)
+
+
+def _ceil_hour(value: datetime) -> datetime:
+    floored = _floor_hour(value)
+    return floored if floored == value else floored + timedelta(hours=1)
 
 
 def _select_zarr_asset(assets: dict[str, Any], priorities: list[str]) -> str | None:
@@ -12,12 +12,14 @@ from rich.console import Console
 from rich.table import Table
 
 from .alerts import load_alert
+from .catalog import aclose_shared_client
 from .events import publish_alert_event
-from .geozarr import ConversionMode, convert_alert
+from .geozarr import ConversionMode
 from .logging_utils import configure_logging
+from .pipeline import run_pipeline
 from .reporting import RunReporter
+from .s3 import close_s3_clients
 from .settings import get_settings
-from .stac import create_stac_item
 
 configure_logging()
 LOGGER = logging.getLogger(__name__)
@@ -31,53 +33,63 @@ async def orchestrate(
     no_scene_search: bool = False,
     report_dir: Path | None = None,
     conversion_mode: ConversionMode = "auto",
+    temporal_cube: bool = False,
+    viewer_warmup: bool | None = None,
+    trace_file: Path | None = None,
 ) -> None:
     settings = get_settings()
     reporter = RunReporter(run_id=run_id)
     reporter.start_run()
 
-    alert = load_alert(alert_path)
+    with reporter.span("alert_load"):
+        alert = load_alert(alert_path)
     reporter.record_alert(alert)
     CONSOLE.print(
         f"Loaded alert [bold]{alert.id}[/bold] for hazard [green]{hazard}[/green]"
     )
 
-    await publish_alert_event(alert)
+    async with reporter.span("event_publish"):
+        await publish_alert_event(alert)
     reporter.record_event_publish()
     CONSOLE.print("Published alert to RabbitMQ")
 
     report_path: Path | None = None
     try:
-        geozarr_output = await convert_alert(
+        result = await run_pipeline(
             alert,
+            reporter,
             include_scene_search=not no_scene_search,
             mode=conversion_mode,
+            temporal_cube=temporal_cube,
+            viewer_warmup=viewer_warmup,
         )
-        reporter.record_conversion(geozarr_output)
-        artifact = (
-            "GeoZarr" if geozarr_output.key.endswith(".zarr") else "placeholder JSON"
-        )
-        CONSOLE.print(f"Wrote {artifact} artefact to {geozarr_output.s3_uri}")
-        scene_count = len(geozarr_output.scenes)
-        if scene_count:
-            scene_ids = ", ".join(scene.id for scene in geozarr_output.scenes)
-            CONSOLE.print(
-                f"Found {scene_count} Sentinel scene(s) intersecting the AOI: {scene_ids}"
-            )
-        else:
-            CONSOLE.print("No Sentinel-2 scenes matched the EODC search criteria")
-
-        stac_item = await create_stac_item(alert, geozarr_output)
-        reporter.record_stac_item(stac_item)
-        CONSOLE.print(f"Created STAC Item: {stac_item['id']}")
     except RuntimeError as exc:
-        reporter.status = "failed"
         raise SystemExit(str(exc)) from exc
     finally:
+        await aclose_shared_client()
+        await close_s3_clients()
         reporter.finish_run()
         reporter.emit_metrics(Path(settings.metrics_path))
         if report_dir is not None:
             report_path = reporter.persist(report_dir)
+        if trace_file is not None:
+            reporter.export_chrome_trace(trace_file)
+
+    geozarr_output = result.output
+    artifact = "GeoZarr" if geozarr_output.key.endswith(".zarr") else "placeholder JSON"
+    CONSOLE.print(f"Wrote {artifact} artefact to {geozarr_output.s3_uri}")
+    scene_count = len(geozarr_output.scenes)
+    if scene_count:
+        scene_ids = ", ".join(scene.id for scene in geozarr_output.scenes)
+        CONSOLE.print(f"Found {scene_count} Sentinel scene(s) intersecting the AOI: {scene_ids}")
+    else:
+        CONSOLE.print("No Sentinel-2 scenes matched the EODC search criteria")
+    CONSOLE.print(f"Created STAC Item: {result.stac_item['id']}")
+    if result.warmup is not None:
+        CONSOLE.print(
+            f"Warmed viewer with {len(result.warmup.requests)} request(s) "
+            f"in {result.warmup.duration_seconds:.1f}s"
+        )
 
     CONSOLE.print("[bold green]Pipeline completed successfully[/bold green]")
 
@@ -95,6 +107,8 @@ async def orchestrate(
     CONSOLE.print(table)
     if report_path is not None:
         CONSOLE.print(f"Saved run summary to [cyan]{report_path}[/cyan]")
+    if trace_file is not None:
+        CONSOLE.print(f"Saved stage trace to [cyan]{trace_file}[/cyan]")
 
 
 @click.command()
@@ -129,10 +143,31 @@ async def orchestrate(
 )
 @click.option(
     "--conversion-mode",
-    type=click.Choice(["auto", "real", "simulate"], case_sensitive=False),
+    type=click.Choice(["auto", "real", "simulate", "synthetic"], case_sensitive=False),
     default="auto",
     show_default=True,
-    help="auto uses real conversion when enabled, otherwise simulate",
+    help="auto uses real conversion when enabled, otherwise simulate; synthetic writes "
+    "a generated scene sized to the AOI",
+)
+@click.option(
+    "--temporal-cube",
+    is_flag=True,
+    default=False,
+    help="Stack the best pre-event and post-event scenes into one time-series store",
+)
+@click.option(
+    "--warm-viewer/--no-warm-viewer",
+    "viewer_warmup",
+    default=None,
+    help="Prime TiTiler with info, TileJSON and low-zoom AOI tiles after publishing "
+    "(defaults to VIEWER_WARMUP_ENABLED)",
+)
+@click.option(
+    "--trace-file",
+    type=click.Path(path_type=Path),
+    default=None,
+    help="Write per-stage timing spans as Chrome trace-event JSON "
+    "(open in chrome://tracing or ui.perfetto.dev)",
 )
 def main(
     alert_relative: str,
@@ -142,6 +177,9 @@ def main(
     no_scene_search: bool,
     report_dir: Path | None,
     conversion_mode: ConversionMode,
+    temporal_cube: bool,
+    viewer_warmup: bool | None,
+    trace_file: Path | None,
 ) -> None:
     data_root = project_root / "data" / "sample_alerts"
     alert_path = data_root / alert_relative
@@ -159,6 +197,9 @@ def main(
             no_scene_search=no_scene_search,
             report_dir=target_report_dir,
             conversion_mode=conversion_mode,
+            temporal_cube=temporal_cube,
+            viewer_warmup=viewer_warmup,
+            trace_file=trace_file,
         )
     )
 
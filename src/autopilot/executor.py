@@ -0,0 +1,321 @@
+"""Memory-budgeted execution of GeoZarr conversions."""
+
+from __future__ import annotations
+
+import asyncio
+import logging
+import os
+import resource
+import threading
+from collections.abc import Callable
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Any, TypeVar
+
+import dask
+
+try:
+    import psutil  # type: ignore
+except ImportError:  # pragma: no cover
+    psutil = None  # type: ignore
+
+from .reporting import span
+from .settings import Settings, get_settings
+
+LOGGER = logging.getLogger(__name__)
+
+T = TypeVar("T")
+
+_BYTES_PER_MB = 1024 * 1024
+# Output variables are written as float64, and dask holds the source chunk and
+# its encoded copy while a task runs.
+_BYTES_PER_PIXEL = 8
+_CHUNK_COPIES = 2
+# GeoZarr writes take their S3 credentials from the AWS_* environment variables
+# (eopf_geozarr's create_geozarr_dataset accepts no storage options), and a
+# finishing conversion restores them under any other still writing. Until writes
+# get per-call credentials, one process converts one alert at a time; scale out
+# with worker pool processes instead.
+MAX_IN_PROCESS_CONCURRENCY = 1
+
+__all__ = [
+    "MAX_IN_PROCESS_CONCURRENCY",
+    "ConversionExecutor",
+    "admits",
+    "configure_conversion_executor",
+    "estimate_working_set",
+    "get_conversion_executor",
+]
+
+
+def estimate_working_set(settings: Settings) -> int:
+    """Project the peak bytes a single conversion keeps resident."""
+
+    if settings.converter_working_set_mb:
+        return settings.converter_working_set_mb * _BYTES_PER_MB
+    chunk_bytes = settings.converter_spatial_chunk**2 * _BYTES_PER_PIXEL
+    groups = max(len(settings.converter_groups), 1)
+    return chunk_bytes * _CHUNK_COPIES * settings.converter_dask_workers * groups
+
+
+def admits(
+    projected_bytes: int,
+    *,
+    reserved_bytes: int,
+    active: int,
+    budget_bytes: int,
+    max_concurrency: int,
+) -> bool:
+    """Whether a job projecting ``projected_bytes`` may start next to ``active`` others.
+
+    An idle executor always admits, so a job larger than the budget runs alone.
+    """
+
+    if active == 0:
+        return True
+    if active >= max_concurrency:
+        return False
+    return reserved_bytes + projected_bytes <= budget_bytes
+
+
+class ConversionExecutor:
+    """Admit conversions while their projected working set fits the memory budget."""
+
+    def __init__(
+        self,
+        budget_bytes: int,
+        max_concurrency: int,
+        scheduler: str = "threads",
+        workers: int = 4,
+        spill_dir: Path | None = None,
+    ) -> None:
+        if budget_bytes <= 0:
+            raise ValueError("budget_bytes must be positive")
+        if max_concurrency < 1:
+            raise ValueError("max_concurrency must be at least 1")
+        self.budget_bytes = budget_bytes
+        self.max_concurrency = max_concurrency
+        self.scheduler = scheduler
+        self.workers = workers
+        self.spill_dir = spill_dir
+        self._condition = threading.Condition()
+        self._reserved = 0
+        self._active = 0
+        self._client = None
+        self._dask_configured = False
+
+    @classmethod
+    def from_settings(
+        cls,
+        settings: Settings,
+        *,
+        budget_bytes: int | None = None,
+        max_concurrency: int | None = None,
+    ) -> "ConversionExecutor":
+        requested = max_concurrency or settings.converter_max_concurrency
+        if requested > MAX_IN_PROCESS_CONCURRENCY:
+            LOGGER.warning(
+                "CONVERTER_MAX_CONCURRENCY=%s capped at %s: concurrent GeoZarr writes in "
+                "one process would overwrite each other's S3 credentials",
+                requested,
+                MAX_IN_PROCESS_CONCURRENCY,
+            )
+        return cls(
+            budget_bytes=budget_bytes or settings.converter_memory_budget_mb * _BYTES_PER_MB,
+            max_concurrency=min(requested, MAX_IN_PROCESS_CONCURRENCY),
+            scheduler=settings.converter_dask_scheduler,
+            workers=settings.converter_dask_workers,
+            spill_dir=Path(settings.converter_spill_dir),
+        )
+
+    @property
+    def reserved_bytes(self) -> int:
+        return self._reserved
+
+    @property
+    def active(self) -> int:
+        return self._active
+
+    async def run(
+        self, func: Callable[..., T], *args: Any, projected_bytes: int
+    ) -> tuple[T, int]:
+        """Run ``func`` in a worker thread; return its result and the process peak RSS.
+
+        The RSS is sampled for the whole process while ``func`` runs, so it includes
+        any conversions admitted alongside it and is only a per-run figure when
+        ``max_concurrency`` is 1.
+        """
+
+        return await asyncio.to_thread(self._run_blocking, func, args, projected_bytes)
+
+    def _run_blocking(
+        self, func: Callable[..., T], args: tuple[Any, ...], projected_bytes: int
+    ) -> tuple[T, int]:
+        self._configure_dask()
+        with self._admitted(projected_bytes):
+            sampler = _PeakRSSSampler()
+            sampler.start()
+            try:
+                with span("convert", function=func.__name__):
+                    result = func(*args)
+            finally:
+                sampler.stop()
+        return result, sampler.peak_bytes
+
+    @contextmanager
+    def _admitted(self, projected_bytes: int):
+        if projected_bytes > self.budget_bytes:
+            LOGGER.warning(
+                "Projected working set %s exceeds memory budget %s; running alone",
+                projected_bytes,
+                self.budget_bytes,
+            )
+        with span("admission_wait", projected_bytes=projected_bytes), self._condition:
+            self._condition.wait_for(lambda: self._fits(projected_bytes))
+            self._reserved += projected_bytes
+            self._active += 1
+        try:
+            yield
+        finally:
+            with self._condition:
+                self._reserved -= projected_bytes
+                self._active -= 1
+                self._condition.notify_all()
+
+    def _fits(self, projected_bytes: int) -> bool:
+        return admits(
+            projected_bytes,
+            reserved_bytes=self._reserved,
+            active=self._active,
+            budget_bytes=self.budget_bytes,
+            max_concurrency=self.max_concurrency,
+        )
+
+    def _configure_dask(self) -> None:
+        """Apply the scheduler config once, process-wide, before the first conversion.
+
+        ``dask.config.set`` mutates global state, so entering it per conversion from
+        worker threads would let overlapping runs restore each other's settings.
+        """
+
+        with self._condition:
+            if self._dask_configured:
+                return
+            config: dict[str, Any] = {}
+            if self.spill_dir is not None:
+                self.spill_dir.mkdir(parents=True, exist_ok=True)
+                config["temporary_directory"] = str(self.spill_dir)
+            if self.scheduler == "distributed":
+                config["scheduler"] = self._distributed_client()
+            else:
+                config["scheduler"] = "threads"
+                config["num_workers"] = self.workers
+            dask.config.set(config)
+            self._dask_configured = True
+
+    def _distributed_client(self):
+        with self._condition:
+            if self._client is not None:
+                return self._client
+            try:
+                from distributed import Client, LocalCluster
+            except ImportError as exc:  # pragma: no cover
+                raise RuntimeError(
+                    "converter_dask_scheduler=distributed requires the distributed package: "
+                    "pip install 'alertzarr[executor]'"
+                ) from exc
+
+            with dask.config.set(
+                {
+                    "distributed.worker.memory.target": 0.6,
+                    "distributed.worker.memory.spill": 0.7,
+                    "distributed.worker.memory.pause": 0.85,
+                    "distributed.worker.memory.terminate": False,
+                }
+            ):
+                cluster = LocalCluster(
+                    n_workers=1,
+                    threads_per_worker=self.workers,
+                    processes=False,
+                    memory_limit=self.budget_bytes,
+                    local_directory=str(self.spill_dir) if self.spill_dir else None,
+                    dashboard_address=None,
+                )
+            self._client = Client(cluster, set_as_default=False)
+            return self._client
+
+    def close(self) -> None:
+        if self._client is not None:
+            cluster = self._client.cluster
+            self._client.close()
+            cluster.close()
+            self._client = None
+            self._dask_configured = False
+
+
+_EXECUTOR: ConversionExecutor | None = None
+_EXECUTOR_LOCK = threading.Lock()
+
+
+def get_conversion_executor() -> ConversionExecutor:
+    """Process-wide executor, built from the settings on first use."""
+
+    global _EXECUTOR
+    with _EXECUTOR_LOCK:
+        if _EXECUTOR is None:
+            _EXECUTOR = ConversionExecutor.from_settings(get_settings())
+        return _EXECUTOR
+
+
+def configure_conversion_executor(
+    *, budget_bytes: int | None = None, max_concurrency: int | None = None
+) -> ConversionExecutor:
+    """Replace the process-wide executor with one using explicit limits.
+
+    Worker pool processes call this at start-up: the pool has already reserved
+    each job's memory against the whole budget, and a process runs one job at a time.
+    """
+
+    global _EXECUTOR
+    executor = ConversionExecutor.from_settings(
+        get_settings(), budget_bytes=budget_bytes, max_concurrency=max_concurrency
+    )
+    with _EXECUTOR_LOCK:
+        previous, _EXECUTOR = _EXECUTOR, executor
+    if previous is not None:
+        previous.close()
+    return executor
+
+
+class _PeakRSSSampler:
+    """Poll the resident set size of the whole process on a background thread."""
+
+    def __init__(self, interval_seconds: float = 0.1) -> None:
+        self.interval_seconds = interval_seconds
+        self.peak_bytes = _current_rss()
+        self._stop = threading.Event()
+        self._thread = threading.Thread(target=self._poll, daemon=True)
+
+    def start(self) -> None:
+        self._thread.start()
+
+    def stop(self) -> None:
+        self._stop.set()
+        self._thread.join()
+        self.peak_bytes = max(self.peak_bytes, _current_rss())
+
+    def _poll(self) -> None:
+        while not self._stop.wait(self.interval_seconds):
+            self.peak_bytes = max(self.peak_bytes, _current_rss())
+
+
+def _current_rss() -> int:
+    if psutil is not None:
+        return int(psutil.Process(os.getpid()).memory_info().rss)
+    try:
+        with open("/proc/self/statm", encoding="ascii") as fp:
+            pages = int(fp.read().split()[1])
+        return pages * os.sysconf("SC_PAGE_SIZE")
+    except (OSError, ValueError, IndexError):  # pragma: no cover - non-Linux fallback
+        # ru_maxrss is the lifetime high-water mark (KiB on Linux, bytes on macOS).
+        return int(resource.getrusage(resource.RUSAGE_SELF).ru_maxrss) * 1024
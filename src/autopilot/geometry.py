@@ -0,0 +1,141 @@
+"""Alert AOI geometry parsed, repaired and measured once per alert."""
+
+from __future__ import annotations
+
+import logging
+from collections.abc import Mapping
+from functools import cached_property
+from typing import Any
+
+import shapely
+from pyproj import Geod
+from shapely.geometry import mapping, shape
+
+LOGGER = logging.getLogger(__name__)
+
+GEOD = Geod(ellps="WGS84")
+
+__all__ = [
+    "AlertGeometry",
+    "alert_geometry",
+    "geodesic_area_km2",
+]
+
+
+class AlertGeometry:
+    """Validated alert AOI with its bbox, geodesic area and search footprint cached.
+
+    Invalid input is repaired with ``make_valid`` (keeping the polygonal parts
+    when there are any). The search footprint is simplified and then buffered
+    by the same tolerance, so it always covers the original AOI; the tolerance
+    doubles until the footprint has at most ``max_vertices``.
+    """
+
+    def __init__(
+        self,
+        geojson: Mapping[str, Any] | None,
+        *,
+        simplify_tolerance: float = 0.001,
+        max_vertices: int = 500,
+    ) -> None:
+        self.geojson = dict(geojson or {})
+        self.simplify_tolerance = simplify_tolerance
+        self.max_vertices = max_vertices
+        self._repaired = False
+
+    @cached_property
+    def geometry(self) -> shapely.Geometry:
+        if not self.geojson:
+            return shapely.Polygon()
+        geom = shape(self.geojson)
+        if geom.is_valid:
+            return geom
+        repaired = shapely.make_valid(geom)
+        polygons = shapely.get_parts(repaired)
+        polygons = [part for part in polygons if part.geom_type in ("Polygon", "MultiPolygon")]
+        if polygons:
+            repaired = shapely.union_all(polygons)
+        LOGGER.info("Repaired invalid AOI geometry (%s)", shapely.is_valid_reason(geom))
+        self._repaired = True
+        return repaired
+
+    @cached_property
+    def prepared(self) -> shapely.Geometry:
+        """``geometry`` prepared in place for repeated predicate checks."""
+
+        shapely.prepare(self.geometry)
+        return self.geometry
+
+    @property
+    def repaired(self) -> bool:
+        """Whether the input was invalid and ``geometry`` is its repaired form."""
+
+        return self.geometry is not None and self._repaired
+
+    @property
+    def is_empty(self) -> bool:
+        return self.geometry.is_empty
+
+    @cached_property
+    def repaired_geojson(self) -> dict[str, Any]:
+        """The input GeoJSON when valid, otherwise the repaired geometry."""
+
+        if self.is_empty or not self.repaired:
+            return self.geojson
+        return mapping(self.geometry)
+
+    @cached_property
+    def bounds(self) -> tuple[float, float, float, float] | None:
+        if self.is_empty:
+            return None
+        return tuple(self.geometry.bounds)
+
+    @cached_property
+    def area_km2(self) -> float | None:
+        if self.is_empty:
+            return None
+        return geodesic_area_km2(self.geometry)
+
+    @cached_property
+    def vertex_count(self) -> int:
+        return int(shapely.get_num_coordinates(self.geometry))
+
+    @cached_property
+    def search_footprint(self) -> shapely.Geometry:
+        geom = self.geometry
+        if self.is_empty or self.vertex_count <= self.max_vertices:
+            return geom
+        if geom.geom_type not in ("Polygon", "MultiPolygon"):
+            return geom.envelope
+        tolerance = self.simplify_tolerance
+        while True:
+            footprint = geom.simplify(tolerance).buffer(tolerance, join_style="mitre")
+            if shapely.get_num_coordinates(footprint) <= self.max_vertices or tolerance > 1:
+                break
+            tolerance *= 2
+        if shapely.get_num_coordinates(footprint) > self.max_vertices:
+            footprint = geom.envelope
+        return footprint
+
+    @cached_property
+    def search_geojson(self) -> dict[str, Any]:
+        """GeoJSON for STAC ``intersects`` bodies; the input itself when already small."""
+
+        if self.search_footprint is self.geometry:
+            return self.repaired_geojson
+        return mapping(self.search_footprint)
+
+
+def geodesic_area_km2(geometry: shapely.Geometry | Mapping[str, Any]) -> float:
+    geom = geometry if isinstance(geometry, shapely.Geometry) else shape(geometry)
+    area, _ = GEOD.geometry_area_perimeter(geom)
+    return round(abs(area) / 1_000_000, 2)
+
+
+def alert_geometry(alert: Any) -> AlertGeometry:
+    """Return ``alert.geometry``, wrapping the raw AOI for alert-like objects without one."""
+
+    geometry = getattr(alert, "geometry", None)
+    if isinstance(geometry, AlertGeometry):
+        return geometry
+    return AlertGeometry(getattr(alert.model, "area_of_interest", None))
@@ -7,21 +7,40 @@ import json
 import logging
 import os
 import re
+import shutil
 import time
+import zlib
 from contextlib import contextmanager
 from dataclasses import dataclass, field
 from datetime import datetime, timezone
+from functools import lru_cache
+from pathlib import Path
 from typing import Literal
 
-import boto3
 import xarray as xr
-from aiobotocore.session import get_session
+import zarr
 from eopf_geozarr import create_geozarr_dataset
-from eopf_geozarr.conversion.fs_utils import get_storage_options
+from eopf_geozarr.conversion.fs_utils import get_storage_options, open_zarr_group
 
 from .alerts import LoadedAlert
-from .catalog import SceneSummary, fetch_eodc_scenes
-from .settings import get_settings
+from .catalog import SceneSummary, fetch_eodc_scenes, iter_eodc_scenes
+from .executor import estimate_working_set, get_conversion_executor
+from .lineage import (
+    MANIFEST_SUFFIX,
+    LineageManifest,
+    alert_lineage_id,
+    load_manifest,
+    plan_incremental_update,
+    update_manifest,
+)
+from .processors import apply_hazard_processors
+from .profiles import resolve_conversion_settings
+from .quicklook import encode_image, render_quicklook, render_tiles, tile_set_for_bbox
+from .reporting import span
+from .s3 import get_s3_manager
+from .settings import Settings, get_settings
+from .synthetic import SENTINEL2_GROUPS, build_synthetic_datatree, synthetic_grid_for_aoi
+from .temporal import build_temporal_cube, scene_datetime, select_pre_post_scenes
 
 LOGGER = logging.getLogger(__name__)
 
@@ -49,22 +68,51 @@ class ConversionOutput:
     item_id: str | None = None
     scenes: list[SceneSummary] = field(default_factory=list)
     viewer: ViewerLinks | None = None
+    process_peak_rss_bytes: int | None = None
+    hazard_indices: list[str] = field(default_factory=list)
+    time_steps: list[str] = field(default_factory=list)
+    lineage_id: str | None = None
+    profile: str | None = None
+    synthetic: bool = False
+    thumbnail_href: str | None = None
+    overview_href: str | None = None
+    zarr_group: str | None = None
 
 
-ConversionMode = Literal["auto", "real", "simulate"]
+ConversionMode = Literal["auto", "real", "simulate", "synthetic"]
 
 
 async def convert_alert(
     alert: LoadedAlert,
     include_scene_search: bool = True,
     mode: ConversionMode = "auto",
+    temporal_cube: bool = False,
 ) -> ConversionOutput:
-    """Convert an alert to GeoZarr, optionally falling back to a placeholder."""
+    """Convert an alert to GeoZarr, optionally falling back to a placeholder.
+
+    With ``temporal_cube`` the real conversion stacks the best pre-event and
+    post-event scenes into one store with a ``time`` dimension. Real conversions
+    use the conversion profile matching the alert's hazard and AOI area.
+    ``synthetic`` runs the same write path on a generated scene sized to the
+    AOI, without any network access besides the output store.
+    """
 
     settings = get_settings()
+    if mode == "synthetic":
+        settings, profile = resolve_conversion_settings(alert, settings)
+        output = await synthetic_conversion(alert, settings)
+        output.profile = profile
+        return output
     if mode in {"auto", "real"} and settings.real_conversion_enabled:
-        real_output = await _attempt_real_conversion(alert)
+        settings, profile = resolve_conversion_settings(alert, settings)
+        if temporal_cube:
+            real_output = await _attempt_temporal_conversion(alert, settings)
+        elif settings.converter_incremental_updates:
+            real_output = await _attempt_incremental_conversion(alert, settings)
+        else:
+            real_output = await _attempt_real_conversion(alert, settings)
         if real_output is not None:
+            real_output.profile = profile
             return real_output
         if mode == "real":
             raise RuntimeError("Real conversion requested but no scenes were available")
@@ -78,7 +126,6 @@ async def simulate_conversion(
     include_scene_search: bool = True,
 ) -> ConversionOutput:
     start = time.perf_counter()
-    session = get_session()
     settings = get_settings()
 
     collection_source = alert.model.hazard_type or settings.converter_collection
@@ -99,13 +146,8 @@ async def simulate_conversion(
     if scenes:
         payload["source_scenes"] = [scene.as_dict() for scene in scenes]
 
-    async with session.create_client(
-        "s3",
-        endpoint_url=settings.minio_endpoint,
-        aws_access_key_id=settings.minio_access_key,
-        aws_secret_access_key=settings.minio_secret_key,
-        region_name=settings.minio_region,
-    ) as s3:
+    s3 = await get_s3_manager(settings).async_client()
+    async with span("s3_put"):
         await s3.put_object(
             Bucket=settings.geozarr_bucket,
             Key=key,
@@ -128,8 +170,47 @@ async def simulate_conversion(
     )
 
 
-async def _attempt_real_conversion(alert: LoadedAlert) -> ConversionOutput | None:
-    settings = get_settings()
+async def synthetic_conversion(alert: LoadedAlert, settings: Settings) -> ConversionOutput:
+    """Write a synthetic multi-resolution scene covering the AOI as GeoZarr.
+
+    The store goes to ``SYNTHETIC_OUTPUT_DIR`` when set, otherwise to the
+    GeoZarr bucket like a real conversion.
+    """
+
+    executor = get_conversion_executor()
+    start = time.perf_counter()
+    written, process_peak_rss_bytes = await executor.run(
+        _convert_synthetic,
+        alert,
+        settings,
+        projected_bytes=estimate_working_set(settings),
+    )
+    duration = time.perf_counter() - start
+    local = settings.synthetic_output_dir is not None
+    viewer = None
+    if not local:
+        viewer = _build_viewer_links(settings, written.collection_id, written.item_id)
+    return ConversionOutput(
+        alert_id=alert.id,
+        bucket="" if local else settings.geozarr_bucket,
+        key=written.key,
+        s3_uri=written.output_uri,
+        bytes_written=written.bytes_written,
+        duration_seconds=duration,
+        collection_id=written.collection_id,
+        item_id=written.item_id,
+        viewer=viewer,
+        process_peak_rss_bytes=process_peak_rss_bytes,
+        hazard_indices=written.hazard_indices,
+        synthetic=True,
+        thumbnail_href=written.thumbnail_href,
+        overview_href=written.overview_href,
+    )
+
+
+async def _attempt_real_conversion(
+    alert: LoadedAlert, settings: Settings
+) -> ConversionOutput | None:
     scenes = await fetch_eodc_scenes(alert)
     candidate_scenes = [scene for scene in scenes if scene.zarr_href]
     if not candidate_scenes:
@@ -137,83 +218,562 @@ async def _attempt_real_conversion(alert: LoadedAlert) -> ConversionOutput | Non
         return None
 
     selected = sorted(candidate_scenes, key=_scene_sort_key, reverse=True)[0]
+    executor = get_conversion_executor()
     start = time.perf_counter()
-    (
-        output_uri,
-        key,
-        bytes_written,
-        collection_id,
-        item_id,
-    ) = await asyncio.to_thread(_convert_scene, alert, selected, settings)
+    written, process_peak_rss_bytes = await executor.run(
+        _convert_scene,
+        alert,
+        selected,
+        settings,
+        projected_bytes=estimate_working_set(settings),
+    )
     duration = time.perf_counter() - start
-    viewer = _build_viewer_links(settings, collection_id, item_id)
+    viewer = _build_viewer_links(settings, written.collection_id, written.item_id)
     return ConversionOutput(
         alert_id=alert.id,
         bucket=settings.geozarr_bucket,
-        key=key,
-        s3_uri=output_uri,
-        bytes_written=bytes_written,
+        key=written.key,
+        s3_uri=written.output_uri,
+        bytes_written=written.bytes_written,
         duration_seconds=duration,
-        collection_id=collection_id,
-        item_id=item_id,
+        collection_id=written.collection_id,
+        item_id=written.item_id,
         scenes=[selected],
         viewer=viewer,
+        process_peak_rss_bytes=process_peak_rss_bytes,
+        hazard_indices=written.hazard_indices,
+        thumbnail_href=written.thumbnail_href,
+        overview_href=written.overview_href,
     )
 
 
+async def _attempt_temporal_conversion(
+    alert: LoadedAlert, settings: Settings
+) -> ConversionOutput | None:
+    issued = _parse_issued(alert)
+
+    def enough(found: list[SceneSummary]) -> bool:
+        # Results arrive newest first, so keep paging until the pre-event side appears.
+        if len(found) < settings.eodc_temporal_results_limit:
+            return False
+        pre, post = select_pre_post_scenes(found, issued)
+        return pre is not None and post is not None
+
+    async with span("scene_search", temporal=True):
+        scenes = [
+            scene
+            async for scene in iter_eodc_scenes(
+                alert,
+                page_size=settings.eodc_temporal_results_limit,
+                days_after=settings.eodc_days_after,
+                stop_when=enough,
+            )
+        ]
+    pre, post = select_pre_post_scenes(scenes, issued)
+    if pre is None or post is None:
+        LOGGER.info("EODC search did not return both a pre-event and a post-event scene")
+        return None
+
+    executor = get_conversion_executor()
+    start = time.perf_counter()
+    written, process_peak_rss_bytes = await executor.run(
+        _convert_temporal_cube,
+        alert,
+        pre,
+        post,
+        settings,
+        projected_bytes=2 * estimate_working_set(settings),
+    )
+    duration = time.perf_counter() - start
+    viewer = _build_viewer_links(settings, written.collection_id, written.item_id)
+    return ConversionOutput(
+        alert_id=alert.id,
+        bucket=settings.geozarr_bucket,
+        key=written.key,
+        s3_uri=written.output_uri,
+        bytes_written=written.bytes_written,
+        duration_seconds=duration,
+        collection_id=written.collection_id,
+        item_id=written.item_id,
+        scenes=[pre, post],
+        viewer=viewer,
+        process_peak_rss_bytes=process_peak_rss_bytes,
+        hazard_indices=written.hazard_indices,
+        time_steps=[pre.datetime, post.datetime],
+    )
+
+
+async def _attempt_incremental_conversion(
+    alert: LoadedAlert, settings: Settings
+) -> ConversionOutput | None:
+    """Convert into the alert lineage's store, writing only scenes it still lacks."""
+
+    scenes = await fetch_eodc_scenes(alert)
+    candidate_scenes = [scene for scene in scenes if scene.zarr_href]
+    lineage_id = alert_lineage_id(alert)
+    key, collection_id, item_id = _output_layout(alert, lineage_id, settings)
+    manifest_key = key.removesuffix(".zarr") + MANIFEST_SUFFIX
+    client = get_s3_manager(settings).sync_client()
+    async with span("lineage_manifest", operation="load"):
+        loaded = await asyncio.to_thread(
+            load_manifest, client, settings.geozarr_bucket, manifest_key
+        )
+    manifest = loaded[0]
+
+    if manifest is None:
+        if not candidate_scenes:
+            LOGGER.info("EODC search returned no scenes with Zarr assets")
+            return None
+        to_write = [sorted(candidate_scenes, key=_scene_sort_key, reverse=True)[0]]
+    else:
+        plan = plan_incremental_update(manifest, alert, candidate_scenes)
+        to_write = plan.new_scenes
+        LOGGER.info(
+            "Lineage %s: %s new scene(s), %.2f km² of added AOI",
+            lineage_id,
+            len(to_write),
+            plan.added_area_km2,
+        )
+
+    start = time.perf_counter()
+    lineage_write = _LineageWrite()
+    process_peak_rss_bytes: int | None = None
+    if to_write:
+        stored = manifest.scene_groups() if manifest is not None else []
+        quicklook_group = _newest_group(
+            stored + [(scene, _slugify(scene.id)) for scene in to_write]
+        )
+        executor = get_conversion_executor()
+        lineage_write, process_peak_rss_bytes = await executor.run(
+            _write_lineage_scenes,
+            alert,
+            to_write,
+            key,
+            settings,
+            quicklook_group,
+            projected_bytes=estimate_working_set(settings),
+        )
+
+    def merge(current: LineageManifest | None) -> LineageManifest:
+        merged = current or LineageManifest(
+            lineage_id=lineage_id,
+            store_key=key,
+            collection_id=collection_id,
+            item_id=item_id,
+            aoi={},
+        )
+        merged.record(alert, lineage_write.written)
+        return merged
+
+    async with span("lineage_manifest", operation="save"):
+        manifest = await asyncio.to_thread(
+            update_manifest,
+            client,
+            settings.geozarr_bucket,
+            manifest_key,
+            merge,
+            loaded=loaded,
+        )
+    duration = time.perf_counter() - start
+
+    return ConversionOutput(
+        alert_id=alert.id,
+        bucket=settings.geozarr_bucket,
+        key=key,
+        s3_uri=f"s3://{settings.geozarr_bucket}/{key}",
+        bytes_written=lineage_write.bytes_written,
+        duration_seconds=duration,
+        collection_id=manifest.collection_id,
+        item_id=manifest.item_id,
+        scenes=manifest.scene_summaries(),
+        viewer=_build_viewer_links(settings, manifest.collection_id, manifest.item_id),
+        process_peak_rss_bytes=process_peak_rss_bytes,
+        hazard_indices=lineage_write.hazard_indices,
+        lineage_id=lineage_id,
+        thumbnail_href=lineage_write.thumbnail_href,
+        overview_href=lineage_write.overview_href,
+        zarr_group=_newest_group(manifest.scene_groups()),
+    )
+
+
+@dataclass
+class _LineageWrite:
+    written: list[tuple[SceneSummary, str]] = field(default_factory=list)
+    bytes_written: int = 0
+    hazard_indices: list[str] = field(default_factory=list)
+    thumbnail_href: str | None = None
+    overview_href: str | None = None
+
+
+def _write_lineage_scenes(
+    alert: LoadedAlert,
+    scenes: list[SceneSummary],
+    key: str,
+    settings,
+    quicklook_group: str | None = None,
+) -> _LineageWrite:
+    """Write each scene as a child group of the lineage store, leaving others intact.
+
+    The store root holds no data, so quicklooks are rendered from ``quicklook_group``,
+    the child group holding the newest scene.
+    """
+
+    store_uri = f"s3://{settings.geozarr_bucket}/{key}"
+    written: list[tuple[SceneSummary, str]] = []
+    # Keyed by name so indices added for any scene survive the later ones.
+    hazard_indices: dict[str, None] = {}
+    thumbnail_href = overview_href = None
+    with _aws_env(
+        access_key=settings.minio_access_key,
+        secret_key=settings.minio_secret_key,
+        region=settings.minio_region,
+        endpoint=settings.minio_endpoint,
+    ):
+        root = open_zarr_group(store_uri, mode="a")
+        root.attrs["alertzarr:lineage"] = alert_lineage_id(alert)
+        for scene in scenes:
+            if not scene.zarr_href:
+                continue
+            group = _slugify(scene.id)
+            datatree = open_source_datatree(
+                scene.zarr_href, settings.eodc_s3_endpoint, settings.eodc_s3_region
+            )
+            if settings.converter_hazard_indices:
+                datatree, added = apply_hazard_processors(datatree, alert.model.hazard_type)
+                hazard_indices.update(dict.fromkeys(added))
+            LOGGER.info("Appending scene %s to %s", scene.id, store_uri)
+            write_geozarr(datatree, f"{store_uri}/{group}", settings)
+            written.append((scene, group))
+        zarr.consolidate_metadata(open_zarr_group(store_uri, mode="r+").store)
+        if written and quicklook_group is not None:
+            thumbnail_href, overview_href = _publish_quicklooks(
+                alert, f"{store_uri}/{quicklook_group}", key, settings
+            )
+
+    bytes_written = sum(
+        _calculate_total_size(settings.geozarr_bucket, f"{key}/{group}/", settings)
+        for _, group in written
+    )
+    return _LineageWrite(
+        written=written,
+        bytes_written=bytes_written,
+        hazard_indices=list(hazard_indices),
+        thumbnail_href=thumbnail_href,
+        overview_href=overview_href,
+    )
+
+
+def _newest_group(scene_groups: list[tuple[SceneSummary, str]]) -> str | None:
+    newest = max(scene_groups, key=lambda pair: _scene_sort_key(pair[0]), default=None)
+    return newest[1] if newest is not None else None
+
+
+@dataclass
+class _SceneConversion:
+    output_uri: str
+    key: str
+    bytes_written: int
+    collection_id: str
+    item_id: str
+    hazard_indices: list[str] = field(default_factory=list)
+    thumbnail_href: str | None = None
+    overview_href: str | None = None
+
+
 def _convert_scene(
     alert: LoadedAlert, scene: SceneSummary, settings
-) -> tuple[str, str, int, str, str]:
+) -> _SceneConversion:
     if not scene.zarr_href:
         raise RuntimeError("Selected scene does not provide a Zarr asset")
 
     key, collection_id, item_id = _build_output_layout(alert, scene, settings)
     output_uri = f"s3://{settings.geozarr_bucket}/{key}"
-    source_storage = get_storage_options(
-        scene.zarr_href,
-        anon=True,
-        endpoint_url=settings.eodc_s3_endpoint,
-        client_kwargs={
-            "endpoint_url": settings.eodc_s3_endpoint,
-            "region_name": settings.eodc_s3_region,
-        },
+    datatree = open_source_datatree(
+        scene.zarr_href, settings.eodc_s3_endpoint, settings.eodc_s3_region
     )
+    hazard_indices: list[str] = []
+    if settings.converter_hazard_indices:
+        datatree, hazard_indices = apply_hazard_processors(
+            datatree, alert.model.hazard_type
+        )
+        if hazard_indices:
+            LOGGER.info("Adding hazard indices: %s", ", ".join(hazard_indices))
 
-    LOGGER.info("Loading source Zarr: %s", scene.zarr_href)
-    datatree = xr.open_datatree(
-        scene.zarr_href,
-        engine="zarr",
-        chunks="auto",
-        storage_options=source_storage,
+    with _aws_env(
+        access_key=settings.minio_access_key,
+        secret_key=settings.minio_secret_key,
+        region=settings.minio_region,
+        endpoint=settings.minio_endpoint,
+    ):
+        write_geozarr(datatree, output_uri, settings)
+        thumbnail_href, overview_href = _publish_quicklooks(alert, output_uri, key, settings)
+
+    bytes_written = _calculate_total_size(settings.geozarr_bucket, key, settings)
+    LOGGER.info("GeoZarr written to %s (%s bytes)", output_uri, bytes_written)
+    return _SceneConversion(
+        output_uri=output_uri,
+        key=key,
+        bytes_written=bytes_written,
+        collection_id=collection_id,
+        item_id=item_id,
+        hazard_indices=hazard_indices,
+        thumbnail_href=thumbnail_href,
+        overview_href=overview_href,
+    )
+
+
+def _convert_synthetic(alert: LoadedAlert, settings) -> _SceneConversion:
+    groups = [group for group in settings.converter_groups if group in SENTINEL2_GROUPS]
+    settings = settings.model_copy(update={"converter_groups": groups or list(SENTINEL2_GROUPS)})
+    grid = synthetic_grid_for_aoi(
+        alert.model.area_of_interest, max_pixels=settings.synthetic_max_pixels
+    )
+    datatree = build_synthetic_datatree(
+        grid.width,
+        grid.height,
+        groups=settings.converter_groups,
+        epsg=grid.epsg,
+        origin=grid.origin,
+        chunk=settings.converter_spatial_chunk,
+        seed=zlib.crc32(alert.id.encode()),
     )
+    hazard_indices: list[str] = []
+    if settings.converter_hazard_indices:
+        datatree, hazard_indices = apply_hazard_processors(
+            datatree, alert.model.hazard_type
+        )
 
+    key, collection_id, item_id = _build_output_layout_for(alert, "synthetic", settings)
+    LOGGER.info(
+        "Writing %sx%s px synthetic scene (EPSG:%s) for alert %s",
+        grid.width,
+        grid.height,
+        grid.epsg,
+        alert.id,
+    )
+    if settings.synthetic_output_dir is not None:
+        output_path = Path(settings.synthetic_output_dir) / key
+        shutil.rmtree(output_path, ignore_errors=True)
+        output_path.parent.mkdir(parents=True, exist_ok=True)
+        output_uri = str(output_path)
+        write_geozarr(datatree, output_uri, settings)
+        thumbnail_href, overview_href = _publish_quicklooks(
+            alert, output_uri, key, settings, local_root=Path(settings.synthetic_output_dir)
+        )
+        bytes_written = sum(
+            path.stat().st_size for path in output_path.rglob("*") if path.is_file()
+        )
+    else:
+        output_uri = f"s3://{settings.geozarr_bucket}/{key}"
+        _delete_prefix(settings.geozarr_bucket, f"{key}/", settings)
+        with _aws_env(
+            access_key=settings.minio_access_key,
+            secret_key=settings.minio_secret_key,
+            region=settings.minio_region,
+            endpoint=settings.minio_endpoint,
+        ):
+            write_geozarr(datatree, output_uri, settings)
+            thumbnail_href, overview_href = _publish_quicklooks(alert, output_uri, key, settings)
+        bytes_written = _calculate_total_size(settings.geozarr_bucket, key, settings)
+
+    LOGGER.info("Synthetic GeoZarr written to %s (%s bytes)", output_uri, bytes_written)
+    return _SceneConversion(
+        output_uri=output_uri,
+        key=key,
+        bytes_written=bytes_written,
+        collection_id=collection_id,
+        item_id=item_id,
+        hazard_indices=hazard_indices,
+        thumbnail_href=thumbnail_href,
+        overview_href=overview_href,
+    )
+
+
+def _convert_temporal_cube(
+    alert: LoadedAlert, pre: SceneSummary, post: SceneSummary, settings
+) -> _SceneConversion:
+    if not pre.zarr_href or not post.zarr_href:
+        raise RuntimeError("Pre- and post-event scenes must both provide Zarr assets")
+
+    pre_date = scene_datetime(pre).strftime("%Y%m%d")
+    post_date = scene_datetime(post).strftime("%Y%m%d")
+    key, collection_id, item_id = _build_output_layout_for(
+        alert, f"prepost-{pre_date}-{post_date}", settings
+    )
+    output_uri = f"s3://{settings.geozarr_bucket}/{key}"
+    pre_tree = open_source_datatree(
+        pre.zarr_href, settings.eodc_s3_endpoint, settings.eodc_s3_region
+    )
+    post_tree = open_source_datatree(
+        post.zarr_href, settings.eodc_s3_endpoint, settings.eodc_s3_region
+    )
+    hazard_indices: list[str] = []
+    if settings.converter_hazard_indices:
+        pre_tree, _ = apply_hazard_processors(pre_tree, alert.model.hazard_type)
+        post_tree, hazard_indices = apply_hazard_processors(
+            post_tree, alert.model.hazard_type, pre_event=pre_tree
+        )
+
+    cube = build_temporal_cube(
+        pre_tree,
+        post_tree,
+        settings.converter_groups,
+        (scene_datetime(pre), scene_datetime(post)),
+        difference=settings.converter_temporal_difference,
+    )
+    LOGGER.info("Writing pre/post-event cube %s -> %s", pre.id, post.id)
     with _aws_env(
         access_key=settings.minio_access_key,
         secret_key=settings.minio_secret_key,
         region=settings.minio_region,
         endpoint=settings.minio_endpoint,
     ):
+        write_geozarr(cube, output_uri, settings)
+
+    bytes_written = _calculate_total_size(settings.geozarr_bucket, key, settings)
+    LOGGER.info("GeoZarr cube written to %s (%s bytes)", output_uri, bytes_written)
+    return _SceneConversion(
+        output_uri=output_uri,
+        key=key,
+        bytes_written=bytes_written,
+        collection_id=collection_id,
+        item_id=item_id,
+        hazard_indices=hazard_indices,
+    )
+
+
+def _publish_quicklooks(
+    alert: LoadedAlert,
+    store_path: str,
+    key: str,
+    settings,
+    *,
+    local_root: Path | None = None,
+) -> tuple[str | None, str | None]:
+    """Render the quicklook and optional AOI tiles and store them beside the store.
+
+    Returns the thumbnail href and the ``{z}/{x}/{y}`` tile template href. Failures
+    are logged and never fail the conversion.
+    """
+
+    if not settings.quicklook_enabled:
+        return None, None
+    with span("quicklook"):
+        return _render_quicklooks(alert, store_path, key, settings, local_root)
+
+
+def _render_quicklooks(
+    alert: LoadedAlert, store_path: str, key: str, settings, local_root: Path | None
+) -> tuple[str | None, str | None]:
+    base = key.removesuffix(".zarr")
+    try:
+        rendered = render_quicklook(
+            store_path, settings.converter_groups, max_size=settings.quicklook_size
+        )
+        if rendered is None:
+            LOGGER.info("No RGB bands in %s; skipping quicklook", store_path)
+            return None, None
+        image, limits = rendered
+        thumbnail = encode_image(image, settings.quicklook_format)
+        thumbnail_key = f"{base}.quicklook.{thumbnail.extension}"
+        _put_artifact(thumbnail_key, thumbnail.body, thumbnail.content_type, settings, local_root)
+
+        overview_href = None
+        tiles = tile_set_for_bbox(
+            alert.geometry.bounds,
+            settings.quicklook_tile_zoom_levels,
+            settings.quicklook_max_tiles,
+        )
+        rendered_tiles = render_tiles(store_path, settings.converter_groups, tiles, limits)
+        for (z, x, y), tile in rendered_tiles.items():
+            encoded = encode_image(tile, settings.quicklook_format)
+            tile_key = f"{base}.tiles/{z}/{x}/{y}.{encoded.extension}"
+            _put_artifact(tile_key, encoded.body, encoded.content_type, settings, local_root)
+            overview_href = _artifact_href(
+                f"{base}.tiles/{{z}}/{{x}}/{{y}}.{encoded.extension}", settings, local_root
+            )
+    except Exception as exc:  # pragma: no cover - defensive, quicklooks are best effort
+        LOGGER.warning("Unable to render quicklook for %s: %s", store_path, exc)
+        return None, None
+
+    LOGGER.info("Quicklook written with %s overview tile(s)", len(rendered_tiles))
+    return _artifact_href(thumbnail_key, settings, local_root), overview_href
+
+
+def _put_artifact(
+    key: str, body: bytes, content_type: str, settings, local_root: Path | None
+) -> None:
+    if local_root is not None:
+        path = local_root / key
+        path.parent.mkdir(parents=True, exist_ok=True)
+        path.write_bytes(body)
+        return
+    client = get_s3_manager(settings).sync_client()
+    client.put_object(
+        Bucket=settings.geozarr_bucket, Key=key, Body=body, ContentType=content_type
+    )
+
+
+def _artifact_href(key: str, settings, local_root: Path | None) -> str:
+    if local_root is not None:
+        return str(local_root / key)
+    if settings.geozarr_public_base_url:
+        return f"{settings.geozarr_public_base_url.rstrip('/')}/{key}"
+    return f"s3://{settings.geozarr_bucket}/{key}"
+
+
+def write_geozarr(datatree: xr.DataTree, output_path: str, settings) -> None:
+    """Write ``datatree`` as GeoZarr using the configured converter parameters."""
+
+    # Covers the dask compute of the lazily opened source and the chunk writes.
+    with span("write_geozarr", output=output_path):
         create_geozarr_dataset(
             dt_input=datatree,
             groups=settings.converter_groups,
-            output_path=output_uri,
+            output_path=output_path,
             spatial_chunk=settings.converter_spatial_chunk,
             min_dimension=settings.converter_min_dimension,
             tile_width=settings.converter_tile_width,
             enable_sharding=settings.converter_enable_sharding,
         )
 
-    bytes_written = _calculate_total_size(settings.geozarr_bucket, key, settings)
-    LOGGER.info("GeoZarr written to %s (%s bytes)", output_uri, bytes_written)
-    return output_uri, key, bytes_written, collection_id, item_id
+
+@lru_cache(maxsize=8)
+def open_source_datatree(href: str, endpoint: str, region: str) -> xr.DataTree:
+    """Lazily open a source Zarr; long-lived workers reuse the opened metadata."""
+
+    source_storage = get_storage_options(
+        href,
+        anon=True,
+        endpoint_url=endpoint,
+        client_kwargs={"endpoint_url": endpoint, "region_name": region},
+    )
+    LOGGER.info("Loading source Zarr: %s", href)
+    with span("open_source", href=href):
+        return xr.open_datatree(
+            href,
+            engine="zarr",
+            chunks="auto",
+            storage_options=source_storage,
+        )
 
 
 def _build_output_layout(
     alert: LoadedAlert, scene: SceneSummary, settings
 ) -> tuple[str, str, str]:
+    return _build_output_layout_for(alert, scene.id, settings)
+
+
+def _build_output_layout_for(
+    alert: LoadedAlert, suffix: str, settings
+) -> tuple[str, str, str]:
+    return _output_layout(alert, f"{alert.id}-{suffix}", settings)
+
+
+def _output_layout(alert: LoadedAlert, name: str, settings) -> tuple[str, str, str]:
     collection_raw = alert.model.hazard_type or settings.converter_collection
     collection_id = _slugify(collection_raw)
-    slug = _slugify(f"{alert.id}-{scene.id}")
+    slug = _slugify(name)
     prefix = settings.converter_output_prefix.strip("/")
     parts = [part for part in (prefix, collection_id) if part]
     key_prefix = "/".join(parts) if parts else collection_id
@@ -254,21 +814,25 @@ def _slugify(value: str) -> str:
 
 
 def _calculate_total_size(bucket: str, key: str, settings) -> int:
-    client = boto3.client(
-        "s3",
-        endpoint_url=settings.minio_endpoint,
-        aws_access_key_id=settings.minio_access_key,
-        aws_secret_access_key=settings.minio_secret_key,
-        region_name=settings.minio_region,
-    )
+    client = get_s3_manager(settings).sync_client()
     paginator = client.get_paginator("list_objects_v2")
     total = 0
-    for page in paginator.paginate(Bucket=bucket, Prefix=key):
-        for item in page.get("Contents", []):
-            total += int(item.get("Size", 0))
+    with span("size_listing"):
+        for page in paginator.paginate(Bucket=bucket, Prefix=key):
+            for item in page.get("Contents", []):
+                total += int(item.get("Size", 0))
     return total
 
 
+def _delete_prefix(bucket: str, prefix: str, settings) -> None:
+    client = get_s3_manager(settings).sync_client()
+    paginator = client.get_paginator("list_objects_v2")
+    for page in paginator.paginate(Bucket=bucket, Prefix=prefix):
+        keys = [{"Key": item["Key"]} for item in page.get("Contents", [])]
+        if keys:
+            client.delete_objects(Bucket=bucket, Delete={"Objects": keys})
+
+
 @contextmanager
 def _aws_env(
     *,
@@ -297,6 +861,22 @@ def _aws_env(
                 os.environ[key] = value
 
 
+def _parse_issued(alert: LoadedAlert) -> datetime:
+    # Pre/post pairing is anchored on the event time; guessing one would pick the
+    # wrong scenes, so a missing or unreadable value fails the temporal run.
+    if not alert.model.issued:
+        raise RuntimeError(f"Alert {alert.id} has no issued time")
+    try:
+        issued = datetime.fromisoformat(alert.model.issued.replace("Z", "+00:00"))
+    except ValueError as exc:
+        raise RuntimeError(
+            f"Alert {alert.id} has an invalid issued time {alert.model.issued!r}"
+        ) from exc
+    if issued.tzinfo is None:
+        issued = issued.replace(tzinfo=timezone.utc)
+    return issued
+
+
 def _scene_sort_key(scene: SceneSummary) -> tuple[datetime, float]:
     try:
         dt = datetime.fromisoformat(scene.datetime.replace("Z", "+00:00"))
@@ -0,0 +1,249 @@
+"""Lineage tracking for re-issued alerts that update an existing GeoZarr store."""
+
+from __future__ import annotations
+
+import json
+import logging
+import random
+import re
+import time
+from collections.abc import Callable
+from dataclasses import dataclass, field
+from datetime import datetime, timezone
+from typing import Any
+
+from botocore.exceptions import ClientError
+from shapely.geometry import box, mapping, shape
+from shapely.ops import unary_union
+
+from .alerts import LoadedAlert
+from .catalog import SceneSummary
+from .geometry import geodesic_area_km2
+from .s3 import is_write_conflict
+
+LOGGER = logging.getLogger(__name__)
+
+MANIFEST_SUFFIX = ".lineage.json"
+_REISSUE_SUFFIX = re.compile(r"[-_.](?:v|r|rev|update|upd)\d+$", re.IGNORECASE)
+_LINEAGE_KEYS = ("lineage", "lineageId", "activation", "activationId", "activation_id")
+
+__all__ = [
+    "IncrementalPlan",
+    "LineageManifest",
+    "alert_lineage_id",
+    "load_manifest",
+    "plan_incremental_update",
+    "save_manifest",
+    "update_manifest",
+]
+
+
+@dataclass
+class LineageManifest:
+    """Record of what an alert lineage's GeoZarr store already contains."""
+
+    lineage_id: str
+    store_key: str
+    collection_id: str
+    item_id: str
+    aoi: dict[str, Any]
+    scenes: dict[str, dict[str, Any]] = field(default_factory=dict)
+    alert_ids: list[str] = field(default_factory=list)
+    updated: str = ""
+
+    def to_dict(self) -> dict[str, Any]:
+        return {
+            "lineage_id": self.lineage_id,
+            "store_key": self.store_key,
+            "collection_id": self.collection_id,
+            "item_id": self.item_id,
+            "aoi": self.aoi,
+            "scenes": self.scenes,
+            "alert_ids": self.alert_ids,
+            "updated": self.updated,
+        }
+
+    @classmethod
+    def from_dict(cls, payload: dict[str, Any]) -> "LineageManifest":
+        return cls(
+            lineage_id=str(payload["lineage_id"]),
+            store_key=str(payload["store_key"]),
+            collection_id=str(payload["collection_id"]),
+            item_id=str(payload["item_id"]),
+            aoi=dict(payload.get("aoi") or {}),
+            scenes={str(k): dict(v) for k, v in (payload.get("scenes") or {}).items()},
+            alert_ids=[str(value) for value in payload.get("alert_ids", [])],
+            updated=str(payload.get("updated", "")),
+        )
+
+    def scene_summaries(self) -> list[SceneSummary]:
+        return [
+            SceneSummary(
+                id=entry["id"],
+                collection=entry["collection"],
+                datetime=entry["datetime"],
+                cloud_cover=entry.get("cloud_cover"),
+                preview_href=entry.get("preview_href"),
+                data_href=entry.get("data_href"),
+                stac_item_href=entry["stac_item_href"],
+                zarr_href=entry.get("zarr_href"),
+                bbox=entry.get("bbox"),
+                epsg=entry.get("epsg"),
+                tile_id=entry.get("tile_id"),
+            )
+            for entry in self.scenes.values()
+        ]
+
+    def scene_groups(self) -> list[tuple[SceneSummary, str]]:
+        """Pair each stored scene with the child group of the store it was written to."""
+
+        groups = [entry["group"] for entry in self.scenes.values()]
+        return list(zip(self.scene_summaries(), groups, strict=True))
+
+    def record(self, alert: LoadedAlert, written: list[tuple[SceneSummary, str]]) -> None:
+        """Merge the alert's AOI and newly written scenes into the manifest."""
+
+        if self.aoi:
+            merged = unary_union([shape(self.aoi), shape(alert.model.area_of_interest)])
+            self.aoi = mapping(merged)
+        else:
+            self.aoi = alert.model.area_of_interest
+        for scene, group in written:
+            self.scenes[scene.id] = {**scene.as_dict(), "group": group}
+        if alert.id not in self.alert_ids:
+            self.alert_ids.append(alert.id)
+        self.updated = datetime.now(timezone.utc).isoformat()
+
+
+@dataclass
+class IncrementalPlan:
+    """Scenes a re-issued alert still needs written into its lineage store."""
+
+    new_scenes: list[SceneSummary]
+    added_area_km2: float
+    aoi_changed: bool
+
+    @property
+    def is_noop(self) -> bool:
+        return not self.new_scenes
+
+
+def alert_lineage_id(alert: LoadedAlert) -> str:
+    """Identify the activation an alert belongs to, ignoring re-issue suffixes."""
+
+    parameters = alert.model.parameters or {}
+    for key in _LINEAGE_KEYS:
+        if value := parameters.get(key):
+            return str(value)
+    return _REISSUE_SUFFIX.sub("", alert.id) or alert.id
+
+
+def plan_incremental_update(
+    manifest: LineageManifest,
+    alert: LoadedAlert,
+    scenes: list[SceneSummary],
+) -> IncrementalPlan:
+    """Select scenes covering newly added AOI area or acquired after the stored ones."""
+
+    old_aoi = shape(manifest.aoi)
+    new_aoi = shape(alert.model.area_of_interest)
+    added = new_aoi.difference(old_aoi)
+    latest = max(
+        (entry.get("datetime", "") for entry in manifest.scenes.values()),
+        default="",
+    )
+
+    new_scenes: list[SceneSummary] = []
+    for scene in scenes:
+        if not scene.zarr_href or scene.id in manifest.scenes:
+            continue
+        newer = _normalise_datetime(scene.datetime) > _normalise_datetime(latest)
+        covers_added = not added.is_empty and (
+            scene.bbox is None or box(*scene.bbox[:2], *scene.bbox[-2:]).intersects(added)
+        )
+        if newer or covers_added:
+            new_scenes.append(scene)
+
+    added_area_km2 = 0.0 if added.is_empty else geodesic_area_km2(added)
+    return IncrementalPlan(
+        new_scenes=new_scenes,
+        added_area_km2=added_area_km2,
+        aoi_changed=not new_aoi.equals(old_aoi),
+    )
+
+
+def load_manifest(
+    client, bucket: str, key: str
+) -> tuple[LineageManifest | None, str | None]:
+    """Return the stored manifest and its ETag, or ``(None, None)`` when absent."""
+
+    try:
+        response = client.get_object(Bucket=bucket, Key=key)
+    except ClientError as exc:
+        if exc.response.get("Error", {}).get("Code") in {"NoSuchKey", "404"}:
+            return None, None
+        raise
+    return LineageManifest.from_dict(json.loads(response["Body"].read())), response.get("ETag")
+
+
+def save_manifest(
+    client, bucket: str, key: str, manifest: LineageManifest, *, etag: str | None
+) -> None:
+    """Write ``manifest`` only if the stored object still has ``etag``.
+
+    ``etag=None`` means the manifest was absent when read, so the write is made
+    with ``If-None-Match: *``. A lost race raises the store's precondition error.
+    """
+
+    conditions = {"IfMatch": etag} if etag else {"IfNoneMatch": "*"}
+    client.put_object(
+        Bucket=bucket,
+        Key=key,
+        Body=json.dumps(manifest.to_dict()).encode("utf-8"),
+        ContentType="application/json",
+        **conditions,
+    )
+
+
+def update_manifest(
+    client,
+    bucket: str,
+    key: str,
+    merge: Callable[[LineageManifest | None], LineageManifest],
+    *,
+    loaded: tuple[LineageManifest | None, str | None] | None = None,
+    max_attempts: int = 5,
+) -> LineageManifest:
+    """Apply ``merge`` to the stored manifest and write it back conditionally.
+
+    ``loaded`` is a ``load_manifest`` result to try first. When another run has
+    saved the manifest since, it is reloaded, merged again and the write retried
+    with jittered backoff, so concurrent re-issues never drop each other's scenes.
+    """
+
+    current, etag = loaded if loaded is not None else load_manifest(client, bucket, key)
+    for attempt in range(max_attempts):
+        manifest = merge(current)
+        try:
+            save_manifest(client, bucket, key, manifest, etag=etag)
+            return manifest
+        except ClientError as exc:
+            if not is_write_conflict(exc):
+                raise
+        delay = min(0.05 * 2**attempt, 2.0) * random.uniform(0.5, 1.0)
+        LOGGER.info("Concurrent update of %s; retrying in %.2fs", key, delay)
+        time.sleep(delay)
+        current, etag = load_manifest(client, bucket, key)
+    raise RuntimeError(f"Gave up updating {key} after {max_attempts} conflicts")
+
+
+def _normalise_datetime(value: str) -> str:
+    if not value:
+        return ""
+    try:
+        parsed = datetime.fromisoformat(value.replace("Z", "+00:00"))
+    except ValueError:
+        return value
+    if parsed.tzinfo is None:
+        parsed = parsed.replace(tzinfo=timezone.utc)
+    return parsed.astimezone(timezone.utc).isoformat()
@@ -4,16 +4,34 @@ from __future__ import annotations
 
 import asyncio
 import logging
+import time
 from dataclasses import dataclass
-from typing import Any, Sequence
+from typing import Any, Awaitable, Callable, Sequence
 
 import httpx
 
 from .alerts import LoadedAlert, parse_alert_payload
+from .prometheus import STATE_STORE_SIZE, Counter, Histogram
 from .state import AlertStateStore
 
 LOGGER = logging.getLogger(__name__)
 
+FEED_POLL_SECONDS = Histogram(
+    "alertzarr_feed_poll_seconds",
+    "Time to fetch and parse one alert feed, failed polls included",
+    ["feed"],
+    buckets=(0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 15.0, 30.0, 60.0),
+)
+FEED_POLL_ERRORS = Counter(
+    "alertzarr_feed_poll_errors_total", "Alert feed polls that failed", ["feed"]
+)
+ALERTS_PARSED = Counter(
+    "alertzarr_alerts_parsed_total",
+    "Alert feed records parsed, by outcome",
+    ["feed", "outcome"],
+)
+ALERTS_PUBLISHED = Counter("alertzarr_alerts_published_total", "New alerts published downstream")
+
 
 @dataclass
 class AlertFeedSpec:
@@ -53,6 +71,9 @@ class AlertFeedClient:
                 alerts.append(parse_alert_payload(record))
             except Exception as exc:  # pragma: no cover
                 LOGGER.warning("Failed to parse alert from %s: %s", self.spec.name, exc)
+        ALERTS_PARSED.labels(self.spec.name, "parsed").inc(len(alerts))
+        if len(records) > len(alerts):
+            ALERTS_PARSED.labels(self.spec.name, "invalid").inc(len(records) - len(alerts))
         return alerts
 
 
@@ -65,25 +86,47 @@ class AlertListener:
         publisher,
         state_store: AlertStateStore,
         poll_seconds: int,
+        scene_prefetcher: Callable[[list[LoadedAlert]], Awaitable[Any]] | None = None,
     ) -> None:
         self.feeds = feeds
         self.publisher = publisher
         self.state_store = state_store
         self.poll_seconds = poll_seconds
+        self.scene_prefetcher = scene_prefetcher
+        STATE_STORE_SIZE.labels("listener").set_function(state_store.__len__)
 
     async def run_once(self) -> int:
-        published = 0
+        fresh: list[LoadedAlert] = []
         for feed in self.feeds:
+            started = time.perf_counter()
             try:
                 alerts = await feed.fetch_alerts()
             except Exception as exc:  # pragma: no cover
                 LOGGER.exception("Feed %s failed: %s", feed.spec.name, exc)
+                FEED_POLL_ERRORS.labels(feed.spec.name).inc()
                 continue
-            for alert in alerts:
-                if self.state_store.is_new(alert.id):
-                    await self.publisher(alert)
-                    self.state_store.mark_processed(alert.id)
-                    published += 1
+            finally:
+                FEED_POLL_SECONDS.labels(feed.spec.name).observe(time.perf_counter() - started)
+            seen = {alert.id for alert in fresh}
+            fresh.extend(
+                alert
+                for alert in alerts
+                if alert.id not in seen and self.state_store.is_new(alert.id)
+            )
+
+        if fresh and self.scene_prefetcher is not None:
+            # One bulk scene search for the batch warms the cache the workers read.
+            try:
+                await self.scene_prefetcher(fresh)
+            except Exception as exc:  # pragma: no cover
+                LOGGER.warning("Scene prefetch for %s alert(s) failed: %s", len(fresh), exc)
+
+        published = 0
+        for alert in fresh:
+            await self.publisher(alert)
+            self.state_store.mark_processed(alert.id)
+            ALERTS_PUBLISHED.inc()
+            published += 1
         return published
 
     async def run_forever(self) -> None:
@@ -7,16 +7,24 @@ from pathlib import Path
 
 import click
 
+from .catalog import fetch_eodc_scenes_bulk, get_scene_search_cache
 from .events import publish_alert_event
 from .listener import AlertFeedClient, AlertFeedSpec, AlertListener
 from .logging_utils import configure_logging
-from .settings import get_settings
+from .prometheus import start_metrics_server
+from .settings import Settings, get_settings
 from .state import AlertStateStore
 
 
 @click.command()
 @click.option("--once", is_flag=True, help="Run a single polling cycle then exit.")
-def main(once: bool) -> None:
+@click.option(
+    "--metrics-port",
+    type=int,
+    default=None,
+    help="Serve Prometheus metrics on this port (defaults to METRICS_PORT; 0 disables)",
+)
+def main(once: bool, metrics_port: int | None) -> None:
     """Bootstrap the alert ingestion pipeline."""
     configure_logging()
     settings = get_settings()
@@ -29,13 +37,22 @@ def main(once: bool) -> None:
     ]
     feeds = [AlertFeedClient(spec) for spec in feed_specs]
     state_store = AlertStateStore(Path(settings.alert_listener_state_path))
+    scene_prefetcher = None
+    if settings.alert_listener_prefetch_scenes:
+        _require_shared_search_cache(settings)
+        scene_prefetcher = _prefetch_scenes
     listener = AlertListener(
         feeds,
         publish_alert_event,
         state_store,
         poll_seconds=settings.alert_listener_poll_seconds,
+        scene_prefetcher=scene_prefetcher,
     )
 
+    port = settings.metrics_port if metrics_port is None else metrics_port
+    if port and not once:
+        start_metrics_server(port, settings.metrics_host)
+
     async def runner() -> None:
         if once:
             await listener.run_once()
@@ -45,5 +62,28 @@ def main(once: bool) -> None:
     asyncio.run(runner())
 
 
+def _require_shared_search_cache(settings: Settings) -> None:
+    """Refuse to prefetch into a cache the workers cannot read.
+
+    Prefetched searches only reach the workers through the on-disk search cache, so
+    ``EODC_SEARCH_CACHE_DIR`` must be set explicitly to storage they also mount; the
+    default directory is local to each process.
+    """
+
+    if (
+        settings.eodc_search_cache_ttl_seconds <= 0
+        or not settings.eodc_search_cache_dir
+        or "eodc_search_cache_dir" not in settings.model_fields_set
+    ):
+        raise SystemExit(
+            "ALERT_LISTENER_PREFETCH_SCENES needs EODC_SEARCH_CACHE_DIR set to a directory "
+            "shared with the workers and EODC_SEARCH_CACHE_TTL_SECONDS > 0"
+        )
+
+
+async def _prefetch_scenes(alerts) -> None:
+    await fetch_eodc_scenes_bulk(alerts, cache=get_scene_search_cache())
+
+
 if __name__ == "__main__":  # pragma: no cover
     main()
@@ -3,6 +3,7 @@
 from __future__ import annotations
 
 import logging
+
 from pythonjsonlogger import jsonlogger
 
 
@@ -12,5 +13,3 @@ def configure_logging(level: int = logging.INFO) -> None:
     handler = logging.StreamHandler()
     handler.setFormatter(formatter)
     logging.basicConfig(level=level, handlers=[handler], force=True)
-
-```
\ No newline at end of file
@@ -0,0 +1,47 @@
+"""Command-line maintenance for the JSONL run metrics."""
+
+from __future__ import annotations
+
+import json
+from pathlib import Path
+
+import click
+
+from .logging_utils import configure_logging
+from .metrics_sink import MetricsTail, compact_segments
+from .settings import get_settings
+
+
+@click.group()
+def main() -> None:
+    """Compact and tail the metrics written to METRICS_PATH."""
+    configure_logging()
+
+
+@main.command()
+@click.option(
+    "--output-dir",
+    type=click.Path(path_type=Path),
+    default=None,
+    help="Directory for the Parquet files (defaults to metrics_parquet/ beside METRICS_PATH)",
+)
+def compact(output_dir: Path | None) -> None:
+    """Convert rotated metrics segments to Parquet and remove them (needs the `parquet` extra)."""
+    written = compact_segments(Path(get_settings().metrics_path), output_dir)
+    for path in written:
+        click.echo(str(path))
+    click.echo(f"Compacted {len(written)} segment(s)")
+
+
+@main.command()
+@click.option("--consumer", default="default", show_default=True, help="Name of the read offset")
+@click.option("--peek", is_flag=True, help="Print new entries without advancing the offset")
+def tail(consumer: str, peek: bool) -> None:
+    """Print the metrics entries written since this consumer's last read as JSON lines."""
+    tailer = MetricsTail(Path(get_settings().metrics_path), consumer)
+    for entry in tailer.read(commit=not peek):
+        click.echo(json.dumps(entry))
+
+
+if __name__ == "__main__":  # pragma: no cover
+    main()
@@ -0,0 +1,368 @@
+"""Buffered, rotating JSONL sink for run metrics, shared safely between processes."""
+
+from __future__ import annotations
+
+import atexit
+import fcntl
+import json
+import logging
+import os
+import threading
+import time
+from collections.abc import Iterator
+from contextlib import contextmanager
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Any
+
+from .settings import Settings, get_settings
+
+try:
+    import pyarrow as pa  # type: ignore
+    import pyarrow.parquet as pq  # type: ignore
+except ImportError:  # pragma: no cover
+    pa = None  # type: ignore
+    pq = None  # type: ignore
+
+LOGGER = logging.getLogger(__name__)
+
+PARQUET_DIRNAME = "metrics_parquet"
+# Lines kept in memory while the metrics directory is unwritable; oldest dropped first.
+_MAX_PENDING_LINES = 10_000
+
+__all__ = [
+    "MetricsSink",
+    "MetricsTail",
+    "close_metrics_sinks",
+    "compact_segments",
+    "get_metrics_sink",
+    "rotated_segments",
+]
+
+
+class MetricsSink:
+    """Append metrics entries to ``path`` from a background flusher thread.
+
+    ``emit`` only serialises the entry into an in-memory buffer; the buffer is
+    written every ``flush_seconds`` or once it holds ``buffer_lines`` entries.
+    Each flush takes an exclusive ``flock`` on ``<path>.lock``, rotates the file
+    when it would exceed ``rotate_bytes`` or is older than ``rotate_seconds``,
+    and appends the whole batch, so any number of processes can share one
+    metrics directory. Rotated segments are renamed to
+    ``<path>.<UTC timestamp>`` and are never written again.
+    """
+
+    def __init__(
+        self,
+        path: Path,
+        *,
+        rotate_bytes: int = 64 * 1024 * 1024,
+        rotate_seconds: float = 86_400.0,
+        flush_seconds: float = 1.0,
+        buffer_lines: int = 256,
+    ) -> None:
+        self.path = Path(path)
+        self.rotate_bytes = rotate_bytes
+        self.rotate_seconds = rotate_seconds
+        self.flush_seconds = flush_seconds
+        self.buffer_lines = max(buffer_lines, 1)
+        self._buffer: list[str] = []
+        self._buffer_lock = threading.Lock()
+        self._write_lock = threading.Lock()
+        self._wake = threading.Event()
+        self._closed = False
+        self._thread: threading.Thread | None = None
+
+    @classmethod
+    def from_settings(cls, path: Path, settings: Settings) -> MetricsSink:
+        return cls(
+            path,
+            rotate_bytes=settings.metrics_rotate_mb * 1024 * 1024,
+            rotate_seconds=settings.metrics_rotate_seconds,
+            flush_seconds=settings.metrics_flush_seconds,
+            buffer_lines=settings.metrics_buffer_lines,
+        )
+
+    @property
+    def lock_path(self) -> Path:
+        return self.path.with_name(self.path.name + ".lock")
+
+    def emit(self, entry: dict[str, Any]) -> None:
+        line = json.dumps(entry, default=str) + "\n"
+        with self._buffer_lock:
+            if self._closed:
+                raise RuntimeError(f"Metrics sink for {self.path} is closed")
+            self._buffer.append(line)
+            full = len(self._buffer) >= self.buffer_lines
+            if self._thread is None:
+                self._thread = threading.Thread(
+                    target=self._run, name="alertzarr-metrics-sink", daemon=True
+                )
+                self._thread.start()
+        if full:
+            self._wake.set()
+
+    def flush(self) -> int:
+        """Write everything buffered so far; returns the number of entries written."""
+
+        with self._write_lock:
+            with self._buffer_lock:
+                lines, self._buffer = self._buffer, []
+            if not lines:
+                return 0
+            try:
+                self._append("".join(lines).encode("utf-8"))
+            except OSError as exc:
+                with self._buffer_lock:
+                    self._buffer[:0] = lines
+                    dropped = len(self._buffer) - _MAX_PENDING_LINES
+                    if dropped > 0:
+                        del self._buffer[:dropped]
+                LOGGER.warning("Unable to write metrics to %s: %s", self.path, exc)
+                return 0
+            return len(lines)
+
+    def close(self) -> None:
+        with self._buffer_lock:
+            self._closed = True
+        self._wake.set()
+        if self._thread is not None:
+            self._thread.join(timeout=max(self.flush_seconds, 1.0) + 5.0)
+        self.flush()
+
+    def _run(self) -> None:
+        while True:
+            self._wake.wait(self.flush_seconds)
+            self._wake.clear()
+            self.flush()
+            if self._closed:
+                return
+
+    def _append(self, payload: bytes) -> None:
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        with _flocked(self.lock_path) as lock_fp:
+            self._rotate_if_due(lock_fp, len(payload))
+            with self.path.open("ab") as fp:
+                fp.write(payload)
+
+    def _rotate_if_due(self, lock_fp, incoming: int) -> None:
+        # The lock file holds the epoch second the active segment was started at.
+        lock_fp.seek(0)
+        raw = lock_fp.read().strip()
+        now = time.time()
+        try:
+            size = self.path.stat().st_size
+        except FileNotFoundError:
+            size = 0
+        if not raw or size == 0:
+            # A new segment, or a file written before rotation was configured.
+            _write_started(lock_fp, now)
+            started = now
+        else:
+            started = float(raw)
+        if size == 0:
+            return
+        too_big = self.rotate_bytes > 0 and size + incoming > self.rotate_bytes
+        too_old = self.rotate_seconds > 0 and now - started >= self.rotate_seconds
+        if not (too_big or too_old):
+            return
+        stamp = datetime.now(timezone.utc).strftime("%Y%m%dT%H%M%S%fZ")
+        target = self.path.with_name(f"{self.path.name}.{stamp}")
+        suffix = 1
+        while target.exists():
+            target = self.path.with_name(f"{self.path.name}.{stamp}-{suffix}")
+            suffix += 1
+        os.rename(self.path, target)
+        _write_started(lock_fp, now)
+        LOGGER.info("Rotated metrics segment to %s (%s bytes)", target, size)
+
+
+class MetricsTail:
+    """Read the metrics written since the last read, across rotations.
+
+    The position is kept in ``<path>.<consumer>.offset`` as the inode and byte
+    offset of the segment read last, so a scraper reads only new bytes instead
+    of the whole history. Segments removed by ``compact_segments`` before they
+    were read are skipped; their entries are in the Parquet files.
+    """
+
+    def __init__(self, path: Path, consumer: str = "default") -> None:
+        self.path = Path(path)
+        self.offset_path = self.path.with_name(f"{self.path.name}.{consumer}.offset")
+
+    def read(self, *, commit: bool = True) -> list[dict[str, Any]]:
+        inode, offset = self._position()
+        segments = [*rotated_segments(self.path), self.path]
+        stats = []
+        for segment in segments:
+            try:
+                stats.append((segment, segment.stat()))
+            except FileNotFoundError:
+                continue
+        start = next((index for index, (_, stat) in enumerate(stats) if stat.st_ino == inode), None)
+        if start is None or offset > stats[start][1].st_size:
+            start, offset = 0, 0
+
+        entries: list[dict[str, Any]] = []
+        position = (inode, offset)
+        for index, (segment, stat) in enumerate(stats[start:]):
+            begin = offset if index == 0 else 0
+            with segment.open("rb") as fp:
+                fp.seek(begin)
+                payload = fp.read()
+            # Flushes append whole lines, but a reader may race a write in progress.
+            complete = payload[: payload.rfind(b"\n") + 1]
+            entries.extend(json.loads(line) for line in complete.splitlines() if line.strip())
+            position = (stat.st_ino, begin + len(complete))
+        if commit and stats:
+            self._save(*position)
+        return entries
+
+    def _position(self) -> tuple[int | None, int]:
+        try:
+            data = json.loads(self.offset_path.read_text(encoding="utf-8"))
+        except (FileNotFoundError, ValueError):
+            return None, 0
+        return data.get("inode"), int(data.get("offset", 0))
+
+    def _save(self, inode: int, offset: int) -> None:
+        temporary = self.offset_path.with_name(self.offset_path.name + ".tmp")
+        temporary.write_text(json.dumps({"inode": inode, "offset": offset}), encoding="utf-8")
+        os.replace(temporary, self.offset_path)
+
+
+def rotated_segments(path: Path) -> list[Path]:
+    """Rotated segments of ``path``, oldest first."""
+
+    path = Path(path)
+    prefix = path.name + "."
+    if not path.parent.exists():
+        return []
+    return sorted(
+        candidate
+        for candidate in path.parent.iterdir()
+        if candidate.name.startswith(prefix)
+        and candidate.name[len(prefix) : len(prefix) + 1].isdigit()
+    )
+
+
+def compact_segments(path: Path, output_dir: Path | None = None) -> list[Path]:
+    """Convert every rotated segment of ``path`` to Parquet and delete the segment.
+
+    Output files keep the segment's timestamp, under ``metrics_parquet/`` next
+    to ``path`` by default. Concurrent compactions are skipped rather than queued.
+    """
+
+    if pa is None:
+        raise RuntimeError("Metrics compaction needs pyarrow: pip install 'alertzarr[parquet]'")
+    path = Path(path)
+    output_dir = output_dir or path.parent / PARQUET_DIRNAME
+    lock_path = path.with_name(path.name + ".compact.lock")
+    written: list[Path] = []
+    with _flocked(lock_path, blocking=False) as acquired:
+        if acquired is None:
+            LOGGER.info("Another process is compacting %s; skipping", path)
+            return written
+        output_dir.mkdir(parents=True, exist_ok=True)
+        for segment in rotated_segments(path):
+            stamp = segment.name[len(path.name) + 1 :]
+            target = output_dir / f"{path.stem}-{stamp}.parquet"
+            with segment.open("rb") as fp:
+                entries = [json.loads(line) for line in fp if line.strip()]
+            temporary = target.with_name(target.name + ".tmp")
+            pq.write_table(_metrics_table(entries), temporary, compression="zstd")
+            os.replace(temporary, target)
+            segment.unlink()
+            written.append(target)
+            LOGGER.info("Compacted %s metric(s) from %s into %s", len(entries), segment, target)
+    return written
+
+
+_SINKS: dict[Path, MetricsSink] = {}
+_SINKS_LOCK = threading.Lock()
+
+
+def get_metrics_sink(path: Path, settings: Settings | None = None) -> MetricsSink:
+    """Process-wide sink for ``path``, flushed and closed at interpreter exit."""
+
+    key = Path(path).resolve()
+    with _SINKS_LOCK:
+        sink = _SINKS.get(key)
+        if sink is None:
+            sink = MetricsSink.from_settings(key, settings or get_settings())
+            _SINKS[key] = sink
+    return sink
+
+
+@atexit.register
+def close_metrics_sinks() -> None:
+    with _SINKS_LOCK:
+        sinks = list(_SINKS.values())
+        _SINKS.clear()
+    for sink in sinks:
+        sink.close()
+
+
+@contextmanager
+def _flocked(path: Path, *, blocking: bool = True) -> Iterator[Any]:
+    path.parent.mkdir(parents=True, exist_ok=True)
+    fd = os.open(path, os.O_RDWR | os.O_CREAT, 0o644)
+    with os.fdopen(fd, "r+", encoding="utf-8") as fp:
+        try:
+            fcntl.flock(fp, fcntl.LOCK_EX if blocking else fcntl.LOCK_EX | fcntl.LOCK_NB)
+        except BlockingIOError:
+            yield None
+            return
+        try:
+            yield fp
+        finally:
+            fcntl.flock(fp, fcntl.LOCK_UN)
+
+
+def _write_started(lock_fp, started: float) -> None:
+    lock_fp.seek(0)
+    lock_fp.truncate()
+    lock_fp.write(f"{started:.3f}")
+    lock_fp.flush()
+
+
+def _metrics_table(entries: list[dict[str, Any]]) -> pa.Table:
+    rows = []
+    for entry in entries:
+        row = {name: entry.get(name) for name in _SCHEMA_FIELDS}
+        if row["timestamp"]:
+            row["timestamp"] = datetime.fromisoformat(row["timestamp"])
+        row["stage_seconds"] = list((entry.get("stage_seconds") or {}).items())
+        rows.append(row)
+    return pa.Table.from_pylist(rows, schema=_schema())
+
+
+_SCHEMA_FIELDS = (
+    "timestamp",
+    "run_id",
+    "alert_id",
+    "status",
+    "duration_seconds",
+    "bytes_written",
+    "source_scene_count",
+    "process_peak_rss_bytes",
+    "scene_cache_hit_rate",
+    "stage_seconds",
+)
+
+
+def _schema() -> pa.Schema:
+    return pa.schema(
+        [
+            ("timestamp", pa.timestamp("us", tz="UTC")),
+            ("run_id", pa.string()),
+            ("alert_id", pa.string()),
+            ("status", pa.string()),
+            ("duration_seconds", pa.float64()),
+            ("bytes_written", pa.int64()),
+            ("source_scene_count", pa.int64()),
+            ("process_peak_rss_bytes", pa.int64()),
+            ("scene_cache_hit_rate", pa.float64()),
+            ("stage_seconds", pa.map_(pa.string(), pa.float64())),
+        ]
+    )
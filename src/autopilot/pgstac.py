@@ -0,0 +1,294 @@
+"""Bulk ingestion of STAC items into pgstac or pgstac-shaped Postgres tables."""
+
+from __future__ import annotations
+
+import logging
+import threading
+import time
+from collections.abc import Iterable, Iterator
+from datetime import datetime, timezone
+from functools import lru_cache
+from typing import Any
+
+from .settings import Settings, get_settings
+from .stac_collections import CollectionExtent, build_collection, collection_key
+
+try:
+    import psycopg  # type: ignore
+    from psycopg.types.json import Jsonb  # type: ignore
+except ImportError:  # pragma: no cover
+    psycopg = None  # type: ignore
+    Jsonb = None  # type: ignore
+
+LOGGER = logging.getLogger(__name__)
+
+FALLBACK_SCHEMA = "alertzarr_stac"
+ITEM_COLUMNS = ("id", "collection", "datetime", "end_datetime", "bbox", "geometry", "content")
+
+# Mirrors the pgstac items/collections layout for databases without the pgstac
+# extension (the bundled postgres:16-alpine has no PostGIS, so geometry is jsonb).
+_FALLBACK_DDL = f"""
+CREATE SCHEMA IF NOT EXISTS {FALLBACK_SCHEMA};
+CREATE TABLE IF NOT EXISTS {FALLBACK_SCHEMA}.collections (
+    id text PRIMARY KEY,
+    content jsonb NOT NULL
+);
+CREATE TABLE IF NOT EXISTS {FALLBACK_SCHEMA}.items (
+    id text NOT NULL,
+    collection text NOT NULL REFERENCES {FALLBACK_SCHEMA}.collections (id),
+    datetime timestamptz,
+    end_datetime timestamptz,
+    bbox float8[],
+    geometry jsonb,
+    content jsonb NOT NULL,
+    PRIMARY KEY (collection, id)
+);
+CREATE INDEX IF NOT EXISTS items_datetime_idx
+    ON {FALLBACK_SCHEMA}.items (datetime DESC, end_datetime);
+"""
+
+_FALLBACK_UPSERT = f"""
+INSERT INTO {FALLBACK_SCHEMA}.items ({", ".join(ITEM_COLUMNS)})
+SELECT DISTINCT ON (collection, id) {", ".join(ITEM_COLUMNS)} FROM items_staging
+ORDER BY collection, id, seq DESC
+ON CONFLICT (collection, id) DO UPDATE SET
+    datetime = EXCLUDED.datetime,
+    end_datetime = EXCLUDED.end_datetime,
+    bbox = EXCLUDED.bbox,
+    geometry = EXCLUDED.geometry,
+    content = EXCLUDED.content
+WHERE items.content IS DISTINCT FROM EXCLUDED.content
+"""
+
+__all__ = [
+    "PgstacIngestor",
+    "get_pgstac_ingestor",
+    "item_row",
+]
+
+
+def item_row(item: dict[str, Any]) -> tuple[Any, ...]:
+    """Column values for ``ITEM_COLUMNS`` in the pgstac-shaped fallback table."""
+
+    properties = item.get("properties", {})
+    start = _parse_datetime(properties.get("start_datetime") or properties.get("datetime"))
+    end = _parse_datetime(properties.get("end_datetime") or properties.get("datetime"))
+    bbox = item.get("bbox") or None
+    return (item["id"], item["collection"], start, end, bbox, item.get("geometry"), item)
+
+
+class PgstacIngestor:
+    """Load items into Postgres in batches, one transaction and one COPY per batch.
+
+    When the pgstac schema is installed the batch is copied into
+    ``pgstac.items_staging_upsert`` and pgstac's trigger merges it; otherwise it
+    is copied into a temporary ``items_staging`` table and upserted into the
+    pgstac-shaped ``alertzarr_stac.items``. Each collection row is prepared
+    (upserted) once per ingestor before its first items.
+    """
+
+    def __init__(
+        self,
+        dsn: str,
+        *,
+        batch_size: int = 500,
+        public_base_url: str | None = None,
+        connection: Any | None = None,
+    ) -> None:
+        if psycopg is None:
+            raise RuntimeError("The pgstac backend needs psycopg: pip install 'alertzarr[pgstac]'")
+        self.dsn = dsn
+        self.batch_size = max(batch_size, 1)
+        self.public_base_url = public_base_url.rstrip("/") if public_base_url else None
+        self._connection = connection
+        self._mode: str | None = None
+        self._collections: set[str] = set()
+        self._lock = threading.Lock()
+
+    @classmethod
+    def from_settings(cls, settings: Settings) -> PgstacIngestor:
+        return cls(
+            settings.stac_pgstac_dsn,
+            batch_size=settings.stac_pgstac_batch_size,
+            public_base_url=settings.stac_public_base_url,
+        )
+
+    @property
+    def connection(self):
+        """The ingestor's connection, reopened if it was closed or broken."""
+
+        if self.connection_lost:
+            LOGGER.warning("Postgres connection lost; reconnecting")
+            self._connection = None
+        if self._connection is None:
+            self._connection = psycopg.connect(self.dsn, autocommit=True)
+        return self._connection
+
+    @property
+    def connection_lost(self) -> bool:
+        """Whether the open connection was closed or broke (e.g. a server restart)."""
+
+        connection = self._connection
+        return connection is not None and (connection.closed or connection.broken)
+
+    @property
+    def mode(self) -> str:
+        """``"pgstac"`` with the extension installed, ``"fallback"`` otherwise."""
+
+        if self._mode is None:
+            with self.connection.transaction(), self.connection.cursor() as cur:
+                cur.execute("SELECT to_regclass('pgstac.items_staging_upsert') IS NOT NULL")
+                installed = cur.fetchone()[0]
+                if not installed:
+                    cur.execute(_FALLBACK_DDL)
+            self._mode = "pgstac" if installed else "fallback"
+            LOGGER.info("pgstac ingestion mode: %s", self._mode)
+        return self._mode
+
+    def ingest(self, items: Iterable[dict[str, Any]]) -> int:
+        with self._lock:
+            return self._ingest(items)
+
+    def _ingest(self, items: Iterable[dict[str, Any]]) -> int:
+        mode = self.mode
+        total = 0
+        started = time.perf_counter()
+        for batch in _batches(_valid_items(items), self.batch_size):
+            try:
+                prepared = self._write_batch(mode, batch)
+            except psycopg.OperationalError:
+                if not self.connection_lost:
+                    raise
+                # The batch rolled back with the connection; replay it once on a new one.
+                prepared = self._write_batch(mode, batch)
+            # Only remembered once the batch has committed.
+            self._collections.update(prepared)
+            total += len(batch)
+        elapsed = time.perf_counter() - started
+        if total:
+            LOGGER.info(
+                "Ingested %s item(s) into Postgres in %.2fs (%.0f items/s)",
+                total,
+                elapsed,
+                total / elapsed if elapsed else float("inf"),
+            )
+        return total
+
+    def close(self) -> None:
+        if self._connection is not None:
+            self._connection.close()
+            self._connection = None
+
+    def _write_batch(self, mode: str, batch: list[dict[str, Any]]) -> set[str]:
+        with self.connection.transaction():
+            prepared = self._prepare_collections(batch)
+            if mode == "pgstac":
+                self._copy_pgstac(batch)
+            else:
+                self._copy_fallback(batch)
+        return prepared
+
+    def collection_document(self, collection_id: str, extent: CollectionExtent) -> dict[str, Any]:
+        """The collection row created before a collection's first items."""
+
+        base = self.public_base_url
+        return build_collection(
+            collection_id,
+            extent,
+            root_href=base,
+            self_href=f"{base}/{collection_key(collection_id)}" if base else None,
+        )
+
+    def _prepare_collections(self, batch: list[dict[str, Any]]) -> set[str]:
+        extents: dict[str, CollectionExtent] = {}
+        for item in batch:
+            if item["collection"] not in self._collections:
+                extents.setdefault(item["collection"], CollectionExtent()).add(item)
+        if not extents:
+            return set()
+        with self.connection.cursor() as cur:
+            for collection_id, extent in extents.items():
+                document = self.collection_document(collection_id, extent)
+                if self.mode == "pgstac":
+                    cur.execute("SELECT 1 FROM pgstac.collections WHERE id = %s", (collection_id,))
+                    if cur.fetchone() is None:
+                        cur.execute("SELECT pgstac.create_collection(%s)", (Jsonb(document),))
+                else:
+                    cur.execute(
+                        f"INSERT INTO {FALLBACK_SCHEMA}.collections (id, content) VALUES (%s, %s) "
+                        "ON CONFLICT (id) DO NOTHING",
+                        (collection_id, Jsonb(document)),
+                    )
+        return set(extents)
+
+    def _copy_pgstac(self, batch: list[dict[str, Any]]) -> None:
+        with self.connection.cursor() as cur:
+            with cur.copy("COPY pgstac.items_staging_upsert (content) FROM STDIN") as copy:
+                copy.set_types(["jsonb"])
+                for item in batch:
+                    copy.write_row((item,))
+
+    def _copy_fallback(self, batch: list[dict[str, Any]]) -> None:
+        with self.connection.cursor() as cur:
+            cur.execute(
+                f"CREATE TEMP TABLE IF NOT EXISTS items_staging "
+                f"(LIKE {FALLBACK_SCHEMA}.items, seq bigint) ON COMMIT DELETE ROWS"
+            )
+            columns = ", ".join((*ITEM_COLUMNS, "seq"))
+            with cur.copy(f"COPY items_staging ({columns}) FROM STDIN") as copy:
+                copy.set_types(
+                    [
+                        "text",
+                        "text",
+                        "timestamptz",
+                        "timestamptz",
+                        "float8[]",
+                        "jsonb",
+                        "jsonb",
+                        "int8",
+                    ]
+                )
+                for seq, item in enumerate(batch):
+                    copy.write_row((*item_row(item), seq))
+            cur.execute(_FALLBACK_UPSERT)
+
+
+@lru_cache(maxsize=1)
+def get_pgstac_ingestor() -> PgstacIngestor:
+    """Process-wide ingestor (one connection) for the configured database."""
+
+    return PgstacIngestor.from_settings(get_settings())
+
+
+def _batches(items: Iterable[dict[str, Any]], size: int) -> Iterator[list[dict[str, Any]]]:
+    batch: list[dict[str, Any]] = []
+    for item in items:
+        batch.append(item)
+        if len(batch) == size:
+            yield batch
+            batch = []
+    if batch:
+        yield batch
+
+
+def _valid_items(items: Iterable[dict[str, Any]]) -> Iterator[dict[str, Any]]:
+    """Drop (and log) items whose datetimes would fail the whole batch's COPY."""
+
+    for item in items:
+        properties = item.get("properties", {})
+        try:
+            for name in ("datetime", "start_datetime", "end_datetime"):
+                _parse_datetime(properties.get(name))
+        except (TypeError, ValueError) as exc:
+            LOGGER.warning("Skipping item %s with an invalid datetime: %s", item.get("id"), exc)
+            continue
+        yield item
+
+
+def _parse_datetime(value: str | None) -> datetime | None:
+    if not value:
+        return None
+    parsed = datetime.fromisoformat(value)
+    if parsed.tzinfo is None:
+        parsed = parsed.replace(tzinfo=timezone.utc)
+    return parsed
@@ -0,0 +1,82 @@
+"""Alert conversion pipeline shared by the CLI and the worker pool."""
+
+from __future__ import annotations
+
+import logging
+from dataclasses import dataclass
+from typing import Any
+
+from .alerts import LoadedAlert
+from .catalog import get_scene_search_cache
+from .geozarr import ConversionMode, ConversionOutput, convert_alert
+from .reporting import RunReporter
+from .settings import get_settings
+from .stac import create_stac_item
+from .warmup import WarmupResult, warm_viewer
+
+LOGGER = logging.getLogger(__name__)
+
+__all__ = ["PipelineResult", "run_pipeline"]
+
+
+@dataclass
+class PipelineResult:
+    """Artefacts produced for one alert."""
+
+    output: ConversionOutput
+    stac_item: dict[str, Any]
+    warmup: WarmupResult | None = None
+
+
+async def run_pipeline(
+    alert: LoadedAlert,
+    reporter: RunReporter,
+    *,
+    include_scene_search: bool = True,
+    mode: ConversionMode = "auto",
+    temporal_cube: bool = False,
+    viewer_warmup: bool | None = None,
+) -> PipelineResult:
+    """Convert ``alert``, publish its STAC item and warm its viewer.
+
+    Each stage is timed and recorded on ``reporter``, which the caller starts and
+    finishes. A failing stage marks the run failed and is re-raised.
+    """
+
+    settings = get_settings()
+    if viewer_warmup is None:
+        viewer_warmup = settings.viewer_warmup_enabled
+    try:
+        async with reporter.span("conversion", mode=mode):
+            output = await convert_alert(
+                alert,
+                include_scene_search=include_scene_search,
+                mode=mode,
+                temporal_cube=temporal_cube,
+            )
+        reporter.record_conversion(output)
+
+        async with reporter.span("stac"):
+            stac_item = await create_stac_item(alert, output)
+        reporter.record_stac_item(stac_item)
+
+        warmup: WarmupResult | None = None
+        if viewer_warmup and output.viewer is not None:
+            async with reporter.span("viewer_warmup"):
+                warmup = await warm_viewer(
+                    output.viewer,
+                    alert.geometry.bounds,
+                    budget_seconds=settings.viewer_warmup_budget_seconds,
+                    zoom_levels=settings.viewer_warmup_zoom_levels,
+                    max_tiles=settings.viewer_warmup_max_tiles,
+                    concurrency=settings.viewer_warmup_concurrency,
+                )
+            reporter.record_viewer_warmup(warmup)
+    except Exception as exc:
+        reporter.status = "failed"
+        reporter.steps["error"] = {"message": str(exc)}
+        raise
+    finally:
+        if (scene_cache := get_scene_search_cache()) is not None:
+            reporter.record_scene_search_cache(scene_cache.stats.as_dict())
+    return PipelineResult(output=output, stac_item=stac_item, warmup=warmup)
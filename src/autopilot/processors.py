@@ -0,0 +1,124 @@
+"""Hazard-specific spectral index processors applied during GeoZarr conversion."""
+
+from __future__ import annotations
+
+import logging
+from dataclasses import dataclass
+
+import xarray as xr
+
+LOGGER = logging.getLogger(__name__)
+
+
+@dataclass(frozen=True, slots=True)
+class SpectralIndex:
+    """Normalised difference of two bands stored in the same datatree group."""
+
+    name: str
+    group: str
+    positive: str
+    negative: str
+    long_name: str
+
+
+NDWI = SpectralIndex(
+    name="ndwi",
+    group="/measurements/reflectance/r10m",
+    positive="b03",
+    negative="b08",
+    long_name="Normalised Difference Water Index",
+)
+NBR = SpectralIndex(
+    name="nbr",
+    group="/measurements/reflectance/r20m",
+    positive="b8a",
+    negative="b12",
+    long_name="Normalised Burn Ratio",
+)
+
+HAZARD_INDICES: dict[str, tuple[SpectralIndex, ...]] = {
+    "flood": (NDWI,),
+    "wildfire": (NBR,),
+}
+
+__all__ = [
+    "HAZARD_INDICES",
+    "NBR",
+    "NDWI",
+    "SpectralIndex",
+    "apply_hazard_processors",
+    "normalized_difference",
+]
+
+
+def normalized_difference(positive: xr.DataArray, negative: xr.DataArray) -> xr.DataArray:
+    """Compute ``(a - b) / (a + b)`` chunk-wise; zero denominators become NaN."""
+
+    a = positive.astype("float32")
+    b = negative.astype("float32")
+    total = a + b
+    return ((a - b) / total.where(total != 0)).astype("float32")
+
+
+def apply_hazard_processors(
+    datatree: xr.DataTree,
+    hazard: str,
+    pre_event: xr.DataTree | None = None,
+) -> tuple[xr.DataTree, list[str]]:
+    """Return a copy of ``datatree`` with the hazard's indices added as variables.
+
+    Indices stay lazy, so they are computed from the same source chunks while the
+    GeoZarr store is written. When a ``pre_event`` tree is supplied, wildfire
+    alerts also gain ``dnbr`` (pre-event NBR minus post-event NBR).
+    """
+
+    indices = HAZARD_INDICES.get(hazard.lower(), ())
+    if not indices:
+        return datatree, []
+
+    result = datatree.copy()
+    added: list[str] = []
+    for index in indices:
+        value = _compute_index(result, index)
+        if value is None:
+            continue
+        result[f"{index.group}/{index.name}"] = value
+        added.append(index.name)
+
+        if index is NBR and pre_event is not None:
+            before = _compute_index(pre_event, index)
+            if before is None:
+                continue
+            before = before.reindex_like(value, method="nearest")
+            delta = (before - value).astype("float32")
+            delta.attrs = {**value.attrs, "long_name": "Differenced Normalised Burn Ratio"}
+            result[f"{index.group}/dnbr"] = delta
+            added.append("dnbr")
+
+    return result, added
+
+
+def _compute_index(datatree: xr.DataTree, index: SpectralIndex) -> xr.DataArray | None:
+    try:
+        node = datatree[index.group]
+    except KeyError:
+        LOGGER.info("Skipping %s - group %s not found", index.name, index.group)
+        return None
+    if index.positive not in node.data_vars or index.negative not in node.data_vars:
+        LOGGER.info(
+            "Skipping %s - bands %s/%s missing from %s",
+            index.name,
+            index.positive,
+            index.negative,
+            index.group,
+        )
+        return None
+
+    positive = node[index.positive]
+    value = normalized_difference(positive, node[index.negative])
+    value.attrs = {
+        **{k: v for k, v in positive.attrs.items() if k not in {"scale_factor", "add_offset"}},
+        "long_name": index.long_name,
+        "units": "1",
+    }
+    return value
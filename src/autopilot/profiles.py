@@ -0,0 +1,173 @@
+"""Conversion profiles selected per alert from hazard type and AOI size."""
+
+from __future__ import annotations
+
+import json
+import logging
+from dataclasses import dataclass, fields
+from functools import lru_cache
+from pathlib import Path
+from typing import Any
+
+from .alerts import LoadedAlert
+from .settings import Settings
+
+LOGGER = logging.getLogger(__name__)
+
+R10M = "/measurements/reflectance/r10m"
+R20M = "/measurements/reflectance/r20m"
+R60M = "/measurements/reflectance/r60m"
+QUICKLOOK = "/quality/l2a_quicklook/r10m"
+
+__all__ = [
+    "DEFAULT_PROFILES",
+    "ConversionProfile",
+    "apply_profile",
+    "load_profiles",
+    "resolve_conversion_settings",
+    "select_profile",
+]
+
+
+@dataclass(frozen=True, slots=True)
+class ConversionProfile:
+    """Converter parameters for alerts of one hazard within an AOI-area bucket.
+
+    ``hazard`` of ``None`` matches any hazard; ``max_area_km2`` of ``None`` is
+    the open-ended top bucket. A larger ``min_dimension`` stops the overview
+    pyramid earlier, so it controls overview depth.
+    """
+
+    name: str
+    hazard: str | None
+    max_area_km2: float | None
+    spatial_chunk: int
+    groups: tuple[str, ...]
+    enable_sharding: bool
+    min_dimension: int
+
+    def matches(self, hazard: str, area_km2: float) -> bool:
+        if self.hazard is not None and self.hazard != hazard:
+            return False
+        return self.max_area_km2 is None or area_km2 <= self.max_area_km2
+
+    @classmethod
+    def from_dict(cls, payload: dict[str, Any]) -> "ConversionProfile":
+        known = {item.name for item in fields(cls)}
+        if unknown := set(payload) - known:
+            raise ValueError(f"Unknown conversion profile field(s): {sorted(unknown)}")
+        return cls(**{**payload, "groups": tuple(payload.get("groups", ()))})
+
+
+DEFAULT_PROFILES: tuple[ConversionProfile, ...] = (
+    # Wildfire indices need the 20 m SWIR bands even for small perimeters.
+    ConversionProfile(
+        name="wildfire-small",
+        hazard="wildfire",
+        max_area_km2=250,
+        spatial_chunk=512,
+        groups=(R10M, R20M, QUICKLOOK),
+        enable_sharding=False,
+        min_dimension=512,
+    ),
+    ConversionProfile(
+        name="small",
+        hazard=None,
+        max_area_km2=250,
+        spatial_chunk=512,
+        groups=(R10M, QUICKLOOK),
+        enable_sharding=False,
+        min_dimension=512,
+    ),
+    ConversionProfile(
+        name="medium",
+        hazard=None,
+        max_area_km2=5_000,
+        spatial_chunk=1024,
+        groups=(R10M, R20M, QUICKLOOK),
+        enable_sharding=True,
+        min_dimension=256,
+    ),
+    ConversionProfile(
+        name="large",
+        hazard=None,
+        max_area_km2=None,
+        spatial_chunk=2048,
+        groups=(R10M, R20M, R60M, QUICKLOOK),
+        enable_sharding=True,
+        min_dimension=128,
+    ),
+)
+
+
+def select_profile(
+    alert: LoadedAlert,
+    profiles: tuple[ConversionProfile, ...] = DEFAULT_PROFILES,
+) -> tuple[ConversionProfile | None, float | None]:
+    """Return the first profile matching the alert's hazard and geodesic AOI area.
+
+    Profiles are checked in order, so hazard-specific and smaller buckets should
+    precede generic and larger ones.
+    """
+
+    area_km2 = alert.geometry.area_km2
+    if area_km2 is None:
+        return None, None
+    hazard = (alert.model.hazard_type or "").lower()
+    for profile in profiles:
+        if profile.matches(hazard, area_km2):
+            return profile, area_km2
+    return None, area_km2
+
+
+@lru_cache(maxsize=8)
+def load_profiles(path: str) -> tuple[ConversionProfile, ...]:
+    """Read profiles from a JSON list of objects with ``ConversionProfile`` fields."""
+
+    payload = json.loads(Path(path).read_text(encoding="utf-8"))
+    if not isinstance(payload, list) or not payload:
+        raise ValueError(f"{path} must contain a non-empty JSON list of profiles")
+    return tuple(ConversionProfile.from_dict(entry) for entry in payload)
+
+
+def apply_profile(settings: Settings, profile: ConversionProfile) -> Settings:
+    """Overlay ``profile`` on the converter fields the operator left at their defaults.
+
+    Fields set explicitly (``CONVERTER_SPATIAL_CHUNK`` and friends) win over the
+    profile. Groups are the exception: the profile narrows them, but only within
+    ``converter_groups``, so an explicit list acts as an allow-list.
+    """
+
+    explicit = settings.model_fields_set
+    overlay = {
+        "converter_spatial_chunk": profile.spatial_chunk,
+        "converter_enable_sharding": profile.enable_sharding,
+        "converter_min_dimension": profile.min_dimension,
+    }
+    update = {name: value for name, value in overlay.items() if name not in explicit}
+    groups = [group for group in profile.groups if group in settings.converter_groups]
+    update["converter_groups"] = groups or list(settings.converter_groups)
+    return settings.model_copy(update=update)
+
+
+def resolve_conversion_settings(
+    alert: LoadedAlert, settings: Settings
+) -> tuple[Settings, str | None]:
+    """Return the settings to convert ``alert`` with and the chosen profile name."""
+
+    if not settings.converter_profiles_enabled:
+        return settings, None
+    profiles = DEFAULT_PROFILES
+    if settings.converter_profiles_path:
+        profiles = load_profiles(settings.converter_profiles_path)
+    profile, area_km2 = select_profile(alert, profiles)
+    if profile is None:
+        return settings, None
+    LOGGER.info(
+        "Using conversion profile %s for %s alert %s (%.2f km²)",
+        profile.name,
+        alert.model.hazard_type,
+        alert.id,
+        area_km2,
+    )
+    return apply_profile(settings, profile), profile.name
@@ -0,0 +1,96 @@
+"""Prometheus metrics shared by the services, backed by ``prometheus_client``.
+
+``prometheus_client`` is an optional dependency (the ``metrics`` extra). Without
+it, ``Counter``, ``Gauge`` and ``Histogram`` are no-op stand-ins, so instrumented
+code runs unchanged, and only ``start_metrics_server`` refuses to start.
+"""
+
+from __future__ import annotations
+
+import logging
+from collections.abc import Callable, Iterator
+from contextlib import contextmanager
+from typing import Any
+
+LOGGER = logging.getLogger(__name__)
+
+# Prometheus' client defaults, for request/handler latencies.
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+# Conversion stages run from sub-second S3 calls to half-hour GeoZarr writes.
+STAGE_BUCKETS = (0.1, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0, 120.0, 300.0, 600.0, 1800.0)
+
+__all__ = [
+    "Counter",
+    "Gauge",
+    "Histogram",
+    "LATENCY_BUCKETS",
+    "QUEUE_HANDLER_SECONDS",
+    "REGISTRY",
+    "STAGE_BUCKETS",
+    "STATE_STORE_SIZE",
+    "start_metrics_server",
+]
+
+
+class _NoopMetric:
+    """Accepts the ``prometheus_client`` metric API and records nothing."""
+
+    def __init__(self, *args: Any, **kwargs: Any) -> None:
+        pass
+
+    def labels(self, *values: Any, **labelkwargs: Any) -> _NoopMetric:
+        return self
+
+    def inc(self, amount: float = 1.0) -> None:
+        pass
+
+    def dec(self, amount: float = 1.0) -> None:
+        pass
+
+    def set(self, value: float) -> None:
+        pass
+
+    def set_function(self, function: Callable[[], float]) -> None:
+        pass
+
+    def observe(self, value: float) -> None:
+        pass
+
+    @contextmanager
+    def time(self) -> Iterator[None]:
+        yield
+
+
+try:
+    import prometheus_client  # type: ignore
+    from prometheus_client import REGISTRY, Counter, Gauge, Histogram  # type: ignore
+except ImportError:  # pragma: no cover
+    prometheus_client = None  # type: ignore
+    REGISTRY = None  # type: ignore
+    Counter = Gauge = Histogram = _NoopMetric  # type: ignore
+
+
+# Shared by the services that consume RabbitMQ queues and keep an AlertStateStore.
+QUEUE_HANDLER_SECONDS = Histogram(
+    "alertzarr_queue_handler_seconds",
+    "Time to handle one RabbitMQ message, by queue and outcome",
+    ["queue", "outcome"],
+    buckets=(*LATENCY_BUCKETS, 30.0, 60.0, 300.0, 900.0),
+)
+STATE_STORE_SIZE = Gauge(
+    "alertzarr_state_store_alerts",
+    "Alert ids recorded in a processed-alert state store",
+    ["service"],
+)
+
+
+def start_metrics_server(port: int, host: str = "0.0.0.0", registry: Any | None = None):
+    """Serve ``GET /metrics`` from a daemon thread; returns the running server."""
+
+    if prometheus_client is None:
+        raise RuntimeError(
+            "Serving metrics needs prometheus_client: pip install 'alertzarr[metrics]'"
+        )
+    server, _ = prometheus_client.start_http_server(port, addr=host, registry=registry or REGISTRY)
+    LOGGER.info("Serving Prometheus metrics on http://%s:%s/metrics", host, server.server_port)
+    return server
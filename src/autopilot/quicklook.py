@@ -0,0 +1,255 @@
+"""Static quicklook images and low-zoom tiles rendered from written GeoZarr stores."""
+
+from __future__ import annotations
+
+import io
+import logging
+import math
+import struct
+import zlib
+from collections.abc import Sequence
+from dataclasses import dataclass
+
+import numpy as np
+import zarr
+from eopf_geozarr.conversion.fs_utils import open_zarr_group
+from pyproj import CRS, Transformer
+
+from .tiles import WEB_MERCATOR_HALF_WORLD, mercator_tile_bounds, tiles_for_bbox
+
+LOGGER = logging.getLogger(__name__)
+
+RGB_BANDS = ("b04", "b03", "b02")
+TILE_SIZE = 256
+
+__all__ = [
+    "RGB_BANDS",
+    "RenderedImage",
+    "encode_image",
+    "encode_png",
+    "render_quicklook",
+    "render_tiles",
+    "tile_set_for_bbox",
+]
+
+
+@dataclass
+class RenderedImage:
+    body: bytes
+    content_type: str
+    extension: str
+
+
+@dataclass
+class _Level:
+    group: zarr.Group
+    cell_size: float
+    transform: tuple[float, ...]
+    crs: CRS
+    shape: tuple[int, int]
+
+
+def render_quicklook(
+    store_path: str,
+    groups: Sequence[str],
+    *,
+    max_size: int = 512,
+) -> tuple[np.ndarray, tuple[np.ndarray, np.ndarray]] | None:
+    """Render a true-colour RGBA quicklook from the coarsest overview level.
+
+    Returns the image and the per-band stretch limits so tiles rendered from
+    the same store share its colour balance; ``None`` when no group carries
+    the red, green and blue bands.
+    """
+
+    levels = _rgb_levels(store_path, groups)
+    if not levels:
+        return None
+    coarsest = levels[-1]
+    rgb = _read_rgb(coarsest.group, slice(None), slice(None))
+    step = max(math.ceil(max(rgb.shape[:2]) / max_size), 1)
+    rgb = rgb[::step, ::step]
+    limits = _stretch_limits(rgb)
+    return _to_rgba(rgb, limits), limits
+
+
+def tile_set_for_bbox(
+    bbox: Sequence[float], zoom_levels: int, max_tiles: int
+) -> list[tuple[int, int, int]]:
+    """Pick WebMercatorQuad tiles for the AOI, starting where it fits in one tile."""
+
+    if zoom_levels <= 0:
+        return []
+    start = 0
+    while start < 22 and len(tiles_for_bbox(bbox, start + 1, "WebMercatorQuad")) == 1:
+        start += 1
+    selected: list[tuple[int, int, int]] = []
+    for zoom in range(start, start + zoom_levels):
+        tiles = tiles_for_bbox(bbox, zoom, "WebMercatorQuad")
+        if len(selected) + len(tiles) > max_tiles:
+            break
+        selected.extend(tiles)
+    return selected
+
+
+def render_tiles(
+    store_path: str,
+    groups: Sequence[str],
+    tiles: Sequence[tuple[int, int, int]],
+    limits: tuple[np.ndarray, np.ndarray],
+) -> dict[tuple[int, int, int], np.ndarray]:
+    """Render WebMercatorQuad RGBA tiles, sampling the overview nearest each zoom.
+
+    Each zoom reads only the window of its chosen level that the tiles cover.
+    """
+
+    levels = _rgb_levels(store_path, groups)
+    if not levels or not tiles:
+        return {}
+    rendered: dict[tuple[int, int, int], np.ndarray] = {}
+    for zoom in sorted({z for z, _, _ in tiles}):
+        zoom_tiles = [tile for tile in tiles if tile[0] == zoom]
+        resolution = 2 * WEB_MERCATOR_HALF_WORLD / (TILE_SIZE * 2**zoom)
+        # Coarsest level still at least as fine as the tile pixels.
+        level = next(
+            (lvl for lvl in reversed(levels) if lvl.cell_size <= resolution),
+            levels[0],
+        )
+        to_native = Transformer.from_crs(3857, level.crs, always_xy=True)
+        bounds = [mercator_tile_bounds(*tile) for tile in zoom_tiles]
+        window = to_native.transform_bounds(
+            min(b[0] for b in bounds),
+            min(b[1] for b in bounds),
+            max(b[2] for b in bounds),
+            max(b[3] for b in bounds),
+        )
+        rows, cols = _window(level, window)
+        if rows.stop <= rows.start or cols.stop <= cols.start:
+            continue
+        rgb = _read_rgb(level.group, rows, cols)
+        for tile, (minx, _, maxx, maxy) in zip(zoom_tiles, bounds, strict=True):
+            pixel = (maxx - minx) / TILE_SIZE
+            centres = np.arange(TILE_SIZE) + 0.5
+            xs, ys = np.meshgrid(minx + centres * pixel, maxy - centres * pixel)
+            nx, ny = to_native.transform(xs, ys)
+            x0, dx, _, y0, _, dy = level.transform
+            col = np.floor((nx - x0) / dx).astype(int) - cols.start
+            row = np.floor((ny - y0) / dy).astype(int) - rows.start
+            inside = (row >= 0) & (row < rgb.shape[0]) & (col >= 0) & (col < rgb.shape[1])
+            sampled = np.full((TILE_SIZE, TILE_SIZE, 3), np.nan)
+            sampled[inside] = rgb[row[inside], col[inside]]
+            rendered[tile] = _to_rgba(sampled, limits)
+    return rendered
+
+
+def encode_image(image: np.ndarray, image_format: str = "png") -> RenderedImage:
+    """Encode ``image`` as PNG, or WebP when requested and Pillow is installed."""
+
+    if image_format == "webp":
+        try:
+            from PIL import Image
+        except ImportError:
+            LOGGER.info("Pillow is not installed; writing PNG quicklooks instead of WebP")
+        else:
+            buffer = io.BytesIO()
+            Image.fromarray(image).save(buffer, format="WEBP", quality=80)
+            return RenderedImage(buffer.getvalue(), "image/webp", "webp")
+    return RenderedImage(encode_png(image), "image/png", "png")
+
+
+def encode_png(image: np.ndarray) -> bytes:
+    """Encode an ``(H, W, 3|4)`` uint8 array as PNG using only the standard library."""
+
+    height, width, channels = image.shape
+    colour_type = {3: 2, 4: 6}[channels]
+    rows = np.ascontiguousarray(image, dtype=np.uint8).reshape(height, width * channels)
+    raw = np.hstack([np.zeros((height, 1), dtype=np.uint8), rows]).tobytes()
+
+    def chunk(tag: bytes, data: bytes) -> bytes:
+        payload = tag + data
+        return struct.pack(">I", len(data)) + payload + struct.pack(">I", zlib.crc32(payload))
+
+    header = struct.pack(">IIBBBBB", width, height, 8, colour_type, 0, 0, 0)
+    return (
+        b"\x89PNG\r\n\x1a\n"
+        + chunk(b"IHDR", header)
+        + chunk(b"IDAT", zlib.compress(raw, 6))
+        + chunk(b"IEND", b"")
+    )
+
+
+def _rgb_levels(store_path: str, groups: Sequence[str]) -> list[_Level]:
+    """Return the overview levels, finest first, of the first group with RGB bands."""
+
+    root = open_zarr_group(store_path, mode="r")
+    for group_path in groups:
+        try:
+            group = root[group_path.strip("/")]
+        except KeyError:
+            continue
+        matrices = (
+            group.attrs.get("multiscales", {}).get("tile_matrix_set", {}).get("tileMatrices", [])
+        )
+        levels: list[_Level] = []
+        for matrix in matrices:
+            level_group = group[matrix["id"]]
+            if not all(band in level_group for band in RGB_BANDS):
+                break
+            spatial_ref = level_group["spatial_ref"].attrs
+            transform = tuple(float(v) for v in str(spatial_ref["GeoTransform"]).split())
+            levels.append(
+                _Level(
+                    group=level_group,
+                    cell_size=float(matrix["cellSize"]),
+                    transform=transform,
+                    crs=CRS.from_wkt(spatial_ref["crs_wkt"]),
+                    shape=tuple(level_group[RGB_BANDS[0]].shape[-2:]),
+                )
+            )
+        if levels:
+            return levels
+    return []
+
+
+def _window(level: _Level, bounds: Sequence[float]) -> tuple[slice, slice]:
+    x0, dx, _, y0, _, dy = level.transform
+    minx, miny, maxx, maxy = bounds
+    col_start = max(math.floor((minx - x0) / dx), 0)
+    col_stop = min(math.ceil((maxx - x0) / dx), level.shape[1])
+    row_start = max(math.floor((maxy - y0) / dy), 0)
+    row_stop = min(math.ceil((miny - y0) / dy), level.shape[0])
+    return slice(row_start, row_stop), slice(col_start, col_stop)
+
+
+def _read_rgb(group: zarr.Group, rows: slice, cols: slice) -> np.ndarray:
+    bands = []
+    for name in RGB_BANDS:
+        array = group[name]
+        window = (0,) * (array.ndim - 2) + (rows, cols)
+        values = np.asarray(array[window], dtype="float64")
+        fill = array.fill_value
+        if fill is not None and not (isinstance(fill, float) and math.isnan(fill)):
+            values[values == fill] = np.nan
+        values[values <= 0] = np.nan
+        bands.append(values)
+    return np.stack(bands, axis=-1)
+
+
+def _stretch_limits(rgb: np.ndarray) -> tuple[np.ndarray, np.ndarray]:
+    low = np.full(3, 0.0)
+    high = np.full(3, 1.0)
+    for band in range(3):
+        values = rgb[..., band]
+        values = values[np.isfinite(values)]
+        if values.size:
+            low[band], high[band] = np.percentile(values, (2, 98))
+    high = np.where(high > low, high, low + 1)
+    return low, high
+
+
+def _to_rgba(rgb: np.ndarray, limits: tuple[np.ndarray, np.ndarray]) -> np.ndarray:
+    low, high = limits
+    valid = np.isfinite(rgb).all(axis=-1)
+    scaled = np.clip((np.nan_to_num(rgb) - low) / (high - low), 0, 1) * 255
+    alpha = np.where(valid, 255, 0)[..., None]
+    return np.concatenate([scaled, alpha], axis=-1).astype(np.uint8)
@@ -2,21 +2,89 @@
 
 from __future__ import annotations
 
+import itertools
 import json
+import os
+import threading
 import time
 import uuid
-from dataclasses import dataclass, field
+from contextlib import AbstractContextManager, nullcontext
+from contextvars import ContextVar, Token
+from dataclasses import asdict, dataclass, field
 from datetime import datetime, timezone
 from pathlib import Path
-from typing import Any
-
-from pyproj import Geod
-from shapely.geometry import shape
+from typing import TYPE_CHECKING, Any
 
 from .alerts import LoadedAlert
-from .geozarr import ConversionOutput
+from .geometry import alert_geometry, geodesic_area_km2
+from .metrics_sink import get_metrics_sink
+
+if TYPE_CHECKING:
+    from .geozarr import ConversionOutput
+    from .warmup import WarmupResult
 
-GEOD = Geod(ellps="WGS84")
+# The reporter of the run executing in this context and the innermost open span
+# id; copied into tasks and ``asyncio.to_thread`` workers, so stages deep in
+# geozarr/stac can open nested spans without a reporter being passed down.
+_ACTIVE_SPAN: ContextVar[tuple[RunReporter, int | None] | None] = ContextVar(
+    "alertzarr_active_span", default=None
+)
+
+
+@dataclass
+class Span:
+    span_id: int
+    name: str
+    parent_id: int | None
+    start_seconds: float
+    thread_id: int
+    duration_seconds: float = 0.0
+    attributes: dict[str, Any] = field(default_factory=dict)
+
+    def as_dict(self) -> dict[str, Any]:
+        payload = asdict(self)
+        payload["start_seconds"] = round(self.start_seconds, 6)
+        payload["duration_seconds"] = round(self.duration_seconds, 6)
+        return payload
+
+
+class _SpanScope:
+    """Times one span; usable with ``with`` and ``async with``."""
+
+    def __init__(self, reporter: RunReporter, name: str, attributes: dict[str, Any]) -> None:
+        self.reporter = reporter
+        self.name = name
+        self.attributes = attributes
+        self.span: Span | None = None
+        self._token: Token | None = None
+
+    def __enter__(self) -> Span:
+        active = _ACTIVE_SPAN.get()
+        parent_id = active[1] if active is not None and active[0] is self.reporter else None
+        self.span = self.reporter._open_span(self.name, parent_id, self.attributes)
+        self._token = _ACTIVE_SPAN.set((self.reporter, self.span.span_id))
+        return self.span
+
+    def __exit__(self, exc_type, exc, tb) -> None:
+        _ACTIVE_SPAN.reset(self._token)
+        if exc_type is not None:
+            self.span.attributes["error"] = exc_type.__name__
+        self.reporter._close_span(self.span)
+
+    async def __aenter__(self) -> Span:
+        return self.__enter__()
+
+    async def __aexit__(self, exc_type, exc, tb) -> None:
+        self.__exit__(exc_type, exc, tb)
+
+
+def span(name: str, **attributes: Any) -> AbstractContextManager:
+    """Open a span on the run active in this context; a no-op outside a run."""
+
+    active = _ACTIVE_SPAN.get()
+    if active is None:
+        return nullcontext()
+    return active[0].span(name, **attributes)
 
 
 @dataclass
@@ -27,16 +95,56 @@ class RunReporter:
     alert_id: str | None = field(default=None, init=False)
     steps: dict[str, Any] = field(default_factory=dict, init=False)
     status: str = field(default="initialized", init=False)
+    spans: list[Span] = field(default_factory=list, init=False)
+    _origin: float = field(default_factory=time.perf_counter, init=False, repr=False)
+    _span_ids: Any = field(default_factory=itertools.count, init=False, repr=False)
+    _span_lock: Any = field(default_factory=threading.Lock, init=False, repr=False)
+    _context_token: Token | None = field(default=None, init=False, repr=False)
 
     def start_run(self) -> None:
         self.run_id = self.run_id or uuid.uuid4().hex
         self.started_at = time.time()
+        self._origin = time.perf_counter()
         self.status = "running"
+        self._context_token = _ACTIVE_SPAN.set((self, None))
+
+    def span(self, name: str, **attributes: Any) -> _SpanScope:
+        """Time a stage: ``with reporter.span("scene_search"):`` or ``async with``.
+
+        Spans opened while another is open in the same context (including
+        worker threads started with ``asyncio.to_thread``) become its children.
+        """
+
+        return _SpanScope(self, name, attributes)
+
+    def stage_seconds(self) -> dict[str, float]:
+        """Total closed-span time per span name."""
+
+        totals: dict[str, float] = {}
+        for recorded in self.spans:
+            totals[recorded.name] = totals.get(recorded.name, 0.0) + recorded.duration_seconds
+        return {name: round(seconds, 3) for name, seconds in totals.items()}
+
+    def _open_span(self, name: str, parent_id: int | None, attributes: dict[str, Any]) -> Span:
+        with self._span_lock:
+            span_id = next(self._span_ids)
+        return Span(
+            span_id=span_id,
+            name=name,
+            parent_id=parent_id,
+            start_seconds=time.perf_counter() - self._origin,
+            thread_id=threading.get_ident(),
+            attributes=dict(attributes),
+        )
+
+    def _close_span(self, recorded: Span) -> None:
+        recorded.duration_seconds = time.perf_counter() - self._origin - recorded.start_seconds
+        with self._span_lock:
+            self.spans.append(recorded)
 
     def record_alert(self, alert: LoadedAlert) -> None:
         self.alert_id = alert.id
-        geometry = getattr(alert.model, "area_of_interest", None)
-        area_km2 = _area_km2(geometry) if geometry else None
+        area_km2 = alert_geometry(alert).area_km2
         self.steps["alert"] = {
             "id": alert.id,
             "issued": alert.model.issued,
@@ -53,8 +161,19 @@ class RunReporter:
             "s3_uri": output.s3_uri,
             "duration_seconds": round(output.duration_seconds, 2),
             "bytes_written": output.bytes_written,
-            "mode": "real" if output.key.endswith(".zarr") else "simulate",
+            "mode": _conversion_mode(output),
         }
+        if output.process_peak_rss_bytes is not None:
+            conversion = self.steps["conversion"]
+            conversion["process_peak_rss_bytes"] = output.process_peak_rss_bytes
+        if output.hazard_indices:
+            self.steps["conversion"]["hazard_indices"] = list(output.hazard_indices)
+        if output.time_steps:
+            self.steps["conversion"]["time_steps"] = list(output.time_steps)
+        if output.lineage_id:
+            self.steps["conversion"]["lineage_id"] = output.lineage_id
+        if output.profile:
+            self.steps["conversion"]["profile"] = output.profile
         if output.scenes:
             self.steps["conversion"].update(
                 {
@@ -84,23 +203,42 @@ class RunReporter:
             "href": self_href,
         }
 
+    def record_scene_search_cache(self, stats: dict[str, Any]) -> None:
+        self.steps["scene_search_cache"] = stats
+
+    def record_viewer_warmup(self, result: WarmupResult) -> None:
+        self.steps["viewer_warmup"] = result.summary()
+
     def finish_run(self) -> None:
         self.finished_at = time.time()
         if self.status != "failed":
             self.status = "succeeded"
+        if self._context_token is not None:
+            try:
+                _ACTIVE_SPAN.reset(self._context_token)
+            except ValueError:  # finished from a different context than it started in
+                pass
+            self._context_token = None
 
     def summary(self) -> dict[str, Any]:
         if self.finished_at and self.started_at:
             duration = self.finished_at - self.started_at
         else:
             duration = 0.0
-        return {
+        summary = {
             "run_id": self.run_id,
             "alert_id": self.alert_id,
             "duration_seconds": round(duration, 2),
             "steps": self.steps,
             "status": self.status,
         }
+        if self.spans:
+            summary["stage_seconds"] = self.stage_seconds()
+            summary["spans"] = [
+                recorded.as_dict()
+                for recorded in sorted(self.spans, key=lambda item: item.start_seconds)
+            ]
+        return summary
 
     def persist(self, directory: Path) -> Path:
         directory.mkdir(parents=True, exist_ok=True)
@@ -109,7 +247,8 @@ class RunReporter:
         return path
 
     def emit_metrics(self, metrics_path: Path) -> Path:
-        metrics_path.parent.mkdir(parents=True, exist_ok=True)
+        """Queue this run's metrics line on the shared buffered sink for ``metrics_path``."""
+
         entry = {
             "timestamp": datetime.now(timezone.utc).isoformat(),
             "run_id": self.run_id,
@@ -120,15 +259,72 @@ class RunReporter:
             "source_scene_count": self.steps.get("conversion", {}).get(
                 "source_scene_count", 0
             ),
+            "process_peak_rss_bytes": self.steps.get("conversion", {}).get(
+                "process_peak_rss_bytes"
+            ),
+            "scene_cache_hit_rate": self.steps.get("scene_search_cache", {}).get("hit_rate"),
+            "stage_seconds": self.stage_seconds(),
         }
-        with metrics_path.open("a", encoding="utf-8") as fp:
-            fp.write(json.dumps(entry) + "\n")
+        get_metrics_sink(metrics_path).emit(entry)
         return metrics_path
 
+    def export_chrome_trace(self, path: Path) -> Path:
+        """Write the spans as Chrome trace-event JSON (chrome://tracing, Perfetto, speedscope)."""
+
+        pid = os.getpid()
+        threads = sorted({recorded.thread_id for recorded in self.spans})
+        events: list[dict[str, Any]] = [
+            {
+                "name": "process_name",
+                "ph": "M",
+                "pid": pid,
+                "args": {"name": f"alertzarr run {self.run_id}"},
+            }
+        ]
+        for index, thread_id in enumerate(threads):
+            events.append(
+                {
+                    "name": "thread_name",
+                    "ph": "M",
+                    "pid": pid,
+                    "tid": thread_id,
+                    "args": {"name": "main" if index == 0 else f"worker-{index}"},
+                }
+            )
+        for recorded in sorted(self.spans, key=lambda item: item.start_seconds):
+            events.append(
+                {
+                    "name": recorded.name,
+                    "cat": "alertzarr",
+                    "ph": "X",
+                    "ts": round(recorded.start_seconds * 1_000_000, 1),
+                    "dur": round(recorded.duration_seconds * 1_000_000, 1),
+                    "pid": pid,
+                    "tid": recorded.thread_id,
+                    "args": {
+                        "span_id": recorded.span_id,
+                        "parent_id": recorded.parent_id,
+                        **recorded.attributes,
+                    },
+                }
+            )
+        trace = {
+            "traceEvents": events,
+            "displayTimeUnit": "ms",
+            "otherData": {"run_id": self.run_id, "alert_id": self.alert_id},
+        }
+        path.parent.mkdir(parents=True, exist_ok=True)
+        path.write_text(json.dumps(trace, default=str), encoding="utf-8")
+        return path
+
+
+def _conversion_mode(output: ConversionOutput) -> str:
+    if output.synthetic:
+        return "synthetic"
+    return "real" if output.key.endswith(".zarr") else "simulate"
+
 
 def _area_km2(geometry: dict[str, Any]) -> float | None:
     if not geometry:
         return None
-    geom = shape(geometry)
-    area, _ = GEOD.geometry_area_perimeter(geom)
-    return round(abs(area) / 1_000_000, 2)
+    return geodesic_area_km2(geometry)
@@ -0,0 +1,157 @@
+"""Process-wide S3 clients for the configured MinIO endpoint."""
+
+from __future__ import annotations
+
+import asyncio
+import logging
+import threading
+import weakref
+from contextlib import AsyncExitStack
+from typing import Any
+
+import boto3
+from aiobotocore.config import AioConfig
+from aiobotocore.session import get_session
+from botocore.config import Config
+from botocore.exceptions import ClientError
+
+from .settings import Settings, get_settings
+
+LOGGER = logging.getLogger(__name__)
+
+# MinIO and S3 answer a failed If-Match/If-None-Match with 412, concurrent
+# conditional writes to the same key with 409.
+_CONFLICT_CODES = {"PreconditionFailed", "412", "ConditionalRequestConflict", "409"}
+
+__all__ = [
+    "S3ClientManager",
+    "close_s3_clients",
+    "get_s3_manager",
+    "is_write_conflict",
+]
+
+
+class S3ClientManager:
+    """Hands out one sync boto3 client and one aiobotocore client per event loop.
+
+    Both clients share the endpoint, credentials and connection-pool size, so a
+    run pays for client construction (service model loading, TLS/HTTP pool
+    setup) once instead of for every upload. boto3 clients are thread-safe and
+    are shared across threads; aiobotocore clients are bound to the loop that
+    created them.
+    """
+
+    def __init__(
+        self,
+        endpoint: str,
+        access_key: str,
+        secret_key: str,
+        region: str,
+        *,
+        max_pool_connections: int = 32,
+    ) -> None:
+        self.endpoint = endpoint
+        self.region = region
+        self.max_pool_connections = max_pool_connections
+        self._credentials = {
+            "aws_access_key_id": access_key,
+            "aws_secret_access_key": secret_key,
+        }
+        self._lock = threading.Lock()
+        self._sync_client: Any | None = None
+        self._async_clients: weakref.WeakKeyDictionary[
+            asyncio.AbstractEventLoop, tuple[AsyncExitStack, Any]
+        ] = weakref.WeakKeyDictionary()
+
+    @classmethod
+    def from_settings(cls, settings: Settings) -> S3ClientManager:
+        return cls(
+            settings.minio_endpoint,
+            settings.minio_access_key,
+            settings.minio_secret_key,
+            settings.minio_region,
+            max_pool_connections=settings.s3_max_pool_connections,
+        )
+
+    def sync_client(self):
+        with self._lock:
+            if self._sync_client is None:
+                self._sync_client = boto3.client(
+                    "s3",
+                    endpoint_url=self.endpoint,
+                    region_name=self.region,
+                    config=Config(max_pool_connections=self.max_pool_connections),
+                    **self._credentials,
+                )
+            return self._sync_client
+
+    async def async_client(self):
+        loop = asyncio.get_running_loop()
+        entry = self._async_clients.get(loop)
+        if entry is None:
+            stack = AsyncExitStack()
+            client = await stack.enter_async_context(
+                get_session().create_client(
+                    "s3",
+                    endpoint_url=self.endpoint,
+                    region_name=self.region,
+                    config=AioConfig(max_pool_connections=self.max_pool_connections),
+                    **self._credentials,
+                )
+            )
+            # Another task may have created one while this one was awaiting.
+            entry = self._async_clients.setdefault(loop, (stack, client))
+            if entry[1] is not client:
+                await stack.aclose()
+        return entry[1]
+
+    async def aclose(self) -> None:
+        """Close the running loop's async client and the sync client."""
+
+        entry = self._async_clients.pop(asyncio.get_running_loop(), None)
+        if entry is not None:
+            await entry[0].aclose()
+        self.close()
+
+    def close(self) -> None:
+        with self._lock:
+            client, self._sync_client = self._sync_client, None
+        if client is not None:
+            client.close()
+
+
+def get_s3_manager(settings: Settings | None = None) -> S3ClientManager:
+    """Return the shared manager for the MinIO endpoint configured in ``settings``."""
+
+    settings = settings or get_settings()
+    key = (
+        settings.minio_endpoint,
+        settings.minio_access_key,
+        settings.minio_secret_key,
+        settings.minio_region,
+        settings.s3_max_pool_connections,
+    )
+    with _MANAGERS_LOCK:
+        manager = _MANAGERS.get(key)
+        if manager is None:
+            manager = _MANAGERS[key] = S3ClientManager.from_settings(settings)
+    return manager
+
+
+def is_write_conflict(exc: ClientError) -> bool:
+    """Whether a conditional write failed because the object changed underneath it."""
+
+    return exc.response.get("Error", {}).get("Code") in _CONFLICT_CODES
+
+
+async def close_s3_clients() -> None:
+    """Close every shared client; call before the event loop shuts down."""
+
+    with _MANAGERS_LOCK:
+        managers = list(_MANAGERS.values())
+    for manager in managers:
+        await manager.aclose()
+
+
+_MANAGERS: dict[tuple[Any, ...], S3ClientManager] = {}
+_MANAGERS_LOCK = threading.Lock()
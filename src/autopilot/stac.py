@@ -2,17 +2,36 @@
 
 from __future__ import annotations
 
-import json
+import asyncio
+import hashlib
+import logging
+from collections import Counter
+from collections.abc import Iterable
+from dataclasses import dataclass
 from datetime import datetime
-from typing import Any
+from functools import lru_cache
+from typing import Any, Literal
 
-from aiobotocore.session import get_session
-from shapely.geometry import shape
+import orjson
+from botocore.exceptions import ClientError
 
 from .alerts import LoadedAlert
 from .catalog import SceneSummary
+from .geometry import alert_geometry
 from .geozarr import ConversionOutput
-from .settings import get_settings
+from .pgstac import get_pgstac_ingestor
+from .reporting import span
+from .s3 import get_s3_manager, is_write_conflict
+from .settings import Settings, get_settings
+from .stac_collections import CollectionMaintainer
+from .stac_parquet import get_stac_parquet_index
+
+LOGGER = logging.getLogger(__name__)
+
+DEFAULT_COLLECTION = "alertzarr-disasters"
+HASH_METADATA_KEY = "content-sha256"
+CREATED_METADATA_KEY = "created"
+VOLATILE_PROPERTIES = ("created", "updated")
 
 
 def build_stac_item(
@@ -21,143 +40,381 @@ def build_stac_item(
     bucket: str,
     public_base_url: str | None = None,
 ) -> dict[str, Any]:
-    geometry = alert.model.area_of_interest
-    geom = shape(geometry)
-    bbox = list(geom.bounds)
-    collection_id = output.collection_id or "alertzarr-disasters"
-    item_id = output.item_id or f"{alert.id}-geozarr"
+    return build_stac_items([(alert, output)], bucket, public_base_url)[0]
+
+
+def build_stac_items(
+    pairs: Iterable[tuple[LoadedAlert, ConversionOutput]],
+    bucket: str,
+    public_base_url: str | None = None,
+) -> list[dict[str, Any]]:
+    """Build one STAC item per ``(alert, output)``, sharing templates and timestamp.
+
+    Backfills regenerate tens of thousands of items; the link and asset dicts
+    that only depend on the bucket, base URL and collection are prepared once
+    per collection and shallow-copied into each item.
+    """
+
     now = datetime.utcnow().isoformat() + "Z"
-    is_zarr_store = output.key.endswith(".zarr")
+    return [
+        _build_item(
+            alert, output, _item_templates(bucket, public_base_url, output.collection_id), now
+        )
+        for alert, output in pairs
+    ]
+
+
+@dataclass(frozen=True)
+class _ItemTemplates:
+    self_prefix: str
+    collection_link: dict[str, str] | None
+    root_link: dict[str, str] | None
+
+
+@lru_cache(maxsize=256)
+def _item_templates(
+    bucket: str, public_base_url: str | None, collection_id: str | None
+) -> _ItemTemplates:
+    collection_id = collection_id or DEFAULT_COLLECTION
+    if not public_base_url:
+        return _ItemTemplates(f"s3://{bucket}/items/", None, None)
+    base = public_base_url.rstrip("/")
+    return _ItemTemplates(
+        f"{base}/items/",
+        {
+            "rel": "collection",
+            "href": f"{base}/collections/{collection_id}.json",
+            "type": "application/json",
+        },
+        {"rel": "root", "href": base, "type": "application/json"},
+    )
+
+
+_ZARR_ASSET = {"type": "application/vnd+zarr", "roles": ["data", "zarr"]}
+_JSON_ASSET = {"type": "application/json", "roles": ["data"]}
+
+
+def _build_item(
+    alert: LoadedAlert, output: ConversionOutput, templates: _ItemTemplates, now: str
+) -> dict[str, Any]:
+    aoi = alert_geometry(alert)
+    item_id = output.item_id or f"{alert.id}-geozarr"
+    template = _ZARR_ASSET if output.key.endswith(".zarr") else _JSON_ASSET
     assets: dict[str, Any] = {
-        "geozarr": {
+        "geozarr": {"href": output.s3_uri, "type": template["type"], "roles": [*template["roles"]]}
+    }
+    if output.zarr_group:
+        # Lineage stores keep each scene in a child group under an empty root.
+        assets["geozarr"]["href"] = f"{output.s3_uri.rstrip('/')}/{output.zarr_group}"
+        assets["lineage-store"] = {
             "href": output.s3_uri,
-            "type": "application/vnd+zarr" if is_zarr_store else "application/json",
-            "roles": ["data", "zarr"] if is_zarr_store else ["data"],
+            "type": template["type"],
+            "roles": [*template["roles"]],
+            "title": "Lineage store with one child group per scene",
+        }
+    links: list[dict[str, Any]] = [
+        {
+            "rel": "self",
+            "href": f"{templates.self_prefix}{item_id}.json",
+            "type": "application/json",
+        }
+    ]
+    if templates.collection_link is not None:
+        links.append(dict(templates.collection_link))
+        links.append(dict(templates.root_link))
+
+    if output.viewer:
+        viewer = output.viewer
+        tilejson_title = f"TileJSON ({viewer.tile_matrix_set})"
+        assets["viewer"] = {
+            "href": viewer.viewer_url,
+            "type": "text/html",
+            "roles": ["overview", "metadata"],
+            "title": "Interactive TiTiler viewer",
+        }
+        assets["tilejson"] = {
+            "href": viewer.tilejson_url,
+            "type": "application/json",
+            "roles": ["metadata", "tilejson"],
+            "title": tilejson_title,
         }
-    }
-    key = f"items/{item_id}.json"
-    links: list[dict[str, Any]] = []
-    if public_base_url:
-        base = public_base_url.rstrip("/")
-        links.append(
-            {
-                "rel": "self",
-                "href": f"{base}/items/{item_id}.json",
-                "type": "application/json",
-            }
-        )
         links.append(
             {
-                "rel": "collection",
-                "href": f"{base}/collections/{collection_id}.json",
-                "type": "application/json",
+                "rel": "preview",
+                "href": viewer.viewer_url,
+                "type": "text/html",
+                "title": "TiTiler viewer",
             }
         )
         links.append(
             {
-                "rel": "root",
-                "href": base,
+                "rel": "tilejson",
+                "href": viewer.tilejson_url,
                 "type": "application/json",
+                "title": tilejson_title,
             }
         )
-    else:
         links.append(
             {
-                "rel": "self",
-                "href": f"s3://{bucket}/{key}",
+                "rel": "info",
+                "href": viewer.info_url,
                 "type": "application/json",
+                "title": "TiTiler dataset metadata",
             }
         )
 
-    if output.viewer:
-        assets["viewer"] = {
-            "href": output.viewer.viewer_url,
-            "type": "text/html",
-            "roles": ["overview", "metadata"],
-            "title": "Interactive TiTiler viewer",
+    if output.thumbnail_href:
+        assets["thumbnail"] = {
+            "href": output.thumbnail_href,
+            "type": _image_type(output.thumbnail_href),
+            "roles": ["thumbnail"],
+            "title": "True-colour quicklook",
         }
-        assets["tilejson"] = {
-            "href": output.viewer.tilejson_url,
-            "type": "application/json",
-            "roles": ["metadata", "tilejson"],
-            "title": f"TileJSON ({output.viewer.tile_matrix_set})",
+    if output.overview_href:
+        assets["overview"] = {
+            "href": output.overview_href,
+            "type": _image_type(output.overview_href),
+            "roles": ["overview", "tiles"],
+            "title": "Pre-rendered WebMercatorQuad tiles ({z}/{x}/{y})",
         }
-        links.extend(
-            [
-                {
-                    "rel": "preview",
-                    "href": output.viewer.viewer_url,
-                    "type": "text/html",
-                    "title": "TiTiler viewer",
-                },
-                {
-                    "rel": "tilejson",
-                    "href": output.viewer.tilejson_url,
-                    "type": "application/json",
-                    "title": f"TileJSON ({output.viewer.tile_matrix_set})",
-                },
-                {
-                    "rel": "info",
-                    "href": output.viewer.info_url,
-                    "type": "application/json",
-                    "title": "TiTiler dataset metadata",
-                },
-            ]
-        )
 
     if output.scenes:
         assets.update(_scene_assets(output.scenes))
         links.extend(_scene_links(output.scenes))
 
+    properties: dict[str, Any] = {
+        "datetime": alert.model.issued,
+        "created": now,
+        "alert:severity": alert.model.severity,
+        "alert:hazard": alert.model.hazard_type,
+        "source:scene_count": len(output.scenes),
+    }
+    if output.hazard_indices:
+        properties["alertzarr:indices"] = list(output.hazard_indices)
+    if output.lineage_id:
+        properties["alertzarr:lineage"] = output.lineage_id
+        properties["updated"] = now
+    if len(output.time_steps) > 1:
+        properties["start_datetime"] = min(output.time_steps)
+        properties["end_datetime"] = max(output.time_steps)
+
     return {
         "type": "Feature",
         "stac_version": "1.0.0",
         "id": item_id,
-        "collection": collection_id,
+        "collection": output.collection_id or DEFAULT_COLLECTION,
         "description": alert.model.description,
-        "geometry": geometry,
-        "bbox": bbox,
-        "properties": {
-            "datetime": alert.model.issued,
-            "created": now,
-            "alert:severity": alert.model.severity,
-            "alert:hazard": alert.model.hazard_type,
-            "source:scene_count": len(output.scenes),
-        },
+        "geometry": aoi.repaired_geojson,
+        "bbox": list(aoi.bounds or ()),
+        "properties": properties,
         "assets": assets,
         "links": links,
     }
 
 
+def encode_stac_item(item: dict[str, Any]) -> bytes:
+    """Serialise an item for upload (orjson: compact UTF-8, several times faster than json)."""
+
+    return orjson.dumps(item)
+
+
 async def create_stac_item(
     alert: LoadedAlert, output: ConversionOutput
 ) -> dict[str, Any]:
     settings = get_settings()
-    stac_item = build_stac_item(
-        alert,
-        output,
-        settings.stac_bucket,
-        public_base_url=settings.stac_public_base_url,
+    with span("stac_build"):
+        stac_item = build_stac_item(
+            alert,
+            output,
+            settings.stac_bucket,
+            public_base_url=settings.stac_public_base_url,
+        )
+    if settings.stac_backend == "pgstac":
+        async with span("pgstac_ingest"):
+            await asyncio.to_thread(get_pgstac_ingestor().ingest, [stac_item])
+        return stac_item
+    (result,) = await publish_stac_items([stac_item], settings=settings)
+    if result.status == "failed":
+        raise RuntimeError(f"Failed to publish STAC item {result.item_id}: {result.error}")
+    return stac_item
+
+
+async def publish_stac_items(
+    items: list[dict[str, Any]],
+    *,
+    settings: Settings | None = None,
+    publisher: StacPublisher | None = None,
+) -> list[PublishResult]:
+    """Publish ``items`` to the STAC bucket and update the derived catalogs once per batch.
+
+    Items whose content is unchanged are not rewritten; their ``created`` property
+    is reset in place to the published value. Collections, the GeoParquet index and
+    (with ``STAC_BACKEND=both``) pgstac only see the items that were written.
+    """
+
+    settings = settings or get_settings()
+    publisher = publisher or StacPublisher(
+        settings.stac_bucket, concurrency=settings.stac_publish_concurrency
     )
+    async with span("stac_put", items=len(items)):
+        results = await publisher.publish_many(items)
+    written: list[tuple[dict[str, Any], bool]] = []
+    for item, result in zip(items, results, strict=True):
+        if result.status == "skipped" and result.created:
+            item["properties"]["created"] = result.created
+        elif result.status == "written":
+            written.append((item, result.new))
+    if not written:
+        return results
+    if settings.stac_collections_enabled:
+        try:
+            async with span("collection_update"):
+                await CollectionMaintainer.from_settings(settings).record_items(written)
+        except Exception as exc:  # the items are published; `alertzarr-stac rebuild` repairs
+            LOGGER.warning("Failed to update collections for %s item(s): %s", len(written), exc)
+    written_items = [item for item, _ in written]
+    if settings.stac_parquet_index_enabled:
+        try:
+            async with span("parquet_index"):
+                await asyncio.to_thread(get_stac_parquet_index().append, written_items)
+        except Exception as exc:  # `alertzarr-stac export-parquet` rebuilds the index
+            LOGGER.warning("Failed to index %s STAC item(s): %s", len(written_items), exc)
+    if settings.stac_backend == "both":
+        try:
+            async with span("pgstac_ingest"):
+                await asyncio.to_thread(get_pgstac_ingestor().ingest, written_items)
+        except Exception as exc:  # the S3 copy stays authoritative
+            LOGGER.warning(
+                "Failed to ingest %s STAC item(s) into pgstac: %s", len(written_items), exc
+            )
+    return results
+
+
+@dataclass
+class PublishResult:
+    item_id: str
+    key: str
+    status: Literal["written", "skipped", "failed"]
+    content_hash: str
+    error: str | None = None
+    new: bool = False
+    created: str | None = None
+
+
+class StacPublisher:
+    """Upload STAC items concurrently, skipping objects whose content is unchanged.
+
+    Each object carries the SHA-256 of its item, minus volatile timestamps, in
+    ``x-amz-meta-content-sha256``. The ETag cannot serve for the comparison
+    because it hashes the whole body, ``created`` included. An unchanged item
+    costs one HEAD request and keeps its original ``created`` timestamp, which is
+    stored alongside the hash and returned on the skipped result.
+    """
+
+    def __init__(
+        self,
+        bucket: str,
+        *,
+        concurrency: int | None = None,
+        prefix: str = "items",
+        client: Any | None = None,
+    ) -> None:
+        self.bucket = bucket
+        self.concurrency = concurrency or get_settings().stac_publish_concurrency
+        self.prefix = prefix.strip("/")
+        self._client = client
+
+    def key_for(self, item: dict[str, Any]) -> str:
+        return f"{self.prefix}/{item['id']}.json"
+
+    async def publish(self, item: dict[str, Any]) -> PublishResult:
+        return (await self.publish_many([item]))[0]
+
+    async def publish_many(self, items: Iterable[dict[str, Any]]) -> list[PublishResult]:
+        client = self._client or await get_s3_manager().async_client()
+        semaphore = asyncio.Semaphore(max(self.concurrency, 1))
 
-    session = get_session()
-    key = f"items/{stac_item['id']}.json"
-
-    async with session.create_client(
-        "s3",
-        endpoint_url=settings.minio_endpoint,
-        aws_access_key_id=settings.minio_access_key,
-        aws_secret_access_key=settings.minio_secret_key,
-        region_name=settings.minio_region,
-    ) as s3:
-        await s3.put_object(
-            Bucket=settings.stac_bucket,
-            Key=key,
-            Body=json.dumps(stac_item).encode("utf-8"),
-            ContentType="application/json",
+        async def bounded(item: dict[str, Any]) -> PublishResult:
+            async with semaphore:
+                return await self._publish_one(client, item)
+
+        results = await asyncio.gather(*(bounded(item) for item in items))
+        counts = Counter(result.status for result in results)
+        LOGGER.info(
+            "Published %s STAC item(s): %s written, %s unchanged, %s failed",
+            len(results),
+            counts["written"],
+            counts["skipped"],
+            counts["failed"],
         )
+        return list(results)
 
-    return stac_item
+    async def _publish_one(self, client: Any, item: dict[str, Any]) -> PublishResult:
+        key = self.key_for(item)
+        digest = item_content_hash(item)
+        try:
+            try:
+                head = await client.head_object(Bucket=self.bucket, Key=key)
+            except ClientError as exc:
+                if exc.response.get("Error", {}).get("Code") not in {"NoSuchKey", "404"}:
+                    raise
+                head = None
+            metadata = head.get("Metadata", {}) if head is not None else {}
+            if metadata.get(HASH_METADATA_KEY) == digest:
+                created = metadata.get(CREATED_METADATA_KEY) or await self._stored_created(
+                    client, key
+                )
+                return PublishResult(item["id"], key, "skipped", digest, created=created)
+            created = item.get("properties", {}).get("created")
+            put = {
+                "Bucket": self.bucket,
+                "Key": key,
+                "Body": encode_stac_item(item),
+                "ContentType": "application/json",
+                "Metadata": {
+                    HASH_METADATA_KEY: digest,
+                    **({CREATED_METADATA_KEY: created} if created else {}),
+                },
+            }
+            # Only the run whose If-None-Match create succeeds counts the item as
+            # new; one that loses the race overwrites it as an update instead.
+            new = head is None
+            if new:
+                try:
+                    await client.put_object(**put, IfNoneMatch="*")
+                except ClientError as exc:
+                    if not is_write_conflict(exc):
+                        raise
+                    new = False
+            if not new:
+                await client.put_object(**put)
+        except Exception as exc:
+            LOGGER.warning("Failed to publish STAC item %s: %s", item.get("id"), exc)
+            return PublishResult(item["id"], key, "failed", digest, error=str(exc))
+        return PublishResult(item["id"], key, "written", digest, new=new)
+
+    async def _stored_created(self, client: Any, key: str) -> str | None:
+        # Objects published before ``created`` was kept in the metadata.
+        response = await client.get_object(Bucket=self.bucket, Key=key)
+        async with response["Body"] as body:
+            stored = orjson.loads(await body.read())
+        return stored.get("properties", {}).get("created")
+
+
+def item_content_hash(item: dict[str, Any]) -> str:
+    """SHA-256 of the item's canonical JSON without volatile timestamp properties."""
+
+    properties = {
+        name: value
+        for name, value in item.get("properties", {}).items()
+        if name not in VOLATILE_PROPERTIES
+    }
+    stable = {**item, "properties": properties}
+    return hashlib.sha256(orjson.dumps(stable, option=orjson.OPT_SORT_KEYS)).hexdigest()
+
+
+def _image_type(href: str) -> str:
+    return "image/webp" if href.endswith(".webp") else "image/png"
 
 
 def _scene_assets(scenes: list[SceneSummary]) -> dict[str, Any]:
@@ -0,0 +1,501 @@
+"""Read-only STAC API over the items and collections published to the STAC bucket."""
+
+from __future__ import annotations
+
+import base64
+import bisect
+import json
+import logging
+import threading
+from collections.abc import Iterable
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, field
+from datetime import datetime, timezone
+from http import HTTPStatus
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Any
+from urllib.parse import parse_qs, urlencode, urlsplit
+
+import orjson
+import shapely
+from botocore.exceptions import ClientError
+from shapely.geometry import shape
+
+from .s3 import get_s3_manager
+from .settings import Settings
+from .stac_collections import CATALOG_KEY
+
+LOGGER = logging.getLogger(__name__)
+
+DEFAULT_LIMIT = 10
+_OPEN = ("", "..")
+
+__all__ = [
+    "StacApiIndex",
+    "StacSearch",
+    "make_server",
+]
+
+
+class StacApiError(ValueError):
+    """Invalid search parameters; reported to the client as 400."""
+
+
+@dataclass
+class StacSearch:
+    bbox: tuple[float, float, float, float] | None = None
+    start: float = float("-inf")
+    end: float = float("inf")
+    hazards: frozenset[str] | None = None
+    collections: frozenset[str] | None = None
+    ids: frozenset[str] | None = None
+    limit: int = DEFAULT_LIMIT
+    token: str | None = None
+
+    @classmethod
+    def from_params(cls, params: dict[str, Any], max_limit: int) -> StacSearch:
+        """Parse GET query parameters or a POST body (lists or comma-separated strings)."""
+
+        search = cls()
+        bbox = _as_list(params.get("bbox"))
+        if bbox:
+            try:
+                values = [float(value) for value in bbox]
+            except (TypeError, ValueError) as exc:
+                raise StacApiError("bbox must be numeric") from exc
+            if len(values) not in (4, 6):
+                raise StacApiError("bbox needs 4 or 6 values")
+            # 3D bboxes are (minx, miny, minz, maxx, maxy, maxz).
+            search.bbox = tuple(values[:2] + values[3:5] if len(values) == 6 else values)
+        if params.get("datetime"):
+            search.start, search.end = _parse_interval(str(_first(params["datetime"])))
+        for name, attr in (("hazard", "hazards"), ("collections", "collections"), ("ids", "ids")):
+            values = _as_list(params.get(name))
+            if values:
+                setattr(search, attr, frozenset(values))
+        if params.get("limit") is not None:
+            try:
+                search.limit = int(_first(params["limit"]))
+            except (TypeError, ValueError) as exc:
+                raise StacApiError("limit must be an integer") from exc
+        search.limit = min(max(search.limit, 1), max_limit)
+        search.token = _first(params.get("token")) or None
+        return search
+
+
+@dataclass
+class _Snapshot:
+    """Immutable view swapped in whole on refresh, so readers never take a lock."""
+
+    items: list[dict[str, Any]] = field(default_factory=list)
+    encoded: dict[str, bytes] = field(default_factory=dict)
+    positions: dict[str, int] = field(default_factory=dict)
+    sort_keys: list[tuple[float, str]] = field(default_factory=list)
+    ends: list[float] = field(default_factory=list)
+    tree: shapely.STRtree | None = None
+    collections: dict[str, dict[str, Any]] = field(default_factory=dict)
+    catalog: dict[str, Any] | None = None
+
+    @classmethod
+    def build(
+        cls,
+        items: Iterable[dict[str, Any]],
+        collections: dict[str, dict[str, Any]],
+        catalog: dict[str, Any] | None,
+    ) -> _Snapshot:
+        ordered = sorted(items, key=_sort_key)
+        geometries = [_item_geometry(item) for item in ordered]
+        return cls(
+            items=ordered,
+            encoded={item["id"]: orjson.dumps(item) for item in ordered},
+            positions={item["id"]: index for index, item in enumerate(ordered)},
+            sort_keys=[_sort_key(item) for item in ordered],
+            ends=[_item_interval(item)[1] for item in ordered],
+            tree=shapely.STRtree(geometries) if geometries else None,
+            collections=collections,
+            catalog=catalog,
+        )
+
+
+class StacApiIndex:
+    """In-memory spatial/temporal index of the published catalog.
+
+    Items are kept sorted by start datetime (then id); searches walk that order
+    newest first from a value-based cursor, so pages stay stable across
+    refreshes. ``refresh`` re-lists the bucket and downloads only objects whose
+    ETag changed, then swaps in a new snapshot.
+    """
+
+    def __init__(
+        self,
+        bucket: str,
+        *,
+        base_url: str,
+        client: Any | None = None,
+        item_prefix: str = "items/",
+        workers: int = 16,
+        max_limit: int = 1000,
+    ) -> None:
+        self.bucket = bucket
+        self.base_url = base_url.rstrip("/")
+        self.item_prefix = item_prefix
+        self.workers = workers
+        self.max_limit = max_limit
+        self._client = client
+        self._objects: dict[str, tuple[str, dict[str, Any]]] = {}
+        self._refresh_lock = threading.Lock()
+        self.snapshot = _Snapshot()
+
+    @classmethod
+    def from_settings(cls, settings: Settings) -> StacApiIndex:
+        return cls(
+            settings.stac_bucket,
+            base_url=settings.stac_public_base_url,
+            client=get_s3_manager(settings).sync_client(),
+            workers=settings.stac_publish_concurrency,
+            max_limit=settings.stac_api_max_limit,
+        )
+
+    @property
+    def client(self):
+        if self._client is None:
+            self._client = get_s3_manager().sync_client()
+        return self._client
+
+    def refresh(self) -> int:
+        """Sync with the bucket; returns the number of objects added, changed or removed."""
+
+        with self._refresh_lock:
+            listed: dict[str, str] = {}
+            paginator = self.client.get_paginator("list_objects_v2")
+            for prefix in (self.item_prefix, "collections/", CATALOG_KEY):
+                for page in paginator.paginate(Bucket=self.bucket, Prefix=prefix):
+                    for obj in page.get("Contents", []):
+                        if obj["Key"].endswith(".json"):
+                            listed[obj["Key"]] = obj.get("ETag", "")
+            changed = [
+                key for key, etag in listed.items() if self._objects.get(key, ("",))[0] != etag
+            ]
+            removed = [key for key in self._objects if key not in listed]
+            if not changed and not removed:
+                return 0
+            with ThreadPoolExecutor(max_workers=max(self.workers, 1)) as pool:
+                documents = list(pool.map(self._load, changed))
+            for key in removed:
+                del self._objects[key]
+            for key, document in zip(changed, documents, strict=True):
+                if document is not None:
+                    self._objects[key] = (listed[key], document)
+
+            items, collections, catalog = [], {}, None
+            for key, (_, document) in self._objects.items():
+                if key == CATALOG_KEY:
+                    catalog = document
+                elif key.startswith(self.item_prefix):
+                    items.append(document)
+                elif document.get("type") == "Collection":
+                    collections[document["id"]] = document
+            self.snapshot = _Snapshot.build(items, collections, catalog)
+            LOGGER.info(
+                "STAC API index refreshed: %s item(s), %s change(s)",
+                len(items),
+                len(changed) + len(removed),
+            )
+            return len(changed) + len(removed)
+
+    def load(
+        self,
+        items: Iterable[dict[str, Any]],
+        collections: Iterable[dict[str, Any]] = (),
+        catalog: dict[str, Any] | None = None,
+    ) -> None:
+        """Serve the given documents instead of the bucket (fixtures, load tests)."""
+
+        by_id = {collection["id"]: collection for collection in collections}
+        self.snapshot = _Snapshot.build(items, by_id, catalog)
+
+    def _load(self, key: str) -> dict[str, Any] | None:
+        try:
+            body = self.client.get_object(Bucket=self.bucket, Key=key)["Body"].read()
+        except ClientError as exc:
+            if exc.response.get("Error", {}).get("Code") in {"NoSuchKey", "404"}:
+                return None  # deleted between the listing and the read
+            raise
+        return json.loads(body)
+
+    def run_refresh_loop(self, interval: float, stop: threading.Event) -> None:
+        while not stop.wait(interval):
+            try:
+                self.refresh()
+            except Exception as exc:  # keep serving the last good snapshot
+                LOGGER.warning("STAC API refresh failed: %s", exc)
+
+    def search(self, search: StacSearch) -> tuple[list[bytes], str | None]:
+        """Return encoded matching items (newest first) and the next-page token."""
+
+        snapshot = self.snapshot
+        if not snapshot.items:
+            return [], None
+        position = bisect.bisect_right(snapshot.sort_keys, (search.end, "\uffff"))
+        if search.token:
+            # The token is the sort key of the first item of the requested page.
+            position = min(position, bisect.bisect_right(snapshot.sort_keys, _decode(search.token)))
+        candidates: set[int] | None = None
+        if search.bbox is not None and snapshot.tree is not None:
+            found = snapshot.tree.query(shapely.box(*search.bbox), predicate="intersects")
+            candidates = set(found.tolist())
+        if search.ids is not None:
+            ids = {
+                snapshot.positions[item_id]
+                for item_id in search.ids
+                if item_id in snapshot.positions
+            }
+            candidates = ids if candidates is None else candidates & ids
+
+        matches: list[bytes] = []
+        next_token = None
+        if candidates is None:
+            order: Iterable[int] = range(position - 1, -1, -1)
+        else:
+            order = sorted((index for index in candidates if index < position), reverse=True)
+        for index in order:
+            item = snapshot.items[index]
+            if snapshot.ends[index] < search.start:
+                continue
+            if search.collections is not None and item.get("collection") not in search.collections:
+                continue
+            if (
+                search.hazards is not None
+                and item.get("properties", {}).get("alert:hazard") not in search.hazards
+            ):
+                continue
+            if len(matches) == search.limit:
+                next_token = _encode(snapshot.sort_keys[index])
+                break
+            matches.append(snapshot.encoded[item["id"]])
+        return matches, next_token
+
+    def item(self, item_id: str) -> bytes | None:
+        return self.snapshot.encoded.get(item_id)
+
+
+def make_server(index: StacApiIndex, host: str, port: int) -> ThreadingHTTPServer:
+    """Build a threaded HTTP server for ``index``; paths may carry the base URL's path prefix."""
+
+    base_path = urlsplit(index.base_url).path.rstrip("/")
+
+    class Handler(BaseHTTPRequestHandler):
+        protocol_version = "HTTP/1.1"
+        # Headers and body go out as separate writes; without TCP_NODELAY every
+        # keep-alive response waits out the client's delayed ACK (~40 ms).
+        disable_nagle_algorithm = True
+
+        def do_GET(self) -> None:
+            url = urlsplit(self.path)
+            params = {name: values[0] for name, values in parse_qs(url.query).items()}
+            self._dispatch(url.path, params, "GET")
+
+        def do_POST(self) -> None:
+            url = urlsplit(self.path)
+            length = int(self.headers.get("Content-Length") or 0)
+            try:
+                params = json.loads(self.rfile.read(length) or b"{}")
+            except ValueError:
+                self._send_json({"code": "BadRequest", "description": "Invalid JSON body"}, 400)
+                return
+            if not isinstance(params, dict):
+                self._send_json(
+                    {"code": "BadRequest", "description": "Search body must be a JSON object"}, 400
+                )
+                return
+            if url.path.rstrip("/").removeprefix(base_path) != "/search":
+                self._send_json({"code": "NotFound", "description": url.path}, 404)
+                return
+            self._dispatch(url.path, params, "POST")
+
+        def log_message(self, format: str, *args: Any) -> None:
+            LOGGER.debug("%s - %s", self.address_string(), format % args)
+
+        def _dispatch(self, path: str, params: dict[str, Any], method: str) -> None:
+            path = path.rstrip("/")
+            if base_path and path.startswith(base_path):
+                path = path[len(base_path) :]
+            parts = [part for part in path.split("/") if part]
+            snapshot = index.snapshot
+            try:
+                if not parts:
+                    self._send_json(_landing_page(index, snapshot))
+                elif parts == ["search"]:
+                    self._send_search(params, method)
+                elif parts == ["collections"]:
+                    self._send_json(
+                        {
+                            "collections": list(snapshot.collections.values()),
+                            "links": [_link("self", f"{index.base_url}/collections")],
+                        }
+                    )
+                elif len(parts) == 2 and parts[0] == "collections":
+                    collection = snapshot.collections.get(parts[1].removesuffix(".json"))
+                    if collection is None:
+                        raise KeyError(parts[1])
+                    self._send_json(collection)
+                elif len(parts) == 2 and parts[0] == "items":
+                    body = index.item(parts[1].removesuffix(".json"))
+                    if body is None:
+                        raise KeyError(parts[1])
+                    self._send(body, 200, "application/geo+json")
+                else:
+                    raise KeyError(path)
+            except KeyError as exc:
+                self._send_json({"code": "NotFound", "description": str(exc)}, 404)
+            except StacApiError as exc:
+                self._send_json({"code": "BadRequest", "description": str(exc)}, 400)
+
+        def _send_search(self, params: dict[str, Any], method: str) -> None:
+            search = StacSearch.from_params(params, index.max_limit)
+            features, token = index.search(search)
+            links = []
+            if token and method == "POST":
+                next_link = _link("next", f"{index.base_url}/search", "application/geo+json")
+                links.append({**next_link, "method": "POST", "body": {**params, "token": token}})
+            elif token:
+                query = {**params, "token": token}
+                links.append(
+                    _link(
+                        "next",
+                        f"{index.base_url}/search?{urlencode(query)}",
+                        "application/geo+json",
+                    )
+                )
+            links_json = orjson.dumps(links)
+            body = b"".join(
+                (
+                    b'{"type":"FeatureCollection","numberReturned":',
+                    str(len(features)).encode(),
+                    b',"features":[',
+                    b",".join(features),
+                    b'],"links":',
+                    links_json,
+                    b"}",
+                )
+            )
+            self._send(body, 200, "application/geo+json")
+
+        def _send_json(self, payload: Any, status: int = 200) -> None:
+            self._send(orjson.dumps(payload), status, "application/json")
+
+        def _send(self, body: bytes, status: int, content_type: str) -> None:
+            self.send_response(status, HTTPStatus(status).phrase)
+            self.send_header("Content-Type", content_type)
+            self.send_header("Content-Length", str(len(body)))
+            self.send_header("Access-Control-Allow-Origin", "*")
+            self.end_headers()
+            self.wfile.write(body)
+
+    server = ThreadingHTTPServer((host, port), Handler)
+    server.daemon_threads = True
+    return server
+
+
+def _landing_page(index: StacApiIndex, snapshot: _Snapshot) -> dict[str, Any]:
+    landing = dict(
+        snapshot.catalog
+        or {
+            "type": "Catalog",
+            "stac_version": "1.0.0",
+            "id": "alertzarr",
+            "description": "GeoZarr outputs published by the AlertZarr pipeline",
+        }
+    )
+    landing["conformsTo"] = [
+        "https://api.stacspec.org/v1.0.0/core",
+        "https://api.stacspec.org/v1.0.0/item-search",
+    ]
+    links = [link for link in landing.get("links", []) if link.get("rel") == "child"]
+    landing["links"] = [
+        _link("self", index.base_url),
+        _link("root", index.base_url),
+        _link("data", f"{index.base_url}/collections"),
+        _link("search", f"{index.base_url}/search", "application/geo+json"),
+        *links,
+    ]
+    return landing
+
+
+def _link(rel: str, href: str, media_type: str = "application/json") -> dict[str, str]:
+    return {"rel": rel, "href": href, "type": media_type}
+
+
+def _encode(key: tuple[float, str]) -> str:
+    return base64.urlsafe_b64encode(json.dumps(key).encode("utf-8")).decode("ascii")
+
+
+def _decode(token: str) -> tuple[float, str]:
+    try:
+        start, item_id = json.loads(base64.urlsafe_b64decode(token.encode("ascii")))
+        return float(start), str(item_id)
+    except (ValueError, TypeError) as exc:
+        raise StacApiError("Invalid pagination token") from exc
+
+
+def _sort_key(item: dict[str, Any]) -> tuple[float, str]:
+    return _item_interval(item)[0], item["id"]
+
+
+def _item_interval(item: dict[str, Any]) -> tuple[float, float]:
+    properties = item.get("properties", {})
+    start = _timestamp(properties.get("start_datetime") or properties.get("datetime"))
+    end = _timestamp(properties.get("end_datetime") or properties.get("datetime"))
+    return (
+        start if start is not None else float("-inf"),
+        end if end is not None else float("-inf"),
+    )
+
+
+def _item_geometry(item: dict[str, Any]) -> shapely.Geometry:
+    if item.get("geometry"):
+        return shape(item["geometry"])
+    bbox = item.get("bbox") or []
+    if len(bbox) >= 4:
+        return shapely.box(bbox[0], bbox[1], bbox[-2], bbox[-1])
+    return shapely.Polygon()
+
+
+def _parse_interval(value: str) -> tuple[float, float]:
+    start, separator, end = value.partition("/")
+    if not separator:
+        instant = _timestamp(start)
+        if instant is None:
+            raise StacApiError(f"Invalid datetime {value!r}")
+        return instant, instant
+    lower = float("-inf") if start in _OPEN else _timestamp(start)
+    upper = float("inf") if end in _OPEN else _timestamp(end)
+    if lower is None or upper is None:
+        raise StacApiError(f"Invalid datetime interval {value!r}")
+    return lower, upper
+
+
+def _timestamp(value: str | None) -> float | None:
+    if not value:
+        return None
+    try:
+        parsed = datetime.fromisoformat(value)
+    except ValueError:
+        return None
+    if parsed.tzinfo is None:
+        parsed = parsed.replace(tzinfo=timezone.utc)
+    return parsed.timestamp()
+
+
+def _first(value: Any) -> Any:
+    if isinstance(value, list):
+        return value[0] if value else None
+    return value
+
+
+def _as_list(value: Any) -> list[str]:
+    if value is None:
+        return []
+    if isinstance(value, list):
+        return [str(entry) for entry in value]
+    return [entry for entry in str(value).split(",") if entry]
@@ -0,0 +1,54 @@
+"""Command-line entry point for the read-only STAC API."""
+
+from __future__ import annotations
+
+import threading
+
+import click
+
+from .logging_utils import configure_logging
+from .settings import get_settings
+from .stac_api import StacApiIndex, make_server
+
+
+@click.command()
+@click.option("--host", default=None, help="Bind address (defaults to STAC_API_HOST)")
+@click.option("--port", type=int, default=None, help="Bind port (defaults to STAC_API_PORT)")
+@click.option(
+    "--refresh-seconds",
+    type=float,
+    default=None,
+    help="Seconds between bucket refreshes; 0 disables (defaults to STAC_API_REFRESH_SECONDS)",
+)
+def main(host: str | None, port: int | None, refresh_seconds: float | None) -> None:
+    """Serve /collections, /items/{id} and /search from the published STAC bucket."""
+    configure_logging()
+    settings = get_settings()
+    index = StacApiIndex.from_settings(settings)
+    index.refresh()
+
+    interval = settings.stac_api_refresh_seconds if refresh_seconds is None else refresh_seconds
+    stop = threading.Event()
+    if interval > 0:
+        threading.Thread(
+            target=index.run_refresh_loop,
+            args=(interval, stop),
+            name="stac-api-refresh",
+            daemon=True,
+        ).start()
+
+    server = make_server(index, host or settings.stac_api_host, port or settings.stac_api_port)
+    click.echo(
+        f"Serving {index.base_url} on http://{server.server_address[0]}:{server.server_port}"
+    )
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        stop.set()
+        server.server_close()
+
+
+if __name__ == "__main__":  # pragma: no cover
+    main()
@@ -0,0 +1,157 @@
+"""Command-line maintenance for the published STAC catalog."""
+
+from __future__ import annotations
+
+import asyncio
+import json
+from collections import Counter
+from collections.abc import Iterator
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+from typing import Any
+
+import click
+
+from .logging_utils import configure_logging
+from .pgstac import PgstacIngestor
+from .s3 import close_s3_clients, get_s3_manager
+from .settings import get_settings
+from .stac import PublishResult, StacPublisher, publish_stac_items
+from .stac_collections import CollectionMaintainer
+from .stac_parquet import get_stac_parquet_index
+
+
+@click.group()
+def main() -> None:
+    """Maintain the STAC catalog in the configured bucket."""
+    configure_logging()
+
+
+@main.command()
+@click.option("--prefix", default="items/", show_default=True, help="Item key prefix to scan")
+@click.option(
+    "--concurrency", type=int, default=None, help="Parallel item reads (STAC_PUBLISH_CONCURRENCY)"
+)
+def rebuild(prefix: str, concurrency: int | None) -> None:
+    """Recompute every collection document and the root catalog from the published items."""
+    settings = get_settings()
+    maintainer = CollectionMaintainer.from_settings(settings)
+
+    async def runner() -> dict[str, int]:
+        try:
+            return await maintainer.rebuild(
+                prefix, concurrency=concurrency or settings.stac_publish_concurrency
+            )
+        finally:
+            await close_s3_clients()
+
+    counts = asyncio.run(runner())
+    for collection_id, count in counts.items():
+        click.echo(f"{collection_id}: {count} item(s)")
+
+
+@main.command()
+@click.option(
+    "--from-dir",
+    type=click.Path(exists=True, file_okay=False, path_type=Path),
+    required=True,
+    help="Directory of item JSON files, e.g. from re-running a backlog of alerts",
+)
+@click.option(
+    "--concurrency", type=int, default=None, help="Parallel uploads (STAC_PUBLISH_CONCURRENCY)"
+)
+def publish(from_dir: Path, concurrency: int | None) -> None:
+    """Publish local STAC items in one batch, skipping the ones already up to date."""
+    settings = get_settings()
+    if settings.stac_backend == "pgstac":
+        raise click.UsageError("STAC_BACKEND=pgstac publishes to Postgres; use ingest-pgstac")
+    publisher = StacPublisher(
+        settings.stac_bucket, concurrency=concurrency or settings.stac_publish_concurrency
+    )
+    items = list(_local_items(from_dir))
+
+    async def runner() -> list[PublishResult]:
+        try:
+            return await publish_stac_items(items, settings=settings, publisher=publisher)
+        finally:
+            await close_s3_clients()
+
+    counts = Counter(result.status for result in asyncio.run(runner()))
+    click.echo(
+        f"Published {len(items)} item(s): {counts['written']} written, "
+        f"{counts['skipped']} unchanged, {counts['failed']} failed"
+    )
+    if counts["failed"]:
+        raise SystemExit(1)
+
+
+@main.command("export-parquet")
+@click.option("--prefix", default="items/", show_default=True, help="Item key prefix to scan")
+@click.option(
+    "--workers", type=int, default=None, help="Parallel item reads (STAC_PUBLISH_CONCURRENCY)"
+)
+def export_parquet(prefix: str, workers: int | None) -> None:
+    """Rebuild the GeoParquet item index from every published item."""
+    settings = get_settings()
+    index = get_stac_parquet_index()
+    count = index.export(prefix, workers=workers or settings.stac_publish_concurrency)
+    click.echo(f"Indexed {count} item(s) under s3://{index.bucket}/{index.prefix}")
+
+
+@main.command("compact-parquet")
+@click.option("--partition", default=None, help="Only compact e.g. collection=flood/year=2025")
+def compact_parquet(partition: str | None) -> None:
+    """Merge the delta files of each GeoParquet index partition."""
+    index = get_stac_parquet_index()
+    click.echo(f"Compacted {index.compact(partition)} partition(s)")
+
+
+@main.command("ingest-pgstac")
+@click.option("--prefix", default="items/", show_default=True, help="Item key prefix to scan")
+@click.option(
+    "--from-dir",
+    type=click.Path(exists=True, file_okay=False, path_type=Path),
+    default=None,
+    help="Read item JSON files from a local directory instead of the bucket",
+)
+@click.option(
+    "--batch-size",
+    type=int,
+    default=None,
+    help="Items per COPY/transaction (STAC_PGSTAC_BATCH_SIZE)",
+)
+def ingest_pgstac(prefix: str, from_dir: Path | None, batch_size: int | None) -> None:
+    """Backfill published items into pgstac (or the pgstac-shaped fallback tables)."""
+    settings = get_settings()
+    ingestor = PgstacIngestor.from_settings(settings)
+    if batch_size:
+        ingestor.batch_size = batch_size
+    items = _local_items(from_dir) if from_dir else _bucket_items(settings, prefix)
+    try:
+        count = ingestor.ingest(items)
+    finally:
+        ingestor.close()
+    click.echo(f"Ingested {count} item(s) into Postgres ({ingestor.mode} mode)")
+
+
+def _local_items(directory: Path) -> Iterator[dict[str, Any]]:
+    for path in sorted(directory.glob("*.json")):
+        yield json.loads(path.read_text(encoding="utf-8"))
+
+
+def _bucket_items(settings, prefix: str) -> Iterator[dict[str, Any]]:
+    client = get_s3_manager(settings).sync_client()
+    paginator = client.get_paginator("list_objects_v2")
+
+    def load(key: str) -> dict[str, Any]:
+        body = client.get_object(Bucket=settings.stac_bucket, Key=key)["Body"].read()
+        return json.loads(body)
+
+    with ThreadPoolExecutor(max_workers=settings.stac_publish_concurrency) as pool:
+        for page in paginator.paginate(Bucket=settings.stac_bucket, Prefix=prefix):
+            keys = [obj["Key"] for obj in page.get("Contents", []) if obj["Key"].endswith(".json")]
+            yield from pool.map(load, keys)
+
+
+if __name__ == "__main__":  # pragma: no cover
+    main()
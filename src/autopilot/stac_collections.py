@@ -0,0 +1,318 @@
+"""STAC collection and root catalog documents kept up to date as items are published."""
+
+from __future__ import annotations
+
+import asyncio
+import json
+import logging
+import random
+from collections.abc import Iterable
+from dataclasses import dataclass
+from datetime import datetime, timezone
+from typing import Any
+
+from botocore.exceptions import ClientError
+
+from .s3 import get_s3_manager, is_write_conflict
+from .settings import Settings
+
+LOGGER = logging.getLogger(__name__)
+
+CATALOG_KEY = "catalog.json"
+CATALOG_ID = "alertzarr"
+ITEM_COUNT_FIELD = "alertzarr:item_count"
+
+__all__ = [
+    "CATALOG_KEY",
+    "CollectionExtent",
+    "CollectionMaintainer",
+    "build_collection",
+    "collection_key",
+]
+
+
+def collection_key(collection_id: str) -> str:
+    return f"collections/{collection_id}.json"
+
+
+@dataclass
+class CollectionExtent:
+    """Spatial/temporal extent and item count accumulated for one collection."""
+
+    bbox: list[float] | None = None
+    start: str | None = None
+    end: str | None = None
+    new_items: int = 0
+
+    def add(self, item: dict[str, Any], *, new: bool = True) -> None:
+        bbox = item.get("bbox")
+        if bbox and len(bbox) in (4, 6):
+            # 3D bboxes are (minx, miny, minz, maxx, maxy, maxz).
+            bbox = [*bbox[:2], *bbox[3:5]] if len(bbox) == 6 else list(bbox)
+            self.bbox = _union_bbox(self.bbox, bbox)
+        properties = item.get("properties", {})
+        for value in (
+            properties.get("start_datetime") or properties.get("datetime"),
+            properties.get("end_datetime") or properties.get("datetime"),
+        ):
+            if value and _parse_datetime(value) is None:
+                LOGGER.warning("Ignoring invalid datetime %r on item %s", value, item.get("id"))
+            elif value:
+                self.start = _earliest(self.start, value)
+                self.end = _latest(self.end, value)
+        if new:
+            self.new_items += 1
+
+
+class CollectionMaintainer:
+    """Merge published items into their collection documents and the root catalog.
+
+    Updates are read-modify-write cycles guarded by ``If-Match`` on the object's
+    ETag (``If-None-Match: *`` when it does not exist yet), retried with jittered
+    backoff when another run wins the race, so concurrent runs never drop each
+    other's extents or counts. ``rebuild`` recomputes everything from the items
+    in the bucket for repair.
+    """
+
+    def __init__(
+        self,
+        bucket: str,
+        *,
+        public_base_url: str | None = None,
+        client: Any | None = None,
+        max_attempts: int = 8,
+    ) -> None:
+        self.bucket = bucket
+        self.public_base_url = public_base_url.rstrip("/") if public_base_url else None
+        self.max_attempts = max_attempts
+        self._client = client
+
+    @classmethod
+    def from_settings(cls, settings: Settings) -> CollectionMaintainer:
+        return cls(
+            settings.stac_bucket,
+            public_base_url=settings.stac_public_base_url,
+            max_attempts=settings.stac_collection_max_attempts,
+        )
+
+    async def record_items(self, items: Iterable[tuple[dict[str, Any], bool]]) -> None:
+        """Merge ``(item, is_new)`` pairs; only new items raise the item count."""
+
+        extents: dict[str, CollectionExtent] = {}
+        for item, new in items:
+            extents.setdefault(item["collection"], CollectionExtent()).add(item, new=new)
+        if not extents:
+            return
+        client = await self._get_client()
+        for collection_id, extent in extents.items():
+            await self._update(
+                client,
+                collection_key(collection_id),
+                lambda current, cid=collection_id, ext=extent: self._merge_collection(
+                    current, cid, ext
+                ),
+            )
+        await self._update(
+            client, CATALOG_KEY, lambda current: self._merge_catalog(current, extents)
+        )
+
+    async def rebuild(self, prefix: str = "items/", concurrency: int = 16) -> dict[str, int]:
+        """Recompute every collection and the catalog from the items under ``prefix``."""
+
+        client = await self._get_client()
+        keys: list[str] = []
+        paginator = client.get_paginator("list_objects_v2")
+        async for page in paginator.paginate(Bucket=self.bucket, Prefix=prefix):
+            keys.extend(
+                item["Key"] for item in page.get("Contents", []) if item["Key"].endswith(".json")
+            )
+
+        semaphore = asyncio.Semaphore(max(concurrency, 1))
+
+        async def load(key: str) -> dict[str, Any] | None:
+            async with semaphore:
+                document, _ = await self._get(client, key)
+                return document
+
+        extents: dict[str, CollectionExtent] = {}
+        for item in await asyncio.gather(*(load(key) for key in keys)):
+            if item and item.get("collection"):
+                extents.setdefault(item["collection"], CollectionExtent()).add(item)
+
+        for collection_id, extent in extents.items():
+            document = self.collection_document(collection_id, extent)
+            await self._put(client, collection_key(collection_id), document)
+        await self._put(client, CATALOG_KEY, self._merge_catalog(None, extents))
+        counts = {cid: extent.new_items for cid, extent in sorted(extents.items())}
+        LOGGER.info("Rebuilt %s STAC collection(s) from %s item(s)", len(counts), len(keys))
+        return counts
+
+    def collection_document(self, collection_id: str, extent: CollectionExtent) -> dict[str, Any]:
+        """A fresh collection document covering ``extent``."""
+
+        return self._merge_collection(None, collection_id, extent)
+
+    async def _get_client(self):
+        return self._client or await get_s3_manager().async_client()
+
+    async def _update(self, client, key: str, merge) -> None:
+        for attempt in range(self.max_attempts):
+            current, etag = await self._get(client, key)
+            document = merge(current)
+            conditions = {"IfMatch": etag} if etag else {"IfNoneMatch": "*"}
+            try:
+                await self._put(client, key, document, **conditions)
+                return
+            except ClientError as exc:
+                if not is_write_conflict(exc):
+                    raise
+            delay = min(0.05 * 2**attempt, 2.0) * random.uniform(0.5, 1.0)
+            LOGGER.info("Concurrent update of %s; retrying in %.2fs", key, delay)
+            await asyncio.sleep(delay)
+        raise RuntimeError(f"Gave up updating {key} after {self.max_attempts} conflicts")
+
+    async def _get(self, client, key: str) -> tuple[dict[str, Any] | None, str | None]:
+        try:
+            response = await client.get_object(Bucket=self.bucket, Key=key)
+        except ClientError as exc:
+            if exc.response.get("Error", {}).get("Code") in {"NoSuchKey", "404"}:
+                return None, None
+            raise
+        async with response["Body"] as body:
+            payload = await body.read()
+        return json.loads(payload), response.get("ETag")
+
+    async def _put(self, client, key: str, document: dict[str, Any], **conditions: str) -> None:
+        await client.put_object(
+            Bucket=self.bucket,
+            Key=key,
+            Body=json.dumps(document).encode("utf-8"),
+            ContentType="application/json",
+            **conditions,
+        )
+
+    def _href(self, key: str) -> str:
+        if self.public_base_url:
+            return f"{self.public_base_url}/{key}"
+        return f"s3://{self.bucket}/{key}"
+
+    def _root_href(self) -> str:
+        return self.public_base_url or self._href(CATALOG_KEY)
+
+    def _merge_collection(
+        self, current: dict[str, Any] | None, collection_id: str, extent: CollectionExtent
+    ) -> dict[str, Any]:
+        document = current or build_collection(
+            collection_id,
+            extent,
+            root_href=self._root_href(),
+            self_href=self._href(collection_key(collection_id)),
+            item_count=0,
+        )
+        if current is not None:
+            spatial = document["extent"]["spatial"]
+            spatial["bbox"][0] = _union_bbox(spatial["bbox"][0], extent.bbox)
+            interval = document["extent"]["temporal"]["interval"][0]
+            interval[0] = _earliest(interval[0], extent.start)
+            interval[1] = _latest(interval[1], extent.end)
+        document[ITEM_COUNT_FIELD] = int(document.get(ITEM_COUNT_FIELD, 0)) + extent.new_items
+        return document
+
+    def _merge_catalog(
+        self, current: dict[str, Any] | None, extents: dict[str, CollectionExtent]
+    ) -> dict[str, Any]:
+        document = current or {
+            "type": "Catalog",
+            "stac_version": "1.0.0",
+            "id": CATALOG_ID,
+            "description": "GeoZarr outputs published by the AlertZarr pipeline",
+            "links": [
+                {"rel": "root", "href": self._root_href(), "type": "application/json"},
+                {"rel": "self", "href": self._root_href(), "type": "application/json"},
+            ],
+        }
+        children = {link["href"] for link in document["links"] if link.get("rel") == "child"}
+        for collection_id in sorted(extents):
+            href = self._href(collection_key(collection_id))
+            if href not in children:
+                document["links"].append(
+                    {
+                        "rel": "child",
+                        "href": href,
+                        "type": "application/json",
+                        "title": collection_id,
+                    }
+                )
+        return document
+
+
+def build_collection(
+    collection_id: str,
+    extent: CollectionExtent,
+    *,
+    root_href: str | None = None,
+    self_href: str | None = None,
+    item_count: int | None = None,
+) -> dict[str, Any]:
+    """A new collection document covering ``extent``.
+
+    ``root``/``parent`` and ``self`` links are added only for the hrefs given, and
+    the ``alertzarr:item_count`` field only when ``item_count`` is.
+    """
+
+    links: list[dict[str, Any]] = []
+    if root_href:
+        links.append({"rel": "root", "href": root_href, "type": "application/json"})
+        links.append({"rel": "parent", "href": root_href, "type": "application/json"})
+    if self_href:
+        links.append({"rel": "self", "href": self_href, "type": "application/json"})
+    document: dict[str, Any] = {
+        "type": "Collection",
+        "stac_version": "1.0.0",
+        "id": collection_id,
+        "description": f"AlertZarr GeoZarr outputs for {collection_id} alerts",
+        "license": "proprietary",
+        "extent": {
+            "spatial": {"bbox": [extent.bbox or [-180, -90, 180, 90]]},
+            "temporal": {"interval": [[extent.start, extent.end]]},
+        },
+        "links": links,
+    }
+    if item_count is not None:
+        document[ITEM_COUNT_FIELD] = item_count
+    return document
+
+
+def _union_bbox(current: list[float] | None, other: list[float] | None) -> list[float] | None:
+    if not other:
+        return current
+    if not current:
+        return list(other)
+    return [
+        min(current[0], other[0]),
+        min(current[1], other[1]),
+        max(current[2], other[2]),
+        max(current[3], other[3]),
+    ]
+
+
+def _parse_datetime(value: str | None) -> datetime | None:
+    if not value:
+        return None
+    try:
+        parsed = datetime.fromisoformat(value)
+    except (TypeError, ValueError):
+        return None
+    return parsed if parsed.tzinfo else parsed.replace(tzinfo=timezone.utc)
+
+
+def _earliest(*values: str | None) -> str | None:
+    """The earliest of ``values`` by instant, so ``Z``/``+00:00`` and fractions compare right."""
+
+    parsed = [(when, value) for value in values if (when := _parse_datetime(value)) is not None]
+    return min(parsed)[1] if parsed else None
+
+
+def _latest(*values: str | None) -> str | None:
+    parsed = [(when, value) for value in values if (when := _parse_datetime(value)) is not None]
+    return max(parsed)[1] if parsed else None
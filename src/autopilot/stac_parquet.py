@@ -0,0 +1,349 @@
+"""Partitioned stac-geoparquet index of the items in the STAC bucket."""
+
+from __future__ import annotations
+
+import io
+import json
+import logging
+import threading
+import uuid
+from collections.abc import Iterable
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timezone
+from functools import lru_cache
+from typing import Any
+
+import shapely
+from shapely.geometry import shape
+
+from .s3 import get_s3_manager
+from .settings import Settings, get_settings
+
+try:
+    import pyarrow as pa  # type: ignore
+    import pyarrow.parquet as pq  # type: ignore
+except ImportError:  # pragma: no cover
+    pa = None  # type: ignore
+    pq = None  # type: ignore
+
+LOGGER = logging.getLogger(__name__)
+
+INDEX_PREFIX = "index/items"
+ROW_GROUP_SIZE = 10_000
+
+__all__ = [
+    "INDEX_PREFIX",
+    "StacParquetIndex",
+    "get_stac_parquet_index",
+    "item_record",
+    "items_table",
+]
+
+
+def item_record(item: dict[str, Any]) -> dict[str, Any]:
+    """Flatten a STAC item into one index row."""
+
+    properties = item.get("properties", {})
+    bbox = item.get("bbox") or []
+    geometry = item.get("geometry")
+    return {
+        "id": item["id"],
+        "collection": item.get("collection"),
+        "hazard": properties.get("alert:hazard"),
+        "severity": properties.get("alert:severity"),
+        "datetime": _parse_datetime(properties.get("datetime")),
+        "start_datetime": _parse_datetime(properties.get("start_datetime")),
+        "end_datetime": _parse_datetime(properties.get("end_datetime")),
+        "bbox": (
+            {"xmin": bbox[0], "ymin": bbox[1], "xmax": bbox[-2], "ymax": bbox[-1]}
+            if len(bbox) >= 4
+            else None
+        ),
+        "geometry": shapely.to_wkb(shape(geometry)) if geometry else None,
+        "assets": [(name, asset["href"]) for name, asset in item.get("assets", {}).items()],
+        "self_href": next(
+            (link["href"] for link in item.get("links", []) if link.get("rel") == "self"), None
+        ),
+    }
+
+
+def items_table(items: Iterable[dict[str, Any]]) -> pa.Table:
+    """Build a GeoParquet table (WKB ``geometry`` plus a ``bbox`` covering column)."""
+
+    _require_pyarrow()
+    table = pa.Table.from_pylist([item_record(item) for item in items], schema=_schema())
+    return _with_geo_metadata(table)
+
+
+class StacParquetIndex:
+    """GeoParquet copy of the item catalog, partitioned by collection and year.
+
+    ``append`` writes each batch of newly published items as a small delta file;
+    ``compact`` folds a partition's files into one file sorted by datetime, with
+    later rows for an item id replacing earlier ones. Object keys embed the UTC
+    write time, so lexical order is write order. Readers can prune partitions by
+    path and row groups by the ``bbox``/``datetime`` statistics, and should
+    de-duplicate on ``id`` when a partition still holds several files.
+
+    Items whose datetimes are not ISO 8601 are logged and left out of the index.
+    The number of files per partition is counted in memory, seeded by one listing
+    the first time a partition is appended to, so publishing does not list the
+    bucket each time, as long as the process reuses one index
+    (``get_stac_parquet_index``). Files written by other processes are picked up
+    when the partition is next compacted.
+    """
+
+    def __init__(
+        self,
+        bucket: str,
+        *,
+        prefix: str = INDEX_PREFIX,
+        compact_min_files: int = 50,
+        client: Any | None = None,
+    ) -> None:
+        _require_pyarrow()
+        self.bucket = bucket
+        self.prefix = prefix.strip("/")
+        self.compact_min_files = compact_min_files
+        self._client = client
+        self._file_counts: dict[str, int] = {}
+        # Publishes append from worker threads; writes and counts go one at a time.
+        self._lock = threading.RLock()
+
+    @classmethod
+    def from_settings(cls, settings: Settings) -> StacParquetIndex:
+        return cls(
+            settings.stac_bucket,
+            compact_min_files=settings.stac_parquet_compact_min_files,
+            client=get_s3_manager(settings).sync_client(),
+        )
+
+    @property
+    def client(self):
+        if self._client is None:
+            self._client = get_s3_manager().sync_client()
+        return self._client
+
+    def append(self, items: Iterable[dict[str, Any]]) -> list[str]:
+        """Write ``items`` as delta files and compact partitions that have grown too many."""
+
+        keys = []
+        with self._lock:
+            for partition, group in _partition(items).items():
+                if partition not in self._file_counts:
+                    self._file_counts[partition] = len(self._list(partition))
+                keys.append(self._write(partition, items_table(group), "delta"))
+                self._file_counts[partition] += 1
+                if self._file_counts[partition] >= self.compact_min_files:
+                    self.compact(partition)
+        return keys
+
+    def compact(self, partition: str | None = None) -> int:
+        """Merge every partition (or just ``partition``) holding more than one file."""
+
+        partitions = [partition] if partition else self.partitions()
+        compacted = 0
+        with self._lock:
+            for name in partitions:
+                keys = self._list(name)
+                self._file_counts[name] = len(keys)
+                if len(keys) < 2:
+                    continue
+                table = _latest_rows(pa.concat_tables([self._read(key) for key in keys]))
+                self._write(name, table, "compacted")
+                self._delete(keys)
+                self._file_counts[name] = 1
+                compacted += 1
+                LOGGER.info(
+                    "Compacted %s file(s) into %s row(s) in %s", len(keys), len(table), name
+                )
+        return compacted
+
+    def rebuild(self, items: Iterable[dict[str, Any]]) -> int:
+        """Replace the whole index with one compacted file per partition of ``items``."""
+
+        count = 0
+        with self._lock:
+            stale = self._list()
+            self._file_counts.clear()
+            for partition, group in _partition(items).items():
+                table = _latest_rows(items_table(group))
+                self._write(partition, table, "compacted")
+                self._file_counts[partition] = 1
+                count += len(table)
+            self._delete(stale)
+        LOGGER.info("Exported %s item(s) to s3://%s/%s", count, self.bucket, self.prefix)
+        return count
+
+    def export(self, items_prefix: str = "items/", workers: int = 16) -> int:
+        """Rebuild the index from every item JSON object under ``items_prefix``."""
+
+        paginator = self.client.get_paginator("list_objects_v2")
+        keys = [
+            obj["Key"]
+            for page in paginator.paginate(Bucket=self.bucket, Prefix=items_prefix)
+            for obj in page.get("Contents", [])
+            if obj["Key"].endswith(".json")
+        ]
+
+        def load(key: str) -> dict[str, Any]:
+            return json.loads(self.client.get_object(Bucket=self.bucket, Key=key)["Body"].read())
+
+        with ThreadPoolExecutor(max_workers=max(workers, 1)) as pool:
+            items = list(pool.map(load, keys))
+        return self.rebuild(items)
+
+    def partitions(self) -> list[str]:
+        return sorted({key.rsplit("/", 1)[0][len(self.prefix) + 1 :] for key in self._list()})
+
+    def read(self, partition: str | None = None) -> pa.Table:
+        keys = self._list(partition)
+        if not keys:
+            return _schema().empty_table()
+        return pa.concat_tables([self._read(key) for key in keys])
+
+    def _write(self, partition: str, table: pa.Table, kind: str) -> str:
+        if kind == "compacted":
+            table = table.sort_by([("datetime", "ascending")])
+        table = _with_geo_metadata(table)
+        stamp = datetime.now(timezone.utc).strftime("%Y%m%dT%H%M%S%fZ")
+        key = f"{self.prefix}/{partition}/{stamp}-{kind}-{uuid.uuid4().hex[:8]}.parquet"
+        buffer = io.BytesIO()
+        pq.write_table(
+            table,
+            buffer,
+            row_group_size=ROW_GROUP_SIZE,
+            compression="zstd",
+            write_statistics=True,
+        )
+        self.client.put_object(
+            Bucket=self.bucket,
+            Key=key,
+            Body=buffer.getvalue(),
+            ContentType="application/vnd.apache.parquet",
+        )
+        return key
+
+    def _read(self, key: str) -> pa.Table:
+        body = self.client.get_object(Bucket=self.bucket, Key=key)["Body"].read()
+        return pq.read_table(io.BytesIO(body), schema=_schema())
+
+    def _list(self, partition: str | None = None) -> list[str]:
+        prefix = f"{self.prefix}/{partition}/" if partition else f"{self.prefix}/"
+        keys: list[str] = []
+        paginator = self.client.get_paginator("list_objects_v2")
+        for page in paginator.paginate(Bucket=self.bucket, Prefix=prefix):
+            keys.extend(obj["Key"] for obj in page.get("Contents", []))
+        return sorted(key for key in keys if key.endswith(".parquet"))
+
+    def _delete(self, keys: list[str]) -> None:
+        for start in range(0, len(keys), 1000):
+            batch = keys[start : start + 1000]
+            self.client.delete_objects(
+                Bucket=self.bucket,
+                Delete={"Objects": [{"Key": key} for key in batch], "Quiet": True},
+            )
+
+
+
+@lru_cache(maxsize=1)
+def get_stac_parquet_index() -> StacParquetIndex:
+    """Process-wide index for the configured bucket, so partition file counts persist."""
+
+    return StacParquetIndex.from_settings(get_settings())
+
+def _partition(items: Iterable[dict[str, Any]]) -> dict[str, list[dict[str, Any]]]:
+    partitions: dict[str, list[dict[str, Any]]] = {}
+    for item in items:
+        properties = item.get("properties", {})
+        try:
+            issued = _parse_datetime(properties.get("datetime"))
+            _parse_datetime(properties.get("start_datetime"))
+            _parse_datetime(properties.get("end_datetime"))
+        except (TypeError, ValueError) as exc:
+            LOGGER.warning("Skipping item %s with an invalid datetime: %s", item.get("id"), exc)
+            continue
+        year = issued.year if issued else "unknown"
+        name = f"collection={item.get('collection') or 'none'}/year={year}"
+        partitions.setdefault(name, []).append(item)
+    return partitions
+
+
+def _latest_rows(table: pa.Table) -> pa.Table:
+    last = {item_id: index for index, item_id in enumerate(table.column("id").to_pylist())}
+    if len(last) == len(table):
+        return table
+    return table.take(sorted(last.values()))
+
+
+def _parse_datetime(value: str | None) -> datetime | None:
+    if not value:
+        return None
+    parsed = datetime.fromisoformat(value)
+    if parsed.tzinfo is None:
+        parsed = parsed.replace(tzinfo=timezone.utc)
+    return parsed
+
+
+def _schema() -> pa.Schema:
+    timestamp = pa.timestamp("us", tz="UTC")
+    return pa.schema(
+        [
+            ("id", pa.string()),
+            ("collection", pa.string()),
+            ("hazard", pa.string()),
+            ("severity", pa.string()),
+            ("datetime", timestamp),
+            ("start_datetime", timestamp),
+            ("end_datetime", timestamp),
+            (
+                "bbox",
+                pa.struct(
+                    [
+                        ("xmin", pa.float64()),
+                        ("ymin", pa.float64()),
+                        ("xmax", pa.float64()),
+                        ("ymax", pa.float64()),
+                    ]
+                ),
+            ),
+            ("geometry", pa.binary()),
+            ("assets", pa.map_(pa.string(), pa.string())),
+            ("self_href", pa.string()),
+        ]
+    )
+
+
+def _with_geo_metadata(table: pa.Table) -> pa.Table:
+    wkb = [value for value in table.column("geometry").to_pylist() if value is not None]
+    geometry_types = sorted({geom.geom_type for geom in shapely.from_wkb(wkb)})
+    metadata = {b"geo": json.dumps(_geo_metadata(geometry_types)).encode("utf-8")}
+    return table.replace_schema_metadata(metadata)
+
+
+def _geo_metadata(geometry_types: list[str]) -> dict[str, Any]:
+    return {
+        "version": "1.1.0",
+        "primary_column": "geometry",
+        "columns": {
+            "geometry": {
+                "encoding": "WKB",
+                "geometry_types": geometry_types,
+                "covering": {
+                    "bbox": {
+                        "xmin": ["bbox", "xmin"],
+                        "ymin": ["bbox", "ymin"],
+                        "xmax": ["bbox", "xmax"],
+                        "ymax": ["bbox", "ymax"],
+                    }
+                },
+            }
+        },
+    }
+
+
+def _require_pyarrow() -> None:
+    if pa is None:
+        raise RuntimeError(
+            "The GeoParquet item index needs pyarrow: pip install 'alertzarr[parquet]'"
+        )
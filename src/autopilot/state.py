@@ -41,6 +41,9 @@ class AlertStateStore:
     def is_new(self, alert_id: str) -> bool:
         return str(alert_id) not in self._seen
 
+    def __len__(self) -> int:
+        return len(self._seen)
+
     def _persist(self) -> None:
         self.path.parent.mkdir(parents=True, exist_ok=True)
         payload = {"alerts": sorted(self._seen)}
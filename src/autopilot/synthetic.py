@@ -0,0 +1,167 @@
+"""Synthetic Sentinel-2-like datatrees for offline conversion workloads."""
+
+from __future__ import annotations
+
+import math
+from collections.abc import Sequence
+from dataclasses import dataclass
+from typing import Any
+
+import dask.array as da
+import numpy as np
+import xarray as xr
+from pyproj import Transformer
+from shapely.geometry import shape
+
+# Resolution (metres) and bands of the EOPF Sentinel-2 L2A reflectance groups.
+SENTINEL2_GROUPS: dict[str, tuple[int, tuple[str, ...]]] = {
+    "/measurements/reflectance/r10m": (10, ("b02", "b03", "b04", "b08")),
+    "/measurements/reflectance/r20m": (20, ("b05", "b06", "b07", "b8a", "b11", "b12")),
+    "/measurements/reflectance/r60m": (60, ("b01", "b09")),
+}
+
+# Wavelength (metres) and amplitude of the value-noise octaves summed into the scene field.
+_OCTAVES: tuple[tuple[float, float], ...] = (
+    (10_240.0, 1.0),
+    (2_560.0, 0.5),
+    (640.0, 0.25),
+    (160.0, 0.125),
+)
+# Per-pixel sensor-like noise (reflectance units) on top of the smooth field.
+_PIXEL_NOISE = 5.0
+
+__all__ = [
+    "SENTINEL2_GROUPS",
+    "SyntheticGrid",
+    "build_synthetic_datatree",
+    "synthetic_grid_for_aoi",
+]
+
+
+@dataclass(frozen=True, slots=True)
+class SyntheticGrid:
+    """10 m UTM pixel grid covering an area of interest."""
+
+    width: int
+    height: int
+    epsg: int
+    origin: tuple[float, float]
+
+
+def synthetic_grid_for_aoi(
+    geometry: dict[str, Any],
+    *,
+    min_pixels: int = 256,
+    max_pixels: int = 10_980,
+) -> SyntheticGrid:
+    """Size a 10 m grid in the AOI's UTM zone, clamped to ``min_pixels``..``max_pixels``.
+
+    The upper bound defaults to one Sentinel-2 tile, matching what a real
+    conversion of a single scene writes.
+    """
+
+    geom = shape(geometry)
+    centroid = geom.centroid
+    zone = int((centroid.x + 180) // 6) % 60 + 1
+    epsg = (32600 if centroid.y >= 0 else 32700) + zone
+    transformer = Transformer.from_crs(4326, epsg, always_xy=True)
+    min_lon, min_lat, max_lon, max_lat = geom.bounds
+    xs, ys = transformer.transform(
+        [min_lon, min_lon, max_lon, max_lon], [min_lat, max_lat, min_lat, max_lat]
+    )
+    left, top = min(xs), max(ys)
+
+    def _pixels(extent: float) -> int:
+        return min(max(math.ceil(extent / 10), min_pixels), max_pixels)
+
+    return SyntheticGrid(
+        width=_pixels(max(xs) - left),
+        height=_pixels(top - min(ys)),
+        epsg=epsg,
+        origin=(math.floor(left / 10) * 10, math.ceil(top / 10) * 10),
+    )
+
+
+def build_synthetic_datatree(
+    width: int,
+    height: int | None = None,
+    *,
+    groups: Sequence[str] | None = None,
+    epsg: int = 32633,
+    origin: tuple[float, float] = (500_000.0, 4_600_000.0),
+    chunk: int = 1024,
+    seed: int = 0,
+) -> xr.DataTree:
+    """Build a lazy multi-resolution reflectance tree ``width`` x ``height`` pixels at 10 m.
+
+    Coarser groups keep the same footprint, so a 10980-pixel request mirrors a
+    full Sentinel-2 tile. Values are uint16 reflectances: one seeded, spatially
+    smooth field (summed value-noise octaves from 10 km down to 160 m) shared by
+    all groups, scaled per band, plus a little per-pixel noise. Neighbouring
+    pixels are correlated like real land cover: zstd compresses a band about 1.8x,
+    where independent per-pixel noise (the worst case) only reaches about 1.3x.
+    """
+
+    height = height or width
+    selected = list(groups) if groups is not None else list(SENTINEL2_GROUPS)
+    rng = np.random.default_rng(seed)
+    lattices: list[tuple[float, np.ndarray]] = []
+    for wavelength, amplitude in _OCTAVES:
+        shape = (math.ceil(height * 10 / wavelength) + 2, math.ceil(width * 10 / wavelength) + 2)
+        lattices.append((wavelength, amplitude * rng.standard_normal(shape, dtype=np.float32)))
+    state = da.random.RandomState(seed)
+    nodes: dict[str, xr.Dataset] = {}
+    for group in selected:
+        if group not in SENTINEL2_GROUPS:
+            raise ValueError(f"Unknown Sentinel-2 group: {group}")
+        resolution, bands = SENTINEL2_GROUPS[group]
+        factor = resolution // 10
+        nx = max(width // factor, 1)
+        ny = max(height // factor, 1)
+        x = origin[0] + resolution * (np.arange(nx) + 0.5)
+        y = origin[1] - resolution * (np.arange(ny) + 0.5)
+        variables = {}
+        base = _smooth_field(lattices, ny, nx, resolution, chunk)
+        for index, band in enumerate(bands):
+            noise = state.normal(0, _PIXEL_NOISE, size=(ny, nx), chunks=chunk)
+            field = 1500 + 400 * index + (350 + 20 * index) * base + noise
+            variables[band] = (
+                ("y", "x"),
+                da.clip(field, 0, 10_000).astype("uint16"),
+                {"proj:epsg": epsg, "long_name": f"Synthetic reflectance {band}"},
+            )
+        nodes[group] = xr.Dataset(variables, coords={"x": x, "y": y})
+
+    tree = xr.DataTree.from_dict(nodes)
+    tree.attrs["other_metadata"] = {"horizontal_CRS_code": f"EPSG:{epsg}"}
+    return tree
+
+
+def _smooth_field(
+    lattices: list[tuple[float, np.ndarray]], ny: int, nx: int, resolution: int, chunk: int
+) -> da.Array:
+    """Lazily sample the octave lattices at pixel centres, normalised to unit variance."""
+
+    norm = math.sqrt(sum(float(np.var(lattice)) for _, lattice in lattices)) or 1.0
+
+    def block(block_info=None) -> np.ndarray:
+        (y0, y1), (x0, x1) = block_info[None]["array-location"]
+        rows = (np.arange(y0, y1) + 0.5) * resolution
+        cols = (np.arange(x0, x1) + 0.5) * resolution
+        out = np.zeros((y1 - y0, x1 - x0), dtype="float32")
+        for wavelength, lattice in lattices:
+            out += _bilinear(lattice, rows / wavelength, cols / wavelength)
+        return out / norm
+
+    chunks = da.core.normalize_chunks(chunk, (ny, nx))
+    return da.map_blocks(block, chunks=chunks, dtype="float32")
+
+
+def _bilinear(lattice: np.ndarray, rows: np.ndarray, cols: np.ndarray) -> np.ndarray:
+    r0 = np.floor(rows).astype(int)
+    c0 = np.floor(cols).astype(int)
+    fr = (rows - r0)[:, None]
+    fc = (cols - c0)[None, :]
+    top = lattice[np.ix_(r0, c0)] * (1 - fc) + lattice[np.ix_(r0, c0 + 1)] * fc
+    bottom = lattice[np.ix_(r0 + 1, c0)] * (1 - fc) + lattice[np.ix_(r0 + 1, c0 + 1)] * fc
+    return top * (1 - fr) + bottom * fr
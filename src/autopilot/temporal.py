@@ -0,0 +1,171 @@
+"""Pre/post-event scene selection and lazy temporal cube assembly."""
+
+from __future__ import annotations
+
+import logging
+from collections.abc import Iterable, Sequence
+from datetime import datetime, timezone
+
+import numpy as np
+import pandas as pd
+import xarray as xr
+
+from .catalog import SceneSummary
+
+LOGGER = logging.getLogger(__name__)
+
+__all__ = ["build_temporal_cube", "scene_datetime", "select_pre_post_scenes"]
+
+
+def scene_datetime(scene: SceneSummary) -> datetime:
+    value = scene.datetime
+    if value.endswith("Z"):
+        value = value[:-1] + "+00:00"
+    parsed = datetime.fromisoformat(value)
+    if parsed.tzinfo is None:
+        parsed = parsed.replace(tzinfo=timezone.utc)
+    return parsed
+
+
+def select_pre_post_scenes(
+    scenes: Iterable[SceneSummary], issued: datetime
+) -> tuple[SceneSummary | None, SceneSummary | None]:
+    """Pick the clearest scene on each side of ``issued``, preferring the nearest in time.
+
+    The two scenes must share a grid: when both report an EPSG code or a tile id
+    they have to match, so the pre-event scene is never resampled across UTM
+    zones. The best post-event scene with a compatible pre-event scene wins;
+    when no pair is compatible the pre-event side is ``None``.
+    """
+
+    if issued.tzinfo is None:
+        issued = issued.replace(tzinfo=timezone.utc)
+    pre: list[SceneSummary] = []
+    post: list[SceneSummary] = []
+    for scene in scenes:
+        if not scene.zarr_href:
+            continue
+        try:
+            when = scene_datetime(scene)
+        except ValueError:
+            continue
+        (pre if when < issued else post).append(scene)
+
+    def rank(scene: SceneSummary) -> tuple[float, float]:
+        cover = scene.cloud_cover if scene.cloud_cover is not None else 100.0
+        return cover, abs((scene_datetime(scene) - issued).total_seconds())
+
+    post.sort(key=rank)
+    pre.sort(key=rank)
+    for after in post:
+        before = next((scene for scene in pre if _same_grid(scene, after)), None)
+        if before is not None:
+            return before, after
+    if pre and post:
+        LOGGER.info("No pre-event scene shares the CRS/tile of the post-event candidates")
+    return None, post[0] if post else None
+
+
+def _same_grid(first: SceneSummary, second: SceneSummary) -> bool:
+    if first.epsg is not None and second.epsg is not None and first.epsg != second.epsg:
+        return False
+    if first.tile_id and second.tile_id and first.tile_id != second.tile_id:
+        return False
+    return True
+
+
+def build_temporal_cube(
+    pre: xr.DataTree,
+    post: xr.DataTree,
+    groups: Sequence[str],
+    times: tuple[datetime, datetime],
+    difference: bool = True,
+) -> xr.DataTree:
+    """Stack two lazily opened trees along ``time`` on the post-event grid.
+
+    Variables present in both trees gain a ``time`` dimension; with ``difference``
+    each of them also gets a ``<name>_diff`` layer (post minus pre). Variables that
+    only exist in the post-event tree, such as dNBR, are carried over unchanged.
+    Nothing is computed here; the cube is evaluated when the GeoZarr store is
+    written.
+    """
+
+    time_index = pd.Index(
+        [np.datetime64(t.astimezone(timezone.utc).replace(tzinfo=None), "ns") for t in times],
+        name="time",
+    )
+    nodes: dict[str, xr.Dataset] = {}
+    for group in groups:
+        try:
+            before = pre[group].to_dataset()
+            after = post[group].to_dataset()
+        except KeyError:
+            LOGGER.info("Skipping group %s - missing from one of the scenes", group)
+            continue
+
+        shared = [name for name in after.data_vars if name in before.data_vars]
+        if not shared:
+            continue
+        spatial = [name for name in shared if {"x", "y"} <= set(after[name].dims)]
+        after_only = [name for name in after.data_vars if name not in before.data_vars]
+
+        mismatched = [
+            name
+            for name in spatial
+            if _epsg(before[name]) is not None
+            and _epsg(after[name]) is not None
+            and _epsg(before[name]) != _epsg(after[name])
+        ]
+        if mismatched:
+            LOGGER.warning(
+                "Skipping group %s - pre/post scenes are in different CRSs (%s vs %s)",
+                group,
+                _epsg(before[mismatched[0]]),
+                _epsg(after[mismatched[0]]),
+            )
+            continue
+
+        aligned = _align_to_grid(before[spatial], after[spatial])
+        cube = xr.concat([aligned, after[spatial]], dim=time_index)
+        for name in spatial:
+            cube[name].attrs = dict(after[name].attrs)
+            if difference:
+                # Reflectance bands are unsigned integers; subtracting before the
+                # cast would wrap every decrease around to a large positive value.
+                delta = after[name].astype("float32") - aligned[name].astype("float32")
+                delta.attrs = {
+                    **after[name].attrs,
+                    "long_name": f"Post-event minus pre-event {name}",
+                }
+                cube[f"{name}_diff"] = delta
+        for name in after_only:
+            cube[name] = after[name]
+        cube.attrs = dict(after.attrs)
+        nodes[group] = cube
+
+    tree = xr.DataTree.from_dict(nodes)
+    tree.attrs = dict(post.attrs)
+    return tree
+
+
+def _epsg(variable: xr.DataArray) -> int | None:
+    value = variable.attrs.get("proj:epsg")
+    return int(value) if value is not None else None
+
+
+def _align_to_grid(source: xr.Dataset, target: xr.Dataset) -> xr.Dataset:
+    """Nearest-neighbour reindex of ``source`` onto ``target``'s x/y coordinates."""
+
+    if source.sizes == target.sizes and all(
+        np.array_equal(source[dim].values, target[dim].values) for dim in ("x", "y")
+    ):
+        return source.assign_coords(x=target.x, y=target.y)
+    tolerance = max(
+        float(np.abs(np.diff(target[dim].values[:2])).max()) / 2
+        if target.sizes[dim] > 1
+        else 0.0
+        for dim in ("x", "y")
+    )
+    return source.reindex(
+        x=target.x, y=target.y, method="nearest", tolerance=tolerance or None
+    )
@@ -0,0 +1,68 @@
+"""Closed-form tile indexing for the TiTiler quad tile matrix sets."""
+
+from __future__ import annotations
+
+import math
+from collections.abc import Sequence
+
+WEB_MERCATOR_HALF_WORLD = 20037508.342789244
+_WEB_MERCATOR_MAX_LAT = 85.0511287798066
+
+__all__ = [
+    "WEB_MERCATOR_HALF_WORLD",
+    "mercator_tile_bounds",
+    "tiles_for_bbox",
+]
+
+
+def tiles_for_bbox(
+    bbox: Sequence[float], zoom: int, tile_matrix_set: str
+) -> list[tuple[int, int, int]]:
+    """Return ``(z, x, y)`` tiles covering a lon/lat ``bbox`` at ``zoom``.
+
+    Supports the two TiTiler quad matrix sets with closed-form indexing:
+    ``WebMercatorQuad`` and ``WorldCRS84Quad``.
+    """
+
+    west, south, east, north = bbox
+    if tile_matrix_set == "WebMercatorQuad":
+        cols = rows = 2**zoom
+
+        def column(lon: float) -> int:
+            return math.floor((lon + 180.0) / 360.0 * cols)
+
+        def row(lat: float) -> int:
+            lat = max(min(lat, _WEB_MERCATOR_MAX_LAT), -_WEB_MERCATOR_MAX_LAT)
+            radians = math.radians(lat)
+            return math.floor((1.0 - math.asinh(math.tan(radians)) / math.pi) / 2.0 * rows)
+
+    elif tile_matrix_set == "WorldCRS84Quad":
+        cols, rows = 2 ** (zoom + 1), 2**zoom
+
+        def column(lon: float) -> int:
+            return math.floor((lon + 180.0) / 360.0 * cols)
+
+        def row(lat: float) -> int:
+            return math.floor((90.0 - lat) / 180.0 * rows)
+
+    else:
+        raise ValueError(f"Unsupported tile matrix set: {tile_matrix_set}")
+
+    x_min = _clamp(column(west), cols)
+    x_max = _clamp(column(east), cols)
+    y_min = _clamp(row(north), rows)
+    y_max = _clamp(row(south), rows)
+    return [(zoom, x, y) for y in range(y_min, y_max + 1) for x in range(x_min, x_max + 1)]
+
+
+def mercator_tile_bounds(z: int, x: int, y: int) -> tuple[float, float, float, float]:
+    """Return the EPSG:3857 ``(minx, miny, maxx, maxy)`` of a WebMercatorQuad tile."""
+
+    size = 2 * WEB_MERCATOR_HALF_WORLD / 2**z
+    minx = -WEB_MERCATOR_HALF_WORLD + x * size
+    maxy = WEB_MERCATOR_HALF_WORLD - y * size
+    return minx, maxy - size, minx + size, maxy
+
+
+def _clamp(index: int, size: int) -> int:
+    return min(max(index, 0), size - 1)
@@ -0,0 +1,226 @@
+"""Prime TiTiler caches for freshly published GeoZarr stores."""
+
+from __future__ import annotations
+
+import asyncio
+import logging
+import statistics
+import time
+from collections.abc import Sequence
+from dataclasses import dataclass, field
+from typing import Any
+
+import httpx
+
+from .geozarr import ViewerLinks
+from .tiles import tiles_for_bbox
+
+LOGGER = logging.getLogger(__name__)
+
+__all__ = [
+    "WarmupRequest",
+    "WarmupResult",
+    "warm_viewer",
+]
+
+
+@dataclass
+class WarmupRequest:
+    kind: str
+    url: str
+    status: int | None
+    latency_ms: float
+    error: str | None = None
+
+    @property
+    def ok(self) -> bool:
+        return self.status is not None and self.status < 400
+
+
+@dataclass
+class WarmupResult:
+    requests: list[WarmupRequest] = field(default_factory=list)
+    duration_seconds: float = 0.0
+    abandoned: int = 0
+    error: str | None = None
+
+    @property
+    def timed_out(self) -> bool:
+        return self.abandoned > 0
+
+    def summary(self) -> dict[str, Any]:
+        by_kind: dict[str, dict[str, Any]] = {}
+        for kind in dict.fromkeys(request.kind for request in self.requests):
+            selected = [request for request in self.requests if request.kind == kind]
+            latencies = sorted(request.latency_ms for request in selected)
+            by_kind[kind] = {
+                "count": len(selected),
+                "failed": sum(not request.ok for request in selected),
+                "latency_ms_p50": round(statistics.median(latencies), 1),
+                "latency_ms_max": round(latencies[-1], 1),
+            }
+        summary: dict[str, Any] = {
+            "duration_seconds": round(self.duration_seconds, 2),
+            "requests": len(self.requests),
+            "failed": sum(not request.ok for request in self.requests),
+            "abandoned": self.abandoned,
+            "timed_out": self.timed_out,
+            "by_kind": by_kind,
+        }
+        if self.error:
+            summary["error"] = self.error
+        return summary
+
+
+async def warm_viewer(
+    viewer: ViewerLinks,
+    bbox: Sequence[float],
+    *,
+    budget_seconds: float = 20.0,
+    zoom_levels: int = 3,
+    max_tiles: int = 32,
+    concurrency: int = 8,
+    client: httpx.AsyncClient | None = None,
+) -> WarmupResult:
+    """Request the viewer's info, TileJSON and low-zoom AOI tiles within a time budget.
+
+    ``info`` and ``tilejson`` are requested together; tile requests start as soon
+    as the TileJSON provides the tile template and zoom range. Requests still in
+    flight when the budget runs out are cancelled and counted as abandoned.
+
+    Warm-up is best-effort: an unexpected error is logged and recorded on the
+    result instead of failing the run that published the viewer.
+    """
+
+    started = time.perf_counter()
+    deadline = started + budget_seconds
+    semaphore = asyncio.Semaphore(max(concurrency, 1))
+    close_client = client is None
+    if client is None:
+        client = httpx.AsyncClient(timeout=budget_seconds, follow_redirects=True)
+
+    def remaining() -> float:
+        return max(deadline - time.perf_counter(), 0.0)
+
+    tasks: set[asyncio.Task] = set()
+    error: str | None = None
+    try:
+        tilejson_task = asyncio.create_task(
+            _fetch(client, semaphore, "tilejson", viewer.tilejson_url)
+        )
+        tasks = {
+            tilejson_task,
+            asyncio.create_task(_fetch(client, semaphore, "info", viewer.info_url)),
+        }
+        done, _ = await asyncio.wait({tilejson_task}, timeout=remaining())
+        if tilejson_task in done:
+            _, document = tilejson_task.result()
+            if not isinstance(document, dict):
+                document = {}
+            for url in _tile_urls(viewer, document, bbox, zoom_levels, max_tiles):
+                tasks.add(asyncio.create_task(_fetch(client, semaphore, "tile", url)))
+
+        await asyncio.wait(tasks, timeout=remaining())
+    except Exception as exc:
+        error = str(exc) or type(exc).__name__
+        LOGGER.warning("Viewer warm-up failed: %s", error)
+    finally:
+        pending = {task for task in tasks if not task.done()}
+        for task in pending:
+            task.cancel()
+        await asyncio.gather(*pending, return_exceptions=True)
+        if close_client:
+            await client.aclose()
+
+    requests: list[WarmupRequest] = []
+    for task in tasks - pending:
+        if task.exception() is not None:
+            error = error or str(task.exception()) or type(task.exception()).__name__
+            continue
+        requests.append(task.result()[0])
+    result = WarmupResult(
+        requests=requests,
+        duration_seconds=time.perf_counter() - started,
+        abandoned=len(pending),
+        error=error,
+    )
+    LOGGER.info(
+        "Viewer warm-up: %s request(s), %s failed, %s abandoned in %.2fs",
+        len(result.requests),
+        sum(not request.ok for request in result.requests),
+        result.abandoned,
+        result.duration_seconds,
+    )
+    return result
+
+
+async def _fetch(
+    client: httpx.AsyncClient,
+    semaphore: asyncio.Semaphore,
+    kind: str,
+    url: str,
+) -> tuple[WarmupRequest, dict[str, Any] | None]:
+    async with semaphore:
+        start = time.perf_counter()
+        try:
+            response = await client.get(url)
+        except httpx.HTTPError as exc:
+            latency = (time.perf_counter() - start) * 1000
+            error = str(exc) or type(exc).__name__
+            return WarmupRequest(kind, url, None, latency, error=error), None
+        latency = (time.perf_counter() - start) * 1000
+
+    document = None
+    if kind == "tilejson" and response.is_success:
+        try:
+            document = response.json()
+        except ValueError:
+            document = None
+    return WarmupRequest(kind, url, response.status_code, latency), document
+
+
+def _tile_urls(
+    viewer: ViewerLinks,
+    tilejson: dict[str, Any],
+    bbox: Sequence[float],
+    zoom_levels: int,
+    max_tiles: int,
+) -> list[str]:
+    templates = tilejson.get("tiles") or []
+    if templates:
+        template = templates[0]
+    else:
+        root = viewer.info_url.removesuffix("/info")
+        template = f"{root}/tiles/{viewer.tile_matrix_set}/{{z}}/{{x}}/{{y}}"
+
+    bounds = tilejson.get("bounds")
+    if bounds and len(bounds) == 4:
+        bbox = (
+            max(bbox[0], bounds[0]),
+            max(bbox[1], bounds[1]),
+            min(bbox[2], bounds[2]),
+            min(bbox[3], bounds[3]),
+        )
+        if bbox[0] > bbox[2] or bbox[1] > bbox[3]:
+            return []
+
+    min_zoom = int(tilejson.get("minzoom") or 0)
+    max_zoom = min(int(tilejson.get("maxzoom") or 24), min_zoom + zoom_levels - 1)
+    urls: list[str] = []
+    for zoom in range(min_zoom, max_zoom + 1):
+        try:
+            tiles = tiles_for_bbox(bbox, zoom, viewer.tile_matrix_set)
+        except ValueError as exc:
+            LOGGER.info("Skipping tile warm-up: %s", exc)
+            return []
+        if len(urls) + len(tiles) > max_tiles:
+            if not urls:
+                urls.extend(_tile_url(template, tile) for tile in tiles[:max_tiles])
+            break
+        urls.extend(_tile_url(template, tile) for tile in tiles)
+    return urls
+
+
+def _tile_url(template: str, tile: tuple[int, int, int]) -> str:
+    z, x, y = tile
+    return template.replace("{z}", str(z)).replace("{x}", str(x)).replace("{y}", str(y))
@@ -0,0 +1,380 @@
+"""Long-lived pool of pre-warmed conversion worker processes."""
+
+from __future__ import annotations
+
+import asyncio
+import json
+import logging
+import multiprocessing
+import multiprocessing.util
+import os
+import time
+from collections.abc import AsyncIterator
+from concurrent.futures import ProcessPoolExecutor
+from contextlib import asynccontextmanager
+from dataclasses import asdict, dataclass
+from pathlib import Path
+from typing import Any, Protocol
+
+try:
+    import aio_pika  # type: ignore
+except ImportError:  # pragma: no cover
+    aio_pika = None  # type: ignore
+
+from .alerts import parse_alert_payload
+from .executor import admits, configure_conversion_executor, estimate_working_set
+from .geozarr import ConversionMode
+from .logging_utils import configure_logging
+from .metrics_sink import close_metrics_sinks
+from .pipeline import run_pipeline
+from .profiles import resolve_conversion_settings
+from .prometheus import QUEUE_HANDLER_SECONDS, STAGE_BUCKETS, Counter, Gauge, Histogram
+from .reporting import RunReporter
+from .s3 import close_s3_clients, get_s3_manager
+from .settings import get_settings
+
+LOGGER = logging.getLogger(__name__)
+
+# Spawned workers import this module, and with it xarray, eopf_geozarr, boto3 and
+# pyproj, before their first job. ``_warm_worker`` then builds per-process state;
+# a persistent event loop lets async clients created by one job serve the next.
+_WORKER_LOOP: asyncio.AbstractEventLoop | None = None
+
+WORKER_JOBS = Counter("alertzarr_worker_jobs_total", "Worker jobs finished, by status", ["status"])
+WORKER_JOB_SECONDS = Histogram(
+    "alertzarr_worker_job_seconds", "End-to-end worker job duration", buckets=STAGE_BUCKETS
+)
+WORKER_JOBS_IN_FLIGHT = Gauge("alertzarr_worker_jobs_in_flight", "Jobs running in the pool")
+WORKER_RESERVED_BYTES = Gauge(
+    "alertzarr_worker_reserved_bytes", "Projected working set of the jobs running in the pool"
+)
+# Jobs run in pool processes; their per-stage span totals come back in the job
+# summary and are observed here, in the process that serves /metrics.
+CONVERSION_STAGE_SECONDS = Histogram(
+    "alertzarr_conversion_stage_seconds",
+    "Time spent per job in each conversion stage",
+    ["stage"],
+    buckets=STAGE_BUCKETS,
+)
+
+
+@dataclass
+class WorkerJob:
+    """A single alert conversion request handled by the pool."""
+
+    alert: dict[str, Any]
+    mode: ConversionMode = "auto"
+    include_scene_search: bool = True
+    temporal_cube: bool = False
+    run_id: str | None = None
+
+    @classmethod
+    def from_message(cls, body: bytes | str) -> "WorkerJob":
+        """Parse a job request or a CloudEvent published by the alert listener."""
+
+        payload = json.loads(body)
+        if not isinstance(payload, dict):
+            raise ValueError("Worker job must be a JSON object")
+        if "alert" in payload:
+            return cls(
+                alert=dict(payload["alert"]),
+                mode=payload.get("mode", "auto"),
+                include_scene_search=bool(payload.get("include_scene_search", True)),
+                temporal_cube=bool(payload.get("temporal_cube", False)),
+                run_id=payload.get("run_id"),
+            )
+        if isinstance(payload.get("data"), dict):
+            return cls(alert=dict(payload["data"]))
+        raise ValueError("Worker job requires an 'alert' or CloudEvent 'data' payload")
+
+
+class JobRunner(Protocol):
+    async def submit(self, job: WorkerJob) -> dict[str, Any]: ...
+
+
+class WorkerPool:
+    """Dispatch jobs to worker processes that keep imports, clients and sources warm.
+
+    Each job's projected working set is reserved against the whole
+    ``CONVERTER_MEMORY_BUDGET_MB`` before it is dispatched, so jobs wait here
+    rather than overcommitting memory; a job larger than the budget runs alone.
+    """
+
+    def __init__(self, processes: int, *, budget_bytes: int | None = None) -> None:
+        if processes < 1:
+            raise ValueError("processes must be at least 1")
+        self.processes = processes
+        self.budget_bytes = budget_bytes or get_settings().converter_memory_budget_mb * 1024**2
+        self._condition = asyncio.Condition()
+        self._reserved = 0
+        self._active = 0
+        self._executor = ProcessPoolExecutor(
+            max_workers=processes,
+            mp_context=multiprocessing.get_context("spawn"),
+            initializer=_warm_worker,
+            initargs=(self.budget_bytes,),
+        )
+
+    async def start(self) -> None:
+        """Spawn every worker process up front so the first jobs skip start-up."""
+
+        loop = asyncio.get_running_loop()
+        pids = await asyncio.gather(
+            *(
+                loop.run_in_executor(self._executor, _ping)
+                for _ in range(self.processes)
+            )
+        )
+        LOGGER.info("Worker pool ready with pids %s", sorted(set(pids)))
+
+    async def submit(self, job: WorkerJob) -> dict[str, Any]:
+        loop = asyncio.get_running_loop()
+        started = time.perf_counter()
+        try:
+            async with self._admitted(_projected_job_bytes(job)):
+                summary = await loop.run_in_executor(self._executor, _run_job, asdict(job))
+        except Exception:
+            WORKER_JOBS.labels("error").inc()
+            raise
+        finally:
+            WORKER_JOB_SECONDS.observe(time.perf_counter() - started)
+        WORKER_JOBS.labels(summary.get("status", "unknown")).inc()
+        for stage, seconds in summary.get("stage_seconds", {}).items():
+            CONVERSION_STAGE_SECONDS.labels(stage).observe(seconds)
+        return summary
+
+    @property
+    def reserved_bytes(self) -> int:
+        return self._reserved
+
+    @asynccontextmanager
+    async def _admitted(self, projected_bytes: int) -> AsyncIterator[None]:
+        if projected_bytes > self.budget_bytes:
+            LOGGER.warning(
+                "Projected working set %s exceeds memory budget %s; running alone",
+                projected_bytes,
+                self.budget_bytes,
+            )
+        async with self._condition:
+            await self._condition.wait_for(
+                lambda: admits(
+                    projected_bytes,
+                    reserved_bytes=self._reserved,
+                    active=self._active,
+                    budget_bytes=self.budget_bytes,
+                    max_concurrency=self.processes,
+                )
+            )
+            self._reserved += projected_bytes
+            self._active += 1
+        WORKER_JOBS_IN_FLIGHT.inc()
+        WORKER_RESERVED_BYTES.inc(projected_bytes)
+        try:
+            yield
+        finally:
+            WORKER_JOBS_IN_FLIGHT.dec()
+            WORKER_RESERVED_BYTES.dec(projected_bytes)
+            async with self._condition:
+                self._reserved -= projected_bytes
+                self._active -= 1
+                self._condition.notify_all()
+
+    def close(self) -> None:
+        self._executor.shutdown(wait=True, cancel_futures=True)
+
+
+class WorkerSocketServer:
+    """Accept newline-delimited JSON jobs on a local Unix socket."""
+
+    def __init__(self, runner: JobRunner, path: Path) -> None:
+        self.runner = runner
+        self.path = path
+        self._server: asyncio.AbstractServer | None = None
+
+    async def start(self) -> None:
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self.path.unlink(missing_ok=True)
+        self._server = await asyncio.start_unix_server(
+            self._handle_connection, path=str(self.path)
+        )
+        LOGGER.info("Worker listening on %s", self.path)
+
+    async def serve_forever(self) -> None:
+        if self._server is None:
+            await self.start()
+        assert self._server is not None
+        async with self._server:
+            await self._server.serve_forever()
+
+    async def close(self) -> None:
+        if self._server is not None:
+            self._server.close()
+            await self._server.wait_closed()
+            self._server = None
+        self.path.unlink(missing_ok=True)
+
+    async def _handle_connection(
+        self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter
+    ) -> None:
+        try:
+            while line := await reader.readline():
+                if not line.strip():
+                    continue
+                response = await self._handle_line(line)
+                writer.write(json.dumps(response).encode("utf-8") + b"\n")
+                await writer.drain()
+        finally:
+            writer.close()
+            await writer.wait_closed()
+
+    async def _handle_line(self, line: bytes) -> dict[str, Any]:
+        try:
+            job = WorkerJob.from_message(line)
+        except (ValueError, TypeError) as exc:
+            return {"status": "rejected", "error": str(exc)}
+        try:
+            return await self.runner.submit(job)
+        except Exception as exc:  # pragma: no cover - surfaced to the caller
+            LOGGER.exception("Worker job failed: %s", exc)
+            return {"status": "failed", "error": str(exc)}
+
+
+class WorkerQueueConsumer:
+    """Consume alert events from RabbitMQ and run them on the worker pool."""
+
+    def __init__(self, runner: JobRunner, queue_name: str, prefetch: int) -> None:
+        if aio_pika is None:  # pragma: no cover
+            raise RuntimeError("aio_pika is required to consume worker jobs")
+        self.runner = runner
+        self.queue_name = queue_name
+        self.prefetch = prefetch
+
+    async def run(self) -> None:
+        settings = get_settings()
+        connection = await aio_pika.connect_robust(settings.rabbitmq_url)
+        async with connection:
+            channel = await connection.channel()
+            await channel.set_qos(prefetch_count=self.prefetch)
+            queue = await channel.declare_queue(self.queue_name, durable=True)
+            await queue.bind(
+                settings.alert_exchange, routing_key=settings.alert_routing_key
+            )
+            tasks: set[asyncio.Task] = set()
+            async with queue.iterator() as queue_iter:
+                async for message in queue_iter:
+                    task = asyncio.create_task(self._process(message))
+                    tasks.add(task)
+                    task.add_done_callback(tasks.discard)
+
+    async def _process(self, message) -> None:
+        """Ack finished jobs, reject malformed ones and requeue failed submissions once.
+
+        A job that fails inside the pipeline still returns a summary and is acked;
+        only errors from the pool itself (a crashed worker process, a shutdown)
+        reach the nack. A message that fails again after redelivery is rejected
+        without requeue so a dead-letter policy on the queue can capture it.
+        """
+
+        started = time.perf_counter()
+        outcome = "error"
+        try:
+            try:
+                job = WorkerJob.from_message(message.body)
+            except (ValueError, TypeError) as exc:
+                LOGGER.warning("Rejecting malformed worker job: %s", exc)
+                outcome = "malformed"
+                await message.reject(requeue=False)
+                return
+            try:
+                summary = await self.runner.submit(job)
+            except Exception as exc:
+                requeue = not message.redelivered
+                outcome = "requeued" if requeue else "rejected"
+                LOGGER.exception(
+                    "Worker job submission failed (%s): %s",
+                    "requeueing" if requeue else "rejecting after redelivery",
+                    exc,
+                )
+                await message.nack(requeue=requeue)
+                return
+            await message.ack()
+            outcome = summary.get("status", "unknown")
+            LOGGER.info(
+                "Worker job for %s finished with status %s",
+                summary.get("alert_id"),
+                summary.get("status"),
+            )
+        finally:
+            QUEUE_HANDLER_SECONDS.labels(self.queue_name, outcome).observe(
+                time.perf_counter() - started
+            )
+
+
+def _warm_worker(budget_bytes: int) -> None:
+    """Build cached clients and the job event loop once per process."""
+
+    global _WORKER_LOOP
+
+    configure_logging()
+    settings = get_settings()
+    get_s3_manager(settings).sync_client()
+    # The parent reserved this job's memory already; a process runs one job at a time.
+    configure_conversion_executor(budget_bytes=budget_bytes, max_concurrency=1)
+    _WORKER_LOOP = asyncio.new_event_loop()
+    asyncio.set_event_loop(_WORKER_LOOP)
+    # Pool processes leave through os._exit, which skips atexit handlers.
+    multiprocessing.util.Finalize(None, _close_worker_clients, exitpriority=10)
+
+
+def _close_worker_clients() -> None:
+    if _WORKER_LOOP is not None and not _WORKER_LOOP.is_closed():
+        _WORKER_LOOP.run_until_complete(close_s3_clients())
+        _WORKER_LOOP.close()
+    close_metrics_sinks()
+
+
+def _projected_job_bytes(job: WorkerJob) -> int:
+    """Working set the job's conversion will reserve, after its profile is applied."""
+
+    settings = get_settings()
+    try:
+        alert = parse_alert_payload(job.alert)
+        settings, _ = resolve_conversion_settings(alert, settings)
+    except Exception as exc:  # the worker fails the job and reports why
+        LOGGER.debug("Projecting %s with the default profile: %s", job.alert.get("id"), exc)
+    projected = estimate_working_set(settings)
+    # A temporal cube holds the pre- and post-event scenes at once.
+    return 2 * projected if job.temporal_cube else projected
+
+
+def _ping() -> int:
+    return os.getpid()
+
+
+def _run_job(job_payload: dict[str, Any]) -> dict[str, Any]:
+    loop = _WORKER_LOOP or asyncio.new_event_loop()
+    return loop.run_until_complete(_process_job(WorkerJob(**job_payload)))
+
+
+async def _process_job(job: WorkerJob) -> dict[str, Any]:
+    settings = get_settings()
+    reporter = RunReporter(run_id=job.run_id)
+    reporter.start_run()
+    try:
+        alert = parse_alert_payload(job.alert)
+        reporter.record_alert(alert)
+        await run_pipeline(
+            alert,
+            reporter,
+            include_scene_search=job.include_scene_search,
+            mode=job.mode,
+            temporal_cube=job.temporal_cube,
+        )
+    except Exception as exc:
+        LOGGER.exception("Worker job failed: %s", exc)
+        reporter.status = "failed"
+        reporter.steps.setdefault("error", {"message": str(exc)})
+    finally:
+        reporter.finish_run()
+        reporter.emit_metrics(Path(settings.metrics_path))
+    return reporter.summary()
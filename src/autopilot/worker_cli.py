@@ -0,0 +1,79 @@
+"""Command-line entry point for the warm conversion worker service."""
+
+from __future__ import annotations
+
+import asyncio
+from pathlib import Path
+
+import click
+
+from .logging_utils import configure_logging
+from .prometheus import start_metrics_server
+from .settings import get_settings
+from .worker import WorkerPool, WorkerQueueConsumer, WorkerSocketServer
+
+
+@click.command()
+@click.option(
+    "--processes",
+    type=int,
+    default=None,
+    help="Worker processes to keep warm (defaults to WORKER_PROCESSES)",
+)
+@click.option(
+    "--transport",
+    type=click.Choice(["rabbitmq", "socket"], case_sensitive=False),
+    default="rabbitmq",
+    show_default=True,
+    help="Receive jobs from the RabbitMQ alert exchange or a local Unix socket",
+)
+@click.option(
+    "--socket-path",
+    type=click.Path(path_type=Path),
+    default=None,
+    help="Unix socket path for --transport socket (defaults to WORKER_SOCKET_PATH)",
+)
+@click.option(
+    "--metrics-port",
+    type=int,
+    default=None,
+    help="Serve Prometheus metrics on this port (defaults to METRICS_PORT; 0 disables)",
+)
+def main(
+    processes: int | None,
+    transport: str,
+    socket_path: Path | None,
+    metrics_port: int | None,
+) -> None:
+    """Serve alert conversions from a pool of pre-warmed worker processes."""
+    configure_logging()
+    settings = get_settings()
+    pool = WorkerPool(processes or settings.worker_processes)
+    port = settings.metrics_port if metrics_port is None else metrics_port
+    if port:
+        start_metrics_server(port, settings.metrics_host)
+
+    async def runner() -> None:
+        await pool.start()
+        if transport == "socket":
+            server = WorkerSocketServer(
+                pool, socket_path or Path(settings.worker_socket_path)
+            )
+            try:
+                await server.serve_forever()
+            finally:
+                await server.close()
+        else:
+            consumer = WorkerQueueConsumer(
+                pool, settings.worker_queue_name, prefetch=pool.processes
+            )
+            await consumer.run()
+
+    try:
+        asyncio.run(runner())
+    finally:
+        pool.close()
+
+
+if __name__ == "__main__":  # pragma: no cover
+    main()
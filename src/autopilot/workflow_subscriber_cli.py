@@ -8,13 +8,20 @@ from pathlib import Path
 import click
 
 from .logging_utils import configure_logging
+from .prometheus import start_metrics_server
 from .settings import get_settings
 from .state import AlertStateStore
 from .workflows import AlertEventSubscriber, WorkflowTrigger
 
 
 @click.command()
-def main() -> None:
+@click.option(
+    "--metrics-port",
+    type=int,
+    default=None,
+    help="Serve Prometheus metrics on this port (defaults to METRICS_PORT; 0 disables)",
+)
+def main(metrics_port: int | None) -> None:
     """Launch the RabbitMQ subscriber that triggers Argo workflows."""
     configure_logging()
     settings = get_settings()
@@ -30,6 +37,9 @@ def main() -> None:
     )
     state_store = AlertStateStore(Path(settings.workflow_trigger_state_path))
     subscriber = AlertEventSubscriber(state_store, trigger)
+    port = settings.metrics_port if metrics_port is None else metrics_port
+    if port:
+        start_metrics_server(port, settings.metrics_host)
 
     asyncio.run(subscriber.run())
 
@@ -4,6 +4,7 @@ from __future__ import annotations
 
 import json
 import logging
+import time
 from typing import Any
 
 import httpx
@@ -14,11 +15,21 @@ except ImportError:  # pragma: no cover
     aio_pika = None  # type: ignore
 
 from .alerts import LoadedAlert, parse_alert_payload
+from .prometheus import QUEUE_HANDLER_SECONDS, STATE_STORE_SIZE, Counter, Histogram
 from .settings import get_settings
 from .state import AlertStateStore
 
 LOGGER = logging.getLogger(__name__)
 
+ARGO_SUBMIT_SECONDS = Histogram(
+    "alertzarr_argo_submit_seconds", "Argo workflow submission latency", ["outcome"]
+)
+ARGO_SUBMIT_ERRORS = Counter(
+    "alertzarr_argo_submit_errors_total",
+    "Failed Argo workflow submissions, by HTTP status or exception type",
+    ["reason"],
+)
+
 
 class WorkflowTrigger:
     """Submit parameterised Argo Workflows based on incoming alerts."""
@@ -67,12 +78,20 @@ class WorkflowTrigger:
             },
         }
         url = f"{self.base_url}/api/v1/workflows/{self.namespace}"
-        async with httpx.AsyncClient(
-            timeout=self.timeout_seconds, headers=headers
-        ) as client:
-            response = await client.post(url, json=payload)
-            response.raise_for_status()
-            return response.json()
+        started = time.perf_counter()
+        try:
+            async with httpx.AsyncClient(
+                timeout=self.timeout_seconds, headers=headers
+            ) as client:
+                response = await client.post(url, json=payload)
+                response.raise_for_status()
+                result = response.json()
+        except Exception as exc:
+            ARGO_SUBMIT_SECONDS.labels("error").observe(time.perf_counter() - started)
+            ARGO_SUBMIT_ERRORS.labels(_submit_error_reason(exc)).inc()
+            raise
+        ARGO_SUBMIT_SECONDS.labels("submitted").observe(time.perf_counter() - started)
+        return result
 
 
 class AlertEventSubscriber:
@@ -89,6 +108,7 @@ class AlertEventSubscriber:
         self.state_store = state_store
         self.trigger = trigger
         self.queue_name = queue_name
+        STATE_STORE_SIZE.labels("workflow_subscriber").set_function(state_store.__len__)
 
     async def run(self) -> None:
         settings = get_settings()
@@ -102,22 +122,31 @@ class AlertEventSubscriber:
             async with queue.iterator() as queue_iter:
                 async for message in queue_iter:
                     async with message.process(requeue=False):
-                        await self._handle_message(message.body)
+                        started = time.perf_counter()
+                        outcome = "error"
+                        try:
+                            outcome = await self._handle_message(message.body)
+                        finally:
+                            QUEUE_HANDLER_SECONDS.labels(self.queue_name, outcome).observe(
+                                time.perf_counter() - started
+                            )
+
+    async def _handle_message(self, body: bytes) -> str:
+        """Handle one alert event; returns the outcome recorded in the handler metrics."""
 
-    async def _handle_message(self, body: bytes) -> None:
         try:
             event = json.loads(body)
             payload = event.get("data") or {}
             alert = parse_alert_payload(payload)
         except Exception as exc:  # pragma: no cover
             LOGGER.warning("Discarding malformed message: %s", exc)
-            return
+            return "malformed"
 
         if not self.state_store.is_new(alert.id):
             LOGGER.debug(
                 "Alert %s already processed; skipping workflow submission", alert.id
             )
-            return
+            return "duplicate"
 
         try:
             await self.trigger.submit(alert)
@@ -127,3 +156,10 @@ class AlertEventSubscriber:
         else:
             self.state_store.mark_processed(alert.id)
             LOGGER.info("Submitted workflow for alert %s", alert.id)
+            return "submitted"
+
+
+def _submit_error_reason(exc: Exception) -> str:
+    if isinstance(exc, httpx.HTTPStatusError):
+        return str(exc.response.status_code)
+    return type(exc).__name__
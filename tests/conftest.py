@@ -0,0 +1,254 @@
+"""Shared in-memory S3 fakes and STAC item / alert builders for the test suite."""
+
+import asyncio
+import hashlib
+import json
+from collections.abc import Sequence
+
+from botocore.exceptions import ClientError
+
+from autopilot.alerts import parse_alert_payload
+
+ISSUED = "2025-09-22T08:00:00Z"
+
+
+def bbox_polygon(bbox: Sequence[float]) -> dict:
+    xmin, ymin, xmax, ymax = bbox
+    return {
+        "type": "Polygon",
+        "coordinates": [[[xmin, ymin], [xmax, ymin], [xmax, ymax], [xmin, ymax], [xmin, ymin]]],
+    }
+
+
+def make_item(
+    item_id: str,
+    *,
+    collection: str = "flood",
+    bbox: Sequence[float] = (0, 0, 1, 1),
+    when: str = "2025-01-01T00:00:00Z",
+    href: str | None = None,
+    **properties,
+) -> dict:
+    """Published-style STAC item; extra keyword arguments override its properties."""
+    return {
+        "type": "Feature",
+        "id": item_id,
+        "collection": collection,
+        "bbox": list(bbox),
+        "geometry": bbox_polygon(bbox),
+        "properties": {
+            "datetime": when,
+            "alert:hazard": collection,
+            "alert:severity": "severe",
+            **properties,
+        },
+        "assets": {"geozarr": {"href": href or f"s3://bucket/{item_id}.zarr"}},
+        "links": [{"rel": "self", "href": f"s3://stac/items/{item_id}.json"}],
+    }
+
+
+def make_alert(
+    alert_id: str = "EMSR1",
+    *,
+    bbox: Sequence[float] = (0, 0, 1, 1),
+    area_of_interest: dict | None = None,
+    hazard: str = "flood",
+    issued: str | None = ISSUED,
+    parameters: dict | None = None,
+):
+    """Parsed alert over ``bbox``; ``issued=None`` leaves the issued time out."""
+    payload = {
+        "id": alert_id,
+        "hazardType": hazard,
+        "areaOfInterest": area_of_interest or bbox_polygon(bbox),
+    }
+    if issued is not None:
+        payload["issued"] = issued
+    if parameters is not None:
+        payload["parameters"] = parameters
+    return parse_alert_payload(payload)
+
+
+def _client_error(code: str, operation: str) -> ClientError:
+    return ClientError({"Error": {"Code": code}}, operation)
+
+
+class _Bucket:
+    """Object state and conditional-write rules shared by the sync and async fakes."""
+
+    def __init__(self) -> None:
+        self.objects: dict[str, bytes] = {}
+        self.metadata: dict[str, dict] = {}
+        self.gets = 0
+        self.heads = 0
+        self.puts = 0
+        self.conflicts = 0
+        self.list_calls = 0
+
+    def etag(self, key: str) -> str:
+        return '"' + hashlib.md5(self.objects[key]).hexdigest() + '"'
+
+    def add_item(self, item: dict) -> None:
+        self.objects[f"items/{item['id']}.json"] = json.dumps(item).encode()
+
+    def document(self, key: str) -> dict:
+        return json.loads(self.objects[key])
+
+    def parquet_keys(self) -> list[str]:
+        return sorted(key for key in self.objects if key.endswith(".parquet"))
+
+    def _head(self, key: str) -> dict:
+        self.heads += 1
+        if key not in self.objects:
+            raise _client_error("404", "HeadObject")
+        return {"Metadata": self.metadata.get(key, {}), "ETag": self.etag(key)}
+
+    def _get(self, key: str) -> tuple[bytes, str]:
+        self.gets += 1
+        if key not in self.objects:
+            raise _client_error("NoSuchKey", "GetObject")
+        return self.objects[key], self.etag(key)
+
+    def _put(
+        self,
+        key: str,
+        body: bytes,
+        metadata: dict | None,
+        if_match: str | None,
+        if_none_match: str | None,
+    ) -> dict:
+        self.puts += 1
+        exists = key in self.objects
+        if (if_none_match == "*" and exists) or (
+            if_match is not None and (not exists or self.etag(key) != if_match)
+        ):
+            self.conflicts += 1
+            raise _client_error("PreconditionFailed", "PutObject")
+        self.objects[key] = body
+        self.metadata[key] = dict(metadata or {})
+        return {"ETag": self.etag(key)}
+
+    def _page(self, prefix: str) -> dict:
+        contents = [
+            {"Key": key, "ETag": self.etag(key)}
+            for key in sorted(self.objects)
+            if key.startswith(prefix)
+        ]
+        return {"Contents": contents}
+
+    def _delete(self, delete: dict) -> dict:
+        for entry in delete["Objects"]:
+            self.objects.pop(entry["Key"], None)
+            self.metadata.pop(entry["Key"], None)
+        return {}
+
+
+class _Body:
+    def __init__(self, payload: bytes) -> None:
+        self.payload = payload
+
+    def read(self) -> bytes:
+        return self.payload
+
+
+class _Paginator:
+    def __init__(self, s3: _Bucket) -> None:
+        self.s3 = s3
+
+    def paginate(self, Bucket: str, Prefix: str = ""):
+        yield self.s3._page(Prefix)
+
+
+class InMemoryS3(_Bucket):
+    """Synchronous boto3-style bucket honouring If-Match/If-None-Match like S3 and MinIO."""
+
+    def head_object(self, Bucket: str, Key: str) -> dict:
+        return self._head(Key)
+
+    def get_object(self, Bucket: str, Key: str) -> dict:
+        payload, etag = self._get(Key)
+        return {"Body": _Body(payload), "ETag": etag}
+
+    def put_object(
+        self,
+        Bucket: str,
+        Key: str,
+        Body: bytes,
+        Metadata: dict | None = None,
+        IfMatch: str | None = None,
+        IfNoneMatch: str | None = None,
+        **kwargs,
+    ) -> dict:
+        return self._put(Key, Body, Metadata, IfMatch, IfNoneMatch)
+
+    def delete_objects(self, Bucket: str, Delete: dict) -> dict:
+        return self._delete(Delete)
+
+    def get_paginator(self, name: str) -> _Paginator:
+        self.list_calls += 1
+        return _Paginator(self)
+
+
+class _AsyncBody(_Body):
+    async def __aenter__(self) -> "_AsyncBody":
+        return self
+
+    async def __aexit__(self, *exc) -> None:
+        return None
+
+    async def read(self) -> bytes:
+        return self.payload
+
+
+class _AsyncPaginator(_Paginator):
+    async def paginate(self, Bucket: str, Prefix: str = ""):
+        yield self.s3._page(Prefix)
+
+
+class AsyncInMemoryS3(_Bucket):
+    """aiobotocore-style twin of :class:`InMemoryS3` that records peak request concurrency.
+
+    Every request yields to the event loop first, so concurrent writers interleave between
+    their read and their conditional write.
+    """
+
+    def __init__(self) -> None:
+        super().__init__()
+        self.in_flight = 0
+        self.max_in_flight = 0
+
+    async def head_object(self, Bucket: str, Key: str) -> dict:
+        await self._tick()
+        return self._head(Key)
+
+    async def get_object(self, Bucket: str, Key: str) -> dict:
+        await self._tick()
+        payload, etag = self._get(Key)
+        return {"Body": _AsyncBody(payload), "ETag": etag}
+
+    async def put_object(
+        self,
+        Bucket: str,
+        Key: str,
+        Body: bytes,
+        Metadata: dict | None = None,
+        IfMatch: str | None = None,
+        IfNoneMatch: str | None = None,
+        **kwargs,
+    ) -> dict:
+        await self._tick()
+        return self._put(Key, Body, Metadata, IfMatch, IfNoneMatch)
+
+    async def delete_objects(self, Bucket: str, Delete: dict) -> dict:
+        await self._tick()
+        return self._delete(Delete)
+
+    def get_paginator(self, name: str) -> _AsyncPaginator:
+        self.list_calls += 1
+        return _AsyncPaginator(self)
+
+    async def _tick(self) -> None:
+        self.in_flight += 1
+        self.max_in_flight = max(self.max_in_flight, self.in_flight)
+        await asyncio.sleep(0.001)
+        self.in_flight -= 1
@@ -0,0 +1,52 @@
+import numpy as np
+
+from autopilot.benchmark import BenchmarkConfig, parameter_grid, run_benchmark
+from autopilot.settings import Settings
+from autopilot.synthetic import build_synthetic_datatree
+
+R10M = "/measurements/reflectance/r10m"
+
+
+def test_synthetic_tree_matches_sentinel2_layout() -> None:
+    tree = build_synthetic_datatree(120, groups=[R10M, "/measurements/reflectance/r60m"])
+
+    assert tree[R10M]["b04"].shape == (120, 120)
+    assert tree["/measurements/reflectance/r60m"]["b01"].shape == (20, 20)
+    assert tree[R10M]["b04"].attrs["proj:epsg"] == 32633
+
+
+def test_synthetic_bands_are_spatially_smooth_and_seeded() -> None:
+    band = build_synthetic_datatree(512, groups=[R10M], chunk=128, seed=7)[R10M]["b04"].values
+    again = build_synthetic_datatree(512, groups=[R10M], chunk=128, seed=7)[R10M]["b04"].values
+    values = band.astype("float64")
+
+    assert (band == again).all()
+    assert np.diff(values, axis=1).std() < 0.2 * values.std()
+
+
+def test_parameter_grid_is_cartesian() -> None:
+    grid = parameter_grid([256, 512], [256], [64], [False, True])
+
+    assert len(grid) == 4
+    assert grid[0] == BenchmarkConfig(256, 256, 64, False)
+    assert grid[-1].label == "chunk512-tile256-min64-sharded"
+
+
+def test_run_benchmark_writes_and_reads_local_store(tmp_path) -> None:
+    tree = build_synthetic_datatree(256, groups=[R10M], chunk=128)
+    settings = Settings(converter_groups=[R10M])
+
+    result = run_benchmark(
+        tree,
+        BenchmarkConfig(128, 128, 64, False),
+        str(tmp_path),
+        settings,
+        read_samples=5,
+    )
+
+    assert result.object_count > 0
+    assert result.total_bytes > 0
+    assert result.source_bytes == 4 * 256 * 256 * 2
+    assert result.read_latency_p50_ms is not None
+    assert result.as_dict()["config"]["label"] == "chunk128-tile128-min64-unsharded"
+    assert not (tmp_path / "chunk128-tile128-min64-unsharded.zarr").exists()
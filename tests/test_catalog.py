@@ -0,0 +1,409 @@
+import asyncio
+import json
+import threading
+import time
+
+import httpx
+from conftest import bbox_polygon, make_alert
+
+from autopilot.catalog import (
+    SceneIndex,
+    SceneSearchCache,
+    aoi_coverage_reached,
+    fetch_eodc_scenes,
+    fetch_eodc_scenes_bulk,
+    iter_eodc_scenes,
+)
+
+ISSUED = "2025-09-22T08:17:00Z"
+
+
+def _body(limit: int = 3, offset: float = 0.0) -> dict:
+    return {
+        "collections": ["sentinel-2-l2a"],
+        "intersects": {
+            "type": "Polygon",
+            "coordinates": [
+                [[offset, 0], [1, 0], [1, 1], [offset, 1], [offset, 0]],
+            ],
+        },
+        "limit": limit,
+        "datetime": "2025-09-12T08:00:00Z/2025-09-23T09:00:00Z",
+        "query": {"eo:cloud_cover": {"lt": 40}},
+    }
+
+
+def _features(count: int) -> list[dict]:
+    return [{"id": f"scene-{index}"} for index in range(count)]
+
+
+def test_cache_serves_repeat_and_smaller_limit_requests() -> None:
+    cache = SceneSearchCache(ttl_seconds=60, max_entries=8)
+    calls = 0
+
+    async def fetch() -> list[dict]:
+        nonlocal calls
+        calls += 1
+        return _features(3)
+
+    async def runner() -> tuple[list[dict], list[dict]]:
+        first = await cache.get_or_fetch(_body(3), fetch)
+        second = await cache.get_or_fetch(_body(2, offset=0.00001), fetch)
+        return first, second
+
+    first, second = asyncio.run(runner())
+
+    assert calls == 1
+    assert [f["id"] for f in second] == ["scene-0", "scene-1"]
+    assert len(first) == 3
+    assert cache.stats.as_dict() == {
+        "hits": 1,
+        "disk_hits": 0,
+        "coalesced": 0,
+        "misses": 1,
+        "hit_rate": 0.5,
+    }
+
+
+def test_cache_coalesces_concurrent_identical_requests() -> None:
+    cache = SceneSearchCache(ttl_seconds=60, max_entries=8)
+    calls = 0
+
+    async def fetch() -> list[dict]:
+        nonlocal calls
+        calls += 1
+        await asyncio.sleep(0.05)
+        return _features(2)
+
+    async def runner() -> list[list[dict]]:
+        return await asyncio.gather(*(cache.get_or_fetch(_body(), fetch) for _ in range(5)))
+
+    results = asyncio.run(runner())
+
+    assert calls == 1
+    assert all(result == _features(2) for result in results)
+    assert cache.stats.coalesced == 4
+
+
+def test_cache_treats_missing_limit_as_unbounded() -> None:
+    cache = SceneSearchCache(ttl_seconds=60, max_entries=8)
+    unbounded = {key: value for key, value in _body().items() if key != "limit"}
+    calls = 0
+
+    async def fetch() -> list[dict]:
+        nonlocal calls
+        calls += 1
+        return _features(5)
+
+    async def runner() -> tuple[list[dict], list[dict], list[dict]]:
+        limited = await cache.get_or_fetch(_body(3), fetch)
+        everything = await cache.get_or_fetch(unbounded, fetch)
+        again = await cache.get_or_fetch(_body(4), fetch)
+        return limited, everything, again
+
+    limited, everything, again = asyncio.run(runner())
+
+    assert len(limited) == 3
+    assert everything == _features(5)
+    assert len(again) == 4
+    assert calls == 2
+
+
+def test_cache_waiters_refetch_when_the_leader_is_cancelled() -> None:
+    cache = SceneSearchCache(ttl_seconds=60, max_entries=8)
+    calls = 0
+
+    async def fetch() -> list[dict]:
+        nonlocal calls
+        calls += 1
+        await asyncio.sleep(0.05)
+        return _features(2)
+
+    async def runner() -> list[list[dict]]:
+        leader = asyncio.create_task(cache.get_or_fetch(_body(), fetch))
+        await asyncio.sleep(0)
+        waiters = [asyncio.create_task(cache.get_or_fetch(_body(), fetch)) for _ in range(3)]
+        await asyncio.sleep(0.01)
+        leader.cancel()
+        return await asyncio.gather(*waiters)
+
+    results = asyncio.run(runner())
+
+    assert all(result == _features(2) for result in results)
+    assert calls == 2
+    assert cache.stats.coalesced == 2
+
+
+def test_cache_expires_entries_and_bounds_size() -> None:
+    cache = SceneSearchCache(ttl_seconds=0.05, max_entries=1)
+
+    async def fetch() -> list[dict]:
+        return _features(1)
+
+    async def runner() -> None:
+        await cache.get_or_fetch(_body(offset=0.5), fetch)
+        await cache.get_or_fetch(_body(), fetch)
+        await cache.get_or_fetch(_body(offset=0.5), fetch)
+        time.sleep(0.06)
+        await cache.get_or_fetch(_body(offset=0.5), fetch)
+
+    asyncio.run(runner())
+
+    assert cache.stats.misses == 4
+    assert cache.stats.hits == 0
+
+
+def test_disk_tier_survives_restart(tmp_path) -> None:
+    async def fetch() -> list[dict]:
+        return _features(3)
+
+    asyncio.run(SceneSearchCache(60, 8, disk_dir=tmp_path).get_or_fetch(_body(), fetch))
+    restarted = SceneSearchCache(60, 8, disk_dir=tmp_path)
+
+    async def fail() -> list[dict]:
+        raise AssertionError("should be served from disk")
+
+    result = asyncio.run(restarted.get_or_fetch(_body(), fail))
+
+    assert result == _features(3)
+    assert restarted.stats.disk_hits == 1
+    assert len(list(tmp_path.glob("*.json"))) == 1
+
+
+def test_fetch_eodc_scenes_reuses_cached_search() -> None:
+    requests: list[dict] = []
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        requests.append(json.loads(request.content))
+        feature = {
+            "id": "S2A_TEST",
+            "collection": "sentinel-2-l2a",
+            "properties": {"datetime": "2025-09-21T10:00:00Z", "eo:cloud_cover": 5},
+            "assets": {"product": {"href": "s3://eodc/S2A_TEST.zarr"}},
+            "links": [],
+        }
+        return httpx.Response(200, json={"features": [feature]})
+
+    alert = make_alert(area_of_interest=_body()["intersects"], issued=ISSUED)
+    cache = SceneSearchCache(60, 8)
+
+    async def runner() -> tuple[list, list]:
+        async with httpx.AsyncClient(transport=httpx.MockTransport(handler)) as client:
+            first = await fetch_eodc_scenes(alert, limit=3, client=client, cache=cache)
+            second = await fetch_eodc_scenes(alert, limit=2, client=client, cache=cache)
+        return first, second
+
+    first, second = asyncio.run(runner())
+
+    assert len(requests) == 1
+    assert requests[0]["datetime"].endswith("T09:00:00Z")
+    assert [scene.id for scene in second] == [scene.id for scene in first] == ["S2A_TEST"]
+
+
+def _paged_handler(pages: int, per_page: int, requests: list[str]):
+    def handler(request: httpx.Request) -> httpx.Response:
+        requests.append(str(request.url))
+        page = int(request.url.params.get("page", 0))
+        features = [
+            {
+                "id": f"scene-{page}-{index}",
+                "bbox": [page, 0, page + 1, 1],
+                "properties": {"datetime": "2025-09-21T10:00:00Z"},
+                "assets": {"product": {"href": f"s3://eodc/scene-{page}-{index}.zarr"}},
+            }
+            for index in range(per_page)
+        ]
+        links = []
+        if page + 1 < pages:
+            links.append({"rel": "next", "href": f"https://stac.test/search?page={page + 1}"})
+        return httpx.Response(200, json={"features": features, "links": links})
+
+    return handler
+
+
+def test_iter_eodc_scenes_follows_next_links() -> None:
+    requests: list[str] = []
+    alert = make_alert(bbox=(0, 0, 4, 1), issued=ISSUED)
+
+    async def runner() -> list[str]:
+        transport = httpx.MockTransport(_paged_handler(3, 2, requests))
+        async with httpx.AsyncClient(transport=transport) as client:
+            return [scene.id async for scene in iter_eodc_scenes(alert, client=client)]
+
+    ids = asyncio.run(runner())
+
+    assert ids == [f"scene-{page}-{index}" for page in range(3) for index in range(2)]
+    assert len(requests) == 3
+
+
+def test_iter_eodc_scenes_stops_on_coverage_with_one_page_prefetched() -> None:
+    requests: list[str] = []
+    alert = make_alert(bbox=(0, 0, 2, 1), issued=ISSUED)
+    stop = aoi_coverage_reached(bbox_polygon((0, 0, 2, 1)))
+
+    async def runner() -> list[str]:
+        transport = httpx.MockTransport(_paged_handler(10, 1, requests))
+        async with httpx.AsyncClient(transport=transport) as client:
+            return [
+                scene.id async for scene in iter_eodc_scenes(alert, stop_when=stop, client=client)
+            ]
+
+    ids = asyncio.run(runner())
+
+    assert ids == ["scene-0-0", "scene-1-0"]
+    # Page three was prefetched while page two was consumed, and nothing beyond it.
+    assert len(requests) <= 3
+
+
+def test_fetch_eodc_scenes_pages_until_limit() -> None:
+    requests: list[str] = []
+    alert = make_alert(issued=ISSUED)
+
+    async def runner() -> list:
+        transport = httpx.MockTransport(_paged_handler(5, 2, requests))
+        async with httpx.AsyncClient(transport=transport) as client:
+            return await fetch_eodc_scenes(
+                alert, limit=3, client=client, cache=SceneSearchCache(60, 8)
+            )
+
+    scenes = asyncio.run(runner())
+
+    assert [scene.id for scene in scenes] == ["scene-0-0", "scene-0-1", "scene-1-0"]
+    assert len(requests) == 2
+
+
+def _item(item_id: str, when: str, cloud: float, x: float) -> dict:
+    return {
+        "id": item_id,
+        "collection": "sentinel-2-l2a",
+        "bbox": [x, 0, x + 1, 1],
+        "geometry": {
+            "type": "Polygon",
+            "coordinates": [[[x, 0], [x + 1, 0], [x + 1, 1], [x, 1], [x, 0]]],
+        },
+        "properties": {"datetime": when, "eo:cloud_cover": cloud},
+        "assets": {"product": {"href": f"s3://eodc/{item_id}.zarr"}},
+    }
+
+
+def test_scene_index_syncs_once_then_answers_locally(tmp_path) -> None:
+    requests: list[dict] = []
+    items = [
+        _item("old", "2025-09-15T10:00:00Z", 5, 0),
+        _item("cloudy", "2025-09-20T10:00:00Z", 80, 0),
+        _item("elsewhere", "2025-09-21T10:00:00Z", 5, 5),
+        _item("new", "2025-09-22T10:00:00Z", 10, 0.5),
+    ]
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        requests.append(json.loads(request.content))
+        return httpx.Response(200, json={"features": items, "links": []})
+
+    alert = make_alert(bbox=(0.2, 0.2, 0.8, 0.8), issued=ISSUED)
+    index = SceneIndex(tmp_path / "index.sqlite")
+    cache = SceneSearchCache(60, 8)
+
+    async def runner() -> tuple[list, list]:
+        async with httpx.AsyncClient(transport=httpx.MockTransport(handler)) as client:
+            first = await fetch_eodc_scenes(alert, limit=3, client=client, cache=cache, index=index)
+            second = await fetch_eodc_scenes(
+                alert, limit=1, client=client, cache=cache, index=index
+            )
+        return first, second
+
+    loop_thread = threading.get_ident()
+    index_threads: list[int] = []
+    for name in ("coverage", "upsert", "record_sync", "search"):
+        method = getattr(index, name)
+
+        def tracked(*args, _method=method, **kwargs):
+            index_threads.append(threading.get_ident())
+            return _method(*args, **kwargs)
+
+        setattr(index, name, tracked)
+
+    first, second = asyncio.run(runner())
+
+    # The SQLite calls run in worker threads, never on the event loop.
+    assert len(index_threads) == 6 and loop_thread not in index_threads
+    assert len(requests) == 1
+    assert "query" not in requests[0] and requests[0]["bbox"] == [0.2, 0.2, 0.8, 0.8]
+    assert [scene.id for scene in first] == ["new", "old"]
+    assert [scene.id for scene in second] == ["new"]
+    assert cache.stats.lookups == 0
+
+
+def test_scene_index_delta_sync_and_offline_fallback(tmp_path) -> None:
+    alert = make_alert(bbox=(0.2, 0.2, 0.8, 0.8), issued=ISSUED)
+    index = SceneIndex(tmp_path / "index.sqlite")
+    index.upsert([_item("known", "2025-09-14T10:00:00Z", 5, 0)])
+    bounds = (0.0, 0.0, 1.0, 1.0)
+    index.record_sync(
+        "sentinel-2-l2a",
+        bounds,
+        "2025-09-01T00:00:00Z",
+        "2025-09-16T00:00:00Z",
+        time.time() - 7200,
+    )
+    requests: list[dict] = []
+
+    def delta(request: httpx.Request) -> httpx.Response:
+        requests.append(json.loads(request.content))
+        fresh = _item("fresh", "2025-09-21T10:00:00Z", 5, 0)
+        return httpx.Response(200, json={"features": [fresh], "links": []})
+
+    def offline(request: httpx.Request) -> httpx.Response:
+        raise httpx.ConnectError("air-gapped", request=request)
+
+    async def search(handler) -> list[str]:
+        async with httpx.AsyncClient(transport=httpx.MockTransport(handler)) as client:
+            scenes = await fetch_eodc_scenes(
+                alert, limit=5, client=client, cache=SceneSearchCache(60, 8), index=index
+            )
+        return [scene.id for scene in scenes]
+
+    assert asyncio.run(search(delta)) == ["fresh", "known"]
+    assert requests[0]["datetime"].startswith("2025-09-14T00:00:00Z/")
+    assert requests[0]["bbox"] == list(bounds)
+
+    assert asyncio.run(search(offline)) == ["fresh", "known"]
+
+
+def test_bulk_search_groups_alerts_and_assigns_features() -> None:
+    requests: list[dict] = []
+    items = [
+        _item("west-new", "2025-09-22T10:00:00Z", 5, 0),
+        _item("west-old", "2025-09-13T10:00:00Z", 5, 0),
+        _item("east", "2025-09-21T10:00:00Z", 5, 1.5),
+        _item("far", "2025-09-21T10:00:00Z", 5, 40),
+    ]
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        requests.append(json.loads(request.content))
+        return httpx.Response(200, json={"features": items, "links": []})
+
+    def alert(alert_id: str, x: float, issued: str = ISSUED):
+        return make_alert(alert_id, bbox=(x, 0.4, x + 0.1, 0.5), issued=issued)
+
+    alerts = [alert(f"west-{i}", 0.2 + i * 0.01) for i in range(25)]
+    alerts += [alert(f"east-{i}", 1.6 + i * 0.01) for i in range(24)]
+    alerts.append(alert("far", 40.5))
+    alerts.append(alert("later", 0.3, issued="2025-10-20T08:00:00Z"))
+    cache = SceneSearchCache(60, 128)
+
+    async def runner() -> tuple[dict, list]:
+        async with httpx.AsyncClient(transport=httpx.MockTransport(handler)) as client:
+            results = await fetch_eodc_scenes_bulk(alerts, limit=3, client=client, cache=cache)
+            single = await fetch_eodc_scenes(alerts[0], limit=3, client=client, cache=cache)
+        return results, single
+
+    results, single = asyncio.run(runner())
+
+    # West, east, far-away and later-window groups; the repeat single search is a cache hit.
+    assert len(requests) == 4
+    assert [scene.id for scene in results["west-0"]] == ["west-new", "west-old"]
+    assert [scene.id for scene in results["east-5"]] == ["east"]
+    assert [scene.id for scene in results["far"]] == ["far"]
+    assert results["later"] == []
+    assert [scene.id for scene in single] == ["west-new", "west-old"]
+    assert cache.stats.hits == 1
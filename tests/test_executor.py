@@ -0,0 +1,111 @@
+import asyncio
+import copy
+import threading
+import time
+from collections.abc import Iterator
+
+import dask
+import pytest
+
+from autopilot.executor import (
+    MAX_IN_PROCESS_CONCURRENCY,
+    ConversionExecutor,
+    estimate_working_set,
+)
+from autopilot.settings import Settings
+
+
+def test_executor_serialises_jobs_that_exceed_budget() -> None:
+    executor = ConversionExecutor(budget_bytes=100, max_concurrency=4)
+    lock = threading.Lock()
+    running = 0
+    overlap = 0
+
+    def job() -> str:
+        nonlocal running, overlap
+        with lock:
+            running += 1
+            overlap = max(overlap, running)
+        time.sleep(0.05)
+        with lock:
+            running -= 1
+        return "done"
+
+    async def runner() -> list[tuple[str, int]]:
+        return await asyncio.gather(
+            executor.run(job, projected_bytes=60),
+            executor.run(job, projected_bytes=60),
+        )
+
+    results = asyncio.run(runner())
+
+    assert overlap == 1
+    assert [result for result, _ in results] == ["done", "done"]
+    assert all(peak > 0 for _, peak in results)
+    assert executor.reserved_bytes == 0
+    assert executor.active == 0
+
+
+def test_executor_admits_concurrent_jobs_that_fit() -> None:
+    executor = ConversionExecutor(budget_bytes=100, max_concurrency=2)
+    barrier = threading.Barrier(2, timeout=2)
+
+    def job() -> bool:
+        barrier.wait()
+        return True
+
+    async def runner() -> list[tuple[bool, int]]:
+        return await asyncio.gather(
+            executor.run(job, projected_bytes=40),
+            executor.run(job, projected_bytes=40),
+        )
+
+    assert [result for result, _ in asyncio.run(runner())] == [True, True]
+
+
+@pytest.fixture
+def restore_dask_config() -> Iterator[None]:
+    # ConversionExecutor applies its scheduler to dask's process-global config.
+    saved = copy.deepcopy(dask.config.config)
+    try:
+        yield
+    finally:
+        dask.config.config.clear()
+        dask.config.config.update(saved)
+
+
+@pytest.mark.usefixtures("restore_dask_config")
+def test_executor_dask_config_is_stable_across_overlapping_jobs() -> None:
+    executor = ConversionExecutor(budget_bytes=100, max_concurrency=2, workers=3)
+    barrier = threading.Barrier(2, timeout=2)
+
+    def job(delay: float) -> list[object]:
+        barrier.wait()
+        seen = [dask.config.get("num_workers")]
+        time.sleep(delay)
+        seen.append(dask.config.get("num_workers"))
+        return seen
+
+    async def runner() -> list[tuple[list[object], int]]:
+        return await asyncio.gather(
+            executor.run(job, 0.01, projected_bytes=40),
+            executor.run(job, 0.05, projected_bytes=40),
+        )
+
+    assert [seen for seen, _ in asyncio.run(runner())] == [[3, 3], [3, 3]]
+    assert dask.config.get("scheduler") == "threads"
+
+
+def test_estimate_working_set_scales_with_chunk_size() -> None:
+    small = Settings(converter_spatial_chunk=512)
+    large = Settings(converter_spatial_chunk=1024)
+    override = Settings(converter_working_set_mb=10)
+
+    assert estimate_working_set(large) == 4 * estimate_working_set(small)
+    assert estimate_working_set(override) == 10 * 1024 * 1024
+
+
+def test_executor_from_settings_runs_one_conversion_per_process() -> None:
+    executor = ConversionExecutor.from_settings(Settings(converter_max_concurrency=4))
+
+    assert executor.max_concurrency == MAX_IN_PROCESS_CONCURRENCY == 1
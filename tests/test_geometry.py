@@ -0,0 +1,65 @@
+import math
+
+import shapely
+from shapely.geometry import mapping, shape
+
+from autopilot.alerts import parse_alert_payload
+from autopilot.geometry import AlertGeometry
+
+
+def _jagged_multipolygon(parts: int = 4, vertices: int = 2000) -> dict:
+    polygons = []
+    for part in range(parts):
+        ring = []
+        for index in range(vertices):
+            angle = 2 * math.pi * index / vertices
+            radius = 0.2 + 0.02 * math.sin(37 * angle) + 0.005 * math.sin(401 * angle)
+            ring.append((part + radius * math.cos(angle), radius * math.sin(angle)))
+        polygons.append(shapely.Polygon(ring))
+    return mapping(shapely.MultiPolygon(polygons))
+
+
+def test_search_footprint_is_small_and_covers_the_aoi() -> None:
+    aoi = AlertGeometry(_jagged_multipolygon(), max_vertices=400)
+
+    footprint = aoi.search_footprint
+
+    assert aoi.vertex_count > 8000
+    assert shapely.get_num_coordinates(footprint) <= 400
+    assert footprint.covers(aoi.geometry)
+    assert footprint.area < aoi.geometry.area * 1.5
+    assert aoi.search_geojson["type"] in ("Polygon", "MultiPolygon")
+
+
+def test_small_valid_aoi_is_passed_through() -> None:
+    geojson = {"type": "Polygon", "coordinates": [[[0, 0], [1, 0], [1, 1], [0, 1], [0, 0]]]}
+    aoi = AlertGeometry(geojson)
+
+    assert aoi.search_geojson is aoi.geojson
+    assert aoi.repaired_geojson is aoi.geojson
+    assert aoi.bounds == (0.0, 0.0, 1.0, 1.0)
+    assert 12_000 < aoi.area_km2 < 12_500
+
+
+def test_invalid_bowtie_is_repaired_once() -> None:
+    bowtie = {"type": "Polygon", "coordinates": [[[0, 0], [1, 1], [1, 0], [0, 1], [0, 0]]]}
+    aoi = AlertGeometry(bowtie)
+
+    assert aoi.repaired
+    assert aoi.geometry.is_valid
+    assert shape(aoi.repaired_geojson).is_valid
+    assert aoi.area_km2 > 0
+
+
+def test_loaded_alert_caches_its_geometry() -> None:
+    alert = parse_alert_payload({"id": "EMSR1", "areaOfInterest": _jagged_multipolygon(1, 600)})
+
+    assert alert.geometry is alert.geometry
+    assert alert.geometry.search_geojson is alert.geometry.search_geojson
+
+
+def test_empty_aoi_has_no_bounds_or_area() -> None:
+    aoi = AlertGeometry({})
+
+    assert aoi.is_empty
+    assert aoi.bounds is None and aoi.area_km2 is None
@@ -0,0 +1,173 @@
+import json
+
+import zarr
+from conftest import InMemoryS3, make_alert
+
+from autopilot import geozarr
+from autopilot.catalog import SceneSummary
+from autopilot.lineage import (
+    LineageManifest,
+    alert_lineage_id,
+    load_manifest,
+    plan_incremental_update,
+    update_manifest,
+)
+from autopilot.settings import Settings
+
+
+def _alert(alert_id: str, max_x: float, parameters: dict | None = None):
+    return make_alert(alert_id, bbox=(0, 0, max_x, 1), parameters=parameters)
+
+
+def _scene(scene_id: str, when: str, bbox: list[float]) -> SceneSummary:
+    return SceneSummary(
+        id=scene_id,
+        collection="sentinel-2-l2a",
+        datetime=when,
+        cloud_cover=10.0,
+        preview_href=None,
+        data_href=None,
+        stac_item_href=f"https://stac.test/{scene_id}",
+        zarr_href=f"s3://bucket/{scene_id}.zarr",
+        bbox=bbox,
+    )
+
+
+def _manifest() -> LineageManifest:
+    manifest = LineageManifest(
+        lineage_id="EMSR123",
+        store_key="alerts/flood/EMSR123.zarr",
+        collection_id="flood",
+        item_id="EMSR123",
+        aoi={},
+    )
+    manifest.record(
+        _alert("EMSR123", 1.0),
+        [(_scene("tile-a", "2025-09-20T10:00:00Z", [0, 0, 1, 1]), "tile-a")],
+    )
+    return manifest
+
+
+def test_alert_lineage_id_strips_reissue_suffix() -> None:
+    assert alert_lineage_id(_alert("EMSR123-v2", 1.0)) == "EMSR123"
+    assert alert_lineage_id(_alert("EMSR123_R3", 1.0)) == "EMSR123"
+    assert alert_lineage_id(_alert("GDACS-1", 1.0, {"activationId": "EMSR9"})) == "EMSR9"
+
+
+def test_plan_is_noop_for_unchanged_reissue() -> None:
+    manifest = _manifest()
+    scenes = [_scene("tile-a", "2025-09-20T10:00:00Z", [0, 0, 1, 1])]
+
+    plan = plan_incremental_update(manifest, _alert("EMSR123-v2", 1.0), scenes)
+
+    assert plan.is_noop
+    assert not plan.aoi_changed
+    assert plan.added_area_km2 == 0.0
+
+
+def test_plan_selects_scenes_for_added_area_and_new_acquisitions() -> None:
+    manifest = _manifest()
+    scenes = [
+        _scene("tile-a", "2025-09-20T10:00:00Z", [0, 0, 1, 1]),
+        _scene("tile-b", "2025-09-20T10:00:00Z", [1, 0, 2, 1]),
+        _scene("tile-far", "2025-09-18T10:00:00Z", [5, 5, 6, 6]),
+        _scene("tile-a-later", "2025-09-25T10:00:00Z", [0, 0, 1, 1]),
+    ]
+
+    plan = plan_incremental_update(manifest, _alert("EMSR123-v2", 2.0), scenes)
+
+    assert [scene.id for scene in plan.new_scenes] == ["tile-b", "tile-a-later"]
+    assert plan.aoi_changed
+    assert plan.added_area_km2 > 10_000
+
+
+def test_manifest_round_trip_merges_aoi() -> None:
+    manifest = _manifest()
+    manifest.record(
+        _alert("EMSR123-v2", 2.0),
+        [(_scene("tile-b", "2025-09-21T10:00:00Z", [1, 0, 2, 1]), "tile-b")],
+    )
+
+    restored = LineageManifest.from_dict(manifest.to_dict())
+
+    assert restored.alert_ids == ["EMSR123", "EMSR123-v2"]
+    assert [scene.id for scene in restored.scene_summaries()] == ["tile-a", "tile-b"]
+    assert restored.scenes["tile-b"]["group"] == "tile-b"
+    assert restored.aoi["type"] == "Polygon"
+
+
+def test_update_manifest_retries_when_another_run_saved_first() -> None:
+    store = InMemoryS3()
+    key = "alerts/flood/EMSR123.lineage.json"
+    stale = load_manifest(store, "bucket", key)
+    assert stale == (None, None)
+
+    # Another run creates the manifest between this run's read and write.
+    store.put_object(Bucket="bucket", Key=key, Body=json.dumps(_manifest().to_dict()).encode())
+
+    def merge(current: LineageManifest | None) -> LineageManifest:
+        merged = current or LineageManifest(
+            lineage_id="EMSR123",
+            store_key="alerts/flood/EMSR123.zarr",
+            collection_id="flood",
+            item_id="EMSR123",
+            aoi={},
+        )
+        merged.record(
+            _alert("EMSR123-v2", 2.0),
+            [(_scene("tile-b", "2025-09-21T10:00:00Z", [1, 0, 2, 1]), "tile-b")],
+        )
+        return merged
+
+    saved = update_manifest(store, "bucket", key, merge, loaded=stale)
+    restored, etag = load_manifest(store, "bucket", key)
+
+    assert etag == store.etag(key)
+    assert store.conflicts == 1
+    assert sorted(saved.scenes) == sorted(restored.scenes) == ["tile-a", "tile-b"]
+    assert restored.alert_ids == ["EMSR123", "EMSR123-v2"]
+
+
+def test_write_lineage_scenes_unions_indices_and_renders_newest_group(monkeypatch) -> None:
+    root = zarr.group(store=zarr.storage.MemoryStore())
+    writes: list[str] = []
+    quicklooks: list[str] = []
+    indices = {"tile-b": ["ndwi"], "tile-c": ["mndwi"]}
+
+    def fake_processors(datatree, hazard):
+        return datatree, indices[datatree]
+
+    def fake_quicklooks(alert, store_path, key, settings):
+        quicklooks.append(store_path)
+        return "s3://bucket/thumb.png", None
+
+    monkeypatch.setattr(geozarr, "open_zarr_group", lambda uri, mode: root)
+    monkeypatch.setattr(
+        geozarr, "open_source_datatree", lambda href, *args: href.split("/")[-1][:-5]
+    )
+    monkeypatch.setattr(geozarr, "apply_hazard_processors", fake_processors)
+    monkeypatch.setattr(geozarr, "write_geozarr", lambda tree, path, settings: writes.append(path))
+    monkeypatch.setattr(geozarr, "_publish_quicklooks", fake_quicklooks)
+    monkeypatch.setattr(geozarr, "_calculate_total_size", lambda bucket, key, settings: 5)
+    settings = Settings(geozarr_bucket="bucket", converter_hazard_indices=True)
+    manifest = _manifest()
+    scenes = [
+        _scene("tile-c", "2025-09-22T10:00:00Z", [1, 0, 2, 1]),
+        _scene("tile-b", "2025-09-21T10:00:00Z", [1, 0, 2, 1]),
+    ]
+    newest = geozarr._newest_group(
+        manifest.scene_groups() + [(scene, scene.id) for scene in scenes]
+    )
+
+    result = geozarr._write_lineage_scenes(
+        _alert("EMSR123-v2", 2.0), scenes, manifest.store_key, settings, newest
+    )
+
+    store = "s3://bucket/alerts/flood/EMSR123.zarr"
+    assert writes == [f"{store}/tile-c", f"{store}/tile-b"]
+    assert result.hazard_indices == ["mndwi", "ndwi"]
+    assert quicklooks == [f"{store}/tile-c"]
+    assert result.thumbnail_href == "s3://bucket/thumb.png"
+    assert result.bytes_written == 10
+    manifest.record(_alert("EMSR123-v2", 2.0), result.written)
+    assert geozarr._newest_group(manifest.scene_groups()) == "tile-c"
@@ -1,4 +1,8 @@
+import pytest
+
 from autopilot.listener import AlertFeedSpec, _extract_records
+from autopilot.listener_cli import _require_shared_search_cache
+from autopilot.settings import Settings
 
 
 def test_alert_feed_spec_parse() -> None:
@@ -23,3 +27,17 @@ def test_extract_records_handles_geojson() -> None:
     records = _extract_records(payload)
     assert records[0]["title"] == "Flood"
     assert records[0]["areaOfInterest"]["type"] == "Point"
+
+
+def test_prefetch_requires_an_explicit_search_cache_dir(monkeypatch) -> None:
+    monkeypatch.delenv("EODC_SEARCH_CACHE_DIR", raising=False)
+
+    for settings in (
+        Settings(),
+        Settings(eodc_search_cache_dir=None),
+        Settings(eodc_search_cache_dir="/shared/cache", eodc_search_cache_ttl_seconds=0),
+    ):
+        with pytest.raises(SystemExit, match="EODC_SEARCH_CACHE_DIR"):
+            _require_shared_search_cache(settings)
+
+    _require_shared_search_cache(Settings(eodc_search_cache_dir="/shared/cache"))
@@ -0,0 +1,123 @@
+import json
+import multiprocessing
+from pathlib import Path
+
+import pytest
+
+from autopilot.metrics_sink import MetricsSink, MetricsTail, compact_segments, rotated_segments
+
+
+def _entries(path: Path) -> list[dict]:
+    lines = []
+    for segment in [*rotated_segments(path), path]:
+        if segment.exists():
+            lines.extend(segment.read_text().splitlines())
+    return [json.loads(line) for line in lines]
+
+
+def _write_from_process(path: str, writer: int, count: int) -> None:
+    sink = MetricsSink(Path(path), rotate_bytes=2_000, flush_seconds=0.01, buffer_lines=7)
+    for index in range(count):
+        sink.emit({"run_id": f"{writer}-{index}", "status": "succeeded"})
+    sink.close()
+
+
+def test_sink_buffers_and_rotates_by_size(tmp_path: Path) -> None:
+    path = tmp_path / "metrics.jsonl"
+    sink = MetricsSink(path, rotate_bytes=200, flush_seconds=60, buffer_lines=1_000)
+    for index in range(3):
+        sink.emit({"run_id": f"run-{index}", "duration_seconds": 1.5})
+    assert not path.exists()
+
+    assert sink.flush() == 3
+    for index in range(3, 12):
+        sink.emit({"run_id": f"run-{index}", "duration_seconds": 1.5})
+        sink.flush()
+    sink.close()
+
+    segments = rotated_segments(path)
+    assert segments and all(segment.stat().st_size <= 200 for segment in segments)
+    assert [entry["run_id"] for entry in _entries(path)] == [f"run-{i}" for i in range(12)]
+
+
+def test_sink_rotates_by_age(tmp_path: Path) -> None:
+    path = tmp_path / "metrics.jsonl"
+    sink = MetricsSink(path, rotate_seconds=60, flush_seconds=60)
+    sink.emit({"run_id": "old"})
+    sink.flush()
+    sink.lock_path.write_text("0")
+    sink.emit({"run_id": "new"})
+    sink.close()
+
+    assert len(rotated_segments(path)) == 1
+    assert [entry["run_id"] for entry in _entries(path)] == ["old", "new"]
+
+
+def test_processes_share_one_metrics_directory(tmp_path: Path) -> None:
+    path = tmp_path / "metrics.jsonl"
+    context = multiprocessing.get_context("spawn")
+    workers = [
+        context.Process(target=_write_from_process, args=(str(path), writer, 60))
+        for writer in range(4)
+    ]
+    for worker in workers:
+        worker.start()
+    for worker in workers:
+        worker.join(timeout=60)
+        assert worker.exitcode == 0
+
+    run_ids = [entry["run_id"] for entry in _entries(path)]
+    assert len(rotated_segments(path)) > 1
+    assert sorted(run_ids) == sorted(f"{w}-{i}" for w in range(4) for i in range(60))
+    for writer in range(4):
+        own = [run_id for run_id in run_ids if run_id.startswith(f"{writer}-")]
+        assert own == [f"{writer}-{index}" for index in range(60)]
+
+
+def test_tail_reads_only_new_entries_across_rotations(tmp_path: Path) -> None:
+    path = tmp_path / "metrics.jsonl"
+    sink = MetricsSink(path, rotate_bytes=60, flush_seconds=60)
+    tail = MetricsTail(path, consumer="scraper")
+
+    for index in range(2):
+        sink.emit({"run_id": f"run-{index}"})
+    sink.flush()
+    assert [entry["run_id"] for entry in tail.read()] == ["run-0", "run-1"]
+    assert tail.read() == []
+
+    for index in range(2, 9):
+        sink.emit({"run_id": f"run-{index}"})
+        sink.flush()
+    assert len(rotated_segments(path)) >= 2
+    assert [entry["run_id"] for entry in tail.read(commit=False)][0] == "run-2"
+    assert [entry["run_id"] for entry in tail.read()] == [f"run-{i}" for i in range(2, 9)]
+    sink.close()
+    assert MetricsTail(path, consumer="other").read()[0]["run_id"] == "run-0"
+
+
+def test_compact_segments_writes_parquet(tmp_path: Path) -> None:
+    pq = pytest.importorskip("pyarrow.parquet")
+    path = tmp_path / "metrics.jsonl"
+    sink = MetricsSink(path, rotate_bytes=300, flush_seconds=60)
+    for index in range(6):
+        sink.emit(
+            {
+                "timestamp": "2026-01-01T00:00:00+00:00",
+                "run_id": f"run-{index}",
+                "status": "succeeded",
+                "duration_seconds": 2.0,
+                "bytes_written": 1024,
+                "stage_seconds": {"write_geozarr": 1.25},
+            }
+        )
+        sink.flush()
+    sink.close()
+    rotated = rotated_segments(path)
+
+    written = compact_segments(path)
+
+    assert len(written) == len(rotated) and not rotated_segments(path)
+    table = pq.read_table(tmp_path / "metrics_parquet")
+    remaining = len(path.read_text().splitlines())
+    assert table.num_rows + remaining == 6
+    assert table.column("stage_seconds").to_pylist()[0] == [("write_geozarr", 1.25)]
@@ -0,0 +1,223 @@
+import os
+import uuid
+from contextlib import contextmanager
+from datetime import datetime, timezone
+
+import pytest
+from conftest import make_item
+
+from autopilot import pgstac
+from autopilot.pgstac import FALLBACK_SCHEMA, ITEM_COLUMNS, PgstacIngestor, _batches, item_row
+
+psycopg = pgstac.psycopg
+requires_psycopg = pytest.mark.skipif(psycopg is None, reason="psycopg is not installed")
+
+
+def test_item_row_uses_temporal_range_when_present() -> None:
+    row = item_row(
+        make_item(
+            "a",
+            datetime="2025-01-02T00:00:00Z",
+            start_datetime="2025-01-01T00:00:00Z",
+            end_datetime="2025-01-03T00:00:00",
+        )
+    )
+
+    assert row[:2] == ("a", "flood")
+    assert row[2] == datetime(2025, 1, 1, tzinfo=timezone.utc)
+    assert row[3] == datetime(2025, 1, 3, tzinfo=timezone.utc)
+    assert row[4] == [0, 0, 1, 1]
+    assert row[-1]["id"] == "a"
+
+
+def test_batches_split_lazily() -> None:
+    items = (make_item(str(index), datetime="2025-01-01T00:00:00Z") for index in range(7))
+
+    assert [len(batch) for batch in _batches(items, 3)] == [3, 3, 1]
+
+
+class _FakeCopy:
+    def __init__(self, log: list) -> None:
+        self.log = log
+
+    def __enter__(self) -> "_FakeCopy":
+        return self
+
+    def __exit__(self, *exc) -> None:
+        return None
+
+    def set_types(self, types: list[str]) -> None:
+        self.log.append(("types", types))
+
+    def write_row(self, row: tuple) -> None:
+        self.log.append(("row", row))
+
+
+class _FakeCursor:
+    def __init__(self, connection: "_FakeConnection") -> None:
+        self.connection = connection
+        self._result: tuple | None = None
+
+    def __enter__(self) -> "_FakeCursor":
+        return self
+
+    def __exit__(self, *exc) -> None:
+        return None
+
+    def execute(self, sql: str, params: tuple | None = None) -> None:
+        self.connection.log.append(("execute", " ".join(sql.split()), params))
+        self._result = (self.connection.pgstac_installed,) if "to_regclass" in sql else None
+
+    def fetchone(self) -> tuple | None:
+        return self._result
+
+    def copy(self, sql: str) -> _FakeCopy:
+        if self.connection.fail_copy:
+            self.connection.fail_copy = False
+            self.connection.broken = True
+            raise psycopg.OperationalError("server closed the connection unexpectedly")
+        self.connection.log.append(("copy", sql))
+        return _FakeCopy(self.connection.log)
+
+
+class _FakeConnection:
+    def __init__(self, pgstac_installed: bool = False, fail_copy: bool = False) -> None:
+        self.pgstac_installed = pgstac_installed
+        self.fail_copy = fail_copy
+        self.closed = False
+        self.broken = False
+        self.log: list[tuple] = []
+
+    @contextmanager
+    def transaction(self):
+        self.log.append(("begin",))
+        yield
+        self.log.append(("commit",))
+
+    def cursor(self) -> _FakeCursor:
+        return _FakeCursor(self)
+
+    def close(self) -> None:
+        self.closed = True
+
+
+def _statements(connection: _FakeConnection) -> list[str]:
+    return [entry[1] for entry in connection.log if entry[0] == "execute"]
+
+
+@requires_psycopg
+def test_fallback_mode_creates_schema_and_upserts_through_staging_copy() -> None:
+    connection = _FakeConnection()
+    ingestor = PgstacIngestor(
+        "postgresql://unused",
+        batch_size=2,
+        public_base_url="https://stac.test/",
+        connection=connection,
+    )
+    items = [make_item(str(index), datetime="2025-01-01T00:00:00Z") for index in range(3)]
+
+    assert ingestor.ingest(items) == 3
+    assert ingestor.ingest([make_item("3", datetime="2025-01-02T00:00:00Z")]) == 1
+
+    statements = _statements(connection)
+    assert statements[1].startswith(f"CREATE SCHEMA IF NOT EXISTS {FALLBACK_SCHEMA};")
+    inserts = [sql for sql in statements if sql.startswith(f"INSERT INTO {FALLBACK_SCHEMA}.coll")]
+    assert len(inserts) == 1
+    collection = next(
+        entry[2][1].obj
+        for entry in connection.log
+        if entry[0] == "execute"
+        and entry[1].startswith(f"INSERT INTO {FALLBACK_SCHEMA}.collections")
+    )
+    assert collection["id"] == "flood"
+    assert {
+        "rel": "self",
+        "href": "https://stac.test/collections/flood.json",
+        "type": "application/json",
+    } in collection["links"]
+    assert (
+        sum(sql.startswith("CREATE TEMP TABLE IF NOT EXISTS items_staging") for sql in statements)
+        == 3
+    )
+    assert sum(sql.startswith(f"INSERT INTO {FALLBACK_SCHEMA}.items") for sql in statements) == 3
+    copies = [entry[1] for entry in connection.log if entry[0] == "copy"]
+    assert copies[0] == f"COPY items_staging ({', '.join(ITEM_COLUMNS)}, seq) FROM STDIN"
+    rows = [entry[1] for entry in connection.log if entry[0] == "row"]
+    assert [row[0] for row in rows] == ["0", "1", "2", "3"]
+    assert [row[-1] for row in rows] == [0, 1, 0, 0]
+    assert connection.log.count(("begin",)) == connection.log.count(("commit",)) == 4
+
+
+@requires_psycopg
+def test_pgstac_mode_creates_missing_collections_and_copies_into_staging_upsert() -> None:
+    connection = _FakeConnection(pgstac_installed=True)
+    ingestor = PgstacIngestor("postgresql://unused", connection=connection)
+
+    ingestor.ingest([make_item("a", datetime="2025-01-01T00:00:00Z")])
+
+    statements = _statements(connection)
+    assert not any(sql.startswith("CREATE SCHEMA") for sql in statements)
+    assert "SELECT pgstac.create_collection(%s)" in statements
+    assert [entry[1] for entry in connection.log if entry[0] == "copy"] == [
+        "COPY pgstac.items_staging_upsert (content) FROM STDIN"
+    ]
+    assert [entry[1][0]["id"] for entry in connection.log if entry[0] == "row"] == ["a"]
+
+
+@requires_psycopg
+def test_ingestor_reconnects_and_replays_a_batch_after_the_connection_breaks(
+    monkeypatch: pytest.MonkeyPatch,
+) -> None:
+    broken = _FakeConnection(fail_copy=True)
+    replacement = _FakeConnection()
+    monkeypatch.setattr(pgstac.psycopg, "connect", lambda dsn, autocommit: replacement)
+    ingestor = PgstacIngestor("postgresql://unused", connection=broken)
+
+    assert ingestor.ingest([make_item("a", datetime="2025-01-01T00:00:00Z")]) == 1
+
+    assert ingestor.connection is replacement
+    assert [entry[1][0] for entry in replacement.log if entry[0] == "row"] == ["a"]
+
+
+@requires_psycopg
+@pytest.mark.skipif(not os.environ.get("PGSTAC_TEST_DSN"), reason="PGSTAC_TEST_DSN not set")
+def test_fallback_ingest_against_postgres() -> None:
+    dsn = os.environ["PGSTAC_TEST_DSN"]
+    collection = f"test-{uuid.uuid4().hex[:8]}"
+    items = [
+        {**make_item(str(index), datetime="2025-01-01T00:00:00Z"), "collection": collection}
+        for index in range(5)
+    ]
+    ingestor = PgstacIngestor(dsn, batch_size=2)
+    try:
+        ingestor.ingest(items)
+        items[0]["properties"]["datetime"] = "2025-02-01T00:00:00Z"
+        ingestor.ingest([items[0], items[0]])
+        with ingestor.connection.cursor() as cur:
+            cur.execute(
+                f"SELECT id, datetime FROM {FALLBACK_SCHEMA}.items WHERE collection = %s "
+                "ORDER BY id",
+                (collection,),
+            )
+            rows = cur.fetchall()
+        assert [row[0] for row in rows] == ["0", "1", "2", "3", "4"]
+        assert rows[0][1] == datetime(2025, 2, 1, tzinfo=timezone.utc)
+    finally:
+        with ingestor.connection.cursor() as cur:
+            cur.execute(f"DELETE FROM {FALLBACK_SCHEMA}.items WHERE collection = %s", (collection,))
+            cur.execute(f"DELETE FROM {FALLBACK_SCHEMA}.collections WHERE id = %s", (collection,))
+        ingestor.close()
+
+
+@requires_psycopg
+def test_items_with_invalid_datetimes_are_skipped() -> None:
+    connection = _FakeConnection()
+    ingestor = PgstacIngestor("postgresql://unused", connection=connection)
+    items = [
+        make_item("good", datetime="2025-01-01T00:00:00Z"),
+        make_item("bad", datetime="last Tuesday"),
+        make_item("worse", datetime="2025-01-01T00:00:00Z", end_datetime=20250102),
+    ]
+
+    assert ingestor.ingest(items) == 1
+    assert [entry[1][0] for entry in connection.log if entry[0] == "row"] == ["good"]
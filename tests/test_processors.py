@@ -0,0 +1,64 @@
+import dask.array as da
+import numpy as np
+import xarray as xr
+
+from autopilot.processors import apply_hazard_processors, normalized_difference
+
+
+def _group(values: dict[str, float], size: int = 4) -> xr.Dataset:
+    coords = {"y": np.arange(size, dtype=float), "x": np.arange(size, dtype=float)}
+    return xr.Dataset(
+        {
+            band: (("y", "x"), da.full((size, size), value, chunks=2), {"proj:epsg": 32633})
+            for band, value in values.items()
+        },
+        coords=coords,
+    )
+
+
+def _tree(r10m: dict[str, float], r20m: dict[str, float]) -> xr.DataTree:
+    return xr.DataTree.from_dict(
+        {
+            "/measurements/reflectance/r10m": _group(r10m),
+            "/measurements/reflectance/r20m": _group(r20m),
+        }
+    )
+
+
+def test_flood_adds_lazy_ndwi_to_source_group() -> None:
+    tree = _tree({"b03": 0.3, "b08": 0.1}, {"b8a": 0.2, "b12": 0.1})
+
+    result, added = apply_hazard_processors(tree, "flood")
+
+    assert added == ["ndwi"]
+    ndwi = result["/measurements/reflectance/r10m/ndwi"]
+    assert isinstance(ndwi.data, da.Array)
+    assert ndwi.dtype == np.float32
+    assert ndwi.attrs["proj:epsg"] == 32633
+    np.testing.assert_allclose(ndwi.values, 0.5, rtol=1e-6)
+    assert "ndwi" not in tree["/measurements/reflectance/r10m"].data_vars
+
+
+def test_wildfire_adds_nbr_and_dnbr_with_pre_event() -> None:
+    post = _tree({"b03": 0.1, "b08": 0.1}, {"b8a": 0.2, "b12": 0.2})
+    pre = _tree({"b03": 0.1, "b08": 0.1}, {"b8a": 0.3, "b12": 0.1})
+
+    result, added = apply_hazard_processors(post, "Wildfire", pre_event=pre)
+
+    assert added == ["nbr", "dnbr"]
+    group = result["/measurements/reflectance/r20m"]
+    np.testing.assert_allclose(group["nbr"].values, 0.0, atol=1e-6)
+    np.testing.assert_allclose(group["dnbr"].values, 0.5, rtol=1e-6)
+
+
+def test_unknown_hazard_and_zero_denominator() -> None:
+    tree = _tree({"b03": 0.0, "b08": 0.0}, {"b8a": 0.0, "b12": 0.0})
+
+    unchanged, added = apply_hazard_processors(tree, "cyclone")
+    assert unchanged is tree and added == []
+
+    value = normalized_difference(
+        tree["/measurements/reflectance/r10m/b03"],
+        tree["/measurements/reflectance/r10m/b08"],
+    )
+    assert np.isnan(value.values).all()
@@ -0,0 +1,92 @@
+import json
+
+from conftest import make_alert
+
+from autopilot.profiles import (
+    QUICKLOOK,
+    R10M,
+    R20M,
+    R60M,
+    apply_profile,
+    resolve_conversion_settings,
+    select_profile,
+)
+from autopilot.settings import Settings
+
+
+def _alert(hazard: str, side_deg: float):
+    return make_alert(
+        f"{hazard}-{side_deg}", hazard=hazard, bbox=(10, 45, 10 + side_deg, 45 + side_deg)
+    )
+
+
+def test_select_profile_by_area_bucket() -> None:
+    small, area = select_profile(_alert("flood", 0.05))
+    large, _ = select_profile(_alert("flood", 2.0))
+
+    assert small.name == "small" and area < 250
+    assert small.groups == (R10M, QUICKLOOK)
+    assert large.name == "large"
+    assert large.spatial_chunk > small.spatial_chunk and large.enable_sharding
+
+
+def test_hazard_specific_profile_takes_precedence() -> None:
+    profile, _ = select_profile(_alert("wildfire", 0.05))
+
+    assert profile.name == "wildfire-small"
+    assert R20M in profile.groups
+
+
+def test_apply_profile_keeps_groups_within_configured_set() -> None:
+    settings = Settings(converter_groups=[R10M, R60M])
+    profile, _ = select_profile(_alert("flood", 2.0))
+
+    applied = apply_profile(settings, profile)
+
+    assert applied.converter_groups == [R10M, R60M]
+    assert applied.converter_spatial_chunk == profile.spatial_chunk
+    assert settings.converter_spatial_chunk == 1024
+
+
+def test_profiles_can_be_disabled() -> None:
+    settings = Settings(converter_profiles_enabled=False)
+
+    resolved, name = resolve_conversion_settings(_alert("flood", 0.05), settings)
+
+    assert resolved is settings and name is None
+
+
+def test_explicit_converter_settings_override_the_profile() -> None:
+    settings = Settings(converter_spatial_chunk=4096)
+    profile, _ = select_profile(_alert("flood", 0.05))
+
+    applied = apply_profile(settings, profile)
+
+    assert applied.converter_spatial_chunk == 4096
+    assert applied.converter_min_dimension == profile.min_dimension
+
+
+def test_profiles_load_from_configured_path(tmp_path) -> None:
+    path = tmp_path / "profiles.json"
+    path.write_text(
+        json.dumps(
+            [
+                {
+                    "name": "everything",
+                    "hazard": None,
+                    "max_area_km2": None,
+                    "spatial_chunk": 256,
+                    "groups": [R10M],
+                    "enable_sharding": False,
+                    "min_dimension": 64,
+                }
+            ]
+        )
+    )
+    settings = Settings(converter_profiles_path=str(path))
+
+    resolved, name = resolve_conversion_settings(_alert("flood", 2.0), settings)
+
+    assert name == "everything"
+    assert resolved.converter_spatial_chunk == 256
+    assert resolved.converter_groups == [R10M]
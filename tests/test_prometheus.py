@@ -0,0 +1,128 @@
+import asyncio
+import json
+import urllib.request
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+
+import httpx
+import pytest
+
+prometheus_client = pytest.importorskip("prometheus_client")
+
+from autopilot import worker, workflows  # noqa: E402
+from autopilot.listener import AlertFeedSpec, AlertListener  # noqa: E402
+from autopilot.prometheus import REGISTRY, start_metrics_server  # noqa: E402
+from autopilot.state import AlertStateStore  # noqa: E402
+
+
+def _sample(name: str, **labels: str) -> float:
+    return REGISTRY.get_sample_value(name, labels) or 0.0
+
+
+def _alert_event(alert_id: str) -> bytes:
+    return json.dumps(
+        {
+            "data": {
+                "id": alert_id,
+                "hazardType": "flood",
+                "severity": "severe",
+                "issued": "2025-09-22T08:00:00Z",
+                "areaOfInterest": {
+                    "type": "Polygon",
+                    "coordinates": [[[0, 0], [1, 0], [1, 1], [0, 1], [0, 0]]],
+                },
+            }
+        }
+    ).encode()
+
+
+def test_metrics_server_serves_registry() -> None:
+    registry = prometheus_client.CollectorRegistry()
+    prometheus_client.Counter("served_total", "Served", registry=registry).inc()
+    server = start_metrics_server(0, "127.0.0.1", registry=registry)
+    try:
+        with urllib.request.urlopen(f"http://127.0.0.1:{server.server_port}/metrics") as response:
+            body = response.read().decode()
+        assert "served_total 1.0" in body
+    finally:
+        server.shutdown()
+        server.server_close()
+
+
+def test_listener_records_feed_and_publish_metrics(tmp_path: Path) -> None:
+    class FailingFeed:
+        spec = AlertFeedSpec(name="broken-feed", url="http://feed.invalid")
+
+        async def fetch_alerts(self):
+            raise RuntimeError("down")
+
+    errors_before = _sample("alertzarr_feed_poll_errors_total", feed="broken-feed")
+    published_before = _sample("alertzarr_alerts_published_total")
+    store = AlertStateStore(tmp_path / "state.json")
+    store.extend(["a", "b"])
+
+    async def publish(alert) -> None:
+        raise AssertionError("nothing to publish")
+
+    listener = AlertListener([FailingFeed()], publish, store, poll_seconds=1)
+    assert asyncio.run(listener.run_once()) == 0
+
+    assert _sample("alertzarr_feed_poll_errors_total", feed="broken-feed") == errors_before + 1
+    assert _sample("alertzarr_alerts_published_total") == published_before
+    assert _sample("alertzarr_feed_poll_seconds_count", feed="broken-feed") >= 1
+    assert _sample("alertzarr_state_store_alerts", service="listener") == 2
+
+
+def test_workflow_subscriber_records_submit_errors_and_duplicates(
+    tmp_path: Path, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    transport = httpx.MockTransport(lambda request: httpx.Response(503))
+    real_client = httpx.AsyncClient
+    monkeypatch.setattr(
+        workflows.httpx,
+        "AsyncClient",
+        lambda **kwargs: real_client(transport=transport, **kwargs),
+    )
+    trigger = workflows.WorkflowTrigger("http://argo.test", "argo", "alertzarr", None, 5)
+    store = AlertStateStore(tmp_path / "state.json")
+    store.extend(["seen"])
+    subscriber = workflows.AlertEventSubscriber(store, trigger)
+    errors_before = _sample("alertzarr_argo_submit_errors_total", reason="503")
+    latency_before = _sample("alertzarr_argo_submit_seconds_count", outcome="error")
+
+    with pytest.raises(httpx.HTTPStatusError):
+        asyncio.run(subscriber._handle_message(_alert_event("fresh")))
+    assert asyncio.run(subscriber._handle_message(_alert_event("seen"))) == "duplicate"
+
+    assert _sample("alertzarr_argo_submit_errors_total", reason="503") == errors_before + 1
+    assert _sample("alertzarr_argo_submit_seconds_count", outcome="error") == latency_before + 1
+    assert _sample("alertzarr_state_store_alerts", service="workflow_subscriber") == 1
+
+
+def test_worker_pool_records_job_and_stage_metrics(monkeypatch: pytest.MonkeyPatch) -> None:
+    def fake_run_job(payload: dict) -> dict:
+        return {
+            "alert_id": payload["alert"]["id"],
+            "status": "succeeded",
+            "stage_seconds": {"write_geozarr": 2.0},
+        }
+
+    monkeypatch.setattr(worker, "_run_job", fake_run_job)
+    pool = worker.WorkerPool(1)
+    pool._executor.shutdown()
+    pool._executor = ThreadPoolExecutor(max_workers=1)
+    jobs_before = _sample("alertzarr_worker_jobs_total", status="succeeded")
+    stage_before = _sample("alertzarr_conversion_stage_seconds_sum", stage="write_geozarr")
+
+    try:
+        summary = asyncio.run(pool.submit(worker.WorkerJob(alert={"id": "a-1"})))
+    finally:
+        pool.close()
+
+    assert summary["status"] == "succeeded"
+    assert _sample("alertzarr_worker_jobs_total", status="succeeded") == jobs_before + 1
+    assert (
+        _sample("alertzarr_conversion_stage_seconds_sum", stage="write_geozarr")
+        == stage_before + 2.0
+    )
+    assert _sample("alertzarr_worker_jobs_in_flight") == 0
@@ -0,0 +1,74 @@
+import struct
+import zlib
+
+import numpy as np
+
+from autopilot.quicklook import encode_png, render_quicklook, render_tiles, tile_set_for_bbox
+from autopilot.tiles import tiles_for_bbox
+
+
+def _decode_png(data: bytes) -> tuple[int, int, int, bytes]:
+    assert data[:8] == b"\x89PNG\r\n\x1a\n"
+    offset, idat, header = 8, b"", None
+    while offset < len(data):
+        (length,) = struct.unpack(">I", data[offset : offset + 4])
+        tag = data[offset + 4 : offset + 8]
+        payload = data[offset + 8 : offset + 8 + length]
+        (crc,) = struct.unpack(">I", data[offset + 8 + length : offset + 12 + length])
+        assert crc == zlib.crc32(tag + payload)
+        if tag == b"IHDR":
+            header = struct.unpack(">IIBBBBB", payload)
+        elif tag == b"IDAT":
+            idat += payload
+        offset += 12 + length
+    width, height, _, colour_type, *_ = header
+    return width, height, colour_type, zlib.decompress(idat)
+
+
+def test_encode_png_round_trips_rgba_rows() -> None:
+    image = np.arange(2 * 3 * 4, dtype=np.uint8).reshape(2, 3, 4)
+
+    width, height, colour_type, raw = _decode_png(encode_png(image))
+
+    assert (width, height, colour_type) == (3, 2, 6)
+    assert raw == b"\x00" + image[0].tobytes() + b"\x00" + image[1].tobytes()
+
+
+def test_tile_set_starts_at_single_tile_zoom_and_respects_cap() -> None:
+    bbox = (12.3, 45.3, 12.5, 45.5)
+
+    tiles = tile_set_for_bbox(bbox, zoom_levels=3, max_tiles=64)
+    start = tiles[0][0]
+
+    assert len(tiles_for_bbox(bbox, start, "WebMercatorQuad")) == 1
+    assert len(tiles_for_bbox(bbox, start + 1, "WebMercatorQuad")) > 1
+    assert {z for z, _, _ in tiles} == {start, start + 1, start + 2}
+    assert len(tile_set_for_bbox(bbox, zoom_levels=3, max_tiles=1)) == 1
+    assert tile_set_for_bbox(bbox, zoom_levels=0, max_tiles=64) == []
+
+
+def test_render_quicklook_and_tiles_from_written_store(tmp_path) -> None:
+    from autopilot.geozarr import write_geozarr
+    from autopilot.settings import Settings
+    from autopilot.synthetic import build_synthetic_datatree
+
+    group = "/measurements/reflectance/r10m"
+    store = str(tmp_path / "scene.zarr")
+    settings = Settings(
+        converter_groups=[group],
+        converter_spatial_chunk=256,
+        converter_min_dimension=64,
+        converter_tile_width=256,
+    )
+    write_geozarr(build_synthetic_datatree(512, groups=[group], chunk=256), store, settings)
+
+    image, limits = render_quicklook(store, [group], max_size=32)
+    tiles = render_tiles(
+        store, [group], tile_set_for_bbox((15.0, 41.5, 15.06, 41.55), 2, 16), limits
+    )
+
+    assert image.shape == (32, 32, 4)
+    assert (image[..., 3] == 255).all()
+    assert tiles
+    assert all(tile.shape == (256, 256, 4) for tile in tiles.values())
+    assert any(tile[..., 3].any() for tile in tiles.values())
@@ -1,8 +1,13 @@
+import asyncio
 import json
+import time
 from pathlib import Path
 
+import pytest
+
 from autopilot.geozarr import ConversionOutput, ViewerLinks
-from autopilot.reporting import RunReporter
+from autopilot.metrics_sink import get_metrics_sink
+from autopilot.reporting import RunReporter, span
 
 
 def test_run_reporter_tracks_steps() -> None:
@@ -103,9 +108,62 @@ def test_emit_metrics_appends_json_lines(tmp_path: Path) -> None:
 
     metrics_path = tmp_path / "metrics.jsonl"
     reporter.emit_metrics(metrics_path)
+    get_metrics_sink(metrics_path).flush()
 
     lines = metrics_path.read_text().strip().splitlines()
     assert len(lines) == 1
     entry = json.loads(lines[0])
     assert entry["run_id"] == "metrics-test"
     assert entry["status"] == "succeeded"
+
+
+def test_spans_nest_across_tasks_and_threads(tmp_path: Path) -> None:
+    reporter = RunReporter(run_id="span-test")
+
+    async def run() -> None:
+        reporter.start_run()
+        async with reporter.span("conversion", mode="simulate"):
+            with span("scene_search"):
+                time.sleep(0.01)
+            await asyncio.to_thread(_timed_stage, "write_geozarr")
+        with pytest.raises(ValueError):
+            with span("stac"):
+                raise ValueError("boom")
+        reporter.finish_run()
+
+    asyncio.run(run())
+
+    by_name = {recorded.name: recorded for recorded in reporter.spans}
+    conversion = by_name["conversion"]
+    assert conversion.parent_id is None
+    assert conversion.attributes == {"mode": "simulate"}
+    assert by_name["scene_search"].parent_id == conversion.span_id
+    assert by_name["write_geozarr"].parent_id == conversion.span_id
+    assert by_name["write_geozarr"].thread_id != conversion.thread_id
+    assert by_name["stac"].attributes["error"] == "ValueError"
+    assert conversion.duration_seconds >= by_name["scene_search"].duration_seconds >= 0.01
+
+    summary = reporter.summary()
+    assert summary["stage_seconds"]["conversion"] >= 0.01
+    assert [entry["name"] for entry in summary["spans"]][0] == "conversion"
+
+    trace = json.loads(reporter.export_chrome_trace(tmp_path / "trace.json").read_text())
+    complete = [event for event in trace["traceEvents"] if event["ph"] == "X"]
+    assert {event["name"] for event in complete} == {
+        "conversion",
+        "scene_search",
+        "write_geozarr",
+        "stac",
+    }
+    assert all(event["dur"] >= 0 and event["ts"] >= 0 for event in complete)
+    assert any(event["ph"] == "M" for event in trace["traceEvents"])
+
+
+def test_module_span_is_noop_outside_a_run() -> None:
+    with span("orphan") as recorded:
+        assert recorded is None
+
+
+def _timed_stage(name: str) -> None:
+    with span(name):
+        time.sleep(0.005)
@@ -0,0 +1,43 @@
+import asyncio
+
+from autopilot.s3 import S3ClientManager, get_s3_manager
+from autopilot.settings import Settings
+
+
+def _manager() -> S3ClientManager:
+    return S3ClientManager(
+        "http://127.0.0.1:9", "key", "secret", "us-east-1", max_pool_connections=4
+    )
+
+
+def test_sync_client_is_built_once_with_pool_size() -> None:
+    manager = _manager()
+
+    client = manager.sync_client()
+
+    assert manager.sync_client() is client
+    assert client.meta.config.max_pool_connections == 4
+    manager.close()
+    assert manager.sync_client() is not client
+
+
+def test_async_client_is_shared_within_a_loop_and_closed() -> None:
+    manager = _manager()
+
+    async def runner() -> tuple:
+        clients = await asyncio.gather(*(manager.async_client() for _ in range(3)))
+        await manager.aclose()
+        return clients
+
+    clients = asyncio.run(runner())
+
+    assert clients[0] is clients[1] is clients[2]
+    assert clients[0].meta.config.max_pool_connections == 4
+
+
+def test_get_s3_manager_is_keyed_by_endpoint_settings() -> None:
+    settings = Settings(s3_max_pool_connections=8)
+
+    assert get_s3_manager(settings) is get_s3_manager(settings.model_copy())
+    other = settings.model_copy(update={"s3_max_pool_connections": 16})
+    assert get_s3_manager(other) is not get_s3_manager(settings)
@@ -1,5 +1,20 @@
+import asyncio
+import json
+
+from conftest import AsyncInMemoryS3, make_item
+
 from autopilot.geozarr import ConversionOutput, ViewerLinks
-from autopilot.stac import build_stac_item
+from autopilot.settings import Settings
+from autopilot.stac import (
+    CREATED_METADATA_KEY,
+    HASH_METADATA_KEY,
+    StacPublisher,
+    build_stac_item,
+    build_stac_items,
+    encode_stac_item,
+    item_content_hash,
+    publish_stac_items,
+)
 
 
 def test_build_stac_item_sets_links() -> None:
@@ -80,6 +95,40 @@ def test_build_stac_item_marks_zarr_assets() -> None:
     assert any(link["rel"] == "tilejson" for link in item["links"])
 
 
+def test_build_stac_item_points_geozarr_asset_at_lineage_group() -> None:
+    class FakeAlert:
+        id = "EMSR123-v2"
+
+        class Model:
+            description = "Test alert"
+            area_of_interest = {
+                "type": "Polygon",
+                "coordinates": [[[-1, -1], [1, -1], [1, 1], [-1, 1], [-1, -1]]],
+            }
+            issued = "2025-01-01T00:00:00Z"
+            severity = "severe"
+            hazard_type = "flood"
+
+        model = Model()
+
+    output = ConversionOutput(
+        alert_id="EMSR123-v2",
+        bucket="bucket",
+        key="alerts/flood/EMSR123.zarr",
+        s3_uri="s3://bucket/alerts/flood/EMSR123.zarr",
+        bytes_written=10,
+        duration_seconds=0.5,
+        lineage_id="EMSR123",
+        zarr_group="S2B_tile-c",
+    )
+
+    assets = build_stac_item(FakeAlert(), output, "stac-bucket")["assets"]
+
+    assert assets["geozarr"]["href"] == "s3://bucket/alerts/flood/EMSR123.zarr/S2B_tile-c"
+    assert assets["lineage-store"]["href"] == "s3://bucket/alerts/flood/EMSR123.zarr"
+    assert assets["lineage-store"]["roles"] == ["data", "zarr"]
+
+
 def test_build_stac_item_uses_public_base_url_for_links() -> None:
     class FakeAlert:
         id = "alert-1"
@@ -118,3 +167,144 @@ def test_build_stac_item_uses_public_base_url_for_links() -> None:
         hrefs["self"] == "https://data.example.com/stac/items/alert-1-placeholder.json"
     )
     assert hrefs["collection"] == "https://data.example.com/stac/collections/flood.json"
+
+
+def test_build_stac_item_registers_quicklook_assets() -> None:
+    class FakeAlert:
+        id = "alert-1"
+
+        class Model:
+            description = "Test alert"
+            area_of_interest = {
+                "type": "Polygon",
+                "coordinates": [[[-1, -1], [1, -1], [1, 1], [-1, 1], [-1, -1]]],
+            }
+            issued = "2025-01-01T00:00:00Z"
+            severity = "severe"
+            hazard_type = "flood"
+
+        model = Model()
+
+    output = ConversionOutput(
+        alert_id="alert-1",
+        bucket="bucket",
+        key="alerts/flood/alert-1-S2A.zarr",
+        s3_uri="s3://bucket/alerts/flood/alert-1-S2A.zarr",
+        bytes_written=10,
+        duration_seconds=0.5,
+        thumbnail_href="https://data.example.com/alerts/flood/alert-1-S2A.quicklook.webp",
+        overview_href="https://data.example.com/alerts/flood/alert-1-S2A.tiles/{z}/{x}/{y}.png",
+    )
+
+    assets = build_stac_item(FakeAlert(), output, "stac-bucket")["assets"]
+
+    assert assets["thumbnail"]["type"] == "image/webp"
+    assert assets["thumbnail"]["roles"] == ["thumbnail"]
+    assert assets["overview"]["href"].endswith("{z}/{x}/{y}.png")
+    assert assets["overview"]["type"] == "image/png"
+
+
+def test_item_content_hash_ignores_volatile_timestamps() -> None:
+    first = make_item("a", created="2025-01-01T00:00:00Z")
+    later = make_item("a", created="2025-02-01T00:00:00Z")
+
+    assert item_content_hash(first) == item_content_hash(later)
+    assert item_content_hash(first) != item_content_hash(
+        make_item("a", created="2025-01-01T00:00:00Z", href="s3://bucket/b.zarr")
+    )
+
+
+def test_publisher_skips_unchanged_items_with_bounded_concurrency() -> None:
+    s3 = AsyncInMemoryS3()
+    publisher = StacPublisher("stac", concurrency=4, client=s3)
+    items = [make_item(f"item-{index}", created="2025-01-01T00:00:00Z") for index in range(20)]
+
+    first = asyncio.run(publisher.publish_many(items))
+    rerun = [make_item(f"item-{index}", created="2025-03-01T00:00:00Z") for index in range(20)]
+    rerun[0]["assets"]["geozarr"]["href"] = "s3://bucket/changed.zarr"
+    second = asyncio.run(publisher.publish_many(rerun))
+
+    assert {result.status for result in first} == {"written"}
+    assert [result.status for result in second].count("skipped") == 19
+    assert second[0].status == "written"
+    assert s3.puts == 21 and s3.heads == 40
+    assert 1 < s3.max_in_flight <= 4
+    assert second[1].created == "2025-01-01T00:00:00Z"
+
+
+def test_publish_stac_items_keeps_stored_created_for_unchanged_items() -> None:
+    s3 = AsyncInMemoryS3()
+    settings = Settings(stac_collections_enabled=False, stac_parquet_index_enabled=False)
+    publisher = StacPublisher("stac", concurrency=4, client=s3)
+    asyncio.run(
+        publish_stac_items(
+            [make_item(name, created="2025-01-01T00:00:00Z") for name in ("a", "b")],
+            settings=settings,
+            publisher=publisher,
+        )
+    )
+    # An object written before ``created`` was stored in its metadata.
+    del s3.metadata["items/b.json"][CREATED_METADATA_KEY]
+
+    rerun = [make_item(name, created="2025-03-01T00:00:00Z") for name in ("a", "b")]
+    results = asyncio.run(publish_stac_items(rerun, settings=settings, publisher=publisher))
+
+    assert [result.status for result in results] == ["skipped", "skipped"]
+    assert [item["properties"]["created"] for item in rerun] == ["2025-01-01T00:00:00Z"] * 2
+
+
+def test_build_stac_items_shares_templates_without_aliasing() -> None:
+    class FakeAlert:
+        def __init__(self, alert_id: str) -> None:
+            self.id = alert_id
+
+        class Model:
+            description = "Test alert"
+            area_of_interest = {
+                "type": "Polygon",
+                "coordinates": [[[-1, -1], [1, -1], [1, 1], [-1, 1], [-1, -1]]],
+            }
+            issued = "2025-01-01T00:00:00Z"
+            severity = "severe"
+            hazard_type = "flood"
+
+        model = Model()
+
+    def output(alert_id: str) -> ConversionOutput:
+        return ConversionOutput(
+            alert_id=alert_id,
+            bucket="bucket",
+            key=f"alerts/flood/{alert_id}.zarr",
+            s3_uri=f"s3://bucket/alerts/flood/{alert_id}.zarr",
+            bytes_written=10,
+            duration_seconds=0.5,
+            collection_id="flood",
+        )
+
+    pairs = [(FakeAlert(f"alert-{index}"), output(f"alert-{index}")) for index in range(3)]
+    items = build_stac_items(pairs, "stac-bucket", public_base_url="https://data.example.com/stac")
+
+    assert [item["id"] for item in items] == [f"alert-{index}-geozarr" for index in range(3)]
+    assert len({item["properties"]["created"] for item in items}) == 1
+    items[0]["links"][1]["href"] = "changed"
+    items[0]["assets"]["geozarr"]["roles"].append("changed")
+    assert items[1]["links"][1]["href"] == "https://data.example.com/stac/collections/flood.json"
+    assert items[1]["assets"]["geozarr"]["roles"] == ["data", "zarr"]
+    assert json.loads(encode_stac_item(items[2])) == items[2]
+
+
+def test_racing_publishers_count_a_new_item_once() -> None:
+    s3 = AsyncInMemoryS3()
+    first = StacPublisher("stac", client=s3)
+    second = StacPublisher("stac", client=s3)
+    item = make_item("a", created="2025-01-01T00:00:00Z")
+    changed = make_item("a", created="2025-01-01T00:00:00Z", href="s3://bucket/b.zarr")
+
+    async def race() -> list:
+        return await asyncio.gather(first.publish(item), second.publish(changed))
+
+    results = asyncio.run(race())
+
+    assert [result.status for result in results] == ["written", "written"]
+    assert sorted(result.new for result in results) == [False, True]
+    assert s3.metadata["items/a.json"][HASH_METADATA_KEY] == item_content_hash(changed)
@@ -0,0 +1,90 @@
+import json
+import threading
+
+import httpx
+from conftest import InMemoryS3, make_item
+
+from autopilot.stac_api import StacApiIndex, StacSearch, make_server
+
+
+def _item(item_id: str, x: float, day: int, collection: str = "flood") -> dict:
+    return make_item(
+        item_id, collection=collection, bbox=(x, 0, x + 1, 1), when=f"2025-01-{day:02d}T00:00:00Z"
+    )
+
+
+def _index(s3: InMemoryS3) -> StacApiIndex:
+    return StacApiIndex("stac", base_url="http://localhost:7000/stac", client=s3, workers=2)
+
+
+def _ids(index: StacApiIndex, **params) -> tuple[list[str], str | None]:
+    features, token = index.search(StacSearch.from_params(params, index.max_limit))
+    return [json.loads(feature)["id"] for feature in features], token
+
+
+def test_search_filters_and_paginates_newest_first() -> None:
+    s3 = InMemoryS3()
+    for day in range(1, 11):
+        s3.add_item(_item(f"item-{day:02d}", day, day, "flood" if day % 2 else "fire"))
+    index = _index(s3)
+    index.refresh()
+
+    ids, token = _ids(index, limit="3")
+    assert ids == ["item-10", "item-09", "item-08"]
+    ids, token = _ids(index, limit="3", token=token)
+    assert ids == ["item-07", "item-06", "item-05"]
+
+    assert _ids(index, hazard="flood", bbox="2.5,0,6.5,1")[0] == ["item-05", "item-03"]
+    assert _ids(index, datetime="2025-01-08T00:00:00Z/..")[0] == ["item-10", "item-09", "item-08"]
+    assert _ids(index, datetime="../2025-01-02T00:00:00Z", collections="fire")[0] == ["item-02"]
+
+
+def test_refresh_downloads_only_changed_objects() -> None:
+    s3 = InMemoryS3()
+    s3.add_item(_item("a", 0, 1))
+    s3.add_item(_item("b", 1, 2))
+    index = _index(s3)
+    assert index.refresh() == 2
+    assert index.refresh() == 0
+    gets = s3.gets
+
+    s3.add_item(_item("c", 2, 3))
+    del s3.objects["items/a.json"]
+    assert index.refresh() == 2
+    assert s3.gets == gets + 1
+    assert _ids(index)[0] == ["c", "b"]
+
+
+def test_server_serves_items_collections_and_search() -> None:
+    s3 = InMemoryS3()
+    for day in range(1, 4):
+        s3.add_item(_item(f"item-{day}", day, day))
+    s3.objects["collections/flood.json"] = json.dumps(
+        {"type": "Collection", "id": "flood", "links": []}
+    ).encode()
+    index = _index(s3)
+    index.refresh()
+    server = make_server(index, "127.0.0.1", 0)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    try:
+        base = f"http://127.0.0.1:{server.server_port}/stac"
+        with httpx.Client(base_url=base) as client:
+            assert client.get("/items/item-2.json").json()["id"] == "item-2"
+            assert client.get("/items/missing").status_code == 404
+            assert [c["id"] for c in client.get("/collections").json()["collections"]] == ["flood"]
+            assert client.get("/search", params={"bbox": "a,b"}).status_code == 400
+
+            page = client.get("/search", params={"limit": 2}).json()
+            assert [feature["id"] for feature in page["features"]] == ["item-3", "item-2"]
+            next_link = next(link for link in page["links"] if link["rel"] == "next")
+            follow = client.get(next_link["href"].replace("http://localhost:7000/stac", "")).json()
+            assert [feature["id"] for feature in follow["features"]] == ["item-1"]
+
+            posted = client.post("/search", json={"ids": ["item-1", "item-3"]}).json()
+            assert posted["numberReturned"] == 2
+            for body in ([], "x", {"limit": {}}, {"limit": []}, {"bbox": {"a": 1}}):
+                assert client.post("/search", json=body).status_code == 400
+    finally:
+        server.shutdown()
+        server.server_close()
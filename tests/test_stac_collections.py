@@ -0,0 +1,101 @@
+import asyncio
+import json
+
+from conftest import AsyncInMemoryS3, make_item
+
+from autopilot.stac_collections import (
+    CATALOG_KEY,
+    ITEM_COUNT_FIELD,
+    CollectionExtent,
+    CollectionMaintainer,
+    collection_key,
+)
+
+
+def test_record_items_merges_extents_and_counts_only_new_items() -> None:
+    s3 = AsyncInMemoryS3()
+    maintainer = CollectionMaintainer(
+        "stac", public_base_url="https://data.example.com/stac", client=s3
+    )
+
+    wildfire = make_item("c", collection="wildfire", bbox=[10, 10, 11, 11], when="2025-03-01")
+
+    asyncio.run(maintainer.record_items([(make_item("a", when="2025-01-02T00:00:00Z"), True)]))
+    asyncio.run(
+        maintainer.record_items(
+            [
+                (make_item("b", bbox=[-2, 0.5, 0.5, 3], when="2025-01-01T00:00:00Z"), True),
+                (make_item("a", when="2025-01-02T00:00:00Z"), False),
+                (wildfire, True),
+            ]
+        )
+    )
+
+    flood = s3.document(collection_key("flood"))
+    assert flood[ITEM_COUNT_FIELD] == 2
+    assert flood["extent"]["spatial"]["bbox"] == [[-2, 0, 1, 3]]
+    assert flood["extent"]["temporal"]["interval"] == [
+        ["2025-01-01T00:00:00Z", "2025-01-02T00:00:00Z"]
+    ]
+    catalog = s3.document(CATALOG_KEY)
+    children = [link["href"] for link in catalog["links"] if link["rel"] == "child"]
+    assert children == [
+        "https://data.example.com/stac/collections/flood.json",
+        "https://data.example.com/stac/collections/wildfire.json",
+    ]
+
+
+def test_concurrent_runs_do_not_lose_updates() -> None:
+    s3 = AsyncInMemoryS3()
+
+    async def scenario() -> None:
+        runs = [
+            CollectionMaintainer("stac", client=s3).record_items(
+                [(make_item(f"item-{index}", bbox=[index, 0, index + 1, 1]), True)]
+            )
+            for index in range(10)
+        ]
+        await asyncio.gather(*runs)
+
+    asyncio.run(scenario())
+
+    flood = s3.document(collection_key("flood"))
+    assert s3.conflicts > 0
+    assert flood[ITEM_COUNT_FIELD] == 10
+    assert flood["extent"]["spatial"]["bbox"] == [[0, 0, 10, 1]]
+
+
+def test_rebuild_recomputes_from_published_items() -> None:
+    s3 = AsyncInMemoryS3()
+    for item in (
+        make_item("a", when="2025-01-01T00:00:00Z"),
+        make_item("b", bbox=[1, 1, 2, 2], when="2025-02-01T00:00:00Z"),
+        make_item("c", collection="wildfire", bbox=[5, 5, 6, 6], when="2025-03-01T00:00:00Z"),
+    ):
+        s3.add_item(item)
+    s3.objects[collection_key("flood")] = json.dumps({ITEM_COUNT_FIELD: 99}).encode()
+
+    counts = asyncio.run(CollectionMaintainer("stac", client=s3).rebuild())
+
+    assert counts == {"flood": 2, "wildfire": 1}
+    flood = s3.document(collection_key("flood"))
+    assert flood[ITEM_COUNT_FIELD] == 2
+    assert flood["extent"]["spatial"]["bbox"] == [[0, 0, 2, 2]]
+    assert len(s3.document(CATALOG_KEY)["links"]) == 4
+
+
+def test_extent_handles_3d_bboxes_and_mixed_datetime_formats() -> None:
+    extent = CollectionExtent()
+    extent.add(
+        {
+            "bbox": [0, 0, -5, 1, 1, 50],
+            "properties": {"datetime": "2025-01-01T12:00:00.500000Z"},
+        }
+    )
+    extent.add({"bbox": [2, -1, 3, 0], "properties": {"datetime": "2025-01-01T12:00:00+00:00"}})
+    extent.add({"bbox": [0, 0, 1, 1], "properties": {"datetime": "yesterday"}})
+
+    assert extent.bbox == [0, -1, 3, 1]
+    assert extent.start == "2025-01-01T12:00:00+00:00"
+    assert extent.end == "2025-01-01T12:00:00.500000Z"
+    assert extent.new_items == 3
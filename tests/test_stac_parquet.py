@@ -0,0 +1,90 @@
+import io
+import json
+
+import pytest
+
+pa = pytest.importorskip("pyarrow")
+pq = pytest.importorskip("pyarrow.parquet")
+
+from conftest import InMemoryS3, make_item  # noqa: E402
+
+from autopilot import stac_parquet  # noqa: E402
+from autopilot.stac_parquet import StacParquetIndex, item_record  # noqa: E402
+
+
+def test_item_record_flattens_item() -> None:
+    record = item_record(make_item("a"))
+
+    assert record["hazard"] == "flood"
+    assert record["bbox"] == {"xmin": 0, "ymin": 0, "xmax": 1, "ymax": 1}
+    assert record["assets"] == [("geozarr", "s3://bucket/a.zarr")]
+    assert record["datetime"].year == 2025
+
+
+def test_append_partitions_and_compacts_with_latest_rows() -> None:
+    s3 = InMemoryS3()
+    index = StacParquetIndex("stac", compact_min_files=3, client=s3)
+
+    wildfire = make_item("b", collection="wildfire", when="2024-06-01T00:00:00Z")
+    index.append([make_item("a"), wildfire])
+    index.append([make_item("c")])
+    assert index.partitions() == ["collection=flood/year=2025", "collection=wildfire/year=2024"]
+    assert len(s3.parquet_keys()) == 3
+
+    updated = make_item("a")
+    updated["assets"]["geozarr"]["href"] = "s3://bucket/a-v2.zarr"
+    index.append([updated])  # third flood file triggers compaction
+
+    flood = [key for key in s3.parquet_keys() if "collection=flood" in key]
+    assert len(flood) == 1 and "-compacted-" in flood[0]
+    table = index.read("collection=flood/year=2025")
+    rows = {row["id"]: row for row in table.to_pylist()}
+    assert sorted(rows) == ["a", "c"]
+    assert rows["a"]["assets"] == [("geozarr", "s3://bucket/a-v2.zarr")]
+
+    metadata = pq.read_schema(io.BytesIO(s3.objects[flood[0]])).metadata
+    geo = json.loads(metadata[b"geo"])
+    assert geo["primary_column"] == "geometry"
+    assert geo["columns"]["geometry"]["geometry_types"] == ["Polygon"]
+
+
+def test_append_lists_each_partition_once_and_skips_invalid_datetimes() -> None:
+    s3 = InMemoryS3()
+    index = StacParquetIndex("stac", compact_min_files=100, client=s3)
+
+    for name in ("a", "b", "c", "d"):
+        index.append([make_item(name), make_item(f"{name}-bad", when="not a date")])
+
+    assert s3.list_calls == 1
+    assert len(s3.parquet_keys()) == 4
+    assert sorted(index.read().column("id").to_pylist()) == ["a", "b", "c", "d"]
+
+
+def test_shared_index_keeps_file_counts_across_publishes(monkeypatch: pytest.MonkeyPatch) -> None:
+    s3 = InMemoryS3()
+    monkeypatch.setattr(
+        StacParquetIndex,
+        "from_settings",
+        classmethod(lambda cls, settings: cls("stac", compact_min_files=100, client=s3)),
+    )
+    stac_parquet.get_stac_parquet_index.cache_clear()
+    try:
+        for name in ("a", "b", "c"):
+            stac_parquet.get_stac_parquet_index().append([make_item(name)])
+    finally:
+        stac_parquet.get_stac_parquet_index.cache_clear()
+
+    assert s3.list_calls == 1
+    assert len(s3.parquet_keys()) == 3
+
+
+def test_export_rebuilds_index_from_published_items() -> None:
+    s3 = InMemoryS3()
+    for item in (make_item("a"), make_item("b"), make_item("c", collection="wildfire")):
+        s3.add_item(item)
+    index = StacParquetIndex("stac", client=s3)
+    index.append([make_item("stale")])
+
+    assert index.export(workers=2) == 3
+    assert len(s3.parquet_keys()) == 2
+    assert sorted(index.read().column("id").to_pylist()) == ["a", "b", "c"]
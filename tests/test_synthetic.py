@@ -0,0 +1,47 @@
+import asyncio
+
+from conftest import make_alert
+
+from autopilot.geozarr import synthetic_conversion
+from autopilot.reporting import RunReporter
+from autopilot.settings import Settings
+from autopilot.synthetic import synthetic_grid_for_aoi
+
+R10M = "/measurements/reflectance/r10m"
+AOI_BBOX = (10.0, 45.0, 10.03, 45.02)
+
+
+def test_grid_is_sized_to_aoi_in_utm_zone() -> None:
+    aoi = make_alert("EMSR-synthetic", bbox=AOI_BBOX).model.area_of_interest
+
+    grid = synthetic_grid_for_aoi(aoi, min_pixels=64)
+    clamped = synthetic_grid_for_aoi(aoi, min_pixels=64, max_pixels=200)
+    southern = synthetic_grid_for_aoi({"type": "Point", "coordinates": [-70, -33]})
+
+    assert (grid.width, grid.height, grid.epsg) == (240, 226, 32632)
+    assert (clamped.width, clamped.height) == (200, 200)
+    assert (southern.width, southern.epsg) == (256, 32719)
+
+
+def test_synthetic_conversion_writes_local_store(tmp_path) -> None:
+    settings = Settings(
+        synthetic_output_dir=str(tmp_path),
+        converter_groups=[R10M],
+        converter_spatial_chunk=128,
+        converter_min_dimension=64,
+        converter_tile_width=128,
+        converter_hazard_indices=True,
+    )
+    alert = make_alert("EMSR-synthetic", bbox=AOI_BBOX)
+
+    output = asyncio.run(synthetic_conversion(alert, settings))
+
+    assert output.synthetic
+    assert output.s3_uri.startswith(str(tmp_path))
+    assert output.bytes_written > 0
+    assert output.hazard_indices == ["ndwi"]
+    assert output.thumbnail_href.endswith(".quicklook.png")
+    assert (tmp_path / output.key.removesuffix(".zarr")).with_suffix(".quicklook.png").exists()
+    reporter = RunReporter()
+    reporter.record_conversion(output)
+    assert reporter.steps["conversion"]["mode"] == "synthetic"
@@ -0,0 +1,136 @@
+import asyncio
+from datetime import datetime, timezone
+
+import dask.array as da
+import numpy as np
+import pytest
+import xarray as xr
+from conftest import make_alert
+
+from autopilot import geozarr
+from autopilot.catalog import SceneSummary
+from autopilot.settings import Settings
+from autopilot.temporal import build_temporal_cube, select_pre_post_scenes
+
+GROUP = "/measurements/reflectance/r10m"
+
+
+def _scene(scene_id: str, when: str, cloud: float | None) -> SceneSummary:
+    return SceneSummary(
+        id=scene_id,
+        collection="sentinel-2-l2a",
+        datetime=when,
+        cloud_cover=cloud,
+        preview_href=None,
+        data_href=None,
+        stac_item_href=f"https://stac.test/{scene_id}",
+        zarr_href=f"s3://bucket/{scene_id}.zarr",
+    )
+
+
+def _tree(value: float, extra: dict[str, float] | None = None) -> xr.DataTree:
+    coords = {"y": np.arange(4, dtype=float) * -10, "x": np.arange(4, dtype=float) * 10}
+    bands = {"b03": value, "b08": value / 2, **(extra or {})}
+    ds = xr.Dataset(
+        {
+            name: (("y", "x"), da.full((4, 4), band, chunks=2), {"proj:epsg": 32633})
+            for name, band in bands.items()
+        },
+        coords=coords,
+    )
+    return xr.DataTree.from_dict({GROUP: ds})
+
+
+def test_select_pre_post_prefers_clear_then_nearest() -> None:
+    issued = datetime(2025, 9, 22, 8, tzinfo=timezone.utc)
+    scenes = [
+        _scene("pre-cloudy", "2025-09-21T10:00:00Z", 35.0),
+        _scene("pre-clear-old", "2025-09-14T10:00:00Z", 5.0),
+        _scene("pre-clear-recent", "2025-09-19T10:00:00Z", 5.0),
+        _scene("post-clear", "2025-09-26T10:00:00Z", 2.0),
+        _scene("post-unknown", "2025-09-23T10:00:00Z", None),
+    ]
+
+    pre, post = select_pre_post_scenes(scenes, issued)
+
+    assert pre is not None and pre.id == "pre-clear-recent"
+    assert post is not None and post.id == "post-clear"
+    assert select_pre_post_scenes(scenes[:3], issued)[1] is None
+
+
+def test_build_temporal_cube_stacks_lazily_with_difference() -> None:
+    pre = _tree(0.2)
+    post = _tree(0.5, extra={"dnbr": 0.1})
+    times = (
+        datetime(2025, 9, 19, 10, tzinfo=timezone.utc),
+        datetime(2025, 9, 26, 10, tzinfo=timezone.utc),
+    )
+
+    cube = build_temporal_cube(pre, post, [GROUP, "/missing"], times)
+
+    ds = cube[GROUP].to_dataset()
+    assert ds["b03"].dims == ("time", "y", "x")
+    assert isinstance(ds["b03"].data, da.Array)
+    assert ds["b03"].attrs["proj:epsg"] == 32633
+    assert str(ds["time"].values[0]).startswith("2025-09-19T10")
+    np.testing.assert_allclose(ds["b03_diff"].values, 0.3, rtol=1e-6)
+    assert ds["dnbr"].dims == ("y", "x")
+    assert "/missing" not in cube.groups
+
+
+def test_build_temporal_cube_aligns_offset_grid() -> None:
+    pre = _tree(1.0)
+    shifted = pre[GROUP].to_dataset().assign_coords(x=pre[GROUP].x + 20)
+    pre = xr.DataTree.from_dict({GROUP: shifted})
+    post = _tree(2.0)
+    times = (
+        datetime(2025, 1, 1, tzinfo=timezone.utc),
+        datetime(2025, 1, 2, tzinfo=timezone.utc),
+    )
+
+    cube = build_temporal_cube(pre, post, [GROUP], times, difference=False)
+
+    before = cube[GROUP]["b03"].isel(time=0).values
+    assert np.isnan(before[:, :2]).all()
+    np.testing.assert_allclose(before[:, 2:], 1.0)
+    assert "b03_diff" not in cube[GROUP].data_vars
+
+
+def test_build_temporal_cube_difference_keeps_sign_of_unsigned_bands() -> None:
+    def tree(value: int) -> xr.DataTree:
+        coords = {"y": np.arange(2, dtype=float), "x": np.arange(2, dtype=float)}
+        band = xr.DataArray(np.full((2, 2), value, dtype="uint16"), dims=("y", "x"))
+        return xr.DataTree.from_dict({GROUP: xr.Dataset({"b04": band}, coords=coords)})
+
+    times = (
+        datetime(2025, 1, 1, tzinfo=timezone.utc),
+        datetime(2025, 1, 2, tzinfo=timezone.utc),
+    )
+    cube = build_temporal_cube(tree(1500), tree(1000), [GROUP], times)
+
+    delta = cube[GROUP]["b04_diff"]
+    assert delta.dtype == np.float32
+    np.testing.assert_array_equal(delta.values, -500.0)
+
+
+def test_select_pre_post_requires_same_crs_and_tile() -> None:
+    issued = datetime(2025, 9, 22, 8, tzinfo=timezone.utc)
+    other_zone = _scene("pre-33U", "2025-09-21T10:00:00Z", 1.0)
+    other_zone.epsg, other_zone.tile_id = 32633, "33UWP"
+    same_zone = _scene("pre-34U", "2025-09-18T10:00:00Z", 20.0)
+    same_zone.epsg, same_zone.tile_id = 32634, "34UCA"
+    post = _scene("post-34U", "2025-09-23T10:00:00Z", 3.0)
+    post.epsg, post.tile_id = 32634, "34UCA"
+
+    pre, chosen = select_pre_post_scenes([other_zone, same_zone, post], issued)
+
+    assert pre is not None and pre.id == "pre-34U"
+    assert chosen is post
+    assert select_pre_post_scenes([other_zone, post], issued) == (None, post)
+
+
+def test_temporal_conversion_requires_an_issued_time() -> None:
+    alert = make_alert("no-issued", issued=None)
+
+    with pytest.raises(RuntimeError, match="no issued time"):
+        asyncio.run(geozarr._attempt_temporal_conversion(alert, Settings()))
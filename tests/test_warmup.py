@@ -0,0 +1,130 @@
+import asyncio
+import json
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import pytest
+
+from autopilot.geozarr import ViewerLinks
+from autopilot.reporting import RunReporter
+from autopilot.tiles import tiles_for_bbox
+from autopilot.warmup import _tile_urls, warm_viewer
+
+AOI_BBOX = (12.3, 45.3, 12.5, 45.5)
+
+
+class _TiTilerStub(BaseHTTPRequestHandler):
+    tile_delay = 0.0
+    seen: list[str] = []
+
+    def do_GET(self) -> None:  # noqa: N802 - http.server naming
+        type(self).seen.append(self.path)
+        root = "/collections/flood/items/item-1"
+        if self.path == f"{root}/info":
+            self._send(200, {"bounds": [12.0, 45.0, 13.0, 46.0]})
+        elif self.path == f"{root}/WebMercatorQuad/tilejson.json":
+            host = f"http://127.0.0.1:{self.server.server_port}"
+            self._send(
+                200,
+                {
+                    "tiles": [f"{host}{root}/tiles/WebMercatorQuad/{{z}}/{{x}}/{{y}}?v=b04"],
+                    "minzoom": 8,
+                    "maxzoom": 14,
+                    "bounds": [12.0, 45.0, 13.0, 46.0],
+                },
+            )
+        elif "/tiles/" in self.path:
+            time.sleep(type(self).tile_delay)
+            self._send(200, {})
+        else:
+            self._send(404, {})
+
+    def _send(self, status: int, payload: dict) -> None:
+        body = json.dumps(payload).encode()
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, *args) -> None:
+        return None
+
+
+@pytest.fixture
+def titiler():
+    _TiTilerStub.seen = []
+    _TiTilerStub.tile_delay = 0.0
+    server = ThreadingHTTPServer(("127.0.0.1", 0), _TiTilerStub)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    base = f"http://127.0.0.1:{server.server_port}"
+    root = f"{base}/collections/flood/items/item-1"
+    yield ViewerLinks(
+        collection_id="flood",
+        item_id="item-1",
+        base_url=base,
+        tile_matrix_set="WebMercatorQuad",
+        viewer_url=f"{root}/viewer",
+        tilejson_url=f"{root}/WebMercatorQuad/tilejson.json",
+        info_url=f"{root}/info",
+    )
+    server.shutdown()
+    server.server_close()
+
+
+def test_tiles_for_bbox_web_mercator() -> None:
+    assert tiles_for_bbox((-180, -85, 180, 85), 1, "WebMercatorQuad") == [
+        (1, 0, 0),
+        (1, 1, 0),
+        (1, 0, 1),
+        (1, 1, 1),
+    ]
+    assert tiles_for_bbox(AOI_BBOX, 8, "WebMercatorQuad") == [(8, 136, 91)]
+    assert tiles_for_bbox((0, 0, 1, 1), 0, "WorldCRS84Quad") == [(0, 1, 0)]
+
+
+def test_warm_viewer_requests_info_tilejson_and_aoi_tiles(titiler) -> None:
+    result = asyncio.run(warm_viewer(titiler, AOI_BBOX, zoom_levels=3))
+
+    kinds = sorted(request.kind for request in result.requests)
+    assert kinds.count("info") == 1 and kinds.count("tilejson") == 1
+    assert kinds.count("tile") >= 3
+    assert all(request.ok for request in result.requests)
+    assert any(path.endswith("?v=b04") for path in _TiTilerStub.seen)
+
+    reporter = RunReporter()
+    reporter.record_viewer_warmup(result)
+    warmup = reporter.steps["viewer_warmup"]
+    assert warmup["failed"] == 0 and not warmup["timed_out"]
+    assert warmup["by_kind"]["tile"]["count"] == kinds.count("tile")
+
+
+def test_warm_viewer_respects_budget(titiler) -> None:
+    _TiTilerStub.tile_delay = 2.0
+
+    result = asyncio.run(warm_viewer(titiler, AOI_BBOX, budget_seconds=0.5))
+
+    assert result.timed_out
+    assert result.duration_seconds < 1.5
+    assert {request.kind for request in result.requests} == {"info", "tilejson"}
+
+
+def test_tile_urls_treat_null_zoom_range_as_defaults(titiler) -> None:
+    urls = _tile_urls(titiler, {"minzoom": None, "maxzoom": None}, AOI_BBOX, 2, 32)
+
+    assert urls and all("/tiles/WebMercatorQuad/" in url for url in urls)
+    assert urls[0].endswith("/0/0/0")
+
+
+def test_warm_viewer_records_unexpected_errors_instead_of_raising(titiler) -> None:
+    class BrokenClient:
+        async def get(self, url: str):
+            raise ValueError(f"unsupported URL {url}")
+
+    result = asyncio.run(warm_viewer(titiler, AOI_BBOX, client=BrokenClient()))
+
+    assert result.requests == []
+    assert "unsupported URL" in result.error
+    assert "unsupported URL" in result.summary()["error"]
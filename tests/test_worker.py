@@ -0,0 +1,177 @@
+import asyncio
+import json
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+from types import SimpleNamespace
+
+import pytest
+
+from autopilot import pipeline, worker
+from autopilot.reporting import RunReporter
+from autopilot.worker import WorkerJob, WorkerQueueConsumer, WorkerSocketServer
+
+
+def test_worker_job_accepts_cloudevent_and_job_payloads() -> None:
+    event = WorkerJob.from_message(json.dumps({"data": {"id": "alert-1"}}))
+    job = WorkerJob.from_message(
+        json.dumps({"alert": {"id": "alert-2"}, "mode": "simulate", "run_id": "r1"})
+    )
+
+    assert event.alert == {"id": "alert-1"}
+    assert event.mode == "auto"
+    assert job.alert == {"id": "alert-2"}
+    assert job.mode == "simulate"
+    assert job.run_id == "r1"
+
+    with pytest.raises(ValueError):
+        WorkerJob.from_message(json.dumps({"unexpected": True}))
+
+
+def test_socket_server_round_trips_jobs(tmp_path: Path) -> None:
+    class FakeRunner:
+        def __init__(self) -> None:
+            self.jobs: list[WorkerJob] = []
+
+        async def submit(self, job: WorkerJob) -> dict:
+            self.jobs.append(job)
+            return {"alert_id": job.alert["id"], "status": "succeeded"}
+
+    runner = FakeRunner()
+    server = WorkerSocketServer(runner, tmp_path / "worker.sock")
+
+    async def scenario() -> list[dict]:
+        await server.start()
+        try:
+            reader, writer = await asyncio.open_unix_connection(str(server.path))
+            writer.write(json.dumps({"alert": {"id": "a-1"}}).encode() + b"\n")
+            writer.write(b"not json\n")
+            await writer.drain()
+            responses = [json.loads(await reader.readline()) for _ in range(2)]
+            writer.close()
+            await writer.wait_closed()
+            return responses
+        finally:
+            await server.close()
+
+    responses = asyncio.run(scenario())
+
+    assert responses[0] == {"alert_id": "a-1", "status": "succeeded"}
+    assert responses[1]["status"] == "rejected"
+    assert [job.alert["id"] for job in runner.jobs] == ["a-1"]
+
+
+def test_queue_consumer_rejects_malformed_and_requeues_failed_submissions() -> None:
+    class FakeMessage:
+        def __init__(self, body: bytes, redelivered: bool = False) -> None:
+            self.body = body
+            self.redelivered = redelivered
+            self.settled: tuple[str, bool] | None = None
+
+        async def ack(self) -> None:
+            self.settled = ("ack", False)
+
+        async def reject(self, requeue: bool = False) -> None:
+            self.settled = ("reject", requeue)
+
+        async def nack(self, requeue: bool = True) -> None:
+            self.settled = ("nack", requeue)
+
+    class FlakyRunner:
+        async def submit(self, job: WorkerJob) -> dict:
+            if job.alert["id"] == "crash":
+                raise RuntimeError("worker process died")
+            return {"alert_id": job.alert["id"], "status": "failed"}
+
+    consumer = WorkerQueueConsumer(FlakyRunner(), "alerts.worker", prefetch=1)
+    messages = {
+        "malformed": FakeMessage(b"not json"),
+        "finished": FakeMessage(json.dumps({"alert": {"id": "ok"}}).encode()),
+        "crashed": FakeMessage(json.dumps({"alert": {"id": "crash"}}).encode()),
+        "crashed_again": FakeMessage(
+            json.dumps({"alert": {"id": "crash"}}).encode(), redelivered=True
+        ),
+    }
+
+    async def scenario() -> None:
+        for message in messages.values():
+            await consumer._process(message)
+
+    asyncio.run(scenario())
+
+    assert messages["malformed"].settled == ("reject", False)
+    assert messages["finished"].settled == ("ack", False)
+    assert messages["crashed"].settled == ("nack", True)
+    assert messages["crashed_again"].settled == ("nack", False)
+
+
+def test_pipeline_records_failure_and_scene_cache(monkeypatch: pytest.MonkeyPatch) -> None:
+    class FakeCache:
+        class stats:
+            @staticmethod
+            def as_dict() -> dict:
+                return {"hits": 2, "misses": 1}
+
+    async def fake_convert(alert, **kwargs):
+        return SimpleNamespace(viewer=None)
+
+    async def failing_stac(alert, output):
+        raise RuntimeError("catalog unavailable")
+
+    monkeypatch.setattr(pipeline, "convert_alert", fake_convert)
+    monkeypatch.setattr(pipeline, "create_stac_item", failing_stac)
+    monkeypatch.setattr(pipeline, "get_scene_search_cache", lambda: FakeCache())
+    monkeypatch.setattr(RunReporter, "record_conversion", lambda self, output: None)
+    reporter = RunReporter(run_id="r-1")
+    reporter.start_run()
+
+    with pytest.raises(RuntimeError, match="catalog unavailable"):
+        asyncio.run(pipeline.run_pipeline(SimpleNamespace(id="a-1"), reporter))
+    reporter.finish_run()
+
+    assert reporter.status == "failed"
+    assert reporter.steps["error"] == {"message": "catalog unavailable"}
+    assert reporter.summary()["stage_seconds"].keys() == {"conversion", "stac"}
+    assert reporter.steps["scene_search_cache"] == {"hits": 2, "misses": 1}
+
+
+def test_pool_reserves_projected_memory_before_dispatch(monkeypatch: pytest.MonkeyPatch) -> None:
+    lock = threading.Lock()
+    running = {"now": 0, "max": 0}
+
+    def fake_run_job(payload: dict) -> dict:
+        with lock:
+            running["now"] += 1
+            running["max"] = max(running["max"], running["now"])
+        time.sleep(0.05)
+        with lock:
+            running["now"] -= 1
+        return {"alert_id": payload["alert"]["id"], "status": "succeeded"}
+
+    monkeypatch.setattr(worker, "_run_job", fake_run_job)
+    projected = worker._projected_job_bytes(WorkerJob(alert={"id": "a"}))
+    assert worker._projected_job_bytes(WorkerJob(alert={"id": "a"}, temporal_cube=True)) == (
+        2 * projected
+    )
+
+    def run(budget_bytes: int, jobs: list[WorkerJob]) -> tuple[int, int]:
+        running["max"] = 0
+        pool = worker.WorkerPool(3, budget_bytes=budget_bytes)
+        pool._executor.shutdown()
+        pool._executor = ThreadPoolExecutor(max_workers=3)
+
+        async def scenario() -> None:
+            await asyncio.gather(*(pool.submit(job) for job in jobs))
+
+        try:
+            asyncio.run(scenario())
+        finally:
+            pool.close()
+        return running["max"], pool.reserved_bytes
+
+    small = [WorkerJob(alert={"id": f"a-{index}"}) for index in range(4)]
+    # Three processes, but only two projected working sets fit the budget.
+    assert run(2 * projected, small) == (2, 0)
+    # A job larger than the whole budget runs alone.
+    assert run(projected, [*small[:2], WorkerJob(alert={"id": "t"}, temporal_cube=True)]) == (1, 0)